@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 캐시 모듈
+
+이 파일이 하는 일:
+같은 텍스트에 대한 임베딩을 다시 만들지 않도록 결과를 저장해 둡니다.
+
+QueryEmbeddingCache (메모리):
+- 검색어 임베딩 전용 LRU + TTL 캐시
+- "장학금", "수강신청", "기숙사"처럼 하루 종일 반복되는 검색어는
+  Gemini 왕복(수백 ms) 없이 바로 응답
+- 적중/미스/만료/제거 횟수를 stats()로 노출 (모니터링용)
+
+PersistentEmbeddingCache (디스크, SQLite):
+- 문서 임베딩(create_embedding) 전용, 프로세스 재시작 후에도 유지
+- 키: SHA-256(전처리된 텍스트 + 모델명 + 차원 + task_type)
+- 재크롤링된 공지 업데이트, migrate_embeddings.py 재실행,
+  같은 학과/학년/카테고리 조합의 프로필 저장 시 Gemini 호출 생략
+- 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+- 적중 시 last_used 갱신은 메모리에 모았다가 put(또는 TOUCH_FLUSH_INTERVAL번 적중)마다
+  한 번에 기록 (읽기 경로에서 매번 WAL 커밋하지 않도록)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+class QueryEmbeddingCache:
+    """
+    크기 제한(LRU) + 선택적 만료 시간(TTL)을 가진 검색어 임베딩 캐시
+
+    키: (정규화된 검색어, 모델명, 차원)
+    값: float32 임베딩 배열
+
+    사용 예시:
+    cache = QueryEmbeddingCache(max_size=512, ttl_seconds=3600)
+    key = cache.make_key("장학금", "models/gemini-embedding-001", 768)
+    embedding = cache.get(key)
+    if embedding is None:
+        embedding = create_embedding(...)
+        cache.put(key, embedding)
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: Optional[float] = None):
+        """
+        매개변수:
+        - max_size: 최대 보관 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        - ttl_seconds: 항목 유효 시간 (None 또는 0이면 만료 없음)
+        """
+        self.max_size = max(1, int(max_size))
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, int], Tuple[np.ndarray, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """캐시 키용 검색어 정규화 (유니코드 NFC, 대소문자 통일, 연속 공백 제거)"""
+        query = unicodedata.normalize("NFC", query or "")
+        return " ".join(query.casefold().split())
+
+    @classmethod
+    def make_key(cls, query: str, model_name: str, dimension: int) -> Tuple[str, str, int]:
+        return (cls.normalize_query(query), model_name, int(dimension))
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[np.ndarray]:
+        """캐시된 임베딩을 반환합니다 (없거나 만료되면 None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            embedding, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key: Tuple[str, str, int], embedding: Any) -> None:
+        """임베딩을 저장합니다 (가득 차면 LRU 항목 제거)."""
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+class PersistentEmbeddingCache:
+    """
+    SQLite 기반 디스크 임베딩 캐시
+
+    한 파일을 파이프라인, 마이그레이션 스크립트, API 서버가 함께 사용합니다.
+    (WAL 모드라 여러 프로세스가 동시에 읽고 쓸 수 있음)
+
+    사용 예시:
+    cache = PersistentEmbeddingCache("/tmp/embeddings.sqlite3", max_entries=20000)
+    key = cache.make_key(text, "models/gemini-embedding-001", 768, "retrieval_document")
+    embedding = cache.get(key)
+    if embedding is None:
+        embedding = create_embedding(...)
+        cache.put(key, embedding)
+    """
+
+    EVICT_CHECK_INTERVAL = 100  # put 몇 번마다 크기 제한을 확인할지
+    TOUCH_FLUSH_INTERVAL = 256  # put 없이 적중만 이어질 때 last_used를 기록할 적중 수
+
+    def __init__(self, path: str, max_entries: int = 20000):
+        """
+        매개변수:
+        - path: SQLite 파일 경로 (상위 디렉터리가 없으면 생성)
+        - max_entries: 최대 보관 임베딩 수
+        """
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "  key TEXT PRIMARY KEY,"
+            "  dimension INTEGER NOT NULL,"
+            "  vector BLOB NOT NULL,"
+            "  last_used REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+        self._puts_since_check = 0
+        self._pending_touches: Dict[str, float] = {}   # 키 → 마지막 적중 시각 (아직 기록 안 함)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, model_name: str, dimension: int, task_type: str = "retrieval_document") -> str:
+        """전처리된 텍스트와 모델 설정으로 SHA-256 키를 만듭니다."""
+        raw = "\x1f".join([model_name, str(int(dimension)), task_type, text])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """캐시된 임베딩(float32)을 반환합니다 (없으면 None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dimension, vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._pending_touches[key] = time.time()
+            if len(self._pending_touches) >= self.TOUCH_FLUSH_INTERVAL:
+                self._flush_touches_locked()
+                self._conn.commit()
+            self.hits += 1
+
+        dimension, blob = row
+        vector = np.frombuffer(blob, dtype=np.float32)
+        if vector.shape != (dimension,):
+            return None
+        return vector
+
+    def put(self, key: str, embedding: Any) -> None:
+        """임베딩을 저장합니다 (EVICT_CHECK_INTERVAL마다 크기 제한 확인)."""
+        vector = np.ascontiguousarray(embedding, dtype=np.float32)
+
+        with self._lock:
+            # 모아 둔 적중 기록을 같은 트랜잭션에 반영 (삭제 대상 선정 전에)
+            self._flush_touches_locked()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, dimension, vector, last_used) VALUES (?, ?, ?, ?)",
+                (key, int(vector.shape[0]), vector.tobytes(), time.time())
+            )
+
+            self._puts_since_check += 1
+            if self._puts_since_check >= self.EVICT_CHECK_INTERVAL:
+                self._puts_since_check = 0
+                self._evict_locked()
+
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """모아 둔 last_used 갱신을 기록합니다."""
+        with self._lock:
+            if self._pending_touches:
+                self._flush_touches_locked()
+                self._conn.commit()
+
+    def _flush_touches_locked(self) -> None:
+        if not self._pending_touches:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE key = ?",
+            [(used_at, key) for key, used_at in self._pending_touches.items()]
+        )
+        self._pending_touches.clear()
+
+    def _evict_locked(self) -> None:
+        """최대 항목 수를 넘은 만큼 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "  SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?"
+            ")",
+            (overflow,)
+        )
+        self.evictions += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 통계"""
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            total = self.hits + self.misses
+            return {
+                "path": self.path,
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pending_touches": len(self._pending_touches),
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
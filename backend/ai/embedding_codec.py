@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 코덱 모듈
+
+이 파일이 하는 일:
+PostgREST가 내려주는 임베딩 값을 float32 NumPy 버퍼로 바로 변환합니다.
+
+PostgREST 응답 형식:
+- pgvector 컬럼: 문자열 "[0.01,-0.2,...]"
+- RPC 파라미터/일부 클라이언트: JSON 리스트 [0.01, -0.2, ...]
+
+왜 필요한가?
+- 기존: json.loads → Python float 객체 768개짜리 리스트 (벡터당 약 25KB 힙)
+  → 다시 NumPy 배열로 복사
+- 코덱: 문자열을 C 파서(np.fromstring)로 바로 float32 배열로 읽음
+  (벡터당 3KB, 중간 리스트 없음)
+
+사용 예시:
+vector = parse_vector(row["content_embedding"])           # (768,) float32
+matrix = parse_matrix([r["content_embedding"] for r in rows])  # (n, 768) float32
+"""
+
+from array import array
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from ai.embedding_service import EmbeddingService
+
+
+def _parse_text(text: str) -> np.ndarray:
+    """pgvector 텍스트("[...]")를 float32 배열로 읽습니다 (Python 리스트를 만들지 않음)."""
+    body = text.strip()
+    if body.startswith("[") and body.endswith("]"):
+        body = body[1:-1]
+    if not body.strip():
+        return np.empty(0, dtype=np.float32)
+
+    vector = np.fromstring(body, dtype=np.float32, sep=",")
+
+    # np.fromstring은 숫자가 아닌 값을 만나면 그 앞까지만 읽으므로 개수로 검증
+    if vector.size != body.count(",") + 1:
+        raise ValueError("pgvector 텍스트 형식이 올바르지 않습니다")
+    return vector
+
+
+def parse_vector(value: Any, dimension: Optional[int] = EmbeddingService.DIMENSION) -> Optional[np.ndarray]:
+    """
+    임베딩 값 1개를 float32 1차원 배열로 변환합니다.
+
+    매개변수:
+    - value: pgvector 문자열, 리스트, NumPy 배열, array('f')/bytes 버퍼
+    - dimension: 기대 차원 (None이면 검사 안 함)
+
+    반환값:
+    - (dimension,) float32 배열, 값이 None/빈 값이면 None
+
+    예외:
+    - ValueError: 형식이 잘못되었거나 차원이 다른 경우
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, str):
+        vector = _parse_text(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        vector = np.frombuffer(value, dtype=np.float32)
+    elif isinstance(value, array) and value.typecode == "f":
+        vector = np.frombuffer(value, dtype=np.float32)
+    else:
+        vector = np.asarray(value, dtype=np.float32).reshape(-1)
+
+    if vector.size == 0:
+        return None
+    if dimension is not None and vector.shape[0] != dimension:
+        raise ValueError(f"임베딩 차원 불일치: 예상 {dimension}, 실제 {vector.shape[0]}")
+    return vector
+
+
+def parse_matrix(
+    values: Sequence[Any],
+    dimension: int = EmbeddingService.DIMENSION,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    임베딩 값 여러 개를 (n, dimension) float32 행렬로 변환합니다.
+
+    행렬을 한 번만 할당하고 각 행을 채우므로 중간 리스트가 생기지 않습니다.
+    값이 없거나 차원이 맞지 않는 행은 영벡터로 두어 입력과 행 순서를 유지합니다.
+    (영벡터의 코사인 유사도는 0)
+
+    매개변수:
+    - values: 임베딩 값 목록
+    - dimension: 기대 차원
+    - out: 결과를 채울 (n, dimension) float32 배열 (없으면 새로 할당)
+    """
+    count = len(values)
+    if out is None:
+        out = np.zeros((count, dimension), dtype=np.float32)
+    elif out.shape != (count, dimension) or out.dtype != np.float32:
+        raise ValueError(f"out 배열 형태가 올바르지 않습니다: {out.shape}, {out.dtype}")
+
+    invalid = 0
+    for row, value in enumerate(values):
+        try:
+            vector = parse_vector(value, dimension)
+        except ValueError:
+            vector = None
+            invalid += 1
+
+        if vector is None:
+            out[row] = 0.0
+        else:
+            out[row] = vector
+
+    if invalid:
+        print(f"[임베딩 코덱] 형식/차원이 잘못된 임베딩 {invalid}개를 영벡터로 처리")
+    return out
+
+
+def parse_unit_matrix(values: Sequence[Any], dimension: int = EmbeddingService.DIMENSION) -> np.ndarray:
+    """parse_matrix 후 행을 제자리에서 단위 벡터로 정규화합니다 (영벡터는 그대로 0)."""
+    matrix = parse_matrix(values, dimension)
+    norms = EmbeddingService.vector_norms(matrix)
+    norms[norms == 0] = 1.0
+    matrix /= norms[:, None]
+    return matrix
+
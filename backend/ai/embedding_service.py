@@ -17,10 +17,15 @@
 """
 
 import google.generativeai as genai
+import numpy as np
+import atexit
 import os
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Any, Dict, Callable, Tuple
 from dotenv import load_dotenv
 
+from ai.embedding_cache import QueryEmbeddingCache, PersistentEmbeddingCache
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -48,12 +53,35 @@ class EmbeddingService:
     DIMENSION = 768
     MAX_CHARS = 8000  # 최대 입력 문자 수 (약 3000 토큰)
 
-    def __init__(self, api_key: Optional[str] = None):
+    # 일괄 임베딩 설정 (batchEmbedContents 요청당 최대 100개)
+    BATCH_SIZE = 100
+    BATCH_CONCURRENCY = int(os.getenv("EMBEDDING_BATCH_CONCURRENCY", 4))
+
+    # 검색어 임베딩 캐시 (프로세스 내 모든 인스턴스가 공유)
+    # QUERY_EMBEDDING_CACHE_TTL=0이면 만료 없이 LRU로만 관리
+    query_cache = QueryEmbeddingCache(
+        max_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 512)),
+        ttl_seconds=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", 6 * 60 * 60))
+    )
+
+    # 문서 임베딩 디스크 캐시 (첫 사용 시 생성, EMBEDDING_CACHE_ENABLED=false면 비활성)
+    DEFAULT_DOCUMENT_CACHE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "embeddings.sqlite3"
+    )
+    _document_cache: Optional[PersistentEmbeddingCache] = None
+    _document_cache_initialized = False
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        embed_fn: Optional[Callable[..., Dict[str, Any]]] = None
+    ):
         """
         임베딩 서비스를 초기화합니다.
 
         매개변수:
         - api_key: Gemini API 키 (없으면 환경변수에서 자동 로드)
+        - embed_fn: genai.embed_content 대체 함수 (테스트용 로컬 스텁 주입)
 
         하는 일:
         1. API 키 설정
@@ -70,6 +98,7 @@ class EmbeddingService:
 
         # Gemini API 설정
         genai.configure(api_key=self.api_key)
+        self._embed_content = embed_fn or genai.embed_content
         print(f"EmbeddingService 초기화 완료 (모델: {self.MODEL_NAME}, 차원: {self.DIMENSION})")
 
     def create_embedding(self, text: str) -> List[float]:
@@ -89,6 +118,9 @@ class EmbeddingService:
         task_type 설명:
         - retrieval_document: 검색될 문서용 (공지사항, 사용자 프로필)
         - retrieval_query: 검색 쿼리용 (사용자 검색어)
+
+        전처리 결과가 같은 텍스트는 디스크 캐시(document_cache)에서 반환하므로
+        재크롤링/마이그레이션 재실행/동일 프로필 저장 시 API를 다시 호출하지 않습니다.
         """
         # 텍스트 전처리
         text = self._preprocess_text(text)
@@ -96,9 +128,21 @@ class EmbeddingService:
         if not text:
             raise ValueError("임베딩할 텍스트가 비어있습니다.")
 
+        # 디스크 캐시 확인 (같은 텍스트는 Gemini 호출 생략)
+        cache = self.document_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(text, self.MODEL_NAME, self.DIMENSION, "retrieval_document")
+            try:
+                cached = cache.get(cache_key)
+                if cached is not None and cached.shape[0] == self.DIMENSION:
+                    return cached.tolist()
+            except Exception as e:
+                print(f"[임베딩 캐시] 조회 실패 (무시): {str(e)}")
+
         try:
             # Gemini Embedding API 호출
-            result = genai.embed_content(
+            result = self._embed_content(
                 model=self.MODEL_NAME,
                 content=text,
                 task_type="retrieval_document",  # 문서 검색용
@@ -113,11 +157,43 @@ class EmbeddingService:
                     f"임베딩 차원 불일치: 예상 {self.DIMENSION}, 실제 {len(embedding)}"
                 )
 
-            return embedding
-
         except Exception as e:
             raise Exception(f"임베딩 생성 실패: {str(e)}")
 
+        if cache is not None:
+            try:
+                cache.put(cache_key, embedding)
+            except Exception as e:
+                print(f"[임베딩 캐시] 저장 실패 (무시): {str(e)}")
+
+        return embedding
+
+    @classmethod
+    def document_cache(cls) -> Optional[PersistentEmbeddingCache]:
+        """
+        문서 임베딩 디스크 캐시를 반환합니다 (프로세스당 1회 생성).
+
+        환경 변수:
+        - EMBEDDING_CACHE_ENABLED: false면 캐시 사용 안 함 (기본 true)
+        - EMBEDDING_CACHE_PATH: SQLite 파일 경로 (기본 backend/.cache/embeddings.sqlite3)
+        - EMBEDDING_CACHE_MAX_ENTRIES: 최대 보관 수 (기본 20000, 약 60MB)
+        """
+        if not cls._document_cache_initialized:
+            cls._document_cache_initialized = True
+            if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+                path = os.getenv("EMBEDDING_CACHE_PATH") or cls.DEFAULT_DOCUMENT_CACHE_PATH
+                try:
+                    cls._document_cache = PersistentEmbeddingCache(
+                        path=path,
+                        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 20000))
+                    )
+                    # 모아 둔 적중 기록(last_used)은 종료 시에도 기록
+                    atexit.register(cls._document_cache.flush)
+                    print(f"[임베딩 캐시] 디스크 캐시 사용: {path}")
+                except Exception as e:
+                    print(f"[임베딩 캐시] 초기화 실패, 캐시 없이 진행: {str(e)}")
+        return cls._document_cache
+
     def create_query_embedding(self, query: str) -> List[float]:
         """
         검색 쿼리에 대한 임베딩을 생성합니다.
@@ -135,6 +211,9 @@ class EmbeddingService:
         Google의 임베딩 모델은 문서와 쿼리를 다르게 인코딩하여
         검색 성능을 최적화합니다.
 
+        같은 검색어(정규화 기준)는 query_cache에서 바로 반환하므로
+        반복 검색은 Gemini API를 호출하지 않습니다.
+
         사용 예시:
         # 사용자가 "장학금"을 검색했을 때
         query_embedding = service.create_query_embedding("장학금")
@@ -145,55 +224,127 @@ class EmbeddingService:
         if not query:
             raise ValueError("검색 쿼리가 비어있습니다.")
 
+        cache_key = self.query_cache.make_key(query, self.MODEL_NAME, self.DIMENSION)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return cached.tolist()
+
         try:
-            result = genai.embed_content(
+            result = self._embed_content(
                 model=self.MODEL_NAME,
                 content=query,
                 task_type="retrieval_query",  # 쿼리 검색용
                 output_dimensionality=self.DIMENSION  # 차원 축소
             )
 
-            return result['embedding']
+            embedding = result['embedding']
+            self.query_cache.put(cache_key, embedding)
+            return embedding
 
         except Exception as e:
             raise Exception(f"쿼리 임베딩 생성 실패: {str(e)}")
 
+    @classmethod
+    def query_cache_stats(cls) -> Dict[str, Any]:
+        """검색어 임베딩 캐시 통계 (적중률 모니터링용)"""
+        return cls.query_cache.stats()
+
     def batch_create_embeddings(
         self,
         texts: List[str],
-        show_progress: bool = True
-    ) -> List[List[float]]:
+        show_progress: bool = True,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Optional[List[float]]]:
         """
         여러 텍스트에 대한 임베딩을 일괄 생성합니다.
 
         매개변수:
         - texts: 임베딩할 텍스트 리스트
         - show_progress: 진행 상황 출력 여부
+        - batch_size: 요청 1회에 담을 텍스트 수 (기본 BATCH_SIZE=100)
+        - max_concurrency: 동시에 보낼 요청 수 (기본 EMBEDDING_BATCH_CONCURRENCY=4)
 
         반환값:
-        - 임베딩 벡터 리스트
+        - 입력 순서와 같은 임베딩 리스트 (실패한 위치는 None)
+
+        처리 과정:
+        1. 디스크 캐시에 있는 텍스트는 API 호출 없이 채움
+        2. 나머지를 batch_size개씩 묶어 다중 content 요청으로 전송
+        3. 최대 max_concurrency개 요청을 동시에 실행
+        4. 실패한 배치/항목은 create_embedding으로 하나씩 재시도
 
         사용 예시:
         texts = ["공지1 내용", "공지2 내용", "공지3 내용"]
         embeddings = service.batch_create_embeddings(texts)
         print(len(embeddings))  # 3
-        print(len(embeddings[0]))  # 3072
+        print(len(embeddings[0]))  # 768
         """
-        embeddings = []
-        total = len(texts)
+        batch_size = max(1, batch_size or self.BATCH_SIZE)
+        max_concurrency = max(1, max_concurrency or self.BATCH_CONCURRENCY)
 
-        for i, text in enumerate(texts, 1):
+        total = len(texts)
+        embeddings: List[Optional[List[float]]] = [None] * total
+        cache = self.document_cache()
+
+        # 1. 전처리 + 캐시 확인
+        pending: List[Tuple[int, str]] = []
+        for index, text in enumerate(texts):
+            processed = self._preprocess_text(text)
+            if not processed:
+                print(f"  임베딩 생성 실패 (인덱스 {index + 1}): 임베딩할 텍스트가 비어있습니다.")
+                continue
+
+            if cache is not None:
+                try:
+                    cached = cache.get(cache.make_key(processed, self.MODEL_NAME, self.DIMENSION))
+                    if cached is not None and cached.shape[0] == self.DIMENSION:
+                        embeddings[index] = cached.tolist()
+                        continue
+                except Exception as e:
+                    print(f"[임베딩 캐시] 조회 실패 (무시): {str(e)}")
+
+            pending.append((index, processed))
+
+        # 2~3. 다중 content 요청을 동시 실행
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        failed: List[Tuple[int, str]] = []
+        done = total - len(pending)
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+                futures = {executor.submit(self._embed_batch, batch): batch for batch in batches}
+
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        vectors = future.result()
+                    except Exception as e:
+                        print(f"  배치 임베딩 실패 ({len(batch)}개, 개별 재시도 예정): {str(e)}")
+                        failed.extend(batch)
+                        continue
+
+                    for (index, processed), vector in zip(batch, vectors):
+                        if vector is None or len(vector) != self.DIMENSION:
+                            failed.append((index, processed))
+                            continue
+                        embeddings[index] = vector
+                        if cache is not None:
+                            try:
+                                cache.put(cache.make_key(processed, self.MODEL_NAME, self.DIMENSION), vector)
+                            except Exception as e:
+                                print(f"[임베딩 캐시] 저장 실패 (무시): {str(e)}")
+
+                    done += len(batch)
+                    if show_progress:
+                        print(f"  임베딩 생성 진행: {done}/{total}")
+
+        # 4. 실패 항목 개별 재시도
+        for index, processed in sorted(failed):
             try:
-                embedding = self.create_embedding(text)
-                embeddings.append(embedding)
-
-                if show_progress and i % 10 == 0:
-                    print(f"  임베딩 생성 진행: {i}/{total}")
-
+                embeddings[index] = self.create_embedding(processed)
             except Exception as e:
-                print(f"  임베딩 생성 실패 (인덱스 {i}): {str(e)}")
-                # 실패한 경우 None 추가 (빈 벡터 [] 저장 방지)
-                embeddings.append(None)
+                print(f"  임베딩 생성 실패 (인덱스 {index + 1}): {str(e)}")
 
         if show_progress:
             success_count = sum(1 for e in embeddings if e)
@@ -201,6 +352,20 @@ class EmbeddingService:
 
         return embeddings
 
+    def _embed_batch(self, batch: List[Tuple[int, str]]) -> List[Optional[List[float]]]:
+        """전처리된 텍스트 묶음을 다중 content 요청 1회로 임베딩합니다."""
+        result = self._embed_content(
+            model=self.MODEL_NAME,
+            content=[text for _, text in batch],
+            task_type="retrieval_document",
+            output_dimensionality=self.DIMENSION
+        )
+
+        vectors = result['embedding']
+        if len(vectors) != len(batch):
+            raise ValueError(f"응답 개수 불일치: 요청 {len(batch)}, 응답 {len(vectors)}")
+        return vectors
+
     def create_notice_embedding_text(
         self,
         title: str,
@@ -364,26 +529,159 @@ class EmbeddingService:
         emb2 = service.create_embedding("등록금 지원")
         similarity = service.calculate_similarity(emb1, emb2)
         print(similarity)  # 0.85 (높은 유사도)
-        """
-        import math
 
+        여러 벡터와 비교할 때는 calculate_similarities를 사용하세요.
+        """
         # 벡터 길이가 다르면 에러
         if len(embedding1) != len(embedding2):
             raise ValueError("임베딩 벡터의 길이가 다릅니다.")
 
-        # 내적 (dot product)
-        dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
+        matrix = self.as_matrix([embedding2])
+        return float(self.calculate_similarities(embedding1, matrix)[0])
+
+    # =========================================================================
+    # 벡터화 유사도 계산 (NumPy)
+    # =========================================================================
+
+    @staticmethod
+    def as_matrix(vectors: Any) -> np.ndarray:
+        """
+        벡터 묶음을 (n, 차원) float32 행렬로 변환합니다.
+
+        NumPy 배열, array('f') 같은 버퍼 객체, 리스트의 리스트를 모두 받습니다.
+        이미 float32 C-연속 배열이면 복사하지 않습니다.
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2:
+            raise ValueError(f"임베딩 행렬은 2차원이어야 합니다 (실제: {matrix.ndim}차원)")
+        return matrix
+
+    @staticmethod
+    def vector_norms(matrix: Any) -> np.ndarray:
+        """
+        각 행 벡터의 크기(L2 norm)를 float32 배열로 반환합니다.
+
+        같은 행렬로 여러 번 검색할 때 미리 계산해 두고
+        calculate_similarities / pairwise_similarities의 norms 인자로 넘기면
+        매 호출마다 크기를 다시 계산하지 않습니다.
+        """
+        matrix = EmbeddingService.as_matrix(matrix)
+        return np.sqrt(np.einsum("ij,ij->i", matrix, matrix), dtype=np.float32)
+
+    @staticmethod
+    def normalize(matrix: Any) -> np.ndarray:
+        """행 벡터를 단위 벡터로 정규화한 float32 행렬을 반환합니다 (영벡터는 그대로 0)."""
+        matrix = EmbeddingService.as_matrix(matrix)
+        norms = EmbeddingService.vector_norms(matrix)
+        norms[norms == 0] = 1.0
+        return matrix / norms[:, None]
+
+    @staticmethod
+    def truncate(matrix: Any, dimension: int) -> np.ndarray:
+        """
+        앞쪽 dimension개 성분만 남기고 다시 정규화한 C-연속 float32 행렬을 반환합니다.
+
+        gemini-embedding-001은 Matryoshka 방식으로 학습되어 앞쪽 차원에 정보가 몰려 있으므로
+        잘라낸 벡터끼리의 코사인 유사도가 원래 유사도의 좋은 근사값이 됩니다.
+        (1차 후보 선별용, 최종 점수는 전체 차원으로 다시 계산)
+        """
+        matrix = EmbeddingService.as_matrix(matrix)
+        if dimension >= matrix.shape[1]:
+            return matrix
+
+        prefix = np.ascontiguousarray(matrix[:, :dimension])
+        norms = EmbeddingService.vector_norms(prefix)
+        norms[norms == 0] = 1.0
+        prefix /= norms[:, None]
+        return prefix
+
+    @staticmethod
+    def calculate_similarities(
+        query: Any,
+        matrix: Any,
+        matrix_norms: Optional[np.ndarray] = None,
+        normalized: bool = False
+    ) -> np.ndarray:
+        """
+        쿼리 벡터 1개와 행렬의 모든 행 간 코사인 유사도를 한 번에 계산합니다.
+
+        매개변수:
+        - query: 쿼리 벡터 (차원,)
+        - matrix: 후보 벡터 행렬 (n, 차원)
+        - matrix_norms: 미리 계산한 행 크기 (vector_norms 결과, 없으면 계산)
+        - normalized: True면 query와 matrix가 이미 단위 벡터라고 보고 내적만 계산
+
+        반환값:
+        - (n,) float32 유사도 배열 (크기가 0인 벡터는 0)
+
+        사용 예시:
+        scores = EmbeddingService.calculate_similarities(query_emb, notice_matrix)
+        top = scores.argsort()[::-1][:10]
+        """
+        query = EmbeddingService.as_matrix(query)[0]
+        matrix = EmbeddingService.as_matrix(matrix)
+
+        if matrix.shape[1] != query.shape[0]:
+            raise ValueError(
+                f"임베딩 차원 불일치: 쿼리 {query.shape[0]}, 행렬 {matrix.shape[1]}"
+            )
 
-        # 각 벡터의 크기 (magnitude)
-        magnitude1 = math.sqrt(sum(a * a for a in embedding1))
-        magnitude2 = math.sqrt(sum(b * b for b in embedding2))
+        scores = matrix @ query
+        if normalized:
+            return scores
+
+        if matrix_norms is None:
+            matrix_norms = EmbeddingService.vector_norms(matrix)
+        query_norm = np.float32(np.linalg.norm(query))
+
+        denominator = matrix_norms * query_norm
+        return np.divide(
+            scores, denominator,
+            out=np.zeros_like(scores), where=denominator > 0
+        ).astype(np.float32, copy=False)
+
+    @staticmethod
+    def pairwise_similarities(
+        a: Any,
+        b: Any,
+        a_norms: Optional[np.ndarray] = None,
+        b_norms: Optional[np.ndarray] = None,
+        normalized: bool = False
+    ) -> np.ndarray:
+        """
+        두 행렬의 모든 행 쌍 간 코사인 유사도를 행렬 곱 한 번으로 계산합니다.
 
-        # 0으로 나누기 방지
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
+        매개변수:
+        - a: (m, 차원) 행렬 (예: 공지 임베딩)
+        - b: (n, 차원) 행렬 (예: 사용자 임베딩)
+        - a_norms / b_norms: 미리 계산한 행 크기 (없으면 계산)
+        - normalized: True면 두 행렬이 이미 단위 벡터라고 보고 내적만 계산
 
-        # 코사인 유사도
-        return dot_product / (magnitude1 * magnitude2)
+        반환값:
+        - (m, n) float32 유사도 행렬
+        """
+        a = EmbeddingService.as_matrix(a)
+        b = EmbeddingService.as_matrix(b)
+
+        if a.shape[1] != b.shape[1]:
+            raise ValueError(f"임베딩 차원 불일치: {a.shape[1]} vs {b.shape[1]}")
+
+        scores = a @ b.T
+        if normalized:
+            return scores
+
+        if a_norms is None:
+            a_norms = EmbeddingService.vector_norms(a)
+        if b_norms is None:
+            b_norms = EmbeddingService.vector_norms(b)
+
+        denominator = np.outer(a_norms, b_norms)
+        return np.divide(
+            scores, denominator,
+            out=np.zeros_like(scores), where=denominator > 0
+        ).astype(np.float32, copy=False)
 
 
 # 테스트 코드
@@ -7,6 +7,7 @@ Flask 애플리케이션의 핵심 라우팅 및 서버 설정을 담당합니
 from flask import Flask, jsonify
 from flask_cors import CORS
 import os
+import threading
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -46,6 +47,10 @@ scheduler = SchedulerService()
 if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
     scheduler.start()
 
+    # 검색 인덱스 예열 (디스크 스냅샷 복원 + 변경분 조회, 요청 처리와 병행)
+    from routes.search import warm_up_search_indexes
+    threading.Thread(target=warm_up_search_indexes, daemon=True).start()
+
 
 @app.route('/')
 def index():
@@ -11,7 +11,7 @@
 """
 
 from flask import Blueprint, request, jsonify, g
-from services.supabase_service import get_supabase_client
+from services.supabase_service import get_supabase_client, NOTICE_LIST_COLUMNS
 from utils.auth_middleware import login_required
 
 # Blueprint 생성 (URL 접두사: /api/bookmarks)
@@ -144,7 +144,7 @@ def get_bookmarks():
         notice_ids = [b["notice_id"] for b in bookmark_result.data]
 
         notices_result = supabase.table("notices")\
-            .select("*")\
+            .select(NOTICE_LIST_COLUMNS)\
             .in_("id", notice_ids)\
             .execute()
 
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from urllib.parse import urlparse
 import requests as http_requests
 from services.supabase_service import SupabaseService
+from services.notice_cursor import next_cursor
 from crawler.crawler_manager import CrawlerManager
 from utils.auth_middleware import login_required, optional_login
 
@@ -236,12 +237,13 @@ def get_notices():
     """
     공지사항 목록을 조회합니다
 
-    GET /api/notices?category=공지사항&limit=20&offset=0
+    GET /api/notices?category=공지사항&limit=20&cursor=<이전 응답의 next_cursor>
 
     쿼리 파라미터:
     - category: 카테고리 필터 (선택)
     - limit: 가져올 개수 (기본 20)
-    - offset: 건너뛸 개수 (기본 0)
+    - cursor: 이전 페이지의 pagination.next_cursor (무한 스크롤, 페이지마다 비용 일정)
+    - offset: 건너뛸 개수 (기본 0, cursor가 없을 때만 사용 — 이전 방식)
 
     응답:
     {
@@ -261,7 +263,8 @@ def get_notices():
         "pagination": {
             "limit": 20,
             "offset": 0,
-            "total": 100
+            "count": 20,
+            "next_cursor": "WyJsYXRlc3QiLC..."   // 마지막 페이지면 null
         }
     }
     """
@@ -274,17 +277,22 @@ def get_notices():
         except (ValueError, TypeError):
             return jsonify({"status": "error", "message": "limit과 offset은 정수여야 합니다"}), 400
         deadline_from = request.args.get('deadline_from', None)
+        cursor = request.args.get('cursor') or None
         user_id = g.user_id  # optional_login으로 설정됨 (없으면 None)
 
         # Supabase에서 조회
         supabase = SupabaseService()
-        notices = supabase.get_notices(
-            category=category,
-            limit=limit,
-            offset=offset,
-            user_id=user_id,
-            deadline_from=deadline_from
-        )
+        try:
+            notices = supabase.get_notices(
+                category=category,
+                limit=limit,
+                offset=offset,
+                user_id=user_id,
+                deadline_from=deadline_from,
+                cursor=cursor
+            )
+        except ValueError as ve:
+            return jsonify({"status": "error", "message": str(ve)}), 400
 
         return jsonify({
             "status": "success",
@@ -292,7 +300,8 @@ def get_notices():
             "pagination": {
                 "limit": limit,
                 "offset": offset,
-                "count": len(notices)
+                "count": len(notices),
+                "next_cursor": next_cursor("deadline" if deadline_from else "latest", notices, limit)
             }
         }), 200
 
@@ -8,18 +8,59 @@
 주요 엔드포인트:
 - GET /api/search/notices: 사용자 맞춤 공지사항 검색
 - GET /api/search/notices/keyword: 키워드 기반 벡터 검색
+- GET /api/search/suggest: 검색어 자동완성 (메모리 접두어 인덱스)
 """
 
+from typing import Optional
+
 from flask import Blueprint, request, jsonify, g
 
 from services.hybrid_search_service import HybridSearchService
+from services.notice_cursor import apply_keyset, decode_cursor, encode_cursor, next_cursor, parse_count_mode
+from services.notice_text_index import get_notice_text_index
+from services.notice_suggest_index import get_notice_suggest_index
 from services.reranking_service import RerankingService
+from services import round_trip_counter
 from services.supabase_service import SupabaseService
 from utils.auth_middleware import login_required
 
 # Blueprint 생성 (URL 접두사: /api/search)
 search_bp = Blueprint('search', __name__, url_prefix='/api/search')
 
+# 전체 검색 응답 컬럼
+ALL_SEARCH_COLUMNS = (
+    "id, title, content, ai_summary, category, source_url, "
+    "published_at, author, view_count, deadline, display_mode, "
+    "has_important_image, content_images, bookmark_count"
+)
+
+@search_bp.before_request
+def _begin_round_trip_count():
+    """요청별 Supabase 왕복 수 계측 시작 (services/round_trip_counter.py)"""
+    g.round_trip_token = round_trip_counter.begin_count()
+
+
+@search_bp.after_request
+def _set_round_trip_header(response):
+    """지금까지의 왕복 수를 X-Supabase-Round-Trips 헤더로 알려줍니다."""
+    count = round_trip_counter.current_count()
+    if count is not None:
+        response.headers["X-Supabase-Round-Trips"] = str(count)
+    return response
+
+
+@search_bp.teardown_request
+def _end_round_trip_count(exc=None):
+    """
+    왕복 수를 엔드포인트별 통계에 기록하고 카운터를 닫습니다.
+    (after_request는 처리되지 않은 예외에서 건너뛸 수 있으므로 teardown에서 토큰을 반드시 되돌림)
+    """
+    token = g.pop("round_trip_token", None)
+    if token is not None:
+        counts = round_trip_counter.end_count(token)
+        round_trip_counter.record(request.endpoint or request.path, counts)
+
+
 # 서비스 싱글턴 캐싱 (매 요청마다 재초기화 방지)
 _search_service = None
 _reranking_service = None
@@ -48,6 +89,23 @@ def reset_search_services():
     _reranking_service = None
 
 
+def warm_up_search_indexes():
+    """
+    서버 시작 직후 검색 인덱스를 준비합니다 (app.py에서 별도 스레드로 호출).
+
+    디스크 스냅샷이 있으면 파일을 매핑하고 변경분만 조회하므로 수백 ms 안에 끝나고,
+    첫 사용자 요청이 사용자/공지 임베딩 전체 조회를 기다리지 않게 됩니다.
+    """
+    try:
+        service = _get_search_service()
+        service.user_snapshot.refresh()
+        service.notice_index.sync()
+        service.text_index.sync()
+        get_notice_suggest_index().sync()
+    except Exception as e:
+        print(f"[검색] 인덱스 예열 실패 (첫 요청 때 준비): {str(e)}")
+
+
 @search_bp.route('/notices', methods=['GET'])
 @login_required
 def search_personalized_notices():
@@ -102,7 +160,7 @@ def search_personalized_notices():
         print(f"   - 제한: {limit}개, 오프셋: {offset}, 최소점수: {min_score}")
         print(f"   - 리랭킹: {rerank}")
 
-        # 하이브리드 검색 (offset으로 다음 배치 제공)
+        # 하이브리드 검색 (offset으로 다음 배치 제공, 2페이지부터는 캐시된 순위를 잘라서 응답)
         results = _get_search_service().find_relevant_notices_for_user(
             user_id=user_id,
             limit=limit,
@@ -302,30 +360,108 @@ def find_relevant_users():
         }), 500
 
 
+def _search_all_with_text_index(
+    supabase_service: SupabaseService,
+    q: str,
+    category: str,
+    date_from: str,
+    date_to: str,
+    sort: str,
+    offset: int,
+    limit: int,
+    cursor: Optional[str] = None
+):
+    """
+    전문 검색 인덱스로 전체 검색 페이지를 만듭니다.
+
+    순위는 메모리에서 (점수 또는 게시일, id) 내림차순으로 정하고,
+    cursor가 있으면 그 다음 위치부터 자릅니다 (DB에는 해당 페이지 id만 조회).
+
+    ILIKE 검색 결과를 빠짐없이 포함하도록 본문 전체 색인 + 검색어 n-gram이 모두 있는 공지만 사용
+    (한 글자 구간이 있는 검색어처럼 n-gram으로 부분 문자열을 찾을 수 없으면 ILIKE 검색 사용)
+
+    반환값:
+    - (공지 리스트, 총 개수, 다음 커서), 인덱스가 준비되지 않았거나 쓸 수 없으면 None (ILIKE 검색 사용)
+
+    예외:
+    - ValueError: 잘못된 cursor
+    """
+    text_index = get_notice_text_index()
+    text_index.sync_in_background()
+    if not text_index.ready or not text_index.covers_substring(q):
+        return None
+
+    hits = text_index.search(
+        q,
+        category=category or None,
+        date_from=date_from or None,
+        date_to=(date_to + "T23:59:59") if date_to else None,
+        min_term_match=1.0
+    )
+    cursor_sort = 'relevance' if sort == 'relevance' else 'latest'
+    if cursor_sort == 'relevance':
+        ranked = [(score, notice_id) for notice_id, score in hits]
+    else:
+        ranked = [(text_index.published_at(notice_id) or "", notice_id) for notice_id, _ in hits]
+    ranked.sort(reverse=True)
+
+    start = offset
+    if cursor:
+        value, cursor_id = decode_cursor(cursor, cursor_sort)
+        after = (value if value is not None else "", cursor_id)
+        try:
+            start = next((i for i, key in enumerate(ranked) if key < after), len(ranked))
+        except TypeError:
+            raise ValueError("cursor 형식이 올바르지 않습니다")
+
+    page = ranked[start:start + limit]
+    following = None
+    if page and start + limit < len(ranked):
+        last_value, last_id = page[-1]
+        following = encode_cursor(cursor_sort, {"id": last_id}, value=last_value)
+
+    page_ids = [notice_id for _, notice_id in page]
+    if not page_ids:
+        return [], len(ranked), None
+
+    result = supabase_service.client.table("notices")\
+        .select(ALL_SEARCH_COLUMNS)\
+        .in_("id", page_ids)\
+        .execute()
+    by_id = {notice["id"]: notice for notice in (result.data or [])}
+    return [by_id[notice_id] for notice_id in page_ids if notice_id in by_id], len(ranked), following
+
+
 @search_bp.route('/notices/all', methods=['GET'])
 def search_all_notices():
     """
     전체 공지사항 검색 (공개 API)
 
-    GET /api/search/notices/all?q=장학금&category=학사&date_from=2026-01-01&date_to=2026-02-28&sort=latest&page=1&limit=20
+    GET /api/search/notices/all?q=장학금&category=학사&date_from=2026-01-01&date_to=2026-02-28&sort=latest&limit=20
+    GET /api/search/notices/all?...&cursor=<이전 응답의 next_cursor>&count=none   (무한 스크롤 다음 페이지)
 
     쿼리 파라미터:
-    - q: 검색어 (제목, 내용 ILIKE 검색) - 선택
+    - q: 검색어 (제목, 내용 전문 검색 — 인덱스 준비 전/views 정렬은 ILIKE) - 선택
     - category: 카테고리 필터 - 선택
     - date_from: 시작일 필터 (YYYY-MM-DD) - 선택
     - date_to: 종료일 필터 (YYYY-MM-DD) - 선택
-    - sort: 정렬 기준 (latest|views) - 기본값: latest
-    - page: 페이지 번호 (기본값: 1)
+    - sort: 정렬 기준 (latest|views|relevance) - 기본값: latest
+      (relevance: 검색어 BM25 점수순, 검색어가 없으면 latest)
+    - cursor: 이전 페이지의 next_cursor (keyset 페이지네이션, 깊은 페이지도 비용 일정) - 선택
+    - page: 페이지 번호 (기본값: 1, cursor가 없을 때만 사용 — 이전 방식)
     - limit: 페이지당 결과 수 (기본값: 20, 최대 100)
+    - count: 총 개수 모드 (exact|planned|estimated|none)
+      기본값: cursor가 없으면 exact, 있으면 none (첫 페이지에서 한 번만 estimated 권장)
 
     응답:
     {
         "status": "success",
         "data": {
             "notices": [...],
-            "total": 150,
+            "total": 150,              // count=none이면 null (전문 검색 인덱스 결과는 항상 정확한 값)
             "page": 1,
-            "total_pages": 8
+            "total_pages": 8,
+            "next_cursor": "WyJsYXRlc3QiLC..."   // 마지막 페이지면 null
         }
     }
     """
@@ -336,70 +472,68 @@ def search_all_notices():
         date_from = request.args.get('date_from', '').strip()
         date_to = request.args.get('date_to', '').strip()
         sort = request.args.get('sort', 'latest').strip()
+        cursor = request.args.get('cursor', '').strip() or None
         page = max(1, int(request.args.get('page', 1)))
         limit = min(100, max(1, int(request.args.get('limit', 20))))
+        count_mode = parse_count_mode(request.args.get('count'), 'none' if cursor else 'exact')
 
-        # 오프셋 계산
-        offset = (page - 1) * limit
+        # 오프셋 계산 (cursor가 없을 때만 사용)
+        offset = 0 if cursor else (page - 1) * limit
 
         print(f"\n[검색] 전체 검색 API")
         print(f"   - 검색어: '{q}', 카테고리: '{category}'")
         print(f"   - 기간: {date_from} ~ {date_to}")
-        print(f"   - 정렬: {sort}, 페이지: {page}, 제한: {limit}")
+        print(f"   - 정렬: {sort}, {'커서' if cursor else f'페이지: {page}'}, 제한: {limit}, 개수: {count_mode or 'none'}")
 
         supabase_service = SupabaseService()
 
-        # 총 개수 조회용 쿼리
-        count_query = supabase_service.client.table("notices")\
-            .select("id", count="exact")
-
-        # 데이터 조회용 쿼리
-        data_query = supabase_service.client.table("notices")\
-            .select("id, title, content, ai_summary, category, source_url, "
-                    "published_at, author, view_count, deadline, display_mode, "
-                    "has_important_image, content_images, bookmark_count")
+        # 검색어가 있으면 전문 검색 인덱스(BM25)로 후보/순위를 정하고 해당 페이지만 조회
+        indexed = _search_all_with_text_index(
+            supabase_service, q, category, date_from, date_to, sort, offset, limit, cursor
+        ) if q and sort != 'views' else None
 
-        # 검색어 필터 (제목 또는 내용 ILIKE)
-        if q:
-            escaped_q = q.replace("%", "\\%").replace("_", "\\_")
-            filter_str = f"title.ilike.%{escaped_q}%,content.ilike.%{escaped_q}%"
-            count_query = count_query.or_(filter_str)
-            data_query = data_query.or_(filter_str)
-
-        # 카테고리 필터
-        if category:
-            count_query = count_query.eq("category", category)
-            data_query = data_query.eq("category", category)
-
-        # 날짜 범위 필터
-        if date_from:
-            count_query = count_query.gte("published_at", date_from)
-            data_query = data_query.gte("published_at", date_from)
-        if date_to:
-            count_query = count_query.lte("published_at", date_to + "T23:59:59")
-            data_query = data_query.lte("published_at", date_to + "T23:59:59")
-
-        # 총 개수 조회
-        count_result = count_query.execute()
-        total = count_result.count if count_result.count is not None else 0
-
-        # 정렬 적용
-        if sort == 'views':
-            data_query = data_query.order("view_count", desc=True)
+        if indexed is not None:
+            notices, total, following = indexed
         else:
-            data_query = data_query.order("published_at", desc=True)
-
-        # 페이지네이션 적용
-        data_query = data_query.range(offset, offset + limit - 1)
-
-        # 데이터 조회
-        result = data_query.execute()
-        notices = result.data or []
+            # 데이터 조회 쿼리 (총 개수도 같은 응답으로 받음 — 별도 count 쿼리 없음)
+            data_query = supabase_service.client.table("notices")\
+                .select(ALL_SEARCH_COLUMNS, count=count_mode)
+
+            # 검색어 필터 (제목 또는 내용 ILIKE)
+            if q:
+                escaped_q = q.replace("%", "\\%").replace("_", "\\_")
+                data_query = data_query.or_(f"title.ilike.%{escaped_q}%,content.ilike.%{escaped_q}%")
+
+            # 카테고리 필터
+            if category:
+                data_query = data_query.eq("category", category)
+
+            # 날짜 범위 필터
+            if date_from:
+                data_query = data_query.gte("published_at", date_from)
+            if date_to:
+                data_query = data_query.lte("published_at", date_to + "T23:59:59")
+
+            # 정렬 (정렬 컬럼 + id) + 커서 다음 행만
+            cursor_sort = 'views' if sort == 'views' else 'latest'
+            data_query = apply_keyset(data_query, cursor_sort, cursor)
+
+            # 페이지네이션 적용
+            if cursor:
+                data_query = data_query.limit(limit)
+            else:
+                data_query = data_query.range(offset, offset + limit - 1)
+
+            # 데이터 조회
+            result = data_query.execute()
+            notices = result.data or []
+            total = result.count if count_mode else None
+            following = next_cursor(cursor_sort, notices, limit)
 
         # 총 페이지 수 계산
-        total_pages = (total + limit - 1) // limit if total > 0 else 0
+        total_pages = ((total + limit - 1) // limit if total > 0 else 0) if total is not None else None
 
-        print(f"   - 결과: {len(notices)}개 / 총 {total}개")
+        print(f"   - 결과: {len(notices)}개 / 총 {total if total is not None else '-'}개")
 
         return jsonify({
             "status": "success",
@@ -407,7 +541,8 @@ def search_all_notices():
                 "notices": notices,
                 "total": total,
                 "page": page,
-                "total_pages": total_pages
+                "total_pages": total_pages,
+                "next_cursor": following
             }
         }), 200
 
@@ -424,6 +559,70 @@ def search_all_notices():
         }), 500
 
 
+@search_bp.route('/suggest', methods=['GET'])
+def suggest_search_terms():
+    """
+    검색어 자동완성 (공개 API, 입력할 때마다 호출)
+
+    GET /api/search/suggest?q=장학&limit=8
+
+    쿼리 파라미터:
+    - q: 입력 중인 검색어 (단어 시작 기준 접두어 일치, 입력 중인 음절도 일치)
+    - limit: 최대 제안 수 (기본값: 8, 최대 20)
+
+    응답:
+    {
+        "status": "success",
+        "data": {
+            "suggestions": [
+                {"text": "국가장학금", "type": "keyword", "notice_id": null},
+                {"text": "2026학년도 국가장학금 2차 신청 안내", "type": "notice", "notice_id": "..."}
+            ]
+        }
+    }
+
+    순위: 최신성 + 조회수 (NoticeSuggestIndex 참고)
+    인덱스 적재 전에는 제목 접두어 ILIKE 조회로 대신합니다.
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        limit = min(20, max(1, int(request.args.get('limit', 8))))
+        if not q:
+            return jsonify({"status": "success", "data": {"suggestions": []}}), 200
+
+        suggest_index = get_notice_suggest_index()
+        suggest_index.sync_in_background()
+
+        if suggest_index.ready:
+            suggestions = suggest_index.suggest(q, limit=limit)
+        else:
+            escaped_q = q.replace("%", "\\%").replace("_", "\\_")
+            result = SupabaseService().client.table("notices")\
+                .select("id, title")\
+                .ilike("title", f"{escaped_q}%")\
+                .order("published_at", desc=True)\
+                .limit(limit)\
+                .execute()
+            suggestions = [
+                {"text": notice["title"], "type": "notice", "notice_id": notice["id"]}
+                for notice in (result.data or [])
+            ]
+
+        return jsonify({"status": "success", "data": {"suggestions": suggestions}}), 200
+
+    except ValueError as ve:
+        return jsonify({
+            "status": "error",
+            "message": f"잘못된 파라미터: {str(ve)}"
+        }), 400
+    except Exception as e:
+        print(f"[에러] 검색어 자동완성 실패: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "검색어 자동완성에 실패했습니다."
+        }), 500
+
+
 @search_bp.route('/health', methods=['GET'])
 def health_check():
     """
@@ -437,20 +636,36 @@ def health_check():
         "data": {
             "service": "search",
             "embedding": true,
-            "database": true
+            "database": true,
+            "query_embedding_cache": {"size": 12, "hits": 340, "misses": 25, "hit_rate": 0.9315, ...},
+            "query_result_cache": {"size": 40, "hits": 120, "semantic_hits": 35, "hit_rate": 0.61, ...},
+            "feed_cache": {"size": 80, "corpus_version": 3, "hits": 210, "misses": 95, ...},
+            "cohort_feed_cache": {"cohorts": 140, "fresh": true, "hits": 1800, "deviations": 12, ...},
+            "user_snapshot": {"users": 5200, "with_embedding": 4800, "memory_mb": 15.2, "reused": 40, ...},
+            "text_index": {"notices": 12000, "terms": 310000, "memory_mb": 18.4, ...},
+            "suggest_index": {"notices": 12000, "keywords": 4100, "keys": 96000, ...},
+            "round_trips": {"search.search_by_keyword": {"requests": 50, "avg_round_trips": 1.4, ...}, ...}
         }
     }
     """
     try:
         # 서비스 초기화 테스트
-        _get_search_service()
+        service = _get_search_service()
 
         return jsonify({
             "status": "success",
             "data": {
                 "service": "search",
                 "embedding": True,
-                "database": True
+                "database": True,
+                "query_embedding_cache": service.embedding_service.query_cache_stats(),
+                "query_result_cache": service.query_result_cache.stats(),
+                "feed_cache": service.feed_cache.stats(),
+                "cohort_feed_cache": service.cohort_cache.stats(),
+                "user_snapshot": service.user_snapshot.stats(),
+                "text_index": service.text_index.stats(),
+                "suggest_index": get_notice_suggest_index().stats(),
+                "round_trips": round_trip_counter.stats()
             }
         }), 200
 
@@ -9,6 +9,7 @@
 from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any, List, Optional, Tuple
 from services.supabase_service import SupabaseService, reset_supabase_client
+from services.feed_cache import bump_profile_version
 from utils.auth_middleware import login_required
 from ai.embedding_service import EmbeddingService
 from ai.enrichment_service import EnrichmentService
@@ -16,6 +17,12 @@ from ai.enrichment_service import EnrichmentService
 # Blueprint 생성 (URL 접두사: /api/users)
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
+# 프로필 응답용 선호도 컬럼 (interests_embedding 768차원 벡터는 앱에서 쓰지 않으므로 제외)
+_PREFERENCE_COLUMNS = (
+    "id, user_id, categories, keywords, notification_enabled, enriched_profile, "
+    "notification_mode, deadline_reminder_days, created_at, updated_at"
+)
+
 
 def _generate_user_embedding_and_profile(
     department: str,
@@ -190,6 +197,9 @@ def create_user_profile():
 
         print(f"[사용자 선호도] 생성 완료: {len(categories)}개 카테고리")
 
+        # 맞춤 피드 캐시 무효화 (재가입 등으로 기존 캐시가 남아 있을 수 있음)
+        bump_profile_version(user_id)
+
         return jsonify({
             "status": "success",
             "data": {
@@ -228,6 +238,7 @@ def create_user_profile():
                 }
                 new_client.table("user_preferences").upsert(preferences_data, on_conflict="user_id").execute()
 
+                bump_profile_version(data['user_id'])
                 print(f"[사용자 프로필] 재시도 성공: {data['email']}")
                 return jsonify({
                     "status": "success",
@@ -302,7 +313,7 @@ def get_user_profile(user_id):
 
         # 2. user_preferences 테이블에서 선호도 정보 조회
         preferences_result = supabase.client.table("user_preferences")\
-            .select("*")\
+            .select(_PREFERENCE_COLUMNS)\
             .eq("user_id", user_id)\
             .single()\
             .execute()
@@ -328,7 +339,7 @@ def get_user_profile(user_id):
                 user_result = new_client.table("users")\
                     .select("*").eq("id", user_id).single().execute()
                 preferences_result = new_client.table("user_preferences")\
-                    .select("*").eq("user_id", user_id).single().execute()
+                    .select(_PREFERENCE_COLUMNS).eq("user_id", user_id).single().execute()
 
                 return jsonify({
                     "status": "success",
@@ -440,6 +451,9 @@ def update_user_profile(user_id):
             except Exception as embed_err:
                 print(f"[임베딩] 프로필 변경 후 임베딩 재생성 실패 (무시): {embed_err}")
 
+        # 학과/학년 변경은 하드 필터와 임베딩에 영향 → 맞춤 피드 캐시 무효화
+        bump_profile_version(user_id)
+
         print(f"[프로필 업데이트] 완료: {user_id} - {update_data}")
 
         return jsonify({
@@ -551,13 +565,20 @@ def update_user_preferences(user_id):
                 "message": "선호도 업데이트에 실패했습니다."
             }), 500
 
+        # 카테고리/임베딩 변경 → 맞춤 피드 캐시 무효화
+        bump_profile_version(user_id)
+
+        # UPDATE 응답에 포함된 임베딩 벡터는 앱으로 보내지 않음
+        preferences = dict(result.data[0])
+        preferences.pop("interests_embedding", None)
+
         print(f"[선호도 업데이트] 완료: {user_id} - {len(categories)}개 카테고리, 임베딩 갱신: {'성공' if interests_embedding else '실패'}")
 
         return jsonify({
             "status": "success",
             "data": {
                 "message": "선호도가 업데이트되었습니다.",
-                "preferences": result.data[0]
+                "preferences": preferences
             }
         }), 200
 
@@ -759,6 +780,8 @@ def delete_user(user_id):
         # auth.users에서 사용자 삭제 (service_role 권한 필요)
         supabase.client.auth.admin.delete_user(user_id)
 
+        bump_profile_version(user_id)
+
         print(f"[사용자 삭제] 완료: {user_id}")
 
         return jsonify({
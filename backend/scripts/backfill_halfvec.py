@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+halfvec 임베딩 백필 스크립트
+
+이 스크립트가 하는 일:
+기존 float32 임베딩(content_embedding, interests_embedding)을
+halfvec 사본 컬럼(content_embedding_half, interests_embedding_half)으로 배치 변환합니다.
+
+선행 조건:
+    docs/migrations/018_halfvec_embeddings.sql 실행
+
+전환 절차:
+    1. 018 마이그레이션 실행 (이후 새로 쓰는 임베딩은 DB 트리거가 사본을 맞춤)
+    2. 이 스크립트 실행 (사본이 없거나 원본과 다른 기존 행 변환, 여러 번 실행해도 안전)
+    3. 019 마이그레이션 실행 (검색 함수 전환)
+
+실행 방법:
+    python backend/scripts/backfill_halfvec.py
+
+옵션:
+    --table: notices / user_preferences / all (기본: all)
+    --batch-size N: 한 번에 변환할 행 수 (기본: 500)
+    --sleep S: 배치 사이 대기 시간(초) (기본: 0.2, DB 부하 완화)
+    --dry-run: 변환할 행 수만 출력
+
+변환은 DB 함수 backfill_halfvec_embeddings가 서버 안에서 수행하므로
+임베딩이 네트워크로 오가지 않습니다. 배치는 기본키 순서(keyset)로 이어서 훑으므로
+테이블을 한 번만 순회합니다 (배치마다 처음부터 다시 찾지 않음).
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import List
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.supabase_service import get_supabase_client
+
+
+# halfvec 사본 컬럼이 있는 테이블 (컬럼 매핑은 018의 DB 함수 안에 있음)
+TABLES: List[str] = ["notices", "user_preferences"]
+
+
+class HalfvecBackfill:
+    """halfvec 사본 배치 백필"""
+
+    def __init__(self, batch_size: int = 500, sleep_seconds: float = 0.2):
+        self.client = get_supabase_client()
+        self.batch_size = batch_size
+        self.sleep_seconds = sleep_seconds
+
+    def count_pending(self, table: str) -> int:
+        """사본이 없거나 원본과 다른 (변환 대상) 행 수"""
+        result = self.client.rpc("count_stale_halfvec_embeddings", {"target_table": table}).execute()
+        return int(result.data or 0)
+
+    def run(self, table: str) -> int:
+        """
+        변환할 행이 없을 때까지 배치를 반복합니다.
+
+        반환값:
+        - 변환한 총 행 수
+        """
+        pending = self.count_pending(table)
+        print(f"\n[{table}] 변환 대상 {pending}개 (배치 {self.batch_size}개)")
+
+        total = 0
+        batch_no = 0
+        after_id = None
+        started = time.time()
+
+        while True:
+            result = self.client.rpc("backfill_halfvec_embeddings", {
+                "target_table": table,
+                "batch_size": self.batch_size,
+                "after_id": after_id
+            }).execute()
+            row = (result.data or [{}])[0]
+            after_id = row.get("last_id")
+            if after_id is None:
+                break
+
+            updated = row.get("updated_count") or 0
+            total += updated
+            batch_no += 1
+            if updated:
+                print(f"  배치 {batch_no}: {updated}개 변환 (누적 {total}/{pending})")
+                time.sleep(self.sleep_seconds)
+
+        print(f"[{table}] 완료 - {total}개 변환, {time.time() - started:.1f}초")
+        return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩을 halfvec 사본 컬럼으로 백필합니다.")
+    parser.add_argument("--table", choices=TABLES + ["all"], default="all")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--sleep", type=float, default=0.2)
+    parser.add_argument("--dry-run", action="store_true", help="변환할 행 수만 출력")
+    args = parser.parse_args()
+
+    tables = TABLES if args.table == "all" else [args.table]
+    backfill = HalfvecBackfill(batch_size=args.batch_size, sleep_seconds=args.sleep)
+
+    print("=" * 60)
+    print("halfvec 임베딩 백필")
+    print("=" * 60)
+
+    for table in tables:
+        if args.dry_run:
+            print(f"[{table}] 변환 대상 {backfill.count_pending(table)}개")
+        else:
+            backfill.run(table)
+
+    print("\n완료! 모든 행이 변환되었으면 019_halfvec_search_functions.sql을 실행하세요.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 파싱 벤치마크
+
+이 스크립트가 하는 일:
+PostgREST가 내려주는 pgvector 문자열 N개를 행렬로 만드는 비용을 비교합니다.
+
+- 기존: json.loads → Python float 리스트 → EmbeddingService.normalize
+- 코덱: ai.embedding_codec.parse_unit_matrix (float32 버퍼에 직접 파싱)
+
+실행 방법:
+    python backend/scripts/benchmark_embedding_codec.py
+
+옵션:
+    --count N: 벡터 수 (기본: 10000)
+    --repeat N: 반복 측정 횟수 (최솟값 사용)
+
+네트워크/API 키 없이 난수 벡터로만 측정합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+from ai.embedding_codec import parse_unit_matrix
+
+
+def legacy_parse(texts):
+    """기존 방식: 중간 Python 리스트를 거쳐 행렬 생성"""
+    lists = [json.loads(t) for t in texts]
+    return lists, EmbeddingService.normalize(lists)
+
+
+def codec_parse(texts):
+    return None, parse_unit_matrix(texts, EmbeddingService.DIMENSION)
+
+
+def measure(fn, texts, repeat: int):
+    """(최소 소요 시간, 최대 메모리 사용량, 결과가 붙잡고 있는 메모리)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    lists, matrix = fn(texts)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lists, matrix
+
+    return best, peak - before, retained - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 파싱 벤치마크")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dimension = EmbeddingService.DIMENSION
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((args.count, dimension)).astype(np.float32)
+    texts = ["[" + ",".join(f"{v:.8f}" for v in row) + "]" for row in vectors]
+
+    print("=" * 72)
+    print(f"pgvector 문자열 파싱 벤치마크 ({args.count:,}개 × {dimension}차원)")
+    print("=" * 72)
+    print(f"{'방식':<26} | {'시간':>10} | {'최대 메모리':>12} | {'결과 보유 메모리':>14}")
+    print("-" * 72)
+
+    results = {}
+    for label, fn in (("json.loads + 리스트", legacy_parse), ("embedding_codec", codec_parse)):
+        elapsed, peak, retained = measure(fn, texts, args.repeat)
+        results[label] = elapsed
+        print(f"{label:<24} | {elapsed * 1000:>8.1f}ms | {peak / 2**20:>10.1f}MB | {retained / 2**20:>12.1f}MB")
+
+    print("-" * 72)
+    print(f"속도 {results['json.loads + 리스트'] / results['embedding_codec']:.1f}배")
+    print("결과 보유 메모리: 기존 방식은 중간 리스트를 쥐고 있는 동안의 값 "
+          "(HybridSearchService 행 딕셔너리에 리스트가 남아 있는 상황과 같음)")
+
+
+if __name__ == "__main__":
+    main()
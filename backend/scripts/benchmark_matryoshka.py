@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Matryoshka 2단계 사용자 매칭 벤치마크
+
+이 스크립트가 하는 일:
+HybridSearchService.find_relevant_users_batch를 전체 차원(768) 정확 계산과
+잘라낸 차원(128/256) 후보 선별 + 전체 차원 재계산으로 각각 실행해
+결과 사용자 집합의 recall과 소요 시간을 비교합니다.
+PREFILTER_CANDIDATES(공지당 재계산 후보 수)를 고르는 데 사용합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_matryoshka.py                # 합성 데이터
+    python backend/scripts/benchmark_matryoshka.py --live         # 실제 임베딩 (Supabase)
+
+옵션:
+    --users N: 합성 사용자 수 (기본: 50000)
+    --notices N: 합성 공지 수 (기본: 20)
+    --max-users N: 공지당 최대 사용자 수 (기본: 50)
+    --dims D [D ...]: 잘라낼 차원 (기본: 128 256)
+    --candidates N [N ...]: 재계산 후보 수 (기본: 100 200 400 800 1600)
+
+합성 데이터는 Matryoshka 임베딩처럼 앞쪽 차원에 분산이 몰리도록 만듭니다.
+(실제 gemini-embedding-001 분포와 다를 수 있으므로 --live 결과를 우선 참고)
+"""
+
+import os
+import sys
+import time
+import argparse
+from array import array
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+from services.hybrid_search_service import HybridSearchService
+from services.user_embedding_snapshot import UserMatrix
+
+
+def matryoshka_like(count: int, centers: np.ndarray, rng, noise: float = 0.8) -> np.ndarray:
+    """군집 중심 + 잡음, 차원이 뒤로 갈수록 분산이 줄어드는 벡터"""
+    dimension = centers.shape[1]
+    decay = 1.0 / np.sqrt(1.0 + np.arange(dimension) / 32.0)
+    labels = rng.integers(0, centers.shape[0], size=count)
+    vectors = centers[labels] + noise * rng.standard_normal((count, dimension)).astype(np.float32)
+    return EmbeddingService.normalize(vectors * decay)
+
+
+def _buffer(vector: np.ndarray) -> array:
+    """array('f') 버퍼 (ai.embedding_codec이 복사 없이 읽는 형식)"""
+    buf = array("f")
+    buf.frombytes(vector.astype(np.float32).tobytes())
+    return buf
+
+
+def synthetic_data(args):
+    rng = np.random.default_rng(14)
+    dimension = EmbeddingService.DIMENSION
+    centers = rng.standard_normal((48, dimension)).astype(np.float32)
+    departments = ["컴퓨터정보공학과", "전자공학과", "경영학과", "간호학과"]
+    categories = ["학사", "장학", "취업", "행사"]
+
+    user_vectors = matryoshka_like(args.users, centers, rng)
+    users = [
+        {
+            "id": f"user-{i}",
+            "department": departments[i % len(departments)],
+            "grade": i % 4 + 1,
+            "categories": [categories[i % len(categories)]],
+            "interests_embedding": _buffer(user_vectors[i])
+        }
+        for i in range(args.users)
+    ]
+
+    notice_vectors = matryoshka_like(args.notices, centers, rng, noise=0.6)
+    notices = [
+        {
+            "id": f"notice-{i}",
+            "category": categories[i % len(categories)],
+            "content_embedding": _buffer(notice_vectors[i]),
+            "enriched_metadata": {"target_departments": [departments[i % len(departments)]]} if i % 2 else {}
+        }
+        for i in range(args.notices)
+    ]
+    return notices, users
+
+
+def live_data(args):
+    service = HybridSearchService()
+    users = service._load_users_for_matching(notifications_only=True)
+    notices = service._fetch_recent_notices(include_embedding=True)
+    notices = [n for n in notices if n.get("content_embedding")][: args.notices]
+    return notices, users
+
+
+def run(service, notice_ids, args, dimension, candidates):
+    service.PREFILTER_DIMENSION = dimension
+    service.PREFILTER_CANDIDATES = candidates
+    start = time.perf_counter()
+    results = service.find_relevant_users_batch(
+        notice_ids, min_score=0.3, max_users=args.max_users
+    )
+    return results, time.perf_counter() - start
+
+
+def time_similarity_stage(notice_matrix, user_matrix, dimension, candidates, repeat=5):
+    """
+    유사도 계산 단계만 측정 (파싱/결과 조립 제외, 두 행렬은 단위 벡터)
+
+    반환값:
+    - (전체 차원, 잘라내기 포함 2단계, 잘라낸 행렬 재사용 2단계) 소요 시간
+    """
+    user_prefix = EmbeddingService.truncate(user_matrix, dimension)
+
+    def exact():
+        return notice_matrix @ user_matrix.T
+
+    def two_stage(prefix):
+        coarse = EmbeddingService.truncate(notice_matrix, dimension) @ prefix.T
+        for row in range(coarse.shape[0]):
+            top = np.argpartition(-coarse[row], candidates - 1)[:candidates]
+            user_matrix[top] @ notice_matrix[row]
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    return (
+        best(exact),
+        best(lambda: two_stage(EmbeddingService.truncate(user_matrix, dimension))),
+        best(lambda: two_stage(user_prefix))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matryoshka 2단계 사용자 매칭 벤치마크")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--notices", type=int, default=20)
+    parser.add_argument("--max-users", type=int, default=50)
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 200, 400, 800, 1600])
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    notices, users = live_data(args) if args.live else synthetic_data(args)
+
+    # Supabase 없이 find_relevant_users_batch를 실행하도록 조회 메서드만 교체
+    service = HybridSearchService.__new__(HybridSearchService)
+    service._get_notices = lambda ids: notices
+    user_matrix = UserMatrix.from_users(users)
+    service._user_matrix = lambda: user_matrix
+    service.PREFILTER_MIN_USERS = 0
+    notice_ids = [n["id"] for n in notices]
+
+    exact, exact_time = run(service, notice_ids, args, 0, 0)
+    truth = {nid: {r["user_id"] for r in rows} for nid, rows in exact.items()}
+
+    print("=" * 72)
+    print(f"Matryoshka 2단계 매칭 (공지 {len(notices)}개 × 사용자 {len(users):,}명, "
+          f"max_users={args.max_users})")
+    print("=" * 72)
+    print(f"{'방식':<22} | {'후보 수':>7} | {'시간':>9} | {'recall':>7} | {'최소 recall':>10}")
+    print("-" * 72)
+    print(f"{'전체 차원 (정확)':<19} | {'-':>7} | {exact_time * 1000:>7.0f}ms | {1.0:>7.3f} | {1.0:>10.3f}")
+
+    for dimension in args.dims:
+        for candidates in args.candidates:
+            results, elapsed = run(service, notice_ids, args, dimension, candidates)
+            recalls = [
+                len(truth[nid] & {r["user_id"] for r in rows}) / len(truth[nid])
+                for nid, rows in results.items() if truth[nid]
+            ]
+            mean = float(np.mean(recalls)) if recalls else 1.0
+            worst = float(np.min(recalls)) if recalls else 1.0
+            label = f"{dimension}차원 → 768 재계산"
+            print(f"{label:<20} | {candidates:>7} | {elapsed * 1000:>7.0f}ms | {mean:>7.3f} | {worst:>10.3f}")
+        print("-" * 72)
+
+    print("후보 수는 max_users × 4보다 작으면 그 값으로 올려서 사용합니다.")
+
+    print(f"\n유사도 계산 단계만 (후보 {HybridSearchService.PREFILTER_CANDIDATES}개)")
+    print("-" * 72)
+    for dimension in args.dims:
+        exact_t, per_call_t, cached_t = time_similarity_stage(
+            HybridSearchService._to_unit_matrix([n["content_embedding"] for n in notices]),
+            user_matrix.matrix, dimension, HybridSearchService.PREFILTER_CANDIDATES
+        )
+        print(f"{dimension}차원: 전체 {exact_t * 1000:.1f}ms | 잘라내기 포함 {per_call_t * 1000:.1f}ms | "
+              f"잘라낸 행렬 재사용 {cached_t * 1000:.1f}ms ({exact_t / cached_t:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+맞춤 피드 조회 페이로드 벤치마크
+
+이 스크립트가 하는 일:
+맞춤 공지 검색 1회에 Supabase에서 내려받는 데이터 크기와 소요 시간을
+기존 방식과 점수 계산 RPC 방식으로 비교합니다.
+
+- 기존: 최근 공지 200개를 content_embedding 포함으로 조회 + 벡터 RPC
+- 변경: score_recent_notices_for_user RPC 1회 (id, 유사도, 하드 필터 매칭만)
+
+실행 방법:
+    python backend/scripts/benchmark_payload.py              # 합성 데이터 (네트워크 없음)
+    python backend/scripts/benchmark_payload.py --live --user-id <uuid>
+
+옵션:
+    --notices N: 합성 데이터 공지 수 (기본: 200)
+    --repeat N: 반복 측정 횟수 (최솟값 사용)
+    --live: 실제 Supabase에 질의 (017 마이그레이션 필요)
+    --user-id: --live 모드에서 사용할 사용자 ID
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+
+
+def _pgvector_text(vector) -> str:
+    """PostgREST가 vector 컬럼을 내려주는 형식 ("[0.1,0.2,...]")"""
+    return "[" + ",".join(f"{v:.8f}" for v in vector) + "]"
+
+
+def build_synthetic_payloads(count: int):
+    """기존/변경 방식의 응답 본문(JSON 문자열)을 만듭니다."""
+    rng = np.random.default_rng(7)
+    dimension = EmbeddingService.DIMENSION
+
+    legacy_rows, scored_rows = [], []
+    for i in range(count):
+        base = {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "title": f"[학사] 2026학년도 공지사항 {i}",
+            "ai_summary": "신청 기간과 대상, 제출 서류를 안내합니다. " * 3,
+            "category": "학사",
+        }
+        legacy_rows.append({
+            **base,
+            "enriched_metadata": {"target_departments": ["컴퓨터정보공학과"], "target_grades": [3]},
+            "content_embedding": _pgvector_text(rng.standard_normal(dimension))
+        })
+        scored_rows.append({**base, "similarity": 0.42, "hard_filter_match": bool(i % 2)})
+
+    # 기존 방식의 벡터 RPC 응답 (본문 content 포함)
+    rpc_rows = [
+        {**{k: r[k] for k in ("id", "title", "ai_summary", "category")},
+         "content": "본문 " * 400, "published_at": datetime.utcnow().isoformat(), "similarity": 0.42}
+        for r in legacy_rows[: min(count, 40)]
+    ]
+
+    legacy = [json.dumps(legacy_rows, ensure_ascii=False), json.dumps(rpc_rows, ensure_ascii=False)]
+    scored = [json.dumps(scored_rows, ensure_ascii=False)]
+    return legacy, scored
+
+
+def time_parse(bodies, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            json.loads(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_synthetic(args):
+    legacy, scored = build_synthetic_payloads(args.notices)
+    legacy_bytes = sum(len(b.encode("utf-8")) for b in legacy)
+    scored_bytes = sum(len(b.encode("utf-8")) for b in scored)
+
+    print("=" * 70)
+    print(f"합성 데이터 페이로드 비교 (공지 {args.notices}개, {EmbeddingService.DIMENSION}차원)")
+    print("=" * 70)
+    print(f"{'방식':<28} | {'응답 크기':>12} | {'JSON 파싱':>10}")
+    print("-" * 70)
+    print(f"{'기존 (임베딩 포함 + RPC)':<24} | {legacy_bytes / 1024:>10.1f}KB | "
+          f"{time_parse(legacy, args.repeat) * 1000:>8.2f}ms")
+    print(f"{'점수 계산 RPC':<26} | {scored_bytes / 1024:>10.1f}KB | "
+          f"{time_parse(scored, args.repeat) * 1000:>8.2f}ms")
+    print("-" * 70)
+    print(f"전송량 {legacy_bytes / max(scored_bytes, 1):.0f}배 감소")
+
+
+def run_live(args):
+    from services.supabase_service import get_supabase_client
+
+    if not args.user_id:
+        raise SystemExit("--live 모드에는 --user-id가 필요합니다.")
+
+    client = get_supabase_client()
+    user = client.table("users").select("department, grade").eq("id", args.user_id).single().execute().data
+    pref = client.table("user_preferences").select("interests_embedding")\
+        .eq("user_id", args.user_id).single().execute().data
+    embedding = pref["interests_embedding"]
+    since = (datetime.utcnow() - timedelta(days=30)).isoformat()
+
+    def legacy():
+        notices = client.table("notices")\
+            .select("id, title, ai_summary, category, enriched_metadata, content_embedding")\
+            .gte("published_at", since).order("published_at", desc=True).limit(200).execute().data
+        rpc = client.rpc("search_notices_by_vector", {
+            "query_embedding": embedding, "match_threshold": 0.2, "match_count": 200
+        }).execute().data
+        return [notices, rpc]
+
+    def scored():
+        return [client.rpc("score_recent_notices_for_user", {
+            "query_embedding": embedding,
+            "user_department": user.get("department"),
+            "user_grade": user.get("grade")
+        }).execute().data]
+
+    print("=" * 70)
+    print("Supabase 실측 비교")
+    print("=" * 70)
+    for label, fn in (("기존 (임베딩 포함 + RPC)", legacy), ("점수 계산 RPC", scored)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            data = fn()
+            best = min(best, time.perf_counter() - start)
+        size = sum(len(json.dumps(d, ensure_ascii=False).encode("utf-8")) for d in data)
+        print(f"{label:<26} | {size / 1024:>10.1f}KB | {best * 1000:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="맞춤 피드 조회 페이로드 벤치마크")
+    parser.add_argument("--notices", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--user-id")
+    args = parser.parse_args()
+
+    if args.live:
+        run_live(args)
+    else:
+        run_synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
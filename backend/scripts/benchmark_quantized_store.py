@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+양자화 임베딩 저장소 벤치마크
+
+이 스크립트가 하는 일:
+QuantizedEmbeddingStore의 정밀도(float32/float16/int8)별로
+메모리, 1차 top-k 검색 시간, 정확 검색 대비 recall@k를 비교합니다.
+
+- 1차: 양자화 행렬만으로 고른 top-k
+- 재계산: top-(k × rescore)개를 원본 float32로 다시 정렬한 top-k
+  (NoticeVectorIndex가 DB에서 원본을 가져오는 것과 같은 방식, 여기서는 메모리 원본 사용)
+
+실행 방법:
+    python backend/scripts/benchmark_quantized_store.py
+
+옵션:
+    --sizes N [N ...]: 벡터 수 목록 (기본: 10000 50000)
+    --queries N: 쿼리 수 (기본: 50)
+    --k N: top-k (기본: 20)
+    --rescore N: 재계산 후보 배수 (기본: NoticeVectorIndex.RESCORE_FACTOR)
+
+실제 임베딩처럼 군집이 있는 합성 데이터(중심 + 잡음)를 사용합니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+from services.quantized_embedding_store import QuantizedEmbeddingStore
+from services.notice_vector_index import NoticeVectorIndex
+
+
+def clustered_vectors(count: int, dimension: int, rng, clusters: int = 64) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return EmbeddingService.normalize(vectors)
+
+
+def build_store(vectors: np.ndarray, mode: str) -> QuantizedEmbeddingStore:
+    store = QuantizedEmbeddingStore(vectors.shape[1], mode=mode)
+    for i, vec in enumerate(vectors):
+        store.put(str(i), vec)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="양자화 임베딩 저장소 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--rescore", type=int, default=NoticeVectorIndex.RESCORE_FACTOR)
+    args = parser.parse_args()
+
+    dimension = EmbeddingService.DIMENSION
+    rng = np.random.default_rng(11)
+    k = args.k
+
+    print("=" * 84)
+    print(f"양자화 저장소 벤치마크 ({dimension}차원, top-{k}, 재계산 후보 {k * args.rescore}개)")
+    print("=" * 84)
+    print(f"{'벡터 수':>8} | {'정밀도':>8} | {'메모리':>9} | {'1차 검색':>9} | "
+          f"{'recall(1차)':>11} | {'recall(재계산)':>13}")
+    print("-" * 84)
+
+    for size in args.sizes:
+        vectors = clustered_vectors(size, dimension, rng)
+        queries = EmbeddingService.normalize(
+            vectors[rng.integers(0, size, args.queries)]
+            + 0.3 * rng.standard_normal((args.queries, dimension)).astype(np.float32)
+        )
+        exact_top = [set(np.argsort(-(vectors @ q))[:k]) for q in queries]
+
+        for mode in QuantizedEmbeddingStore.MODES:
+            store = build_store(vectors, mode)
+
+            elapsed, recall_first, recall_rescored = 0.0, 0.0, 0.0
+            for q, truth in zip(queries, exact_top):
+                start = time.perf_counter()
+                rows, _ = store.top_k(q, k)
+                elapsed += time.perf_counter() - start
+                recall_first += len(truth & set(rows.tolist())) / k
+
+                shortlist, _ = store.top_k(q, k * args.rescore)
+                rescored = shortlist[np.argsort(-(vectors[shortlist] @ q))[:k]]
+                recall_rescored += len(truth & set(rescored.tolist())) / k
+
+            n = len(queries)
+            print(f"{size:>8,} | {mode:>8} | {store.nbytes / 2**20:>7.1f}MB | "
+                  f"{elapsed / n * 1000:>7.2f}ms | {recall_first / n:>11.3f} | {recall_rescored / n:>13.3f}")
+        print("-" * 84)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+유사도 계산 마이크로벤치마크
+
+이 스크립트가 하는 일:
+768차원 임베딩에 대해 기존 방식(후보마다 calculate_similarity를 호출하는
+순수 Python 루프)과 벡터화 방식(calculate_similarities 행렬-벡터 곱 1회)의
+소요 시간을 후보 수별로 비교합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_similarity.py
+
+옵션:
+    --sizes N [N ...]: 후보 수 목록 (기본: 1000 10000 100000)
+    --legacy-max N: 순수 Python 루프를 실제로 돌릴 최대 후보 수 (초과분은 선형 추정)
+    --repeat N: 벡터화 방식 반복 측정 횟수 (최솟값 사용)
+
+네트워크/API 키 없이 난수 벡터로만 측정합니다.
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+
+
+def legacy_similarity(embedding1, embedding2) -> float:
+    """기존 calculate_similarity 구현 (제너레이터 기반 순수 Python)"""
+    dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
+    magnitude1 = math.sqrt(sum(a * a for a in embedding1))
+    magnitude2 = math.sqrt(sum(b * b for b in embedding2))
+    if magnitude1 == 0 or magnitude2 == 0:
+        return 0.0
+    return dot_product / (magnitude1 * magnitude2)
+
+
+def time_legacy(query, candidates) -> float:
+    query_list = query.tolist()
+    candidate_lists = candidates.tolist()
+
+    start = time.perf_counter()
+    for candidate in candidate_lists:
+        legacy_similarity(query_list, candidate)
+    return time.perf_counter() - start
+
+
+def time_vectorized(query, candidates, repeat: int, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        EmbeddingService.calculate_similarities(query, candidates, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사도 계산 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dimension = EmbeddingService.DIMENSION
+    rng = np.random.default_rng(42)
+    query = rng.standard_normal(dimension).astype(np.float32)
+
+    print("=" * 78)
+    print(f"유사도 계산 벤치마크 ({dimension}차원)")
+    print("=" * 78)
+    print(f"{'후보 수':>10} | {'Python 루프':>14} | {'벡터화':>10} | {'벡터화(norm 캐시)':>18} | {'배속':>8}")
+    print("-" * 78)
+
+    for size in args.sizes:
+        candidates = rng.standard_normal((size, dimension)).astype(np.float32)
+
+        # 순수 Python 루프는 legacy-max개까지만 실제 측정하고 선형 추정
+        measured = min(size, args.legacy_max)
+        legacy = time_legacy(query, candidates[:measured]) * (size / measured)
+        estimated = "*" if measured < size else " "
+
+        vectorized = time_vectorized(query, candidates, args.repeat)
+
+        norms = EmbeddingService.vector_norms(candidates)
+        cached = time_vectorized(query, candidates, args.repeat, matrix_norms=norms)
+
+        print(f"{size:>10,} | {legacy * 1000:>12.1f}ms{estimated}| "
+              f"{vectorized * 1000:>8.2f}ms | {cached * 1000:>16.2f}ms | "
+              f"{legacy / vectorized:>7.0f}x")
+
+    print("-" * 78)
+    print("* 표시는 --legacy-max개 측정값으로 선형 추정한 값입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 자동완성(접두어) 인덱스 벤치마크
+
+이 스크립트가 하는 일:
+합성 한국어 공지 제목 + 키워드로 NoticeSuggestIndex를 만들고
+적재 시간, 키 수, 입력 중인 검색어(1~4글자 접두어)당 지연 시간(p50/p95/최대)을 출력합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_suggest_index.py
+
+옵션:
+    --size N: 공지 수 (기본: 50000)
+    --queries N: 검색어 수 (기본: 1000)
+    --updates N: 증분 갱신(크롤링 1회분) 공지 수 (기본: 50)
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.notice_suggest_index import NoticeSuggestIndex
+
+
+COMMON_WORDS = [
+    "장학금", "신청", "안내", "수강신청", "등록금", "납부", "기숙사", "입사", "졸업", "논문",
+    "취업", "채용", "설명회", "특강", "모집", "공모전", "휴학", "복학", "성적", "교환학생",
+    "도서관", "휴관", "학생증", "발급", "학사일정", "계절학기", "비교과", "프로그램", "봉사", "상담",
+]
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 2000, 7)]
+
+
+def make_notice(rng, words, cdf, notice_id: str):
+    indices = np.minimum(np.searchsorted(cdf, rng.random(6)), len(words) - 1)
+    title_words = [words[i] for i in indices]
+    return {
+        "id": notice_id,
+        "title": " ".join(title_words),
+        "view_count": int(rng.pareto(1.5) * 50),
+        "published_at": f"2026-{1 + int(rng.integers(0, 9)):02d}-{1 + int(rng.integers(0, 28)):02d}",
+        "enriched_metadata": {"keywords_expanded": title_words[:3]}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색어 자동완성 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    words = list(COMMON_WORDS)
+    while len(words) < 20000:
+        words.append("".join(rng.choice(SYLLABLES, size=rng.integers(2, 5))))
+    weights = 1.0 / np.arange(1, len(words) + 1)
+    cdf = np.cumsum(weights / weights.sum())
+
+    notices = [make_notice(rng, words, cdf, f"n{i}") for i in range(args.size)]
+
+    index = NoticeSuggestIndex()
+    start = time.perf_counter()
+    for offset in range(0, len(notices), 500):
+        index.upsert_many(notices[offset:offset + 500])
+    stats = index.stats()
+    print(f"적재: 공지 {stats['notices']}개, 키워드 {stats['keywords']}개, 키 {stats['keys']}개, "
+          f"{time.perf_counter() - start:.1f}초")
+
+    # 입력 중인 검색어: 자주 쓰는 단어/무작위 단어의 앞 1~4글자
+    queries = []
+    for _ in range(args.queries):
+        word = words[min(int(np.searchsorted(cdf, rng.random())), len(words) - 1)]
+        queries.append(word[:int(rng.integers(1, len(word) + 1))])
+
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        index.suggest(query, limit=8)
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"자동완성: p50 {np.percentile(times, 50):.3f}ms, p95 {np.percentile(times, 95):.3f}ms, "
+          f"최대 {max(times):.3f}ms")
+
+    updates = [make_notice(rng, words, cdf, f"u{i}") for i in range(args.updates)]
+    start = time.perf_counter()
+    index.upsert_many(updates)
+    print(f"증분 갱신 {args.updates}개: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+공지 전문 검색(BM25) 인덱스 벤치마크
+
+이 스크립트가 하는 일:
+합성 한국어 공지(제목 + 본문)로 NoticeTextIndex를 만들고
+적재 시간, 포스팅 메모리, 검색어당 지연 시간(p50/p95)과 결과 수를 출력합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_text_index.py
+
+옵션:
+    --size N: 공지 수 (기본: 50000)
+    --queries N: 검색어 수 (기본: 200)
+    --content-chars N: 공지당 본문 길이 (기본: 1500)
+
+단어는 자주 쓰는 공지 어휘 + 무작위 음절 단어를 Zipf 분포로 섞어 만듭니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.notice_text_index import NoticeTextIndex
+
+
+COMMON_WORDS = [
+    "장학금", "신청", "안내", "수강신청", "등록금", "납부", "기숙사", "입사", "졸업", "논문",
+    "취업", "채용", "설명회", "특강", "모집", "공모전", "휴학", "복학", "성적", "교환학생",
+    "도서관", "휴관", "학생증", "발급", "학사일정", "계절학기", "비교과", "프로그램", "봉사", "상담",
+]
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 2000, 7)]
+
+
+def make_vocabulary(rng, size: int = 20000):
+    words = list(COMMON_WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choice(SYLLABLES, size=rng.integers(2, 5))))
+    weights = 1.0 / np.arange(1, len(words) + 1)
+    return words, np.cumsum(weights / weights.sum())
+
+
+def sample_words(rng, words, cdf, count: int):
+    indices = np.minimum(np.searchsorted(cdf, rng.random(count)), len(words) - 1)
+    return [words[i] for i in indices]
+
+
+def make_text(rng, words, cdf, chars: int) -> str:
+    parts, length = [], 0
+    suffixes = rng.choice(["", "을", "를", "의", "은", "에", "과"], size=chars // 3)
+    for word, suffix in zip(sample_words(rng, words, cdf, chars // 3), suffixes):
+        word += suffix
+        parts.append(word)
+        length += len(word) + 1
+        if length >= chars:
+            break
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공지 전문 검색 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--content-chars", type=int, default=1500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    words, cdf = make_vocabulary(rng)
+
+    notices = [
+        {
+            "id": f"n{i}",
+            "title": make_text(rng, words, cdf, 30),
+            "content": make_text(rng, words, cdf, args.content_chars),
+            "category": "학사",
+            "published_at": f"2026-01-{1 + i % 28:02d}"
+        }
+        for i in range(args.size)
+    ]
+
+    index = NoticeTextIndex()
+    start = time.perf_counter()
+    for offset in range(0, len(notices), 500):
+        index.upsert_many(notices[offset:offset + 500])
+    build_seconds = time.perf_counter() - start
+    stats = index.stats()
+    print(f"적재: 공지 {stats['notices']}개, n-gram {stats['terms']}개, "
+          f"{build_seconds:.1f}초, 포스팅 {stats['memory_mb']}MB")
+
+    queries = [" ".join(sample_words(rng, words, cdf, int(rng.integers(1, 3)))) for _ in range(args.queries)]
+    times, counts = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = index.search(query, limit=20)
+        times.append((time.perf_counter() - start) * 1000)
+        counts.append(len(hits))
+
+    print(f"검색: p50 {np.percentile(times, 50):.2f}ms, p95 {np.percentile(times, 95):.2f}ms, "
+          f"평균 결과 {np.mean(counts):.1f}개")
+
+    start = time.perf_counter()
+    index.upsert("n0", {**notices[0], "title": "장학금 신청 안내 (수정)"})
+    print(f"단건 수정: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
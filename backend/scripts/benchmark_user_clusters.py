@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 클러스터 2단계 매칭 벤치마크
+
+이 스크립트가 하는 일:
+합성 사용자(기본 10만 명)로 HybridSearchService.find_relevant_users_batch를
+전체 사용자 정확 계산과 클러스터 2단계 매칭(공지 × 중심 → 상위 probes개 클러스터 구성원만 계산)으로
+각각 실행해 공지당 알림 대상 집합의 recall과 소요 시간을 비교합니다.
+CLUSTER_PROBES(펼칠 클러스터 수)를 고르는 데 사용합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_user_clusters.py
+
+옵션:
+    --users N: 합성 사용자 수 (기본: 100000)
+    --notices N: 합성 공지 수 (기본: 20)
+    --max-users N: 공지당 최대 사용자 수 (기본: 50)
+    --k N: 클러스터 수 (기본: √사용자 수)
+    --probes P [P ...]: 펼칠 클러스터 수 (기본: 8 16 32 64)
+
+합성 데이터는 관심사 주제(중심) 두 개를 섞은 위치에 사용자가 모이도록 만듭니다.
+(주제가 뚜렷할수록 recall이 높게 나오므로 실제 분포에서는 probes를 넉넉히 잡을 것)
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+from services.hybrid_search_service import HybridSearchService
+from services.user_cluster_index import UserClusterIndex
+from services.user_embedding_snapshot import UserMatrix
+
+
+def clustered(count: int, centers: np.ndarray, rng, noise: float) -> np.ndarray:
+    """
+    주제 두 개를 섞은 벡터 + 잡음 (청크 단위로 생성해 임시 메모리 제한)
+    관심사가 여러 주제에 걸친 사용자가 클러스터 경계에 놓이도록 섞음 비율을 무작위로 둡니다.
+    """
+    out = np.empty((count, centers.shape[1]), dtype=np.float32)
+    for start in range(0, count, 10000):
+        n = min(10000, count - start)
+        first = rng.integers(0, centers.shape[0], size=n)
+        second = rng.integers(0, centers.shape[0], size=n)
+        mix = rng.uniform(0.0, 0.5, size=(n, 1)).astype(np.float32)
+        chunk = (1 - mix) * centers[first] + mix * centers[second]
+        chunk += noise * rng.standard_normal((n, centers.shape[1]), dtype=np.float32)
+        out[start:start + n] = EmbeddingService.normalize(chunk)
+    return out
+
+
+def synthetic_data(args):
+    rng = np.random.default_rng(16)
+    dimension = EmbeddingService.DIMENSION
+    centers = EmbeddingService.normalize(rng.standard_normal((200, dimension)).astype(np.float32)) * 4.0
+    departments = np.array(["컴퓨터정보공학과", "전자공학과", "경영학과", "간호학과"], dtype=object)
+    categories = ["학사", "장학", "취업", "행사"]
+
+    n = args.users
+    users = UserMatrix(
+        ids=[f"user-{i}" for i in range(n)],
+        matrix=clustered(n, centers, rng, noise=0.25),
+        departments=departments[np.arange(n) % len(departments)],
+        grades=(np.arange(n) % 4 + 1).astype(np.int32),
+        notification_enabled=np.ones(n, dtype=bool),
+        has_embedding=np.ones(n, dtype=bool),
+        categories=[[categories[i % len(categories)]] for i in range(n)]
+    )
+
+    notice_vectors = clustered(args.notices, centers, rng, noise=0.2)
+    notices = [
+        {
+            "id": f"notice-{i}",
+            "category": categories[i % len(categories)],
+            "content_embedding": notice_vectors[i].tolist(),
+            "enriched_metadata": {"target_departments": [str(departments[i % len(departments)])]} if i % 2 else {}
+        }
+        for i in range(args.notices)
+    ]
+    return notices, users
+
+
+def tie_aware_recall(truth_scores, rows) -> float:
+    """
+    정확 결과 상위 N개 중 다시 찾은 비율 (동점은 같은 사용자로 간주)
+
+    하드 필터 보너스만으로 통과한 사용자는 점수가 같아서(예: 0.3) 정확 계산에서도
+    그중 누가 max_users 안에 드는지는 임의이므로 사용자 ID 대신 점수로 비교합니다.
+    """
+    cutoff = min(truth_scores) - 1e-9
+    found = sum(1 for r in rows if r["total_score"] >= cutoff)
+    return min(found, len(truth_scores)) / len(truth_scores)
+
+
+def run(service, notice_ids, args):
+    start = time.perf_counter()
+    results = service.find_relevant_users_batch(notice_ids, min_score=0.3, max_users=args.max_users)
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 클러스터 2단계 매칭 벤치마크")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--notices", type=int, default=20)
+    parser.add_argument("--max-users", type=int, default=50)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--probes", type=int, nargs="+", default=[8, 16, 32, 64])
+    args = parser.parse_args()
+
+    notices, users = synthetic_data(args)
+
+    # Supabase 없이 find_relevant_users_batch를 실행하도록 조회 메서드만 교체
+    service = HybridSearchService.__new__(HybridSearchService)
+    service._get_notices = lambda ids: notices
+    service._user_matrix = lambda: users
+    service.PREFILTER_DIMENSION = 0
+    notice_ids = [n["id"] for n in notices]
+
+    service._cluster_index = lambda matrix: None
+    exact, exact_time = run(service, notice_ids, args)
+    truth = {nid: [r["total_score"] for r in rows] for nid, rows in exact.items()}
+
+    start = time.perf_counter()
+    index = UserClusterIndex.fit(users, k=args.k)
+    fit_time = time.perf_counter() - start
+    service._cluster_index = lambda matrix: index
+
+    print("=" * 72)
+    print(f"사용자 클러스터 2단계 매칭 (공지 {len(notices)}개 × 사용자 {len(users):,}명, "
+          f"max_users={args.max_users})")
+    print(f"클러스터 {index.k}개, 학습 {fit_time:.1f}초")
+    print("=" * 72)
+    print(f"{'방식':<18} | {'probes':>6} | {'계산 사용자':>10} | {'시간':>9} | {'recall':>7} | {'최소 recall':>10}")
+    print("-" * 72)
+    print(f"{'전체 사용자 (정확)':<15} | {'-':>6} | {len(users):>12,} | {exact_time * 1000:>7.0f}ms | "
+          f"{1.0:>7.3f} | {1.0:>10.3f}")
+
+    query_matrix = HybridSearchService._to_unit_matrix([n["content_embedding"] for n in notices])
+    for probes in args.probes:
+        service.CLUSTER_PROBES = probes
+        results, elapsed = run(service, notice_ids, args)
+        scanned = np.mean([len(index.candidate_rows(q, probes)) for q in query_matrix])
+        recalls = [tie_aware_recall(truth[nid], rows) for nid, rows in results.items() if truth[nid]]
+        mean = float(np.mean(recalls)) if recalls else 1.0
+        worst = float(np.min(recalls)) if recalls else 1.0
+        print(f"{'클러스터 2단계':<16} | {probes:>6} | {int(scanned):>12,} | {elapsed * 1000:>7.0f}ms | "
+              f"{mean:>7.3f} | {worst:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+IVF 벡터 인덱스 벤치마크
+
+이 스크립트가 하는 일:
+IvfVectorIndex를 전체 탐색(학습 전 리스트 1개)과 nprobe별 IVF 검색으로 비교해
+쿼리당 지연 시간(p50/p95)과 정확 검색 대비 recall@k를 출력합니다.
+학습/삽입/삭제/저장/불러오기 시간도 함께 측정합니다.
+VECTOR_INDEX_NPROBE(검색할 리스트 수)를 고르는 데 사용합니다.
+
+실행 방법:
+    python backend/scripts/benchmark_vector_index.py
+
+옵션:
+    --size N: 벡터 수 (기본: 100000)
+    --queries N: 쿼리 수 (기본: 100)
+    --k N: top-k (기본: 20)
+    --mode M: 저장 정밀도 float32/float16/int8 (기본: float32)
+    --nprobe P [P ...]: 검색할 리스트 수 (기본: 4 8 16 32 64)
+
+실제 임베딩처럼 군집이 있는 합성 데이터(중심 + 잡음)를 사용합니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.embedding_service import EmbeddingService
+from services.ivf_vector_index import IvfVectorIndex
+
+
+def clustered_vectors(count: int, dimension: int, rng, clusters: int = 256) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = np.empty((count, dimension), dtype=np.float32)
+    for start in range(0, count, 10000):
+        n = min(10000, count - start)
+        labels = rng.integers(0, clusters, size=n)
+        chunk = centers[labels] + 0.8 * rng.standard_normal((n, dimension), dtype=np.float32)
+        vectors[start:start + n] = EmbeddingService.normalize(chunk)
+    return vectors
+
+
+def measure(index, queries, exact_top, k, nprobe=None):
+    times, recall = [], 0.0
+    for q, truth in zip(queries, exact_top):
+        start = time.perf_counter()
+        hits = index.search(q, k, nprobe=nprobe)
+        times.append(time.perf_counter() - start)
+        recall += len(truth & {int(item_id) for item_id, _, _ in hits}) / k
+    times = np.array(times) * 1000
+    return np.percentile(times, 50), np.percentile(times, 95), recall / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF 벡터 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--mode", default="float32")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    dimension = EmbeddingService.DIMENSION
+    rng = np.random.default_rng(17)
+    k = args.k
+
+    vectors = clustered_vectors(args.size, dimension, rng)
+    queries = EmbeddingService.normalize(
+        vectors[rng.integers(0, args.size, args.queries)]
+        + 0.3 * rng.standard_normal((args.queries, dimension)).astype(np.float32)
+    )
+    exact_top = [set(np.argpartition(-(vectors @ q), k - 1)[:k].tolist()) for q in queries]
+
+    index = IvfVectorIndex(dimension, mode=args.mode)
+    start = time.perf_counter()
+    for i, vec in enumerate(vectors):
+        index.put(str(i), vec, {"title": f"공지 {i}"})
+    insert_time = time.perf_counter() - start
+
+    print("=" * 72)
+    print(f"IVF 벡터 인덱스 벤치마크 ({args.size:,}개 × {dimension}차원, {args.mode}, top-{k})")
+    print("=" * 72)
+    print(f"삽입 (학습 전): {insert_time / args.size * 1e6:.1f}µs/개")
+
+    p50, p95, recall = measure(index, queries, exact_top, k)
+    rows = [("전체 탐색", "-", p50, p95, recall)]
+
+    start = time.perf_counter()
+    index.train()
+    train_time = time.perf_counter() - start
+    print(f"학습: {train_time:.1f}초 (리스트 {index.nlist}개, {index.nbytes / 2**20:.1f}MB)")
+
+    for nprobe in args.nprobe:
+        p50, p95, recall = measure(index, queries, exact_top, k, nprobe=nprobe)
+        rows.append(("IVF", nprobe, p50, p95, recall))
+
+    print("-" * 72)
+    print(f"{'방식':<10} | {'nprobe':>6} | {'p50':>8} | {'p95':>8} | {'recall@k':>8}")
+    print("-" * 72)
+    for name, nprobe, p50, p95, recall in rows:
+        print(f"{name:<10} | {nprobe:>6} | {p50:>6.1f}ms | {p95:>6.1f}ms | {recall:>8.3f}")
+    print("-" * 72)
+
+    # 학습 후 증분 삽입/삭제 (가장 가까운 리스트에 넣고 빼기)
+    extra = clustered_vectors(2000, dimension, rng)
+    start = time.perf_counter()
+    for i, vec in enumerate(extra):
+        index.put(f"extra-{i}", vec)
+    put_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(len(extra)):
+        index.remove(f"extra-{i}")
+    remove_time = time.perf_counter() - start
+    print(f"증분 삽입: {put_time / len(extra) * 1e6:.1f}µs/개, 삭제: {remove_time / len(extra) * 1e6:.1f}µs/개")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.npz")
+        start = time.perf_counter()
+        index.save(path)
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = IvfVectorIndex.load(path)
+        load_time = time.perf_counter() - start
+        print(f"저장: {save_time:.2f}초 ({os.path.getsize(path) / 2**20:.1f}MB), "
+              f"불러오기: {load_time:.2f}초 ({len(loaded):,}개)")
+
+
+if __name__ == "__main__":
+    main()
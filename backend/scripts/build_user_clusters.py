@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 관심사 클러스터 학습 스크립트
+
+이 스크립트가 하는 일:
+user_preferences.interests_embedding 전체로 k-means 클러스터를 학습하고
+중심 벡터와 사용자별 배정을 파일로 저장합니다.
+(HybridSearchService가 알림 매칭 시 읽어서 가까운 클러스터 구성원만 비교)
+
+평소에는 크롤링 파이프라인 4단계가 재학습 기준(재배정 10% / 24시간)을 넘었을 때만
+자동으로 다시 학습하므로, 이 스크립트는 최초 구축이나 k 변경 시에 실행합니다.
+
+실행 방법:
+    python backend/scripts/build_user_clusters.py
+
+옵션:
+    --k N: 클러스터 수 (기본: √사용자 수)
+
+환경 변수:
+    USER_CLUSTER_INDEX_PATH: 저장 경로 (기본: backend/.cache/user_clusters.npz)
+"""
+
+import os
+import sys
+import argparse
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.hybrid_search_service import HybridSearchService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 관심사 클러스터를 학습합니다.")
+    parser.add_argument("--k", type=int, default=None, help="클러스터 수")
+    args = parser.parse_args()
+
+    service = HybridSearchService()
+    index = service.rebuild_user_clusters(force=True, k=args.k)
+    if index is None:
+        print("학습할 사용자가 없습니다.")
+        return
+
+    sizes = index.cluster_sizes()
+    print("=" * 60)
+    print(f"클러스터 {index.k}개, 사용자 {len(index.ids)}명")
+    print(f"클러스터 크기: 최소 {sizes.min()}, 중앙값 {int(sorted(sizes)[len(sizes) // 2])}, 최대 {sizes.max()}")
+    print(f"저장 위치: {service.CLUSTER_INDEX_PATH}")
+    if len(index.ids) < service.CLUSTER_MIN_USERS:
+        print(f"참고: 사용자가 USER_CLUSTER_MIN_USERS({service.CLUSTER_MIN_USERS})명 미만이면 "
+              "매칭에는 클러스터를 쓰지 않습니다.")
+
+
+if __name__ == "__main__":
+    main()
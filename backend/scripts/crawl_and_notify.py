@@ -12,8 +12,11 @@
 2. AI 전체 분석 (요약, 카테고리, 중요도) + 임베딩 생성
 3. DB 저장 (notices 테이블 + content_embedding)
 4. 하이브리드 검색으로 관련 사용자 찾기 (임베딩 비교)
+   (사용자가 많으면 관심사 클러스터 중 가까운 클러스터 구성원만 비교)
 5. 캘린더 이벤트 생성
 6. 푸시 알림 발송 + notification_logs 저장
+7. 코호트(학과/학년/카테고리) 맞춤 피드 재구축
+   (앱 내 SchedulerService로 실행될 때 같은 프로세스의 검색 API가 사용)
 
 실행 방법:
 python backend/scripts/crawl_and_notify.py
@@ -110,6 +113,9 @@ class CrawlAndNotifyPipeline:
             new_notices = self._step1_crawl()
 
             if not new_notices:
+                # 서버 재시작 직후 등 코호트 피드가 비어 있으면 채워 둠
+                if not self.hybrid_search_service.cohort_cache.is_fresh():
+                    self._rebuild_cohort_feeds()
                 print("\n[완료] 새로운 공지사항이 없습니다. 종료합니다.")
                 return
 
@@ -138,6 +144,9 @@ class CrawlAndNotifyPipeline:
             del relevance_results
             gc.collect()
 
+            # 6단계: 코호트 맞춤 피드 재구축 (새 공지 반영)
+            self._rebuild_cohort_feeds()
+
             # 최종 통계
             self._print_final_stats(
                 start_time=start_time,
@@ -311,29 +320,16 @@ class CrawlAndNotifyPipeline:
         print(f"\n[통계] DB 저장 완료: {len(saved_ids)}개")
         return saved_ids
 
-    def _load_user_categories(self) -> Dict[str, List[str]]:
-        """사용자별 선호 카테고리를 일괄 조회합니다."""
-        try:
-            result = self.supabase.table("user_preferences")\
-                .select("user_id, categories")\
-                .execute()
-
-            user_categories = {}
-            for pref in (result.data or []):
-                user_categories[pref["user_id"]] = pref.get("categories") or []
-
-            print(f"  [정보] {len(user_categories)}명의 선호 카테고리 로드 완료")
-            return user_categories
-
-        except Exception as e:
-            print(f"  [경고] 사용자 카테고리 로드 실패: {str(e)}")
-            return {}
-
     def _step4_calculate_relevance(
         self,
         notice_ids: List[str]
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """4단계: 하이브리드 검색 + 카테고리 기반 이중 임계값 필터링"""
+        """
+        4단계: 하이브리드 검색 + 카테고리 기반 이중 임계값 필터링 (공지 일괄 처리)
+
+        임계값은 공지당 상위 50명으로 자르기 전에 적용하므로, 조건을 넘는 사용자가 있으면 50명까지 채웁니다.
+        (자세한 선별 규칙: HybridSearchService.find_relevant_users_batch)
+        """
         print("\n" + "-"*60)
         print("[4단계] 하이브리드 검색 기반 관련 사용자 찾기 (이중 임계값)")
         print("-"*60)
@@ -347,75 +343,58 @@ class CrawlAndNotifyPipeline:
         print(f"  [설정] 비관심 카테고리 임계값: {category_unmatch_min}")
         print(f"  [설정] 최소 벡터 점수: {min_vector_score}")
 
-        # 사용자 선호 카테고리 캐시 (전체 조회 1회)
-        user_categories_map = self._load_user_categories()
+        # 사용자가 많으면 클러스터 인덱스 준비 (재학습 기준을 넘었을 때만 k-means 학습)
+        try:
+            self.hybrid_search_service.rebuild_user_clusters()
+        except Exception as e:
+            print(f"  [경고] 사용자 클러스터 갱신 실패 (정확 매칭 사용): {str(e)}")
 
-        relevance_results = {}
+        # 공지 전체 × 사용자 전체를 한 번에 매칭 (사용자 스냅샷 재사용)
+        try:
+            relevance_results = self.hybrid_search_service.find_relevant_users_batch(
+                notice_ids=notice_ids,
+                min_score=category_match_min,
+                max_users=50,
+                category_unmatch_min_score=category_unmatch_min,
+                min_vector_score=min_vector_score
+            )
+        except Exception as e:
+            print(f"  [오류] 관련도 일괄 계산 실패: {str(e)}")
+            return {notice_id: [] for notice_id in notice_ids}
 
         for i, notice_id in enumerate(notice_ids, 1):
-            print(f"\n[{i}/{len(notice_ids)}] 공지 {notice_id[:8]}... 관련 사용자 검색 중")
+            filtered_users = relevance_results.get(notice_id, [])
 
+            # 상위 결과에 대해 리랭킹 (선택적)
             try:
-                # 공지사항 카테고리 조회
-                notice_result = self.supabase.table("notices")\
-                    .select("category")\
-                    .eq("id", notice_id)\
-                    .single()\
-                    .execute()
-                notice_category = (notice_result.data or {}).get("category", "")
-
-                # 하이브리드 검색 (낮은 임계값으로 넓게 검색)
-                relevant_users = self.hybrid_search_service.find_relevant_users(
-                    notice_id=notice_id,
-                    min_score=category_match_min,
-                    max_users=50
-                )
-
-                # 카테고리 기반 이중 임계값 필터링
-                filtered_users = []
-                for user_data in relevant_users:
-                    user_id = user_data.get("user_id")
-                    total_score = user_data.get("total_score", 0)
-                    vector_score = user_data.get("vector_score", 0)
-
-                    # 최소 벡터 점수 체크 (raw similarity 기준)
-                    raw_similarity = vector_score / 0.7 if vector_score > 0 else 0
-                    if raw_similarity < min_vector_score:
-                        continue
-
-                    # 카테고리 매칭 여부 확인
-                    user_cats = user_categories_map.get(user_id, [])
-                    is_category_match = notice_category in user_cats
-
-                    # 이중 임계값 적용
-                    threshold = category_match_min if is_category_match else category_unmatch_min
-                    if total_score >= threshold:
-                        user_data["category_match"] = is_category_match
-                        filtered_users.append(user_data)
-
-                # 상위 결과에 대해 리랭킹 (선택적)
                 if len(filtered_users) > 10 and self.reranking_service.should_rerank(filtered_users):
                     filtered_users = self.reranking_service.rerank_users_for_notice(
                         notice_id=notice_id,
                         candidate_users=filtered_users,
                         top_n=10
                     )
-
-                relevance_results[notice_id] = filtered_users
-
-                print(f"  [완료] {len(relevant_users)}명 검색 → "
-                      f"{len(filtered_users)}명 필터링 통과 "
-                      f"(카테고리: {notice_category})")
-
             except Exception as e:
-                print(f"  [오류] 관련도 계산 실패: {str(e)}")
-                relevance_results[notice_id] = []
+                print(f"  [경고] 리랭킹 실패 (기존 순위 유지): {str(e)}")
+
+            relevance_results[notice_id] = filtered_users
+            print(f"[{i}/{len(notice_ids)}] 공지 {notice_id[:8]}... → {len(filtered_users)}명 필터링 통과")
 
         total_users = sum(len(users) for users in relevance_results.values())
         print(f"\n[통계] 관련 사용자 검색 완료: {len(notice_ids)}개 공지, 총 {total_users}명 알림 대상")
 
         return relevance_results
 
+    def _rebuild_cohort_feeds(self):
+        """6단계: 학과/학년/카테고리 코호트별 맞춤 피드 미리 계산"""
+        print("\n" + "-"*60)
+        print("[6단계] 코호트 맞춤 피드 재구축")
+        print("-"*60)
+
+        try:
+            self.hybrid_search_service.rebuild_cohort_feeds()
+        except Exception as e:
+            print(f"  [경고] 코호트 피드 재구축 실패 (사용자별 계산으로 폴백): {str(e)}")
+
     def _load_user_notification_settings(self) -> Dict[str, Dict[str, Any]]:
         """사용자별 알림 설정을 일괄 조회합니다."""
         try:
@@ -46,7 +46,7 @@ class EmbeddingMigration:
     3. 진행 상황 추적 및 재시도 처리
     """
 
-    BATCH_SIZE = 20  # 한 번에 처리할 개수
+    BATCH_SIZE = 200  # 한 번에 처리할 개수 (임베딩은 100개씩 묶어 동시 요청)
 
     def __init__(self):
         """마이그레이션 초기화"""
@@ -105,30 +105,43 @@ class EmbeddingMigration:
 
             print(f"\n[배치 {batch_num}/{total_batches}] {len(batch)}개 처리 중...")
 
+            # 1~2. 메타데이터 보강 + 임베딩 텍스트 생성 (로컬 처리)
+            prepared = []
             for notice in batch:
+                title = notice.get("title", "")[:40]
                 try:
-                    notice_id = notice["id"]
-                    title = notice.get("title", "")[:40]
-
-                    # 1. 메타데이터 보강
                     enriched = self.enrichment_service.enrich_notice(notice)
-                    enriched_metadata = enriched.get("enriched_metadata", {})
-
-                    # 2. 임베딩 텍스트 생성
                     embedding_text = self._create_notice_embedding_text(enriched)
+                except Exception as e:
+                    failed_count += 1
+                    print(f"  [실패] {title}... ({str(e)})")
+                    continue
+
+                if not embedding_text:
+                    print(f"  [스킵] {title}... (텍스트 없음)")
+                    skipped_count += 1
+                    continue
 
-                    if not embedding_text:
-                        print(f"  [스킵] {title}... (텍스트 없음)")
-                        skipped_count += 1
-                        continue
+                prepared.append((notice, enriched.get("enriched_metadata", {}), embedding_text))
 
-                    # 3. 임베딩 생성
-                    embedding = self.embedding_service.create_embedding(embedding_text)
+            # 3. 임베딩 일괄 생성 (다중 content 요청 + 동시 실행, 실패 위치는 None)
+            embeddings = self.embedding_service.batch_create_embeddings(
+                [text for _, _, text in prepared],
+                show_progress=False
+            )
 
-                    # 4. DB 업데이트 (dry_run이 아닐 때만)
+            # 4. DB 업데이트 (dry_run이 아닐 때만)
+            for (notice, enriched_metadata, _), embedding in zip(prepared, embeddings):
+                title = notice.get("title", "")[:40]
+                if embedding is None:
+                    failed_count += 1
+                    print(f"  [실패] {title}... (임베딩 생성 실패)")
+                    continue
+
+                try:
                     if not dry_run:
                         self._update_notice_embedding(
-                            notice_id=notice_id,
+                            notice_id=notice["id"],
                             embedding=embedding,
                             enriched_metadata=enriched_metadata
                         )
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+맞춤 피드 캐시 모듈
+
+이 파일이 하는 일:
+사용자별 맞춤 공지 순위(find_relevant_notices_for_user 결과 전체)를 저장해 두고,
+같은 세션의 다음 페이지 요청은 저장된 목록을 잘라서 바로 응답합니다.
+
+버전 기반 무효화:
+- 프로필 버전: 사용자가 프로필/선호도를 바꾸면 증가 (routes/users.py)
+- 공지 코퍼스 버전: 새 공지 저장/임베딩 갱신(NoticeService), 공지 삭제(SupabaseService) 시 증가
+- 캐시 키에 두 버전이 포함되므로, 버전이 바뀌면 기존 항목은 자동으로 미스
+
+다른 프로세스(별도 크롤링 작업 scripts/crawl_and_notify.py, 다른 WSGI 워커)의 공지 변경:
+- CORPUS_VERSION_CHECK_INTERVAL(기본 30초)마다 백그라운드로 notices의 (최대 updated_at, 행 수)를 조회
+- 지난번과 다르면 코퍼스 버전 증가 → 다른 프로세스의 저장/수정/삭제도 최대 확인 간격 안에 반영
+- 같은 프로세스의 변경은 bump_corpus_version으로 바로 반영
+  (조회수 갱신 작업도 updated_at을 바꾸므로 그 직후에도 한 번 무효화됨)
+
+코호트 피드 (CohortFeedCache):
+- 학과/학년/관심 카테고리가 같은 학생은 하드 필터와 관심사 임베딩이 사실상 동일
+- 파이프라인 실행 후 코호트별 순위를 미리 계산해 두고 구성원 전체에 제공
+- 임베딩이 코호트 중심에서 벗어난 사용자는 사용자별 계산으로 폴백
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# =============================================================================
+# 버전 카운터 (프로세스 전역)
+# =============================================================================
+
+_versions_lock = threading.Lock()
+_profile_versions: Dict[str, int] = {}
+_corpus_version = 0
+
+# DB 코퍼스 표식 (다른 프로세스의 공지 변경 감지, 0이면 확인하지 않음)
+CORPUS_VERSION_CHECK_INTERVAL = float(os.getenv("CORPUS_VERSION_CHECK_INTERVAL", "30"))
+_corpus_marker: Optional[Tuple[Optional[str], Optional[int]]] = None
+_corpus_checked_at = 0.0
+_corpus_check_thread: Optional[threading.Thread] = None
+
+
+def bump_profile_version(user_id: str) -> None:
+    """사용자 프로필/선호도 변경 시 호출합니다."""
+    with _versions_lock:
+        _profile_versions[user_id] = _profile_versions.get(user_id, 0) + 1
+
+
+def bump_corpus_version() -> None:
+    """공지 저장/임베딩 갱신/삭제 시 호출합니다."""
+    global _corpus_version
+    with _versions_lock:
+        _corpus_version += 1
+
+
+def get_profile_version(user_id: str) -> int:
+    with _versions_lock:
+        return _profile_versions.get(user_id, 0)
+
+
+def get_corpus_version() -> int:
+    """
+    현재 공지 코퍼스 버전 (요청 경로에서 호출되므로 DB를 기다리지 않음).
+    확인 간격이 지났으면 DB 표식 확인을 백그라운드로 시작합니다.
+    """
+    global _corpus_checked_at, _corpus_check_thread
+    with _versions_lock:
+        now = time.monotonic()
+        if (CORPUS_VERSION_CHECK_INTERVAL > 0
+                and now - _corpus_checked_at >= CORPUS_VERSION_CHECK_INTERVAL
+                and (_corpus_check_thread is None or not _corpus_check_thread.is_alive())):
+            _corpus_checked_at = now
+            _corpus_check_thread = threading.Thread(target=refresh_corpus_version, daemon=True)
+            _corpus_check_thread.start()
+        return _corpus_version
+
+
+def refresh_corpus_version() -> bool:
+    """
+    DB 표식을 조회해서 지난 확인 이후 바뀌었으면 코퍼스 버전을 올립니다.
+
+    반환값:
+    - 버전을 올렸는지 (첫 확인은 기준값만 기록)
+    """
+    global _corpus_marker, _corpus_version
+    try:
+        marker = _fetch_corpus_marker()
+    except Exception as e:
+        print(f"[피드 캐시] 공지 코퍼스 버전 확인 실패: {str(e)}")
+        return False
+
+    with _versions_lock:
+        changed = _corpus_marker is not None and marker != _corpus_marker
+        if changed:
+            _corpus_version += 1
+        _corpus_marker = marker
+        return changed
+
+
+def _fetch_corpus_marker() -> Tuple[Optional[str], Optional[int]]:
+    """notices의 (최대 updated_at, 행 수): 저장/수정은 updated_at, 삭제는 행 수로 드러남"""
+    # 순환 import 방지 (supabase_service가 이 모듈의 bump_corpus_version을 사용)
+    from services.supabase_service import get_supabase_client
+
+    result = get_supabase_client().table("notices")\
+        .select("updated_at", count="exact")\
+        .order("updated_at", desc=True)\
+        .limit(1)\
+        .execute()
+    latest = result.data[0].get("updated_at") if result.data else None
+    return latest, result.count
+
+
+# =============================================================================
+# 사용자별 피드 캐시
+# =============================================================================
+
+class PersonalFeedCache:
+    """
+    사용자별 전체 순위 목록 캐시 (LRU + TTL)
+
+    사용 예시:
+    cache = PersonalFeedCache()
+    key = cache.make_key(user_id, min_score, weights)
+    ranked = cache.get(user_id, key)
+    if ranked is None:
+        ranked = compute_full_ranking(...)
+        cache.put(user_id, key, ranked)
+    page = ranked[offset:offset + limit]
+    """
+
+    def __init__(self, max_users: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        매개변수:
+        - max_users: 최대 보관 사용자 수 (기본값: 환경 변수 FEED_CACHE_MAX_USERS 또는 2000)
+        - ttl_seconds: 항목 유효 시간 (기본값: 환경 변수 FEED_CACHE_TTL 또는 600초, 0이면 캐시 비활성)
+        """
+        if max_users is None:
+            max_users = int(os.getenv("FEED_CACHE_MAX_USERS", "2000"))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("FEED_CACHE_TTL", "600"))
+
+        self.max_users = max(1, int(max_users))
+        self.ttl_seconds = float(ttl_seconds)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple, List[Dict[str, Any]], float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(user_id: str, min_score: float, weights: Dict[str, float]) -> Tuple:
+        """
+        현재 버전과 검색 조건으로 캐시 키를 만듭니다.
+
+        계산 시작 전에 키를 만들어야 계산 도중 버전이 바뀐 경우
+        저장된 항목이 다음 요청에서 미스로 처리됩니다.
+        """
+        return (
+            get_profile_version(user_id),
+            get_corpus_version(),
+            float(min_score),
+            tuple(sorted(weights.items()))
+        )
+
+    def get(self, user_id: str, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """키가 일치하고 만료되지 않은 순위 목록을 반환합니다 (없으면 None)."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != key or time.monotonic() - entry[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id: str, key: Tuple, ranked: List[Dict[str, Any]]) -> None:
+        """순위 목록을 저장합니다 (사용자당 1개, 가득 차면 LRU 제거)."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[user_id] = (key, ranked, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_users": self.max_users,
+                "ttl_seconds": self.ttl_seconds,
+                "corpus_version": get_corpus_version(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+# =============================================================================
+# 코호트(학과/학년/카테고리) 피드 캐시
+# =============================================================================
+
+class CohortFeedCache:
+    """
+    같은 학과/학년/관심 카테고리 조합을 가진 사용자들이 공유하는 피드 캐시
+
+    크롤링 파이프라인이 끝날 때마다 rebuild로 통째로 교체되며,
+    사용자 임베딩이 코호트 중심 벡터와 충분히 가까울 때만 사용됩니다.
+    (그 외 사용자는 기존 사용자별 순위 계산으로 폴백)
+
+    사용 예시:
+    cache = CohortFeedCache(embedding_version="models/gemini-embedding-001:768")
+    cache.replace(feeds, get_corpus_version())  # {cohort_key: (centroid, ranked)}
+    ranked = cache.lookup(department, grade, categories, user_unit_vector)
+    """
+
+    def __init__(
+        self,
+        embedding_version: str,
+        similarity_threshold: Optional[float] = None,
+        max_age_seconds: Optional[float] = None
+    ):
+        """
+        매개변수:
+        - embedding_version: 임베딩 모델/차원 식별자 (모델이 바뀌면 코호트 키도 바뀜)
+        - similarity_threshold: 코호트 피드를 쓸 최소 코사인 유사도
+          (기본값: 환경 변수 COHORT_SIMILARITY_THRESHOLD 또는 0.97)
+        - max_age_seconds: 재구축 후 유효 시간 (기본값: 환경 변수 COHORT_FEED_MAX_AGE 또는 6시간)
+        """
+        if similarity_threshold is None:
+            similarity_threshold = float(os.getenv("COHORT_SIMILARITY_THRESHOLD", "0.97"))
+        if max_age_seconds is None:
+            max_age_seconds = float(os.getenv("COHORT_FEED_MAX_AGE", str(6 * 60 * 60)))
+
+        self.embedding_version = embedding_version
+        self.similarity_threshold = similarity_threshold
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._feeds: Dict[Tuple, Tuple[Any, List[Dict[str, Any]]]] = {}
+        self._corpus_version: Optional[int] = None
+        self._built_at: float = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.deviations = 0
+
+    def cohort_key(self, department: Optional[str], grade: Optional[int], categories: List[str]) -> Tuple:
+        return (department or "", grade, tuple(sorted(set(categories or []))), self.embedding_version)
+
+    def replace(self, feeds: Dict[Tuple, Tuple[Any, List[Dict[str, Any]]]], corpus_version: int) -> None:
+        """
+        코호트 피드 전체를 교체합니다.
+
+        매개변수:
+        - feeds: {cohort_key: (정규화된 중심 벡터, 전체 순위 리스트)}
+        - corpus_version: 재구축 시작 시점의 공지 코퍼스 버전
+        """
+        with self._lock:
+            self._feeds = feeds
+            self._corpus_version = corpus_version
+            self._built_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        """마지막 재구축 이후 공지 변경(다른 프로세스 포함)이 없고 유효 시간 이내인지 확인합니다."""
+        version = get_corpus_version()
+        with self._lock:
+            return self._is_fresh_locked(version)
+
+    def _is_fresh_locked(self, version: int) -> bool:
+        return (
+            self._corpus_version is not None
+            and self._corpus_version == version
+            and time.monotonic() - self._built_at <= self.max_age_seconds
+        )
+
+    def lookup(
+        self,
+        department: Optional[str],
+        grade: Optional[int],
+        categories: List[str],
+        user_vector: Any
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        사용자가 속한 코호트의 순위 목록을 반환합니다.
+
+        매개변수:
+        - user_vector: 정규화된 사용자 관심사 임베딩
+
+        반환값:
+        - 순위 리스트, 코호트가 없거나 오래됐거나 임베딩 편차가 크면 None
+        """
+        key = self.cohort_key(department, grade, categories)
+        version = get_corpus_version()
+        with self._lock:
+            entry = self._feeds.get(key) if self._is_fresh_locked(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            centroid, ranked = entry
+            if float(centroid @ user_vector) < self.similarity_threshold:
+                self.deviations += 1
+                return None
+
+            self.hits += 1
+            return ranked
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 통계"""
+        version = get_corpus_version()
+        with self._lock:
+            total = self.hits + self.misses + self.deviations
+            return {
+                "cohorts": len(self._feeds),
+                "fresh": self._is_fresh_locked(version),
+                "similarity_threshold": self.similarity_threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "deviations": self.deviations,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
@@ -24,8 +24,10 @@
 """
 
 import os
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 from supabase import Client
 from dotenv import load_dotenv
 
@@ -33,7 +35,16 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ai.embedding_service import EmbeddingService
+from ai.embedding_codec import parse_unit_matrix
 from services.supabase_service import get_supabase_client
+from services.notice_vector_index import get_notice_vector_index
+from services.notice_text_index import get_notice_text_index
+from services.feed_cache import PersonalFeedCache, CohortFeedCache, get_corpus_version
+from services.query_result_cache import SemanticQueryCache
+from services.notice_hydrator import NoticeHydrator
+from services.user_embedding_snapshot import UserEmbeddingSnapshot, UserMatrix
+from services.user_cluster_index import UserClusterIndex
+from services.shared_embedding_store import default_snapshot_dir, default_snapshot_role
 
 load_dotenv()
 
@@ -45,7 +56,8 @@ class HybridSearchService:
     주요 기능:
     1. find_relevant_notices_for_user: 사용자에게 맞는 공지 검색
     2. find_relevant_users: 공지에 맞는 사용자 검색 (알림용)
-    3. search_by_keyword: 키워드 기반 벡터 검색
+    3. find_relevant_users_batch: 여러 공지에 맞는 사용자 일괄 검색 (파이프라인용)
+    4. search_by_keyword: 키워드 기반 벡터 검색
     """
 
     # 점수 가중치 기본값 (사용자-공지 매칭용)
@@ -54,12 +66,67 @@ class HybridSearchService:
         "vector": 0.7         # 벡터 유사도 비중
     }
 
+    # 벡터 유사도 최소값 (RPC match_threshold와 동일, 미만이면 벡터 점수 0)
+    VECTOR_MATCH_THRESHOLD = 0.2
+
+    # 사용자 필터 RPC에 candidate_ids로 넘길 최대 후보 수 (넘으면 학과/학년 조건 + 결과 후처리)
+    MAX_RPC_CANDIDATE_IDS = 500
+
+    # 사용자 일괄 조회 페이지 크기 (PostgREST 기본 최대 행 수)
+    USER_PAGE_SIZE = 1000
+
+    # 맞춤 피드 벡터 검색 후보 수 (페이지 크기와 무관하게 전체 순위를 한 번에 계산)
+    FEED_VECTOR_CANDIDATES = 200
+
+    # Matryoshka 2단계 사용자 매칭 (find_relevant_users_batch)
+    # 앞쪽 PREFILTER_DIMENSION차원(재정규화)으로 근사 점수 → 공지당 상위 후보만 768차원으로 재계산
+    # MATRYOSHKA_PREFILTER_DIM=0이면 비활성, 후보 수는 scripts/benchmark_matryoshka.py 결과로 선택
+    PREFILTER_DIMENSION = int(os.getenv("MATRYOSHKA_PREFILTER_DIM", "128"))
+    PREFILTER_MIN_USERS = 2000   # 이보다 적으면 전체 차원 행렬 곱이 충분히 빠름
+    PREFILTER_CANDIDATES = 400   # 공지당 재계산 후보 수 (max_users × 4보다 작으면 그 값 사용)
+
+    # 코호트 피드를 만들 최소 구성원 수 (1명짜리 조합은 사용자별 계산과 차이 없음)
+    COHORT_MIN_MEMBERS = 2
+
+    # 코호트 피드 캐시 (클래스 공유: 파이프라인 인스턴스가 재구축 → API 인스턴스가 조회)
+    cohort_cache = CohortFeedCache(
+        embedding_version=f"{EmbeddingService.MODEL_NAME}:{EmbeddingService.DIMENSION}"
+    )
+
+    # 검색 인덱스 디스크 스냅샷 (재시작 직후 전체 조회 대신 파일 매핑 + 변경분 조회)
+    # SEARCH_SNAPSHOT_ENABLED=false면 저장/복원하지 않음
+    SNAPSHOT_DIR = default_snapshot_dir()
+
+    # 워커 간 스냅샷 공유 역할 (auto: writer 1개만 DB 갱신, 나머지 워커는 같은 파일을 mmap으로 읽음)
+    SNAPSHOT_ROLE = default_snapshot_role()
+
+    # 사용자 임베딩 스냅샷 (클래스 공유: 공지마다/파이프라인 실행마다 사용자 전체를 다시 받지 않음)
+    # RerankingService도 이 스냅샷에서 프로필을 읽음
+    user_snapshot = UserEmbeddingSnapshot(
+        dimension=EmbeddingService.DIMENSION, snapshot_dir=SNAPSHOT_DIR, snapshot_role=SNAPSHOT_ROLE
+    )
+
+    # 사용자 클러스터 2단계 매칭 (find_relevant_users_batch)
+    # 사용자가 CLUSTER_MIN_USERS명 이상이고 클러스터 인덱스가 있으면
+    # 공지와 가까운 CLUSTER_PROBES개 클러스터 구성원만 정확 계산 (scripts/benchmark_user_clusters.py로 선택)
+    CLUSTER_MIN_USERS = int(os.getenv("USER_CLUSTER_MIN_USERS", "50000"))
+    CLUSTER_PROBES = int(os.getenv("USER_CLUSTER_PROBES", "32"))
+    CLUSTER_INDEX_PATH = os.getenv("USER_CLUSTER_INDEX_PATH") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "user_clusters.npz"
+    )
+    user_clusters: Optional[UserClusterIndex] = None
+    _user_clusters_loaded = False
+    _user_clusters_lock = threading.Lock()
+
     # 키워드 검색용 가중치 (제목 + 벡터 결합용)
     KEYWORD_SEARCH_WEIGHTS = {
         "title": 0.5,         # 제목 매칭 보너스
         "vector": 0.5         # 벡터 유사도 비중
     }
 
+    # 키워드 검색 의미 캐시 (클래스 공유: 임베딩이 가까운 검색어는 후보 집합 재사용, 제목 보너스만 재계산)
+    query_result_cache = SemanticQueryCache()
+
     def __init__(self):
         """하이브리드 검색 서비스 초기화 (공유 싱글턴 클라이언트 사용)"""
         # Supabase 클라이언트 (공유 싱글턴 — reset_supabase_client() 시 자동 반영)
@@ -68,6 +135,22 @@ class HybridSearchService:
         # 임베딩 서비스
         self.embedding_service = EmbeddingService()
 
+        # pgvector RPC 사용 여부 (false면 항상 로컬 인덱스로 검색)
+        self.use_vector_rpc = os.getenv("USE_VECTOR_RPC", "true").lower() == "true"
+
+        # DB에 설치되지 않은 선택적 RPC 이름 (016/017 마이그레이션 미적용 시 기존 방식으로 전환)
+        self.missing_rpcs = set()
+
+        # 로컬 공지 벡터 인덱스 (RPC 실패/비활성 시 사용, 첫 폴백 때 적재, 프로세스 공유 — 공지 삭제 시 바로 제거)
+        # 저장 정밀도는 NOTICE_INDEX_PRECISION (float32/float16/int8, 손실 정밀도는 원본으로 재계산)
+        self.notice_index = get_notice_vector_index()
+
+        # 공지 전문 검색 인덱스 (BM25, 프로세스 공유 — NoticeService 저장 시 바로 반영)
+        self.text_index = get_notice_text_index()
+
+        # 사용자별 맞춤 피드 캐시 (다음 페이지 요청은 저장된 순위 목록을 잘라서 응답)
+        self.feed_cache = PersonalFeedCache()
+
         print("HybridSearchService 초기화 완료")
 
     def find_relevant_notices_for_user(
@@ -96,32 +179,70 @@ class HybridSearchService:
         2. 하드 필터링 (학과, 학년)
         3. 벡터 검색 (관심사 매칭)
         4. 점수 결합 및 정렬
+
+        전체 순위는 (프로필 버전, 공지 코퍼스 버전) 키로 캐싱되므로
+        같은 세션의 다음 페이지 요청은 다시 계산하지 않습니다.
         """
         weights = weights or self.DEFAULT_WEIGHTS
 
+        cache_key = self.feed_cache.make_key(user_id, min_score, weights)
+        ranked = self.feed_cache.get(user_id, cache_key)
+        if ranked is None:
+            ranked = self._rank_notices_for_user(user_id, min_score, weights)
+            if ranked is None:
+                return []
+            self.feed_cache.put(user_id, cache_key, ranked)
+
+        # offset 적용 (새로고침 시 다음 배치 제공)
+        # 리랭킹이 결과 딕셔너리에 점수를 덧붙이므로 캐시 항목은 복사해서 반환
+        return [dict(r) for r in ranked[offset:offset + limit]]
+
+    def _rank_notices_for_user(
+        self,
+        user_id: str,
+        min_score: float,
+        weights: Dict[str, float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        사용자 맞춤 공지 전체 순위를 계산합니다 (페이지 자르기 전).
+
+        반환값:
+        - 점수 내림차순 공지 리스트, 사용자가 없으면 None
+        """
         # 1. 사용자 프로필 조회
         user_profile = self._get_user_profile(user_id)
         if not user_profile:
             print(f"사용자를 찾을 수 없습니다: {user_id}")
-            return []
+            return None
 
-        # 2. 하드 필터링
-        hard_filtered = self._hard_filter_notices(
-            department=user_profile.get("department"),
-            grade=user_profile.get("grade")
-        )
+        # 코호트 피드가 있으면 그대로 사용 (기본 가중치일 때만)
+        cohort_ranked = self._lookup_cohort_feed(user_profile, weights)
+        if cohort_ranked is not None:
+            return [r for r in cohort_ranked if r["total_score"] >= min_score]
 
-        # 3. 벡터 검색 (사용자 임베딩으로)
+        # 2~3. 하드 필터 + 벡터 유사도를 DB에서 한 번에 계산 (017 마이그레이션)
         user_embedding = user_profile.get("interests_embedding")
-        if user_embedding:
-            vector_results = self._vector_search_notices(
-                query_embedding=user_embedding,
-                notice_ids=[n["id"] for n in hard_filtered] if hard_filtered else None,
-                limit=limit * 2
-            )
+        scored = self._score_recent_notices(user_profile) if user_embedding else None
+
+        if scored is not None:
+            hard_filtered, vector_results = scored
         else:
-            # 임베딩이 없으면 벡터 검색 스킵
-            vector_results = []
+            # 2. 하드 필터링
+            hard_filtered = self._hard_filter_notices(
+                department=user_profile.get("department"),
+                grade=user_profile.get("grade")
+            )
+
+            # 3. 벡터 검색 (사용자 임베딩으로)
+            if user_embedding:
+                vector_results = self._vector_search_notices(
+                    query_embedding=user_embedding,
+                    notice_ids=[n["id"] for n in hard_filtered] if hard_filtered else None,
+                    limit=self.FEED_VECTOR_CANDIDATES
+                )
+            else:
+                # 임베딩이 없으면 벡터 검색 스킵
+                vector_results = []
 
         # 4. 점수 결합
         combined = self._combine_notice_scores(
@@ -143,8 +264,134 @@ class HybridSearchService:
             x["total_score"]
         ), reverse=True)
 
-        # offset 적용 (새로고침 시 다음 배치 제공)
-        return results[offset:offset + limit]
+        return results
+
+    def _score_recent_notices(
+        self,
+        user_profile: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        점수 계산 RPC로 최근 공지의 (유사도, 하드 필터 매칭)을 받아옵니다.
+
+        반환값:
+        - (하드 필터 결과, 벡터 검색 결과) — _combine_notice_scores 입력 형식
+        - None: RPC 비활성/미설치/실패 또는 후보 없음 (기존 방식으로 계산)
+        """
+        if not self.use_vector_rpc:
+            return None
+
+        rows = self._call_optional_rpc(
+            "score_recent_notices_for_user",
+            {
+                "query_embedding": user_profile["interests_embedding"],
+                "user_department": user_profile.get("department"),
+                "user_grade": user_profile.get("grade"),
+                "match_threshold": self.VECTOR_MATCH_THRESHOLD,
+                "candidate_count": 200
+            }
+        )
+        if not rows:
+            return None
+
+        matched = sorted(
+            (r for r in rows if (r.get("similarity") or 0) > self.VECTOR_MATCH_THRESHOLD),
+            key=lambda r: r["similarity"],
+            reverse=True
+        )[:self.FEED_VECTOR_CANDIDATES]
+
+        return rows, [{"id": r["id"], "similarity": r["similarity"]} for r in matched]
+
+    def _lookup_cohort_feed(
+        self,
+        user_profile: Dict[str, Any],
+        weights: Dict[str, float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """사용자가 속한 코호트의 미리 계산된 순위를 반환합니다 (없으면 None)."""
+        user_embedding = user_profile.get("interests_embedding")
+        if weights != self.DEFAULT_WEIGHTS or not user_embedding:
+            return None
+
+        return self.cohort_cache.lookup(
+            department=user_profile.get("department"),
+            grade=user_profile.get("grade"),
+            categories=user_profile.get("categories") or [],
+            user_vector=self._to_unit_matrix([user_embedding])[0]
+        )
+
+    def rebuild_cohort_feeds(self) -> int:
+        """
+        학과/학년/관심 카테고리 코호트별 맞춤 피드를 미리 계산합니다.
+        크롤링 파이프라인 실행 후 호출합니다.
+
+        과정:
+        1. 관심사 임베딩이 있는 전체 사용자를 코호트별로 묶음
+        2. 코호트 중심 벡터 = 구성원 단위 벡터 평균 (정규화)
+        3. 최근 공지를 1회 조회하여 코호트마다 하드 필터 적용
+        4. 중심 벡터 × 공지 임베딩 행렬 곱 1회로 벡터 점수 계산
+        5. 사용자별 계산과 같은 방식으로 점수 결합 및 정렬
+
+        반환값:
+        - 만들어진 코호트 수
+        """
+        corpus_version = get_corpus_version()
+
+        users = self._load_users_for_matching(notifications_only=False)
+        cohorts: Dict[Tuple, List[Dict[str, Any]]] = {}
+        for user in users:
+            key = self.cohort_cache.cohort_key(user.get("department"), user.get("grade"), user["categories"])
+            cohorts.setdefault(key, []).append(user)
+        cohorts = {k: members for k, members in cohorts.items() if len(members) >= self.COHORT_MIN_MEMBERS}
+
+        notices = self._fetch_recent_notices(include_embedding=True)
+        embedded = [n for n in notices if n.get("content_embedding")]
+        if not cohorts or not embedded:
+            self.cohort_cache.replace({}, corpus_version)
+            print("[코호트] 재구축할 코호트 또는 공지가 없습니다")
+            return 0
+
+        keys = list(cohorts.keys())
+        centroids = EmbeddingService.normalize(np.stack([
+            self._to_unit_matrix([u["interests_embedding"] for u in cohorts[k]]).mean(axis=0)
+            for k in keys
+        ]))
+        notice_matrix = self._to_unit_matrix([n["content_embedding"] for n in embedded])
+
+        # (코호트 수 × 공지 수) 유사도, RPC와 같은 임계값 적용
+        similarities = EmbeddingService.pairwise_similarities(centroids, notice_matrix, normalized=True)
+
+        feeds = {}
+        for i, key in enumerate(keys):
+            department, grade, categories, _ = key
+            hard_filtered = self._hard_filter_notices(
+                department=department or None,
+                grade=grade,
+                notices=[dict(n) for n in notices]
+            )
+
+            scores = similarities[i]
+            matched = np.flatnonzero(scores > self.VECTOR_MATCH_THRESHOLD)
+            matched = matched[np.argsort(-scores[matched], kind="stable")][:self.FEED_VECTOR_CANDIDATES]
+            vector_results = [
+                {"id": embedded[j]["id"], "similarity": float(scores[j])}
+                for j in matched
+            ]
+
+            ranked = self._combine_notice_scores(
+                hard_filtered=hard_filtered,
+                vector_results=vector_results,
+                weights=self.DEFAULT_WEIGHTS
+            )
+            ranked.sort(key=lambda x: (
+                1 if x.get("category") in categories else 0,
+                x["total_score"]
+            ), reverse=True)
+
+            feeds[key] = (centroids[i], ranked)
+
+        self.cohort_cache.replace(feeds, corpus_version)
+        members = sum(len(m) for m in cohorts.values())
+        print(f"[코호트] 피드 재구축 완료: {len(feeds)}개 코호트, 사용자 {members}명")
+        return len(feeds)
 
     def find_relevant_users(
         self,
@@ -189,15 +436,29 @@ class HybridSearchService:
         )
 
         # 3. 벡터 검색 (공지 임베딩으로)
+        # 후보(알림 켜진 사용자 전체) ID 배열 대신 학과/학년 조건을 DB에 넘겨 인덱스 스캔과 함께 거름
+        # - 대상 사용자는 보너스가 있으므로 조건 안 유사도 상위, 그 외 사용자는 전체 유사도 상위만 후보가 될 수 있음
         notice_embedding = notice.get("content_embedding")
+        vector_results = []
         if notice_embedding:
-            vector_results = self._vector_search_users(
-                notice_embedding=notice_embedding,
-                user_ids=[u["id"] for u in candidate_users] if candidate_users else None,
-                limit=max_users * 2
-            )
-        else:
-            vector_results = []
+            vector_results = self._vector_search_users(notice_embedding=notice_embedding, limit=max_users * 2)
+
+            target_departments = enriched.get("target_departments") or []
+            target_grades = enriched.get("target_grades") or []
+            if not enriched.get("is_for_all", False) and (target_departments or target_grades):
+                seen = {r["user_id"] for r in vector_results}
+                vector_results += [
+                    r for r in self._vector_search_users(
+                        notice_embedding=notice_embedding,
+                        limit=max_users * 2,
+                        target_departments=target_departments,
+                        target_grades=target_grades
+                    )
+                    if r["user_id"] not in seen
+                ]
+
+            enabled = {u["id"] for u in candidate_users}
+            vector_results = [r for r in vector_results if r["user_id"] in enabled]
 
         # 4. 점수 결합
         combined = self._combine_user_scores(
@@ -216,6 +477,142 @@ class HybridSearchService:
 
         return results[:max_users]
 
+    def find_relevant_users_batch(
+        self,
+        notice_ids: List[str],
+        min_score: float = 0.5,
+        max_users: int = 50,
+        weights: Optional[Dict[str, float]] = None,
+        category_unmatch_min_score: Optional[float] = None,
+        min_vector_score: float = 0.0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 공지사항에 관련 있는 사용자를 한 번에 검색합니다 (파이프라인 알림용).
+
+        매개변수:
+        - notice_ids: 공지사항 ID 리스트
+        - min_score: 관심 카테고리 사용자의 최소 점수
+        - max_users: 공지당 최대 사용자 수
+        - weights: 점수 가중치
+        - category_unmatch_min_score: 비관심 카테고리 사용자의 최소 점수 (None이면 min_score)
+        - min_vector_score: 최소 벡터 유사도 (raw similarity 기준)
+
+        반환값:
+        - {notice_id: [사용자 결과, ...]} (공지별 total_score 내림차순)
+
+        find_relevant_users와의 차이:
+        - 공지 N개를 1회 쿼리로 조회, 사용자는 스냅샷(변경분만 재조회)에서 사용
+        - (공지 × 사용자) 유사도 행렬을 행렬 곱 한 번으로 계산
+        - 하드 필터 보너스와 이중 임계값을 배열 마스크로 적용
+        - 사용자가 CLUSTER_MIN_USERS명 이상이고 클러스터 인덱스가 있으면 가까운 클러스터만 계산
+        - 그보다 적고 PREFILTER_MIN_USERS명 이상이면 잘라낸 차원으로 후보를 고른 뒤 재계산
+
+        선별 규칙 (파이프라인 4단계의 이전 방식 find_relevant_users + 후처리 필터와 다른 점):
+        - 이중 임계값과 min_vector_score를 max_users명으로 자르기 전에 적용
+          (이전: 점수 상위 max_users명을 고른 뒤 걸러서 max_users명보다 적게 남을 수 있었음)
+        - 알림 켜진 사용자 전원의 유사도를 계산 (이전: 벡터 RPC 상위 2 × max_users명만 후보)
+        - 유사도가 VECTOR_MATCH_THRESHOLD 이하면 벡터 점수 0 (벡터 RPC의 match_threshold와 같은 규칙)
+        """
+        weights = weights or self.DEFAULT_WEIGHTS
+        if category_unmatch_min_score is None:
+            category_unmatch_min_score = min_score
+
+        results: Dict[str, List[Dict[str, Any]]] = {nid: [] for nid in notice_ids}
+        if not notice_ids:
+            return results
+
+        # 1. 공지사항 일괄 조회 (임베딩 있는 공지만 매칭 대상)
+        notices = [n for n in self._get_notices(notice_ids) if n.get("content_embedding")]
+        if not notices:
+            return results
+
+        # 2. 사용자 스냅샷 (변경분만 동기화, 알림 켜짐 + 임베딩 있는 사용자만 매칭 대상)
+        users = self._user_matrix()
+        eligible = users.notification_enabled & users.has_embedding
+        if not eligible.any():
+            return results
+
+        notice_matrix = self._to_unit_matrix([n["content_embedding"] for n in notices])
+        user_matrix = users.matrix
+
+        # 3. 후보 선택 방식
+        #    - 클러스터 인덱스: 공지와 가까운 클러스터 구성원만 정확 계산
+        #    - Matryoshka: 앞쪽 차원 근사 점수 상위 후보만 정확 계산 (잘라낸 행렬은 스냅샷에 보관)
+        #    - 그 외: (공지 × 사용자) 전체 유사도 행렬
+        clusters = self._cluster_index(users)
+        candidate_count = max(self.PREFILTER_CANDIDATES, max_users * 4)
+        use_prefilter = clusters is None and 0 < self.PREFILTER_DIMENSION < user_matrix.shape[1] \
+            and len(users) >= self.PREFILTER_MIN_USERS and candidate_count < len(users)
+
+        similarity = None
+        if clusters is not None:
+            cluster_candidates = clusters.score(notice_matrix, self.CLUSTER_PROBES)
+        else:
+            similarity = EmbeddingService.pairwise_similarities(
+                EmbeddingService.truncate(notice_matrix, self.PREFILTER_DIMENSION) if use_prefilter else notice_matrix,
+                users.prefix(self.PREFILTER_DIMENSION) if use_prefilter else user_matrix,
+                normalized=True
+            )
+            similarity[similarity <= self.VECTOR_MATCH_THRESHOLD] = 0.0
+        eligible_rows = np.flatnonzero(eligible)
+        category_masks: Dict[str, np.ndarray] = {}
+
+        for row, notice in enumerate(notices):
+            enriched = notice.get("enriched_metadata") or {}
+
+            # 하드 필터 마스크 (학과 AND 학년, 전체 대상이면 모두 True)
+            hard_match = self._hard_filter_mask(users, enriched)
+            hard_scores = np.where(hard_match, weights["hard_filter"], 0.0)
+
+            # 후보 행과 후보의 정확 유사도
+            if clusters is not None:
+                rows, row_similarity = cluster_candidates[row]
+                keep = eligible[rows]
+                rows, row_similarity = rows[keep], row_similarity[keep]
+                row_similarity[row_similarity <= self.VECTOR_MATCH_THRESHOLD] = 0.0
+            elif use_prefilter:
+                approx = np.where(eligible, hard_scores + similarity[row] * weights["vector"], -np.inf)
+                rows = np.argpartition(-approx, candidate_count - 1)[:candidate_count]
+                rows = rows[eligible[rows]]
+                row_similarity = user_matrix[rows] @ notice_matrix[row]
+                row_similarity[row_similarity <= self.VECTOR_MATCH_THRESHOLD] = 0.0
+            else:
+                rows = eligible_rows
+                row_similarity = similarity[row, rows]
+
+            vector_scores = row_similarity * weights["vector"]
+            total_scores = hard_scores[rows] + vector_scores
+
+            # 이중 임계값 (관심 카테고리 / 비관심 카테고리)
+            category = notice.get("category") or ""
+            if category not in category_masks:
+                category_masks[category] = users.category_mask(category)
+            category_match = category_masks[category][rows]
+            thresholds = np.where(category_match, min_score, category_unmatch_min_score)
+
+            passed = np.flatnonzero(
+                (total_scores >= thresholds) & (row_similarity >= min_vector_score)
+            )
+            if passed.size > max_users:
+                top = np.argpartition(-total_scores[passed], max_users - 1)[:max_users]
+                passed = passed[top]
+            passed = passed[np.argsort(-total_scores[passed], kind="stable")]
+
+            results[notice["id"]] = [
+                {
+                    "user_id": users.ids[rows[p]],
+                    "department": users.departments[rows[p]] or None,
+                    "grade": int(users.grades[rows[p]]) if users.grades[rows[p]] >= 0 else None,
+                    "hard_filter_score": float(hard_scores[rows[p]]),
+                    "vector_score": float(vector_scores[p]),
+                    "total_score": float(total_scores[p]),
+                    "category_match": bool(category_match[p])
+                }
+                for p in passed
+            ]
+
+        return results
+
     def search_by_keyword(
         self,
         query: str,
@@ -234,9 +631,10 @@ class HybridSearchService:
         - 검색 결과 리스트 (공지사항 + 점수)
 
         검색 과정:
-        1. 제목에서 키워드 포함 여부 확인 (ILIKE)
-        2. 벡터 유사도 검색
-        3. 두 결과 결합 (제목 매칭 보너스 + 벡터 점수)
+        1. 검색어 임베딩 (같은 검색어는 query_cache에서 바로)
+        2. 의미 캐시 조회 (임베딩이 가까운 이전 검색어의 후보 집합 → 제목 보너스만 재계산)
+        3. 미스면 제목/본문 전문 검색 (BM25 인덱스, 준비 전이면 제목 ILIKE) + 벡터 유사도 검색
+        4. 두 결과 결합 (텍스트 점수 + 벡터 점수)
         """
         if not query or len(query.strip()) < 2:
             return []
@@ -244,24 +642,35 @@ class HybridSearchService:
         query = query.strip()
         print(f"\n[검색] 하이브리드 키워드 검색: '{query}'")
 
-        # 1. 제목 검색 (ILIKE)
-        title_results = self._search_by_title(query, limit=limit * 2)
-        print(f"   - 제목 매칭: {len(title_results)}개")
-
-        # 2. 벡터 검색
+        # 계산 시작 전 버전 (계산 도중 새 공지가 저장되면 캐시에 넣지 않음)
+        corpus_version = get_corpus_version()
         query_embedding = self.embedding_service.create_query_embedding(query)
-        vector_results = self._vector_search_notices(
-            query_embedding=query_embedding,
-            limit=limit * 2
-        )
-        print(f"   - 벡터 매칭: {len(vector_results)}개")
 
-        # 3. 결과 결합
-        combined = self._combine_keyword_search_results(
-            title_results=title_results,
-            vector_results=vector_results,
-            min_score=min_score
-        )
+        candidates = self.query_result_cache.lookup(query, query_embedding, candidate_limit=limit * 2)
+        if candidates is not None:
+            combined = self._rescore_cached_candidates(query, candidates, limit * 2, min_score)
+            print(f"   - 의미 캐시 적중: 후보 {len(candidates)}개 재사용")
+        else:
+            # 단계별 상세 조회를 모았다가 결합 직전 1번에 조회
+            hydrator = NoticeHydrator(self.supabase)
+
+            # 1. 텍스트 검색 (BM25 / ILIKE)
+            title_results = self._search_by_title(query, limit=limit * 2, hydrator=hydrator)
+            print(f"   - 제목 매칭: {len(title_results)}개")
+
+            # 2. 벡터 검색
+            vector_results = self._vector_search_notices(
+                query_embedding=query_embedding,
+                limit=limit * 2
+            )
+            print(f"   - 벡터 매칭: {len(vector_results)}개")
+
+            # 3. 결과 결합 (최소 점수 필터 전 후보 집합을 캐시에 저장)
+            candidates = self._merge_keyword_candidates(title_results, vector_results, hydrator)
+            self.query_result_cache.put(
+                query, query_embedding, candidates, candidate_limit=limit * 2, corpus_version=corpus_version
+            )
+            combined = [dict(c) for c in candidates if c["total_score"] >= min_score]
 
         # 점수순 정렬 및 제한
         combined.sort(key=lambda x: x.get("total_score", 0), reverse=True)
@@ -274,148 +683,208 @@ class HybridSearchService:
     def _search_by_title(
         self,
         query: str,
-        limit: int = 50
+        limit: int = 50,
+        hydrator: Optional[NoticeHydrator] = None
     ) -> List[Dict[str, Any]]:
         """
-        제목에서 키워드를 검색합니다 (ILIKE).
+        제목/본문에서 키워드를 검색합니다.
+
+        전문 검색 인덱스가 준비됐으면 BM25 순위를 쓰고 (1위 = 제목 가중치 만점, 나머지는 비례),
+        아니면 제목 ILIKE 매칭에 고정 가중치를 줍니다.
 
         매개변수:
         - query: 검색 키워드
         - limit: 최대 결과 수
+        - hydrator: 상세 정보 조회를 모으는 NoticeHydrator (BM25 결과 id 등록, ILIKE 행 전달)
 
         반환값:
-        - 제목 매칭 결과 리스트
+        - 텍스트 매칭 결과 리스트 [{"id", "title_match", "title_score", ("text_score")}]
+          (상세 정보는 hydrator.fetch()로 한 번에 조회)
         """
+        hydrator = hydrator or NoticeHydrator(self.supabase)
+
+        text_results = self._search_by_text_index(query, limit, hydrator)
+        if text_results is not None:
+            return text_results
+
         try:
             # ILIKE 와일드카드 문자 이스케이프 (%, _ 는 ILIKE 특수 패턴 문자)
             escaped_query = query.replace("%", "\\%").replace("_", "\\_")
 
-            # ILIKE 검색 (대소문자 무시)
+            # ILIKE 검색 (대소문자 무시, 상세 컬럼까지 같이 조회 → hydrator에 전달)
             result = self.supabase.table("notices")\
-                .select("id, title, content, ai_summary, category, source_url, published_at, view_count")\
+                .select(hydrator.columns)\
                 .ilike("title", f"%{escaped_query}%")\
                 .order("published_at", desc=True)\
                 .limit(limit)\
                 .execute()
 
             notices = result.data or []
+            hydrator.add_rows(notices)
 
             # 제목 매칭 점수 추가
-            results = []
-            for notice in notices:
-                results.append({
+            return [
+                {
                     "id": notice["id"],
-                    "title": notice["title"],
-                    "content": notice.get("content", ""),
-                    "ai_summary": notice.get("ai_summary"),
-                    "category": notice.get("category"),
-                    "source_url": notice.get("source_url"),
-                    "published_at": notice.get("published_at"),
-                    "view_count": notice.get("view_count", 0),
                     "title_match": True,
                     "title_score": self.KEYWORD_SEARCH_WEIGHTS["title"]
-                })
-
-            return results
+                }
+                for notice in notices
+            ]
 
         except Exception as e:
             print(f"제목 검색 실패: {str(e)}")
             return []
 
-    def _combine_keyword_search_results(
+    def _search_by_text_index(
+        self,
+        query: str,
+        limit: int,
+        hydrator: NoticeHydrator
+    ) -> Optional[List[Dict[str, Any]]]:
+        """BM25 인덱스 검색 (상세 정보는 hydrator에 id만 등록, 인덱스를 쓸 수 없으면 None)"""
+        try:
+            self.text_index.sync_in_background()
+            if not self.text_index.ready:
+                return None
+
+            hits = self.text_index.search(query, limit=limit)
+            if not hits:
+                return []
+
+            hydrator.require(notice_id for notice_id, _ in hits)
+            top_score = hits[0][1]
+            return [
+                {
+                    "id": notice_id,
+                    "title_match": True,
+                    "text_score": score,
+                    "title_score": self.KEYWORD_SEARCH_WEIGHTS["title"] * score / top_score
+                }
+                for notice_id, score in hits
+            ]
+
+        except Exception as e:
+            print(f"[전문 검색] 인덱스 검색 실패 (ILIKE 사용): {str(e)}")
+            return None
+
+    def _merge_keyword_candidates(
         self,
         title_results: List[Dict[str, Any]],
         vector_results: List[Dict[str, Any]],
-        min_score: float = 0.3
+        hydrator: Optional[NoticeHydrator] = None
     ) -> List[Dict[str, Any]]:
         """
-        제목 검색과 벡터 검색 결과를 결합합니다.
+        제목 검색과 벡터 검색 결과를 결합합니다 (최소 점수 필터 전 후보 집합, 의미 캐시에 저장됨).
+
+        두 단계에서 상세 정보가 필요한 id를 모두 모아 hydrator로 한 번만 조회하고 id 딕셔너리로 결합합니다.
+        (이전: BM25 결과 상세 조회 + 벡터 전용 결과 상세 조회 = 2번)
 
         점수 계산:
-        - 제목 매칭: +0.5점
+        - 텍스트 매칭: 최대 +0.5점 (BM25 1위 대비 비율, ILIKE 폴백이면 고정 0.5)
         - 벡터 유사도: 0~1점 (0.5 가중치 적용)
         - 최종 점수: 제목 점수 + 벡터 점수
 
         매개변수:
         - title_results: 제목 검색 결과
         - vector_results: 벡터 검색 결과
-        - min_score: 최소 점수 (필터링용)
+        - hydrator: _search_by_title에 넘긴 것과 같은 NoticeHydrator
 
         반환값:
-        - 결합된 검색 결과
+        - 결합된 후보 리스트 (상세 정보 + title_score / vector_score / total_score)
+          (상세 조회에 없는 공지는 삭제된 것으로 보고 텍스트/벡터 결과 모두 제외)
         """
-        combined = {}
-
-        # 제목 검색 결과 추가
-        for result in title_results:
-            notice_id = result["id"]
-            combined[notice_id] = {
+        hydrator = hydrator or NoticeHydrator(self.supabase)
+        hydrator.require(r["id"] for r in title_results)
+        hydrator.require(r["id"] for r in vector_results)
+        rows = hydrator.fetch()
+
+        def candidate(notice_id: str) -> Dict[str, Any]:
+            row = rows[notice_id]
+            return {
                 "id": notice_id,
-                "title": result["title"],
-                "content": result.get("content", ""),
-                "ai_summary": result.get("ai_summary"),
-                "category": result.get("category"),
-                "source_url": result.get("source_url"),
-                "published_at": result.get("published_at"),
-                "view_count": result.get("view_count", 0),
-                "title_match": True,
-                "title_score": self.KEYWORD_SEARCH_WEIGHTS["title"],
+                "title": row.get("title"),
+                "content": row.get("content") or "",
+                "ai_summary": row.get("ai_summary"),
+                "category": row.get("category"),
+                "source_url": row.get("source_url"),
+                "published_at": row.get("published_at"),
+                "view_count": row.get("view_count") or 0,
+                "title_match": False,
+                "title_score": 0.0,
                 "vector_score": 0.0,
-                "total_score": self.KEYWORD_SEARCH_WEIGHTS["title"]
+                "total_score": 0.0
             }
 
+        combined: Dict[str, Dict[str, Any]] = {}
+
+        # 텍스트 검색 결과 추가
+        for result in title_results:
+            notice_id = result["id"]
+            if notice_id not in rows:
+                continue
+            title_score = result.get("title_score", self.KEYWORD_SEARCH_WEIGHTS["title"])
+            entry = candidate(notice_id)
+            entry["title_match"] = True
+            entry["title_score"] = title_score
+            entry["total_score"] = title_score
+            combined[notice_id] = entry
+
         # 벡터 검색 결과 추가/결합
-        vector_only_ids = []  # 벡터만 매칭된 공지 ID (추후 상세 정보 조회용)
         for result in vector_results:
             notice_id = result["id"]
+            if notice_id not in rows:
+                continue
             vector_score = result.get("similarity", 0) * self.KEYWORD_SEARCH_WEIGHTS["vector"]
+            entry = combined.get(notice_id)
+            if entry is None:
+                entry = combined[notice_id] = candidate(notice_id)
+            entry["vector_score"] = vector_score
+            entry["total_score"] += vector_score
 
-            if notice_id in combined:
-                # 이미 제목 매칭된 결과에 벡터 점수 추가
-                combined[notice_id]["vector_score"] = vector_score
-                combined[notice_id]["total_score"] += vector_score
-            else:
-                # 벡터만 매칭된 새 결과
-                combined[notice_id] = {
-                    "id": notice_id,
-                    "title": result.get("title"),
-                    "content": "",
-                    "ai_summary": result.get("ai_summary"),
-                    "category": result.get("category"),
-                    "source_url": None,
-                    "published_at": None,
-                    "view_count": 0,
-                    "title_match": False,
-                    "title_score": 0.0,
-                    "vector_score": vector_score,
-                    "total_score": vector_score
-                }
-                vector_only_ids.append(notice_id)
-
-        # 벡터 전용 결과의 누락 필드를 DB에서 보완
-        if vector_only_ids:
-            try:
-                detail_result = self.supabase.table("notices")\
-                    .select("id, content, source_url, published_at, view_count")\
-                    .in_("id", vector_only_ids)\
-                    .execute()
-
-                for detail in (detail_result.data or []):
-                    nid = detail["id"]
-                    if nid in combined:
-                        combined[nid]["content"] = detail.get("content", "")
-                        combined[nid]["source_url"] = detail.get("source_url")
-                        combined[nid]["published_at"] = detail.get("published_at")
-                        combined[nid]["view_count"] = detail.get("view_count", 0)
-            except Exception as e:
-                print(f"벡터 전용 결과 상세 정보 조회 실패: {str(e)}")
+        return list(combined.values())
 
-        # 최소 점수 필터링
-        results = [
-            r for r in combined.values()
-            if r["total_score"] >= min_score
-        ]
+    def _rescore_cached_candidates(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        limit: int,
+        min_score: float
+    ) -> List[Dict[str, Any]]:
+        """
+        의미 캐시에서 가져온 후보에 새 검색어의 제목 보너스만 다시 적용합니다.
 
+        - 벡터 점수: 캐시된 검색어 기준 값 그대로 (임베딩이 임계값 이상 가까우므로 차이가 작음)
+        - 제목 점수: BM25 인덱스가 준비됐으면 새 검색어의 BM25 순위(1위 대비 비율),
+          아니면 ILIKE와 같은 기준(제목에 검색어 포함)으로 고정 가중치
+        - DB 조회 없음 (후보에 상세 정보가 이미 있음)
+        """
+        title_weight = self.KEYWORD_SEARCH_WEIGHTS["title"]
+        title_scores: Dict[str, float] = {}
+
+        if self.text_index.ready:
+            hits = self.text_index.search(query, limit=limit)
+            if hits:
+                top_score = hits[0][1]
+                for notice_id, score in hits:
+                    title_scores[notice_id] = title_weight * score / top_score
+        else:
+            needle = query.casefold()
+            for candidate in candidates:
+                if needle in (candidate.get("title") or "").casefold():
+                    title_scores[candidate["id"]] = title_weight
+
+        results = []
+        for candidate in candidates:
+            title_score = title_scores.get(candidate["id"], 0.0)
+            total_score = title_score + candidate["vector_score"]
+            if total_score < min_score:
+                continue
+            result = dict(candidate)
+            result["title_match"] = candidate["id"] in title_scores
+            result["title_score"] = title_score
+            result["total_score"] = total_score
+            results.append(result)
         return results
 
     # =========================================================================
@@ -471,14 +940,137 @@ class HybridSearchService:
             print(f"공지사항 조회 실패: {str(e)}")
             return None
 
+    def _get_notices(self, notice_ids: List[str]) -> List[Dict[str, Any]]:
+        """여러 공지사항을 단일 IN 쿼리로 조회"""
+        try:
+            result = self.supabase.table("notices")\
+                .select("id, title, category, content_embedding, enriched_metadata")\
+                .in_("id", notice_ids)\
+                .execute()
+
+            return result.data or []
+
+        except Exception as e:
+            print(f"공지사항 일괄 조회 실패: {str(e)}")
+            return []
+
+    def _user_matrix(self) -> UserMatrix:
+        """사용자 스냅샷을 변경분만 동기화해서 반환합니다."""
+        return self.user_snapshot.refresh()
+
+    def _cluster_index(self, users: UserMatrix) -> Optional[UserClusterIndex]:
+        """
+        현재 스냅샷에 맞춘 사용자 클러스터 인덱스를 반환합니다.
+
+        - 사용자가 CLUSTER_MIN_USERS명 미만이면 None (정확/Matryoshka 매칭)
+        - 인덱스가 없으면 저장 파일을 한 번 읽어 봄 (학습은 rebuild_user_clusters에서만)
+        - 스냅샷이 바뀌었으면 신규/변경 사용자만 가까운 중심에 배정
+        """
+        if len(users) < self.CLUSTER_MIN_USERS:
+            return None
+
+        cls = HybridSearchService
+        with cls._user_clusters_lock:
+            if cls.user_clusters is None and not cls._user_clusters_loaded:
+                cls._user_clusters_loaded = True
+                try:
+                    cls.user_clusters = UserClusterIndex.load(self.CLUSTER_INDEX_PATH, users)
+                except Exception as e:
+                    print(f"[사용자 클러스터] 저장 파일 로드 실패 (정확 매칭 사용): {str(e)}")
+
+            if cls.user_clusters is not None and not cls.user_clusters.is_aligned(users):
+                cls.user_clusters = cls.user_clusters.aligned_to(users)
+            return cls.user_clusters
+
+    def rebuild_user_clusters(self, force: bool = False, k: Optional[int] = None) -> Optional[UserClusterIndex]:
+        """
+        사용자 클러스터를 (필요하면) 다시 학습하고 파일로 저장합니다.
+        크롤링 파이프라인 알림 단계 전과 scripts/build_user_clusters.py에서 호출합니다.
+
+        매개변수:
+        - force: True면 사용자 수/재학습 기준과 무관하게 학습
+        - k: 클러스터 수 (기본: √사용자 수)
+
+        반환값:
+        - 사용 중인 클러스터 인덱스 (사용자가 적어 쓰지 않으면 None)
+        """
+        users = self._user_matrix()
+        if not force and len(users) < self.CLUSTER_MIN_USERS:
+            return None
+
+        index = self._cluster_index(users) if len(users) >= self.CLUSTER_MIN_USERS else None
+        if index is not None and not force and not index.needs_refit():
+            return index
+
+        index = UserClusterIndex.fit(users, k=k)
+        try:
+            index.save(self.CLUSTER_INDEX_PATH)
+        except Exception as e:
+            print(f"[사용자 클러스터] 저장 실패 (메모리 인덱스만 사용): {str(e)}")
+
+        with HybridSearchService._user_clusters_lock:
+            HybridSearchService.user_clusters = index
+        return index
+
+    def _load_users_for_matching(self, notifications_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        관심사 임베딩이 있는 사용자 목록을 스냅샷에서 만듭니다.
+
+        매개변수:
+        - notifications_only: True면 알림 활성화 사용자만 (알림 매칭용)
+
+        반환값:
+        - [{"id", "department", "grade", "categories", "interests_embedding"}, ...]
+          (interests_embedding은 스냅샷 행렬의 단위 벡터 행)
+        """
+        users = self._user_matrix()
+        mask = users.has_embedding & users.notification_enabled if notifications_only else users.has_embedding
+
+        loaded = []
+        for row in np.flatnonzero(mask):
+            user = users.user_at(row)
+            user["interests_embedding"] = users.matrix[row]
+            loaded.append(user)
+
+        print(f"[매칭] {'알림 대상 ' if notifications_only else ''}사용자 {len(loaded)}명 로드")
+        return loaded
+
+    @staticmethod
+    def _to_unit_matrix(embeddings: List[Any]) -> np.ndarray:
+        """임베딩 리스트(리스트 또는 pgvector 문자열)를 행 정규화된 float32 행렬로 변환"""
+        return parse_unit_matrix(embeddings, EmbeddingService.DIMENSION)
+
     # =========================================================================
     # 내부 메서드: 하드 필터링
     # =========================================================================
 
+    def _fetch_recent_notices(self, include_embedding: bool = False) -> List[Dict[str, Any]]:
+        """
+        하드 필터 대상 최근 공지사항 조회 (30일 이내, 최대 200개)
+
+        매개변수:
+        - include_embedding: content_embedding 포함 여부
+          (건당 ~15KB JSON이므로 로컬에서 유사도를 계산할 때만 True)
+        """
+        columns = "id, title, ai_summary, category, enriched_metadata"
+        if include_embedding:
+            columns += ", content_embedding"
+
+        thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        result = self.supabase.table("notices")\
+            .select(columns)\
+            .gte("published_at", thirty_days_ago)\
+            .order("published_at", desc=True)\
+            .limit(200)\
+            .execute()
+
+        return result.data or []
+
     def _hard_filter_notices(
         self,
         department: Optional[str] = None,
-        grade: Optional[int] = None
+        grade: Optional[int] = None,
+        notices: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         하드 필터링으로 공지사항을 필터링합니다.
@@ -487,18 +1079,13 @@ class HybridSearchService:
         - enriched_metadata.target_departments가 없거나 빈 배열이면 패스 (전체 대상)
         - 사용자 학과가 target_departments에 포함되면 패스
         - 학년도 동일하게 처리
+
+        매개변수:
+        - notices: 이미 조회한 공지 목록 (None이면 최근 공지를 조회)
         """
         try:
-            # 최근 공지사항 조회 (30일 이내)
-            thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
-            result = self.supabase.table("notices")\
-                .select("id, title, ai_summary, category, enriched_metadata, content_embedding")\
-                .gte("published_at", thirty_days_ago)\
-                .order("published_at", desc=True)\
-                .limit(200)\
-                .execute()
-
-            notices = result.data or []
+            if notices is None:
+                notices = self._fetch_recent_notices()
 
             # Python에서 필터링 (JSONB 쿼리가 복잡해서)
             now_iso = datetime.utcnow().isoformat()
@@ -549,41 +1136,23 @@ class HybridSearchService:
     ) -> List[Dict[str, Any]]:
         """
         하드 필터링으로 사용자를 필터링합니다.
+
+        알림이 켜진 모든 사용자를 스냅샷에서 꺼내 hard_filter_match를 표시합니다.
+        (공지마다 users 테이블 전체를 조회하지 않음)
         """
         try:
-            # 알림 활성화된 사용자만 조회
-            query = self.supabase.table("users")\
-                .select("id, department, grade, user_preferences(notification_enabled, interests_embedding)")\
-
-            result = query.execute()
-            users = result.data or []
+            users = self._user_matrix()
+            hard_match = self._hard_filter_mask(users, {
+                "target_departments": target_departments,
+                "target_grades": target_grades,
+                "is_for_all": is_for_all
+            })
 
             filtered = []
-            for user in users:
-                prefs = user.get("user_preferences", [])
-                if prefs and isinstance(prefs, list) and len(prefs) > 0:
-                    pref = prefs[0]
-                    if not pref.get("notification_enabled", True):
-                        continue
-                    user["interests_embedding"] = pref.get("interests_embedding")
-
-                # 전체 대상이면 모두 포함
-                if is_for_all:
-                    user["hard_filter_match"] = True
-                    filtered.append(user)
-                    continue
-
-                # 학과 매칭
-                dept_match = not target_departments or user.get("department") in target_departments
-
-                # 학년 매칭
-                grade_match = not target_grades or user.get("grade") in target_grades
-
-                if dept_match and grade_match:
-                    user["hard_filter_match"] = True
-                else:
-                    user["hard_filter_match"] = False
-
+            for row in np.flatnonzero(users.notification_enabled):
+                user = users.user_at(row)
+                user.pop("categories")
+                user["hard_filter_match"] = bool(hard_match[row])
                 filtered.append(user)
 
             return filtered
@@ -592,6 +1161,18 @@ class HybridSearchService:
             print(f"사용자 하드 필터링 실패: {str(e)}")
             return []
 
+    @staticmethod
+    def _hard_filter_mask(users: UserMatrix, enriched: Dict[str, Any]) -> np.ndarray:
+        """공지 대상(학과 AND 학년, 전체 대상이면 모두)에 해당하는 사용자 마스크"""
+        if enriched.get("is_for_all", False):
+            return np.ones(len(users), dtype=bool)
+
+        target_depts = enriched.get("target_departments") or []
+        target_grades = enriched.get("target_grades") or []
+        dept_match = np.isin(users.departments, target_depts) if target_depts else True
+        grade_match = np.isin(users.grades, target_grades) if target_grades else True
+        return np.broadcast_to(dept_match & grade_match, (len(users),))
+
     # =========================================================================
     # 내부 메서드: 벡터 검색
     # =========================================================================
@@ -606,74 +1187,93 @@ class HybridSearchService:
         벡터 유사도로 공지사항을 검색합니다.
 
         Supabase의 pgvector RPC 함수를 사용하거나,
-        Python에서 직접 코사인 유사도를 계산합니다.
+        RPC가 실패/비활성이면 로컬 공지 벡터 인덱스로 계산합니다.
+
+        notice_ids가 있으면 후보 필터 RPC로 DB 안에서 후보만 검색합니다.
+        (결과는 id, similarity만 포함)
         """
-        try:
-            # RPC 함수 호출 시도
-            result = self.supabase.rpc(
-                "search_notices_by_vector",
+        if self.use_vector_rpc and notice_ids:
+            filtered = self._call_optional_rpc(
+                "search_notices_by_vector_filtered",
                 {
                     "query_embedding": query_embedding,
-                    "match_threshold": 0.2,
+                    "candidate_ids": notice_ids,
+                    "match_threshold": self.VECTOR_MATCH_THRESHOLD,
                     "match_count": limit
                 }
-            ).execute()
+            )
+            if filtered is not None:
+                return filtered
 
-            if result.data:
-                # notice_ids 필터 적용 (set 변환으로 O(1) 조회)
-                if notice_ids:
-                    notice_ids_set = set(notice_ids)
-                    return [r for r in result.data if r["id"] in notice_ids_set]
-                return result.data
+        if self.use_vector_rpc:
+            try:
+                # RPC 함수 호출 시도
+                result = self.supabase.rpc(
+                    "search_notices_by_vector",
+                    {
+                        "query_embedding": query_embedding,
+                        "match_threshold": self.VECTOR_MATCH_THRESHOLD,
+                        "match_count": limit
+                    }
+                ).execute()
+
+                if result.data:
+                    # notice_ids 필터 적용 (set 변환으로 O(1) 조회)
+                    if notice_ids:
+                        notice_ids_set = set(notice_ids)
+                        return [r for r in result.data if r["id"] in notice_ids_set]
+                    return result.data
 
-        except Exception as e:
-            print(f"RPC 벡터 검색 실패, Python 폴백: {str(e)}")
+            except Exception as e:
+                print(f"RPC 벡터 검색 실패, 로컬 인덱스 폴백: {str(e)}")
 
-        # 폴백: Python에서 직접 계산
+        # 폴백: 로컬 인덱스에서 계산
         return self._vector_search_fallback(query_embedding, notice_ids, limit)
 
+    def _call_optional_rpc(self, name: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        마이그레이션으로 추가된 선택적 RPC를 호출합니다.
+
+        반환값:
+        - 결과 리스트 (결과 없음이면 빈 리스트)
+        - None: 함수가 없거나 호출 실패 → 호출한 쪽에서 기존 방식으로 진행
+        """
+        if name in self.missing_rpcs:
+            return None
+
+        try:
+            result = self.supabase.rpc(name, params).execute()
+            return result.data or []
+
+        except Exception as e:
+            error_msg = str(e)
+            # PGRST202: 함수 없음 (마이그레이션 미적용) → 이후 호출은 바로 기존 방식 사용
+            if "PGRST202" in error_msg or "Could not find the function" in error_msg:
+                self.missing_rpcs.add(name)
+                print(f"RPC 미설치, 기존 방식 사용: {name}")
+            else:
+                print(f"RPC 호출 실패, 기존 방식으로 재시도: {name} - {error_msg}")
+            return None
+
     def _vector_search_fallback(
         self,
         query_embedding: List[float],
         notice_ids: Optional[List[str]] = None,
         limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """벡터 검색 폴백 (Python에서 직접 계산)"""
+        """벡터 검색 폴백 (메모리 상주 공지 인덱스에서 행렬-벡터 곱으로 계산)"""
         try:
-            # 공지사항 조회
-            query = self.supabase.table("notices")\
-                .select("id, title, ai_summary, category, content_embedding")
-
-            if notice_ids:
-                query = query.in_("id", notice_ids)
-
-            result = query.execute()
-            notices = result.data or []
-
-            # 코사인 유사도 계산
-            results = []
-            for notice in notices:
-                embedding = notice.get("content_embedding")
-                if not embedding:
-                    continue
-
-                similarity = self.embedding_service.calculate_similarity(
-                    query_embedding,
-                    embedding
-                )
-
-                results.append({
-                    "id": notice["id"],
-                    "title": notice["title"],
-                    "ai_summary": notice.get("ai_summary"),
-                    "category": notice.get("category"),
-                    "similarity": similarity
-                })
-
-            # 유사도순 정렬
-            results.sort(key=lambda x: x["similarity"], reverse=True)
+            # 변경분만 동기화 (MIN_SYNC_INTERVAL 이내면 생략)
+            self.notice_index.sync()
+        except Exception as e:
+            print(f"공지 인덱스 동기화 실패 (기존 인덱스로 검색): {str(e)}")
 
-            return results[:limit]
+        try:
+            return self.notice_index.search(
+                query_embedding,
+                limit=limit,
+                notice_ids=notice_ids or None
+            )
 
         except Exception as e:
             print(f"폴백 벡터 검색 실패: {str(e)}")
@@ -683,69 +1283,116 @@ class HybridSearchService:
         self,
         notice_embedding: List[float],
         user_ids: Optional[List[str]] = None,
-        limit: int = 100
+        limit: int = 100,
+        target_departments: Optional[List[str]] = None,
+        target_grades: Optional[List[int]] = None
     ) -> List[Dict[str, Any]]:
         """
-        벡터 유사도로 사용자를 검색합니다.
+        벡터 유사도로 사용자(알림 켜짐 + 임베딩 있음)를 검색합니다.
+
+        매개변수:
+        - user_ids: 명시적 후보 사용자 (MAX_RPC_CANDIDATE_IDS명 이하면 RPC 인자로 전달, 넘으면 결과에서 거름)
+        - target_departments / target_grades: 학과/학년 조건 (필터 RPC가 DB 안에서 인덱스 스캔과 함께 거름)
+
+        RPC가 비활성(use_vector_rpc=false)이거나 실패하면 사용자 스냅샷에서 계산합니다.
         """
-        try:
-            # RPC 함수 호출 시도
-            result = self.supabase.rpc(
-                "search_users_by_notice_vector",
+        filtered_by_rpc = bool(user_ids) and len(user_ids) <= self.MAX_RPC_CANDIDATE_IDS
+        has_predicates = bool(target_departments or target_grades)
+
+        if self.use_vector_rpc and (filtered_by_rpc or has_predicates):
+            filtered = self._call_optional_rpc(
+                "search_users_by_notice_vector_filtered",
                 {
                     "notice_embedding": notice_embedding,
-                    "match_threshold": 0.2,
+                    "candidate_ids": user_ids if filtered_by_rpc else None,
+                    "target_departments": target_departments or None,
+                    "target_grades": target_grades or None,
+                    "match_threshold": self.VECTOR_MATCH_THRESHOLD,
                     "match_count": limit
                 }
-            ).execute()
+            )
+            if filtered is not None:
+                return self._keep_user_ids(filtered, None if filtered_by_rpc else user_ids)
 
-            if result.data:
-                if user_ids:
-                    return [r for r in result.data if r["user_id"] in user_ids]
-                return result.data
+        # 학과/학년 조건은 기존 RPC로 거를 수 없으므로 스냅샷에서 계산
+        if self.use_vector_rpc and not has_predicates:
+            try:
+                # RPC 함수 호출 시도
+                result = self.supabase.rpc(
+                    "search_users_by_notice_vector",
+                    {
+                        "notice_embedding": notice_embedding,
+                        "match_threshold": self.VECTOR_MATCH_THRESHOLD,
+                        "match_count": limit
+                    }
+                ).execute()
+
+                if result.data:
+                    return self._keep_user_ids(result.data, user_ids)
 
-        except Exception as e:
-            print(f"RPC 사용자 검색 실패, Python 폴백: {str(e)}")
+            except Exception as e:
+                print(f"RPC 사용자 검색 실패, Python 폴백: {str(e)}")
 
         # 폴백: Python에서 직접 계산
-        return self._vector_search_users_fallback(notice_embedding, user_ids, limit)
+        return self._vector_search_users_fallback(
+            notice_embedding, user_ids, limit, target_departments=target_departments, target_grades=target_grades
+        )
+
+    @staticmethod
+    def _keep_user_ids(rows: List[Dict[str, Any]], user_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """후보 사용자가 있으면 그 안의 결과만 남깁니다 (set 변환으로 O(1) 조회)."""
+        if not user_ids:
+            return rows
+        user_ids_set = set(user_ids)
+        return [r for r in rows if r["user_id"] in user_ids_set]
 
     def _vector_search_users_fallback(
         self,
         notice_embedding: List[float],
         user_ids: Optional[List[str]] = None,
-        limit: int = 100
+        limit: int = 100,
+        target_departments: Optional[List[str]] = None,
+        target_grades: Optional[List[int]] = None
     ) -> List[Dict[str, Any]]:
-        """사용자 벡터 검색 폴백"""
+        """
+        사용자 벡터 검색 폴백 (메모리 사용자 스냅샷에서 계산)
+
+        - user_ids가 있으면 후보만 정확 계산, 없으면 알림 켜진 사용자만 (RPC와 같은 조건)
+        - target_departments / target_grades가 있으면 해당 학과/학년 사용자만
+        - 사용자가 CLUSTER_MIN_USERS명 이상이고 클러스터 인덱스가 있으면 가까운 클러스터만 계산
+        - 그 외에는 스냅샷 행렬 전체와 행렬-벡터 곱 1회
+        """
         try:
-            query = self.supabase.table("user_preferences")\
-                .select("user_id, interests_embedding")
+            users = self._user_matrix()
+            query = self._to_unit_matrix([notice_embedding])[0]
 
+            clusters = None if user_ids else self._cluster_index(users)
             if user_ids:
-                query = query.in_("user_id", user_ids)
-
-            result = query.execute()
-            prefs = result.data or []
-
-            results = []
-            for pref in prefs:
-                embedding = pref.get("interests_embedding")
-                if not embedding:
-                    continue
-
-                similarity = self.embedding_service.calculate_similarity(
-                    notice_embedding,
-                    embedding
-                )
-
-                results.append({
-                    "user_id": pref["user_id"],
-                    "similarity": similarity
-                })
-
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-
-            return results[:limit]
+                rows = np.array([users.row_of[u] for u in user_ids if u in users.row_of], dtype=np.int64)
+                similarities = users.matrix[rows] @ query
+            elif clusters is not None:
+                rows, similarities = clusters.score(query[None, :], self.CLUSTER_PROBES)[0]
+            else:
+                rows = np.arange(len(users))
+                similarities = users.matrix @ query
+
+            keep = users.has_embedding[rows]
+            if not user_ids:
+                keep &= users.notification_enabled[rows]
+            if target_departments or target_grades:
+                keep &= self._hard_filter_mask(users, {
+                    "target_departments": target_departments, "target_grades": target_grades
+                })[rows]
+            rows, similarities = rows[keep], similarities[keep]
+            if rows.size > limit:
+                top = np.argpartition(-similarities, limit - 1)[:limit]
+                rows, similarities = rows[top], similarities[top]
+            order = np.argsort(-similarities, kind="stable")
+
+            return [
+                {"user_id": users.ids[rows[i]], "similarity": float(similarities[i])}
+                for i in order
+            ]
 
         except Exception as e:
             print(f"폴백 사용자 검색 실패: {str(e)}")
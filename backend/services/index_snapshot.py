@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+검색 인덱스 디스크 스냅샷 모듈
+
+이 파일이 하는 일:
+메모리 검색 구조(사용자 임베딩 스냅샷, 공지 벡터 인덱스)를 버전이 붙은 디렉터리에
+.npy 배열 + manifest.json으로 저장하고, 재시작 시 mmap으로 바로 읽어 옵니다.
+
+디렉터리 구조 (name = "users", "notices" 등):
+    {root}/{name}/CURRENT            ← 현재 세대 번호 (임시 파일에 쓴 뒤 os.replace로 교체)
+    {root}/{name}/g000012/manifest.json
+    {root}/{name}/g000012/matrix.npy ← np.load(mmap_mode="r")로 복사 없이 매핑
+
+- 세대 디렉터리를 다 쓴 뒤에 CURRENT를 바꾸므로 읽는 쪽은 항상 완전한 세대만 봄
+- 직전 세대 1개는 남겨 둠 (교체 직전에 세대 번호를 읽은 프로세스가 이어서 열 수 있도록)
+- manifest의 format/kind/dimension이 다르면 읽지 않음 (코드 변경 후 옛 파일 무시)
+
+왜 필요한가?
+- 서버가 잠들었다 깨어나면(cold start) 사용자/공지 임베딩을 Supabase에서 전부 다시 받아야 함
+- 스냅샷이 있으면 파일을 매핑하고 마지막 저장 이후 변경분만 조회하면 됨
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class IndexSnapshotStore:
+    """
+    세대 번호로 교체되는 .npy 스냅샷 디렉터리
+
+    사용 예시:
+    store = IndexSnapshotStore("/var/data/search", "users")
+    store.write({"matrix": matrix, "ids": ids}, {"kind": "users", "dimension": 768})
+    loaded = store.read(kind="users", dimension=768)   # (arrays, manifest) 또는 None
+    """
+
+    FORMAT_VERSION = 1
+    KEEP_GENERATIONS = 2
+
+    def __init__(self, root: str, name: str):
+        self.path = os.path.join(root, name)
+
+    @property
+    def _current_file(self) -> str:
+        return os.path.join(self.path, "CURRENT")
+
+    def current_generation(self) -> Optional[int]:
+        try:
+            with open(self._current_file, "r", encoding="utf-8") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def write(self, arrays: Dict[str, np.ndarray], manifest: Dict[str, Any]) -> int:
+        """
+        새 세대로 저장하고 CURRENT를 교체합니다.
+
+        매개변수:
+        - arrays: 이름 → 배열 (object dtype 불가, 문자열은 str dtype으로 변환해서 전달)
+        - manifest: JSON으로 저장할 메타데이터 (kind, dimension, 동기화 기준 등)
+
+        반환값:
+        - 저장한 세대 번호
+        """
+        os.makedirs(self.path, exist_ok=True)
+        generation = (self.current_generation() or 0) + 1
+        directory = os.path.join(self.path, f"g{generation:06d}")
+        tmp_directory = f"{directory}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_directory, f"{name}.npy"), array, allow_pickle=False)
+
+        manifest = {
+            **manifest,
+            "format": self.FORMAT_VERSION,
+            "generation": generation,
+            "saved_at": time.time(),
+            "arrays": sorted(arrays)
+        }
+        with open(os.path.join(tmp_directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_directory, directory)
+
+        tmp_current = f"{self._current_file}.tmp-{os.getpid()}"
+        with open(tmp_current, "w", encoding="utf-8") as f:
+            f.write(str(generation))
+        os.replace(tmp_current, self._current_file)
+
+        self._remove_old_generations(generation)
+        return generation
+
+    def read(
+        self,
+        kind: str,
+        dimension: Optional[int] = None,
+        mmap: bool = True
+    ) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+        """
+        현재 세대를 읽습니다.
+
+        매개변수:
+        - kind / dimension: manifest와 다르면 None (다른 형식의 스냅샷)
+        - mmap: True면 배열을 읽기 전용 메모리 매핑으로 반환 (실제 읽기는 접근할 때)
+
+        반환값:
+        - (이름 → 배열, manifest) 또는 None
+        """
+        generation = self.current_generation()
+        if generation is None:
+            return None
+
+        directory = os.path.join(self.path, f"g{generation:06d}")
+        try:
+            with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (manifest.get("format") != self.FORMAT_VERSION or manifest.get("kind") != kind
+                or (dimension is not None and manifest.get("dimension") != dimension)):
+            print(f"[스냅샷] 형식이 달라 무시: {directory}")
+            return None
+
+        # np.memmap 하위 클래스 대신 같은 매핑을 보는 일반 ndarray로 반환 (연산 결과가 memmap이 되지 않도록)
+        arrays = {
+            name: np.asarray(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None))
+            for name in manifest["arrays"]
+        }
+        return arrays, manifest
+
+    def _remove_old_generations(self, current: int) -> None:
+        for entry in os.listdir(self.path):
+            if not entry.startswith("g") or ".tmp-" in entry:
+                continue
+            try:
+                generation = int(entry[1:])
+            except ValueError:
+                continue
+            if generation <= current - self.KEEP_GENERATIONS:
+                shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
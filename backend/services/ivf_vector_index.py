@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+IVF 근사 최근접 이웃(ANN) 벡터 인덱스 모듈
+
+이 파일이 하는 일:
+정규화된 임베딩을 k-means 중심(nlist개) 기준 역색인 리스트로 나눠 보관하고,
+쿼리와 가까운 nprobe개 리스트만 계산해 상위 k개를 찾습니다.
+(pgvector RPC를 쓸 수 없을 때 로컬 검색 엔진으로 사용)
+
+구조:
+- centroids: (nlist × dimension) 정규화된 중심 (학습 전이면 None → 리스트 1개 = 전체 탐색)
+- 리스트마다 QuantizedEmbeddingStore 1개 (float32/float16/int8, 리스트 안은 연속 행렬)
+- ID → 리스트 번호
+
+왜 HNSW가 아니라 IVF인가?
+- HNSW는 삽입마다 그래프 탐색이 필요해 순수 Python으로는 10만 건 구축에 수 분이 걸림
+- IVF는 학습(k-means)과 검색이 모두 NumPy 행렬 곱이라 구축 수 초, 검색은 리스트 몇 개의 행렬-벡터 곱
+- 삽입/삭제는 가장 가까운 리스트에 넣고 빼기만 하면 됨 (중심은 재학습 때만 바뀜)
+
+재학습:
+- MIN_TRAIN_SIZE 미만은 학습하지 않음 (전체 탐색이 더 빠름)
+- 학습 당시보다 RETRAIN_GROWTH배 이상 늘면 needs_training() → 호출한 쪽에서 train()
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.embedding_service import EmbeddingService
+from services.spherical_kmeans import kmeans, nearest_centroids
+from services.quantized_embedding_store import QuantizedEmbeddingStore
+
+
+class IvfVectorIndex:
+    """
+    IVF(역색인) 벡터 인덱스
+
+    사용 예시:
+    index = IvfVectorIndex(dimension=768, mode="float32")
+    index.put("notice-1", unit_vector, {"title": "..."})
+    if index.needs_training():
+        index.train()
+    hits = index.search(query_unit_vector, limit=20)
+    # [("notice-1", {"title": "..."}, 0.82), ...]
+    """
+
+    MIN_TRAIN_SIZE = 4096           # 이보다 적으면 리스트 1개 (전체 탐색)
+    RETRAIN_GROWTH = 2.0            # 학습 당시 크기의 이 배수를 넘으면 재학습
+    TRAIN_SAMPLE_SIZE = 20000       # 중심 학습 표본 수
+    DEFAULT_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "32"))
+
+    def __init__(self, dimension: int, mode: str = "float32", nprobe: Optional[int] = None):
+        """
+        매개변수:
+        - dimension: 임베딩 차원
+        - mode: 저장 정밀도 float32/float16/int8
+        - nprobe: 검색 시 계산할 리스트 수 (기본값: 환경 변수 VECTOR_INDEX_NPROBE 또는 32)
+        """
+        if mode not in QuantizedEmbeddingStore.MODES:
+            raise ValueError(f"지원하지 않는 정밀도입니다: {mode} (가능: {', '.join(QuantizedEmbeddingStore.MODES)})")
+
+        self.dimension = dimension
+        self.mode = mode
+        self.nprobe = nprobe or self.DEFAULT_NPROBE
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._list_of)
+
+    @property
+    def lossy(self) -> bool:
+        return self.mode != "float32"
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        return len(self._lists)
+
+    @property
+    def nbytes(self) -> int:
+        """리스트 벡터 + 중심 메모리 (바이트)"""
+        centroid_bytes = self.centroids.nbytes if self.centroids is not None else 0
+        return sum(store.nbytes for store in self._lists) + centroid_bytes
+
+    def clear(self) -> None:
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[QuantizedEmbeddingStore] = [QuantizedEmbeddingStore(self.dimension, self.mode)]
+        self._list_of: Dict[str, int] = {}
+        self._trained_size = 0
+
+    # =========================================================================
+    # 삽입 / 삭제
+    # =========================================================================
+
+    def put(self, item_id: str, unit_vector: np.ndarray, payload: Any = None) -> None:
+        """벡터를 가장 가까운 리스트에 추가하거나 교체합니다 (리스트가 바뀌면 옮김)."""
+        list_no = self._assign(unit_vector)
+        previous = self._list_of.get(item_id)
+        if previous is not None and previous != list_no:
+            self._lists[previous].remove(item_id)
+
+        self._lists[list_no].put(item_id, unit_vector, payload)
+        self._list_of[item_id] = list_no
+
+    def remove(self, item_id: str) -> bool:
+        list_no = self._list_of.pop(item_id, None)
+        if list_no is None:
+            return False
+        return self._lists[list_no].remove(item_id)
+
+    def get(self, item_id: str) -> Optional[Tuple[np.ndarray, Any]]:
+        """저장된 (벡터, 페이로드) — int8/float16은 근사 벡터"""
+        list_no = self._list_of.get(item_id)
+        if list_no is None:
+            return None
+        store = self._lists[list_no]
+        row = store.row_of(item_id)
+        return store.vector_at(row), store.payload_at(row)
+
+    def _assign(self, unit_vector: np.ndarray) -> int:
+        if self.centroids is None:
+            return 0
+        return int(np.argmax(self.centroids @ unit_vector))
+
+    # =========================================================================
+    # 학습
+    # =========================================================================
+
+    def needs_training(self) -> bool:
+        size = len(self)
+        if size < self.MIN_TRAIN_SIZE:
+            return False
+        return self.centroids is None or size > self._trained_size * self.RETRAIN_GROWTH
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        현재 벡터로 중심을 학습하고 모든 항목을 리스트에 다시 나눕니다.
+
+        매개변수:
+        - nlist: 리스트 수 (기본: √항목 수, 8~4096)
+        """
+        ids, data, scales, payloads = self._export()
+        if not ids:
+            return
+
+        vectors = data.astype(np.float32) * scales[:, None] if self.lossy else data
+        nlist = nlist or int(np.clip(np.sqrt(len(ids)), 8, 4096))
+
+        rng = np.random.default_rng(seed)
+        sample = np.arange(len(ids))
+        if len(ids) > self.TRAIN_SAMPLE_SIZE:
+            sample = np.sort(rng.choice(len(ids), self.TRAIN_SAMPLE_SIZE, replace=False))
+        centroids = kmeans(
+            EmbeddingService.normalize(vectors[sample]), nlist, iterations=iterations, seed=seed
+        )
+
+        labels = nearest_centroids(vectors, centroids)
+        self._rebuild(centroids, ids, data, scales, payloads, labels)
+        self._trained_size = len(ids)
+        print(f"[IvfVectorIndex] 학습 완료: {len(ids)}개 → 리스트 {len(centroids)}개 ({self.mode})")
+
+    def _export(self) -> Tuple[List[str], np.ndarray, np.ndarray, List[Any]]:
+        """모든 리스트의 항목을 (ID, 저장 정밀도 행렬, 스케일, 페이로드)로 모읍니다."""
+        ids: List[str] = []
+        payloads: List[Any] = []
+        data, scales = [], []
+        for store in self._lists:
+            store_ids, store_data, store_scales, store_payloads = store.export_raw()
+            ids.extend(store_ids)
+            payloads.extend(store_payloads)
+            data.append(store_data)
+            scales.append(store_scales)
+        return ids, np.concatenate(data), np.concatenate(scales), payloads
+
+    def _rebuild(
+        self,
+        centroids: Optional[np.ndarray],
+        ids: List[str],
+        data: np.ndarray,
+        scales: np.ndarray,
+        payloads: List[Any],
+        labels: np.ndarray,
+        copy: bool = True
+    ) -> None:
+        """
+        리스트 번호(labels)대로 저장소를 새로 만듭니다 (재양자화 없이 원래 행 그대로).
+
+        copy=False이고 행이 이미 리스트 순서로 정렬되어 있으면(export_arrays 결과)
+        각 리스트가 data의 연속 구간을 복사 없이 감쌉니다.
+        """
+        nlist = 1 if centroids is None else len(centroids)
+        sorted_rows = labels.size == 0 or bool(np.all(labels[1:] >= labels[:-1]))
+        order = np.arange(labels.size) if sorted_rows else np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))])
+
+        lists = []
+        list_of: Dict[str, int] = {}
+        for list_no in range(nlist):
+            start, end = offsets[list_no], offsets[list_no + 1]
+            rows = order[start:end]
+            list_ids = [ids[r] for r in rows]
+            list_payloads = [payloads[r] for r in rows]
+            if not copy and sorted_rows:
+                store = QuantizedEmbeddingStore.from_raw(
+                    self.dimension, self.mode, list_ids, data[start:end], scales[start:end], list_payloads
+                )
+            else:
+                capacity = rows.size + rows.size // 4 + 16
+                store = QuantizedEmbeddingStore(self.dimension, self.mode, initial_capacity=capacity)
+                store.extend_raw(list_ids, data[rows], scales[rows], list_payloads)
+            for item_id in list_ids:
+                list_of[item_id] = list_no
+            lists.append(store)
+
+        self.centroids = centroids
+        self._lists = lists
+        self._list_of = list_of
+
+    # =========================================================================
+    # 검색
+    # =========================================================================
+
+    def search(
+        self,
+        query: np.ndarray,
+        limit: int,
+        threshold: Optional[float] = None,
+        ids: Optional[List[str]] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[str, Any, float]]:
+        """
+        (근사) 유사도 상위 limit개를 내림차순으로 반환합니다.
+
+        매개변수:
+        - query: 정규화된 float32 쿼리 (dimension,)
+        - threshold: 이 값보다 큰 점수만 (None이면 제한 없음)
+        - ids: 후보 ID (주어지면 리스트와 무관하게 후보 전체를 정확히 계산)
+        - nprobe: 이번 검색에서 계산할 리스트 수 (기본: self.nprobe)
+
+        반환값:
+        - [(ID, 페이로드, 점수), ...]
+        """
+        if limit <= 0 or len(self) == 0:
+            return []
+
+        if ids is not None:
+            probes = self._rows_by_list(ids)
+        else:
+            probes = [(list_no, None) for list_no in self._probe_lists(query, nprobe or self.nprobe)]
+
+        found: List[Tuple[QuantizedEmbeddingStore, np.ndarray, np.ndarray]] = []
+        for list_no, rows in probes:
+            store = self._lists[list_no]
+            top_rows, scores = store.top_k(query, limit, rows=rows, threshold=threshold)
+            if top_rows.size:
+                found.append((store, top_rows, scores))
+        if not found:
+            return []
+
+        scores = np.concatenate([s for _, _, s in found])
+        owners = np.concatenate([np.full(r.size, i) for i, (_, r, _) in enumerate(found)])
+        rows = np.concatenate([r for _, r, _ in found])
+
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [
+            (found[owners[i]][0].id_at(int(rows[i])), found[owners[i]][0].payload_at(int(rows[i])), float(scores[i]))
+            for i in order
+        ]
+
+    def _probe_lists(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(1, dtype=np.int64)
+        nprobe = min(nprobe, len(self.centroids))
+        return np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+    def _rows_by_list(self, ids: List[str]) -> List[Tuple[int, np.ndarray]]:
+        grouped: Dict[int, List[int]] = {}
+        for item_id in ids:
+            list_no = self._list_of.get(item_id)
+            if list_no is not None:
+                grouped.setdefault(list_no, []).append(self._lists[list_no].row_of(item_id))
+        return [(list_no, np.array(rows, dtype=np.int64)) for list_no, rows in grouped.items()]
+
+    # =========================================================================
+    # 저장 / 불러오기
+    # =========================================================================
+
+    def export_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        저장용 배열 (복사본이므로 반환 후 인덱스가 바뀌어도 안전)
+        페이로드는 JSON으로 저장하므로 JSON으로 표현 가능한 값이어야 합니다.
+        """
+        ids, data, scales, payloads = self._export()
+        labels = np.array([self._list_of[item_id] for item_id in ids], dtype=np.int32)
+        return {
+            "mode": np.array(self.mode),
+            "centroids": self.centroids if self.centroids is not None else np.empty((0, self.dimension), np.float32),
+            "trained_size": np.array(self._trained_size),
+            "ids": np.array(ids, dtype=str),
+            "data": data,
+            "scales": scales,
+            "labels": labels,
+            "payloads": np.array(json.dumps(payloads, ensure_ascii=False))
+        }
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: Dict[str, np.ndarray],
+        nprobe: Optional[int] = None,
+        copy: bool = True
+    ) -> "IvfVectorIndex":
+        """
+        export_arrays()로 만든 배열로 인덱스를 만듭니다.
+
+        copy=False면 벡터 배열을 복사하지 않고 감쌉니다 (mmap 공유 스냅샷, 쓰기가 생기면 그 리스트만 복사).
+        """
+        centroids = np.array(arrays["centroids"], dtype=np.float32)
+        index = cls(arrays["data"].shape[1], mode=str(arrays["mode"]), nprobe=nprobe)
+        index._rebuild(
+            centroids if len(centroids) else None,
+            arrays["ids"].tolist(),
+            arrays["data"],
+            arrays["scales"],
+            json.loads(str(arrays["payloads"])),
+            np.asarray(arrays["labels"]),
+            copy=copy
+        )
+        index._trained_size = int(arrays["trained_size"])
+        return index
+
+    def save(self, path: str) -> None:
+        """.npz 파일로 저장합니다 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **self.export_arrays())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, nprobe: Optional[int] = None) -> "IvfVectorIndex":
+        """save()로 저장한 파일을 읽어 인덱스를 만듭니다."""
+        with np.load(path) as saved:
+            return cls.from_arrays({name: saved[name] for name in saved.files}, nprobe=nprobe)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+공지 목록 커서(keyset) 페이지네이션 모듈
+
+이 파일이 하는 일:
+range(offset, offset + limit - 1) 대신 "마지막으로 받은 공지 다음부터" 조회하도록
+정렬 키 + id 커서를 만들고 PostgREST 쿼리에 적용합니다.
+
+왜 커서인가:
+- OFFSET은 건너뛸 행을 모두 읽으므로 깊은 페이지일수록 선형으로 느려짐
+- (정렬 컬럼, id) 조건은 인덱스 범위 조회 → 페이지마다 비용이 일정
+- 페이지 사이에 새 공지가 들어와도 중복/누락이 없음
+
+커서 형식:
+- base64url(JSON [정렬, 마지막 공지의 정렬 값, 마지막 공지 id]) — 클라이언트는 내용을 해석하지 않음
+- 정렬이 다른 커서는 ValueError (라우트에서 400)
+
+NULL 순서는 PostgreSQL 기본값을 따릅니다 (DESC는 NULL 먼저, ASC는 NULL 나중).
+(docs/migrations/020_notice_keyset_indexes.sql)
+
+개수 모드 (count 파라미터):
+- exact: 정확한 개수 (조건에 맞는 행 전체를 셈 — 비쌈)
+- planned: 쿼리 플래너 추정치 (통계 기반, 즉시)
+- estimated: 작은 결과는 exact, 큰 결과는 planned
+- none: 개수 조회 안 함
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 정렬 이름 → (컬럼, 내림차순 여부)
+SORT_KEYS = {
+    "latest": ("published_at", True),
+    "views": ("view_count", True),
+    "deadline": ("deadline", False),
+}
+
+COUNT_MODES = ("exact", "planned", "estimated", "none")
+
+
+def encode_cursor(sort: str, notice: Dict[str, Any], value: Any = None) -> str:
+    """마지막 공지로 다음 페이지 커서를 만듭니다 (value: 정렬 값 직접 지정, 예: 검색 점수)."""
+    if value is None and sort in SORT_KEYS:
+        value = notice.get(SORT_KEYS[sort][0])
+    payload = json.dumps([sort, value, notice["id"]], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    """
+    커서를 (정렬 값, id)로 풉니다.
+
+    예외:
+    - ValueError: 형식이 잘못됐거나 다른 정렬의 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, notice_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("cursor 형식이 올바르지 않습니다")
+
+    if cursor_sort != sort or not isinstance(notice_id, str):
+        raise ValueError(f"cursor가 현재 정렬({sort})과 맞지 않습니다")
+    return value, notice_id
+
+
+def next_cursor(sort: str, notices: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """페이지가 가득 찼으면 마지막 공지로 다음 커서를 만듭니다 (덜 찼으면 마지막 페이지 → None)."""
+    if limit <= 0 or len(notices) < limit:
+        return None
+    return encode_cursor(sort, notices[-1])
+
+
+def parse_count_mode(value: Optional[str], default: str) -> Optional[str]:
+    """
+    count 파라미터를 supabase select(count=...) 값으로 바꿉니다.
+
+    반환값:
+    - "exact" | "planned" | "estimated", none이면 None
+
+    예외:
+    - ValueError: 지원하지 않는 값
+    """
+    mode = (value or default).strip().lower()
+    if mode not in COUNT_MODES:
+        raise ValueError(f"count는 {', '.join(COUNT_MODES)} 중 하나여야 합니다")
+    return None if mode == "none" else mode
+
+
+def _quote(value: Any) -> str:
+    """PostgREST 필터 값 인용 (타임스탬프의 ':', '.' 등 예약 문자 보호)"""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def apply_keyset(query, sort: str, cursor: Optional[str] = None):
+    """
+    정렬(정렬 컬럼 + id)을 적용하고, 커서가 있으면 그 다음 행만 남깁니다.
+
+    매개변수:
+    - query: supabase select 쿼리 빌더
+    - sort: SORT_KEYS의 키
+    - cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+
+    예외:
+    - ValueError: 잘못된 커서
+    """
+    column, desc = SORT_KEYS[sort]
+    query = query.order(column, desc=desc).order("id", desc=desc)
+    if not cursor:
+        return query
+
+    value, notice_id = decode_cursor(cursor, sort)
+    op = "lt" if desc else "gt"
+    quoted_id = _quote(notice_id)
+
+    if value is None:
+        # NULL 구간 안: 같은 NULL 중 id 다음 + (DESC면) NULL 뒤에 오는 값 전체
+        if desc:
+            return query.or_(f"and({column}.is.null,id.{op}.{quoted_id}),{column}.not.is.null")
+        return query.is_(column, "null").filter("id", op, notice_id)
+
+    quoted = _quote(value)
+    conditions = f"{column}.{op}.{quoted},and({column}.eq.{quoted},id.{op}.{quoted_id})"
+    if not desc:
+        conditions += f",{column}.is.null"
+    return query.or_(conditions)
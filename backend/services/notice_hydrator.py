@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+검색 결과 공지 상세 정보 보완(hydration) 모듈
+
+이 파일이 하는 일:
+검색의 여러 단계(전문 검색 순위, 벡터 RPC, 리랭킹 후보)가 각자 공지 상세를 조회하던 것을
+"필요한 id만 모았다가 마지막에 한 번의 IN 쿼리로 조회 → id 딕셔너리로 결합"으로 바꿉니다.
+
+- require(ids): 상세가 필요한 id 등록 (이미 가진 행은 다시 조회하지 않음)
+- add_rows(rows): 이미 같은 컬럼으로 조회한 행 등록 (예: 제목 ILIKE 결과)
+- fetch(): 등록된 id 전체를 select(columns).in_("id", ids) 1번으로 조회
+- hydrate(items): 항목의 빈 필드를 조회한 행으로 채운 새 리스트
+
+사용 예시:
+hydrator = NoticeHydrator(client)
+hydrator.require([hit_id for hit_id, _ in bm25_hits])
+hydrator.require([r["id"] for r in vector_results])
+rows = hydrator.fetch()   # DB 왕복 1번
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+# 키워드 검색 결과에 필요한 상세 컬럼
+NOTICE_HYDRATION_COLUMNS = "id, title, content, ai_summary, category, source_url, published_at, view_count"
+
+
+class NoticeHydrator:
+    """검색 요청 하나 동안 공지 상세 조회를 모아서 1번에 처리하는 도우미"""
+
+    def __init__(self, client, columns: str = NOTICE_HYDRATION_COLUMNS):
+        self.client = client
+        self.columns = columns
+        self._pending: Dict[str, None] = {}          # 순서 유지 집합
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self.queries = 0
+
+    def require(self, notice_ids: Iterable[Optional[str]]) -> "NoticeHydrator":
+        for notice_id in notice_ids:
+            if notice_id and notice_id not in self._rows:
+                self._pending[notice_id] = None
+        return self
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._rows[row["id"]] = row
+            self._pending.pop(row["id"], None)
+
+    def fetch(self) -> Dict[str, Dict[str, Any]]:
+        """
+        등록된 id의 상세를 한 번에 조회합니다.
+
+        반환값:
+        - {공지 ID: 행} (조회 실패 시 지금까지 가진 행만, 삭제된 공지는 없음)
+        """
+        if self._pending:
+            notice_ids = list(self._pending)
+            self._pending.clear()
+            try:
+                result = self.client.table("notices")\
+                    .select(self.columns)\
+                    .in_("id", notice_ids)\
+                    .execute()
+                self.queries += 1
+                self.add_rows(result.data or [])
+            except Exception as e:
+                print(f"[상세 조회] 공지 {len(notice_ids)}개 조회 실패: {str(e)}")
+        return self._rows
+
+    def row(self, notice_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self._rows.get(notice_id) if notice_id else None
+
+    def hydrate(self, items: List[Dict[str, Any]], id_key: str = "id") -> List[Dict[str, Any]]:
+        """항목의 빈(None/누락) 필드를 조회한 행으로 채운 새 리스트를 반환합니다 (항목 값이 우선)."""
+        self.require(item.get(id_key) for item in items)
+        rows = self.fetch()
+        hydrated = []
+        for item in items:
+            row = rows.get(item.get(id_key))
+            if row is None:
+                hydrated.append(dict(item))
+                continue
+            merged = dict(item)
+            for field, value in row.items():
+                if merged.get(field) is None:
+                    merged[field] = value
+            hydrated.append(merged)
+        return hydrated
@@ -10,7 +10,10 @@ AI로 분석한 공지사항을 데이터베이스에 저장하고 관리합니
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
-from services.supabase_service import get_supabase_client
+from services.supabase_service import get_supabase_client, NOTICE_DETAIL_COLUMNS
+from services.feed_cache import bump_corpus_version
+from services.notice_text_index import get_notice_text_index
+from services.notice_suggest_index import get_notice_suggest_index
 
 
 class NoticeService:
@@ -108,6 +111,12 @@ class NoticeService:
 
         return db_data
 
+    def _update_search_indexes(self, notice_id: str, db_data: Dict[str, Any]) -> None:
+        """같은 프로세스의 전문 검색/자동완성 인덱스에 바로 반영합니다 (적재 전이면 다음 전체 적재에서 반영)."""
+        for index in (get_notice_text_index(), get_notice_suggest_index()):
+            if index.ready:
+                index.upsert(notice_id, db_data)
+
     def _upsert_notice(self, source_url: str, db_data: Dict[str, Any], label: str = "") -> Optional[str]:
         """공통 INSERT/UPDATE 로직"""
         # 중복 체크 (URL 기반)
@@ -124,6 +133,8 @@ class NoticeService:
                 .eq("id", notice_id)\
                 .execute()
 
+            bump_corpus_version()
+            self._update_search_indexes(notice_id, db_data)
             print(f"[업데이트{label}] {db_data['title'][:40]}...")
             return notice_id
         else:
@@ -134,6 +145,8 @@ class NoticeService:
 
             if result.data:
                 notice_id = result.data[0]["id"]
+                bump_corpus_version()
+                self._update_search_indexes(notice_id, db_data)
                 print(f"[저장{label}] {db_data['title'][:40]}...")
                 return notice_id
             else:
@@ -250,6 +263,7 @@ class NoticeService:
                 .execute()
 
             if result.data:
+                bump_corpus_version()
                 print(f"[완료] AI 분석 결과 업데이트 완료: {notice_id}")
                 return True
             else:
@@ -289,7 +303,7 @@ class NoticeService:
         """아직 AI 분석되지 않은 공지사항을 조회합니다."""
         try:
             result = self.client.table("notices")\
-                .select("*")\
+                .select(NOTICE_DETAIL_COLUMNS)\
                 .eq("is_processed", False)\
                 .order("published_at", desc=True)\
                 .limit(limit)\
@@ -354,6 +368,7 @@ class NoticeService:
                 .execute()
 
             if result.data:
+                bump_corpus_version()
                 print(f"임베딩 업데이트 완료: {notice_id[:8]}...")
                 return True
             else:
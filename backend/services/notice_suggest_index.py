@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 자동완성(접두어) 인덱스 모듈
+
+이 파일이 하는 일:
+공지 제목과 보강 키워드(enriched_metadata.keywords_expanded)를 정렬된 키 배열로 보관하고,
+입력 중인 검색어로 시작하는 항목을 최신성 + 조회수 순으로 돌려줍니다.
+
+구조 (정렬 배열 접두어 인덱스):
+- 키: 정규화한 제목/키워드의 각 단어 시작 위치부터 끝까지 ("국가 장학금 신청" → 3개 키)
+  → '장학'을 입력해도 제목 중간 단어로 찾음
+- 키 배열은 정렬 상태로 유지, 접두어 범위는 bisect 2번으로 찾음
+- 범위 안 항목 점수는 numpy 배열에서 한 번에 모아 상위 k개만 정렬
+
+정규화:
+- NFKD로 한글 음절을 자모로 분해 → 입력 중인 '장하'도 '장학금'의 접두어로 일치
+- 소문자, 구두점/괄호([학사] 등)는 공백으로
+
+점수 (시간이 지나도 항목 간 순서가 변하지 않도록 로그 공간의 절대값 사용):
+    VIEW_WEIGHT × ln(1 + 조회수) + ln2 × (게시일, 일 단위) / RECENCY_HALF_LIFE_DAYS
+- 게시일이 반감기만큼 최신이면 조회수 (e^(ln2/VIEW_WEIGHT) - 1)배와 같은 가치
+- 키워드: 그 키워드가 붙은 공지 중 최고 점수 + ln(공지 수)
+
+갱신 (SyncedNoticeIndex):
+- updated_at 기준 증분 동기화, NoticeService 저장 직후 바로 반영 (크롤링마다 증분 갱신)
+- 조회수 갱신 작업은 update_views로 점수만 바꿈 (updated_at이 바뀌지 않음)
+- 수정/삭제된 항목의 키는 점수를 -inf로 두고 남겨 두었다가 COMPACT_RATIO를 넘으면 전체 재적재
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.synced_notice_index import SyncedNoticeIndex
+
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_suggest_key(text: Optional[str]) -> str:
+    """자동완성 비교용 정규화 (NFKD 자모 분해 + 소문자 + 구두점 제거)"""
+    decomposed = unicodedata.normalize("NFKD", text or "").lower()
+    decomposed = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SEPARATORS.sub(" ", decomposed).strip()
+
+
+class NoticeSuggestIndex(SyncedNoticeIndex):
+    """
+    제목/키워드 접두어 자동완성 인덱스
+
+    사용 예시:
+    index = get_notice_suggest_index()
+    index.sync()
+    index.suggest("장학", limit=8)
+    # [{"text": "국가장학금", "type": "keyword", "notice_id": None}, {"text": "...", "type": "notice", ...}]
+    """
+
+    VIEW_WEIGHT = 0.5
+    RECENCY_HALF_LIFE_DAYS = 30
+    CANDIDATE_FACTOR = 4          # 같은 항목의 여러 키/같은 제목 중복 제거용 여유 후보 배수
+    MAX_KEYWORDS_PER_NOTICE = 20
+
+    FIELDS = "id, title, view_count, published_at, enriched_metadata, updated_at"
+    LOG_PREFIX = "[자동완성]"
+
+    def __len__(self) -> int:
+        return len(self._notice_titles)
+
+    def _reset(self) -> None:
+        self._keys: List[str] = []
+        self._key_entries = np.zeros(0, dtype=np.int32)
+        self._dead_keys = 0
+
+        # 항목 (제목 또는 키워드): 번호 → (표시 문자열, 종류, 공지 ID)
+        self._entries: List[Tuple[str, str, Optional[str]]] = []
+        self._entry_keys: List[int] = []                    # 항목별 키 개수 (삭제 표시 집계용)
+        self._scores = np.full(1024, -np.inf, dtype=np.float64)
+
+        self._notice_entry: Dict[str, int] = {}
+        self._notice_titles: Dict[str, str] = {}
+        self._notice_published: Dict[str, Optional[str]] = {}
+        self._notice_views: Dict[str, Optional[int]] = {}
+        self._notice_keywords: Dict[str, List[str]] = {}
+        self._keyword_entry: Dict[str, int] = {}
+        self._keyword_notices: Dict[str, Dict[str, float]] = {}
+        self._keyword_best: Dict[str, float] = {}
+
+    def _adopt(self, other: "NoticeSuggestIndex") -> None:
+        for name in ("_keys", "_key_entries", "_dead_keys", "_entries", "_entry_keys", "_scores",
+                     "_notice_entry", "_notice_titles", "_notice_published", "_notice_views",
+                     "_notice_keywords", "_keyword_entry", "_keyword_notices", "_keyword_best"):
+            setattr(self, name, getattr(other, name))
+
+    def dead_ratio(self) -> float:
+        return self._dead_keys / max(len(self._keys), 1)
+
+    def describe(self) -> str:
+        return f"공지 {len(self)}개, 키워드 {len(self._keyword_entry)}개, 키 {len(self._keys)}개"
+
+    # =========================================================================
+    # 갱신
+    # =========================================================================
+
+    @classmethod
+    def notice_score(cls, view_count: Optional[int], published_at: Optional[str]) -> float:
+        days = 0.0
+        if published_at:
+            try:
+                days = datetime.fromisoformat(str(published_at).replace("Z", "+00:00")).timestamp() / 86400
+            except ValueError:
+                pass
+        return cls.VIEW_WEIGHT * math.log1p(max(view_count or 0, 0)) + math.log(2) * days / cls.RECENCY_HALF_LIFE_DAYS
+
+    def upsert(self, notice_id: str, notice: Dict[str, Any]) -> None:
+        """공지 1개를 추가/교체합니다 (notice: title, view_count, published_at, enriched_metadata)."""
+        self.upsert_many([{**notice, "id": notice_id}])
+
+    def upsert_many(self, notices: List[Dict[str, Any]]) -> None:
+        pending: List[Tuple[str, int]] = []
+        with self._lock:
+            for notice in notices:
+                self._upsert_locked(notice, pending)
+            self._insert_keys(pending)
+
+    def update_views(self, notice_id: str, view_count: int) -> None:
+        """조회수만 바뀐 공지의 점수를 갱신합니다 (제목/키워드 점수 모두)."""
+        with self._lock:
+            if notice_id not in self._notice_titles:
+                return
+            self._notice_views[notice_id] = view_count
+            score = self.notice_score(view_count, self._notice_published.get(notice_id))
+            entry = self._notice_entry.get(notice_id)
+            if entry is not None:
+                self._scores[entry] = score
+            self._set_keywords(notice_id, None, score, [])
+
+    def remove(self, notice_id: str) -> bool:
+        with self._lock:
+            if notice_id not in self._notice_titles:
+                return False
+            entry = self._notice_entry.pop(notice_id, None)
+            if entry is not None:
+                self._kill(entry)
+            self._notice_titles.pop(notice_id)
+            self._notice_published.pop(notice_id, None)
+            self._notice_views.pop(notice_id, None)
+            self._set_keywords(notice_id, [], 0.0, [])
+            return True
+
+    def _upsert_locked(self, notice: Dict[str, Any], pending: List[Tuple[str, int]]) -> None:
+        notice_id = notice["id"]
+        title = (notice.get("title") or "").strip()
+        # 크롤러 저장 데이터에는 조회수가 없음 → 기존 조회수 유지
+        views = notice["view_count"] if "view_count" in notice else self._notice_views.get(notice_id)
+        score = self.notice_score(views, notice.get("published_at"))
+
+        entry = self._notice_entry.get(notice_id)
+        if entry is not None and self._notice_titles.get(notice_id) != title:
+            self._kill(entry)
+            del self._notice_entry[notice_id]
+            entry = None
+        if entry is None and title:
+            entry = self._new_entry((title, "notice", notice_id), normalize_suggest_key(title), pending)
+            self._notice_entry[notice_id] = entry
+        if entry is not None:
+            self._scores[entry] = score
+        self._notice_titles[notice_id] = title
+        self._notice_published[notice_id] = notice.get("published_at")
+        self._notice_views[notice_id] = views
+
+        metadata = notice.get("enriched_metadata") or {}
+        keywords = metadata.get("keywords_expanded") if isinstance(metadata, dict) else None
+        if isinstance(keywords, list):
+            self._set_keywords(notice_id, keywords[:self.MAX_KEYWORDS_PER_NOTICE], score, pending)
+        elif notice_id in self._notice_keywords:
+            self._set_keywords(notice_id, None, score, pending)
+
+    def _set_keywords(
+        self,
+        notice_id: str,
+        keywords: Optional[List[Any]],
+        score: float,
+        pending: List[Tuple[str, int]]
+    ) -> None:
+        """공지의 키워드 목록(None이면 기존 목록 유지, 점수만 갱신)을 반영합니다."""
+        old_keys = self._notice_keywords.get(notice_id, [])
+        if keywords is None:
+            new_keys, originals = old_keys, {}
+        else:
+            originals = {}
+            for keyword in keywords:
+                key = normalize_suggest_key(keyword) if isinstance(keyword, str) else ""
+                if key:
+                    originals.setdefault(key, keyword.strip())
+            new_keys = list(originals)
+
+        for key in set(old_keys) | set(new_keys):
+            notices = self._keyword_notices.setdefault(key, {})
+            previous = notices.pop(notice_id, None)
+            if key in new_keys:
+                notices[notice_id] = score
+
+            entry = self._keyword_entry.get(key)
+            if not notices:
+                # 붙은 공지가 없어진 키워드는 삭제 표시 (다시 붙으면 새 항목)
+                del self._keyword_notices[key]
+                self._keyword_best.pop(key, None)
+                if entry is not None:
+                    self._kill(entry)
+                    del self._keyword_entry[key]
+                continue
+            if entry is None:
+                entry = self._new_entry((originals.get(key, key), "keyword", None), key, pending)
+                self._keyword_entry[key] = entry
+
+            # 최고 점수는 최고 점수 공지가 내려가거나 빠질 때만 다시 계산 (인기 키워드는 공지가 수천 개)
+            best = self._keyword_best.get(key, -math.inf)
+            if previous is not None and previous >= best and notices.get(notice_id, -math.inf) < previous:
+                best = max(notices.values())
+            elif key in new_keys:
+                best = max(best, score)
+            self._keyword_best[key] = best
+            self._scores[entry] = best + math.log(len(notices))
+
+        if new_keys:
+            self._notice_keywords[notice_id] = new_keys
+        else:
+            self._notice_keywords.pop(notice_id, None)
+
+    def _new_entry(self, entry: Tuple[str, str, Optional[str]], key: str, pending: List[Tuple[str, int]]) -> int:
+        entry_id = len(self._entries)
+        self._entries.append(entry)
+        if entry_id >= self._scores.size:
+            scores = np.full(self._scores.size * 2, -np.inf, dtype=np.float64)
+            scores[:self._scores.size] = self._scores
+            self._scores = scores
+
+        starts = [0] + [i + 1 for i, c in enumerate(key) if c == " "]
+        pending.extend((key[start:], entry_id) for start in starts)
+        self._entry_keys.append(len(starts))
+        return entry_id
+
+    def _kill(self, entry_id: int) -> None:
+        """항목을 삭제 표시합니다 (키는 다음 전체 재적재 때 정리)."""
+        self._dead_keys += self._entry_keys[entry_id]
+        self._scores[entry_id] = -np.inf
+
+    def _insert_keys(self, pending: List[Tuple[str, int]]) -> None:
+        """
+        새 키를 정렬 배열에 병합합니다.
+
+        새 키만 정렬하고 위치는 bisect로 찾은 뒤, 키 목록은 구간 슬라이스 이어 붙이기,
+        항목 번호는 np.insert로 한 번에 넣습니다 (기존 키 n개, 새 키 m개 → O(n + m log n)).
+        """
+        if not pending:
+            return
+        pending.sort()
+        positions = [bisect_right(self._keys, key) for key, _ in pending]
+
+        merged: List[str] = []
+        previous = 0
+        for position, (key, _) in zip(positions, pending):
+            merged += self._keys[previous:position]
+            merged.append(key)
+            previous = position
+        merged += self._keys[previous:]
+
+        self._keys = merged
+        self._key_entries = np.insert(self._key_entries, positions, [entry for _, entry in pending])
+
+    # =========================================================================
+    # 검색
+    # =========================================================================
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        query로 시작하는 (단어 시작 기준) 제목/키워드를 점수순으로 반환합니다.
+
+        반환값:
+        - [{"text", "type": "notice"|"keyword", "notice_id"}, ...] (같은 문자열은 1번만)
+        """
+        prefix = normalize_suggest_key(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            low = bisect_left(self._keys, prefix)
+            high = bisect_left(self._keys, prefix + "\U0010ffff", lo=low)
+            if low >= high:
+                return []
+
+            entries = self._key_entries[low:high]
+            scores = self._scores[entries]
+            count = min(entries.size, limit * self.CANDIDATE_FACTOR)
+            top = np.argpartition(-scores, count - 1)[:count] if count < entries.size else np.arange(entries.size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            results, seen = [], set()
+            for position in top.tolist():
+                if not np.isfinite(scores[position]):
+                    break
+                text, kind, notice_id = self._entries[int(entries[position])]
+                if text.lower() in seen:
+                    continue
+                seen.add(text.lower())
+                results.append({"text": text, "type": kind, "notice_id": notice_id})
+                if len(results) >= limit:
+                    break
+            return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "notices": len(self),
+            "keywords": len(self._keyword_entry),
+            "keys": len(self._keys),
+            "dead_ratio": round(self.dead_ratio(), 3)
+        }
+
+
+# =============================================================================
+# 프로세스 공유 인스턴스 (검색 API, NoticeService 저장 훅, 조회수 갱신 작업이 같은 인덱스를 사용)
+# =============================================================================
+
+_shared_index: Optional[NoticeSuggestIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_notice_suggest_index() -> NoticeSuggestIndex:
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = NoticeSuggestIndex()
+        return _shared_index
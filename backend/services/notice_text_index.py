@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+공지사항 전문 검색(BM25) 인덱스 모듈
+
+이 파일이 하는 일:
+공지 제목 + 본문 전체를 글자 2-gram/3-gram으로 나눠 역색인을 만들고,
+검색어와 겹치는 n-gram으로 후보를 모아 BM25 점수로 순위를 매깁니다.
+
+왜 n-gram인가?
+- 한국어는 조사/어미가 붙어 띄어쓰기 단위 토큰으로는 '장학금을', '장학금' 이 다른 단어가 됨
+- 형태소 분석기 없이도 2-gram/3-gram이면 부분 문자열 검색(ILIKE '%장학금%')과 비슷하게 찾음
+
+구조:
+- 문서 번호(docnum): 추가 순서대로 증가하는 정수 (수정/삭제는 기존 번호를 삭제 표시 후 새 번호)
+- 포스팅: n-gram별 (문서 번호 간격 varint 바이트열, 빈도 uint8 바이트열)
+  문서 번호가 항상 증가하므로 간격이 작아 대부분 1~2바이트 (Python 리스트 대비 수 배 작음)
+- 검색: 포스팅을 numpy로 한 번에 복원 → BM25 점수 누적 → 검색어 n-gram의
+  MIN_TERM_MATCH 비율 이상이 겹친 문서만 결과로 사용
+  (전체 검색 API는 min_term_match=1.0: 검색어 n-gram이 모두 있는 문서만 → ILIKE 부분 문자열 결과를 빠짐없이 포함)
+
+갱신 (SyncedNoticeIndex):
+- sync: updated_at 기준 변경분만 조회, 삭제 표시가 많아지거나 주기가 지나면 전체 재적재
+- NoticeService 저장/수정 직후 upsert로 같은 프로세스의 인덱스에 바로 반영
+
+성능 (scripts/benchmark_text_index.py, 합성 공지 2만 개 · 본문 1500자):
+- 포스팅 46MB, 검색 p50 약 2ms / p95 약 7ms, 단건 수정 수 ms
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.synced_notice_index import SyncedNoticeIndex
+
+
+_TOKEN_RUN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    텍스트를 글자 2-gram + 3-gram 목록으로 나눕니다.
+
+    - NFKC 정규화 + 소문자 (전각/반각, 대소문자 무시)
+    - 글자/숫자 연속 구간마다 n-gram (구간을 넘는 n-gram은 만들지 않음)
+    - 한 글자 구간은 그대로 토큰
+    """
+    grams: List[str] = []
+    for run in _TOKEN_RUN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if len(run) == 1:
+            grams.append(run)
+            continue
+        grams.extend(run[i:i + 2] for i in range(len(run) - 1))
+        grams.extend(run[i:i + 3] for i in range(len(run) - 2))
+    return grams
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """음이 아닌 정수 배열 → varint 바이트열 (7비트씩, 상위 비트 = 다음 바이트 있음)"""
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 5):
+        nbytes += values >= (1 << (7 * k))
+
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(5):
+        sel = nbytes > k
+        if not sel.any():
+            break
+        chunk = (values[sel] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (nbytes[sel] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[sel] + k] = (chunk | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_varints(buffer: bytes) -> np.ndarray:
+    """encode_varints의 역변환 → int64 배열"""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if data.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    ends = (data & 0x80) == 0
+    last = np.flatnonzero(ends)
+    first = np.concatenate([[0], last[:-1] + 1])
+    # 각 바이트의 varint 안 위치 (0, 1, 2, ...)
+    position = np.arange(data.size) - np.repeat(first, last - first + 1)
+    parts = (data & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(parts, first)
+
+
+class NoticeTextIndex(SyncedNoticeIndex):
+    """
+    메모리 상주 공지 BM25 인덱스
+
+    사용 예시:
+    index = get_notice_text_index()
+    index.sync()
+    hits = index.search("장학금 신청", limit=20)    # [(공지 ID, BM25 점수), ...]
+    """
+
+    K1 = 1.2                      # BM25 빈도 포화 계수
+    B = 0.75                      # BM25 문서 길이 정규화 계수
+    TITLE_WEIGHT = 3              # 제목 n-gram 빈도 가중치 (본문 1회 = 1)
+    MIN_TERM_MATCH = 0.6          # 검색어 n-gram 중 이 비율 이상 겹쳐야 결과로 사용
+    MAX_TF = 255                  # 빈도 저장 상한 (uint8)
+
+    FIELDS = "id, title, content, category, published_at, updated_at"
+    LOG_PREFIX = "[전문 검색]"
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def _reset(self) -> None:
+        self._term_ids: Dict[str, int] = {}
+        self._postings: List[bytearray] = []
+        self._frequencies: List[bytearray] = []
+        self._last_doc = np.zeros(1024, dtype=np.int64)     # n-gram별 마지막 문서 번호 (간격 계산용)
+
+        self._doc_of: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._meta: List[Optional[Dict[str, Any]]] = []
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._total_length = 0.0
+
+    def _adopt(self, other: "NoticeTextIndex") -> None:
+        """새로 만든 인덱스의 내용으로 교체합니다 (잠금 안에서 호출)."""
+        for name in ("_term_ids", "_postings", "_frequencies", "_last_doc",
+                     "_doc_of", "_ids", "_meta", "_lengths", "_alive", "_total_length"):
+            setattr(self, name, getattr(other, name))
+
+    def dead_ratio(self) -> float:
+        return (len(self._ids) - len(self._doc_of)) / max(len(self._ids), 1)
+
+    def describe(self) -> str:
+        return f"공지 {len(self)}개, n-gram {len(self._term_ids)}개 ({self.nbytes / 2**20:.1f}MB)"
+
+    # =========================================================================
+    # 갱신
+    # =========================================================================
+
+    def upsert(self, notice_id: str, notice: Dict[str, Any]) -> None:
+        """공지 1개를 추가/교체합니다 (notice: title, content, category, published_at)."""
+        self.upsert_many([{**notice, "id": notice_id}])
+
+    def upsert_many(self, notices: List[Dict[str, Any]]) -> None:
+        """공지 여러 개를 추가/교체합니다 (포스팅은 한 번에 모아 인코딩)."""
+        term_ids: List[np.ndarray] = []
+        docnums: List[np.ndarray] = []
+        frequencies: List[np.ndarray] = []
+
+        with self._lock:
+            for notice in notices:
+                self._remove_locked(notice["id"])
+                terms, tf, length = self._term_counts(notice)
+                if terms.size == 0:
+                    continue
+
+                docnum = self._new_doc(notice, length)
+                term_ids.append(terms)
+                docnums.append(np.full(terms.size, docnum, dtype=np.int64))
+                frequencies.append(np.minimum(tf, self.MAX_TF).astype(np.uint8))
+
+            if term_ids:
+                self._append_postings(np.concatenate(term_ids), np.concatenate(docnums), np.concatenate(frequencies))
+
+    def remove(self, notice_id: str) -> bool:
+        with self._lock:
+            return self._remove_locked(notice_id)
+
+    def _remove_locked(self, notice_id: str) -> bool:
+        docnum = self._doc_of.pop(notice_id, None)
+        if docnum is None:
+            return False
+        self._alive[docnum] = False
+        self._total_length -= float(self._lengths[docnum])
+        self._ids[docnum] = None
+        self._meta[docnum] = None
+        return True
+
+    def _term_counts(self, notice: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, int]:
+        """공지 → (n-gram 번호, 빈도, 문서 길이), 처음 보는 n-gram은 번호를 새로 붙임"""
+        grams = tokenize(notice.get("content"))
+        title_grams = tokenize(notice.get("title"))
+        assign = self._term_ids.setdefault
+        ids = np.fromiter(
+            (assign(gram, len(self._term_ids)) for gram in grams + title_grams * self.TITLE_WEIGHT),
+            dtype=np.int64
+        )
+        self._add_terms()
+        terms, tf = np.unique(ids, return_counts=True)
+        return terms, tf, int(ids.size)
+
+    def _new_doc(self, notice: Dict[str, Any], length: int) -> int:
+        docnum = len(self._ids)
+        if docnum >= self._lengths.size:
+            self._lengths = np.resize(self._lengths, self._lengths.size * 2)
+            alive = np.zeros(self._lengths.size, dtype=bool)
+            alive[:docnum] = self._alive[:docnum]
+            self._alive = alive
+
+        self._ids.append(notice["id"])
+        self._meta.append({
+            "category": notice.get("category"),
+            "published_at": notice.get("published_at")
+        })
+        self._lengths[docnum] = length
+        self._alive[docnum] = True
+        self._total_length += length
+        self._doc_of[notice["id"]] = docnum
+        return docnum
+
+    def _add_terms(self) -> None:
+        """새로 번호를 받은 n-gram의 빈 포스팅을 만듭니다."""
+        count = len(self._term_ids)
+        added = count - len(self._postings)
+        if added <= 0:
+            return
+        self._postings.extend(bytearray() for _ in range(added))
+        self._frequencies.extend(bytearray() for _ in range(added))
+        if count > self._last_doc.size:
+            last_doc = np.zeros(max(count, self._last_doc.size * 2), dtype=np.int64)
+            last_doc[:self._last_doc.size] = self._last_doc
+            self._last_doc = last_doc
+
+    def _append_postings(self, term_ids: np.ndarray, docnums: np.ndarray, frequencies: np.ndarray) -> None:
+        """(n-gram, 문서 번호, 빈도) 묶음을 n-gram별 포스팅 끝에 간격 varint로 덧붙입니다."""
+        order = np.lexsort((docnums, term_ids))
+        term_ids, docnums, frequencies = term_ids[order], docnums[order], frequencies[order]
+
+        starts = np.flatnonzero(np.concatenate([[True], term_ids[1:] != term_ids[:-1]]))
+        previous = np.empty_like(docnums)
+        previous[1:] = docnums[:-1]
+        previous[starts] = self._last_doc[term_ids[starts]]
+
+        # 포스팅이 비어 있는 n-gram의 첫 간격은 문서 번호 그대로 (last_doc 초기값 0과 구분하지 않아도 됨)
+        gaps = docnums - previous
+        encoded = encode_varints(gaps)
+        sizes = np.ones(gaps.size, dtype=np.int64)
+        for k in range(1, 5):
+            sizes += gaps >= (1 << (7 * k))
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+        ends = np.concatenate([starts[1:], [term_ids.size]])
+        raw_frequencies = frequencies.tobytes()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            term_id = int(term_ids[start])
+            self._postings[term_id] += encoded[offsets[start]:offsets[end]]
+            self._frequencies[term_id] += raw_frequencies[start:end]
+        self._last_doc[term_ids[ends - 1]] = docnums[ends - 1]
+
+    # =========================================================================
+    # 검색
+    # =========================================================================
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        category: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_term_match: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 점수순으로 공지를 찾습니다.
+
+        매개변수:
+        - query: 검색어
+        - limit: 최대 결과 수 (None이면 조건에 맞는 전체)
+        - category / date_from / date_to: published_at, category 필터 (문자열 비교)
+        - min_term_match: 겹쳐야 하는 검색어 n-gram 비율 (기본값: MIN_TERM_MATCH)
+
+        반환값:
+        - [(공지 ID, BM25 점수), ...] 점수 내림차순
+        """
+        grams = Counter(tokenize(query))
+        if not grams:
+            return []
+
+        with self._lock:
+            size = len(self._ids)
+            live = len(self._doc_of)
+            if live == 0:
+                return []
+
+            average_length = max(self._total_length / live, 1.0)
+            scores = np.zeros(size, dtype=np.float32)
+            matched = np.zeros(size, dtype=np.int16)
+
+            for term, query_tf in grams.items():
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    continue
+                docs = np.cumsum(decode_varints(bytes(self._postings[term_id])))
+                tf = np.frombuffer(bytes(self._frequencies[term_id]), dtype=np.uint8).astype(np.float32)
+                df = tf.size
+                idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+                norm = self.K1 * (1.0 - self.B + self.B * self._lengths[docs] / average_length)
+                scores[docs] += query_tf * idf * tf * (self.K1 + 1.0) / (tf + norm)
+                matched[docs] += 1
+
+            ratio = self.MIN_TERM_MATCH if min_term_match is None else min_term_match
+            required = max(1, math.ceil(len(grams) * ratio))
+            hits = np.flatnonzero((matched >= required) & self._alive[:size])
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+
+            results = []
+            for docnum in hits.tolist():
+                meta = self._meta[docnum]
+                published_at = meta.get("published_at") or ""
+                if category and meta.get("category") != category:
+                    continue
+                if date_from and published_at < date_from:
+                    continue
+                if date_to and published_at > date_to:
+                    continue
+                results.append((self._ids[docnum], float(scores[docnum])))
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    @staticmethod
+    def covers_substring(query: str) -> bool:
+        """
+        부분 문자열 검색(ILIKE '%검색어%')의 결과를 n-gram으로 빠짐없이 찾을 수 있는지.
+        한 글자 구간은 본문에서 더 긴 구간의 일부일 수 있어 토큰으로 찾을 수 없음
+        """
+        runs = _TOKEN_RUN.findall(unicodedata.normalize("NFKC", query or "").lower())
+        return bool(runs) and all(len(run) > 1 for run in runs)
+
+    def published_at(self, notice_id: str) -> Optional[str]:
+        docnum = self._doc_of.get(notice_id)
+        return self._meta[docnum].get("published_at") if docnum is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        """포스팅 + 문서 배열 메모리 사용량 (바이트, 사전/ID 문자열 제외)"""
+        return (sum(len(p) for p in self._postings) + sum(len(f) for f in self._frequencies)
+                + self._lengths.nbytes + self._alive.nbytes + self._last_doc.nbytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "notices": len(self),
+            "terms": len(self._term_ids),
+            "memory_mb": round(self.nbytes / 2**20, 1),
+            "watermark": self._watermark
+        }
+
+
+# =============================================================================
+# 프로세스 공유 인스턴스 (검색 API와 NoticeService 저장 훅이 같은 인덱스를 사용)
+# =============================================================================
+
+_shared_index: Optional[NoticeTextIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_notice_text_index() -> NoticeTextIndex:
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = NoticeTextIndex()
+        return _shared_index
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+공지사항 벡터 인덱스 모듈
+
+이 파일이 하는 일:
+모든 공지사항의 content_embedding을 메모리에 상주시키고,
+pgvector RPC를 쓸 수 없을 때 로컬에서 빠르게 유사도 검색을 수행합니다.
+
+구조:
+- 임베딩: IVF 역색인 리스트 (IvfVectorIndex), 각 행은 미리 정규화(단위 벡터)
+  저장 정밀도는 float32/float16/int8 중 선택 (QuantizedEmbeddingStore)
+  공지가 IvfVectorIndex.MIN_TRAIN_SIZE개 미만이면 리스트 1개 (전체 탐색)
+- 메타데이터: 검색 결과에 필요한 제목/요약/카테고리
+
+float16/int8 정밀도에서는 1차 후보를 limit × RESCORE_FACTOR개 뽑은 뒤
+DB에서 원본 임베딩을 가져와 정확한 유사도로 다시 정렬합니다.
+
+왜 필요한가?
+- 기존 폴백: 매 검색마다 전체 공지 임베딩을 PostgREST로 내려받고
+  공지마다 순수 Python 768차원 루프로 코사인 유사도 계산 (수천 건이면 수 초)
+- 인덱스: 한 번 적재 후 updated_at 기준으로 변경분만 동기화,
+  검색은 행렬-벡터 곱 1회 + argpartition으로 상위 k개 선택 (수 ms)
+- 공지가 많아지면 가까운 nprobe개 리스트만 계산 (10만 개에서도 수 ms)
+- watermark/전체 재적재 규칙은 SyncedNoticeIndex 공통 (전문 검색/자동완성 인덱스와 같음)
+
+디스크 스냅샷 (snapshot_dir를 주면):
+- 전체 적재 직후와 변경 반영 후 SAVE_INTERVAL마다 인덱스 + watermark를 저장
+- 프로세스 시작 후 첫 sync에서 파일로 인덱스를 복원하고 watermark 이후 변경분만 조회
+
+워커 간 공유 (snapshot_role이 off가 아니면, services/shared_embedding_store.py):
+- writer 워커만 DB와 동기화하고 변경 반영 후 PUBLISH_INTERVAL마다 새 세대를 저장
+- reader 워커는 세대 번호가 바뀌면 새 세대를 mmap으로 매핑 (리스트별 벡터 구간을 복사 없이 사용)
+"""
+
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+
+from ai.embedding_service import EmbeddingService
+from ai.embedding_codec import parse_vector, parse_unit_matrix
+from services.supabase_service import get_supabase_client
+from services.shared_embedding_store import SharedEmbeddingStore, default_snapshot_dir, default_snapshot_role
+from services.ivf_vector_index import IvfVectorIndex
+from services.synced_notice_index import SyncedNoticeIndex
+
+
+class NoticeVectorIndex(SyncedNoticeIndex):
+    """
+    메모리 상주 공지사항 벡터 인덱스
+
+    사용 예시:
+    index = NoticeVectorIndex()
+    index.sync()
+    results = index.search(query_embedding, limit=20)
+    # [{"id": ..., "title": ..., "similarity": 0.82}, ...]
+    """
+
+    DIMENSION = 768
+    RESCORE_FACTOR = 4            # 손실 정밀도일 때 재계산할 1차 후보 배수
+    QUANTIZATION_MARGIN = 0.02    # 1차 후보 임계값 여유 (양자화 오차로 경계 후보를 놓치지 않도록)
+    SAVE_INTERVAL = 10 * 60       # 변경 반영 후 디스크 저장 최소 간격 (초)
+    RESTORE_GRACE = 30 * 60       # 디스크에서 복원한 뒤 전체 재적재를 미루는 최소 시간 (초)
+    PUBLISH_INTERVAL = 60         # 워커 공유 시 writer가 변경분을 발행하는 최소 간격 (초)
+
+    FIELDS = "id, title, ai_summary, category, content_embedding, updated_at"
+    LOG_PREFIX = "[NoticeVectorIndex]"
+
+    def __init__(
+        self,
+        dimension: int = DIMENSION,
+        precision: Optional[str] = None,
+        full_vector_fetcher: Optional[Callable[[List[str]], Dict[str, Any]]] = None,
+        nprobe: Optional[int] = None,
+        snapshot_dir: Optional[str] = None,
+        snapshot_role: str = "off"
+    ):
+        """
+        매개변수:
+        - dimension: 임베딩 차원
+        - precision: 저장 정밀도 float32/float16/int8
+          (기본값: 환경 변수 NOTICE_INDEX_PRECISION 또는 float32)
+        - full_vector_fetcher: 공지 ID 목록 → {ID: 원본 임베딩} (재계산용, 기본값: Supabase 조회)
+        - nprobe: IVF 학습 후 검색할 리스트 수 (기본값: 환경 변수 VECTOR_INDEX_NPROBE 또는 32)
+        - snapshot_dir: 디스크 스냅샷 루트 디렉터리 (None이면 저장/복원 안 함)
+        - snapshot_role: 워커 간 공유 역할 (auto/writer/reader/off, SharedEmbeddingStore 참고)
+        """
+        self.dimension = dimension
+        self._mode = precision or os.getenv("NOTICE_INDEX_PRECISION", "float32")
+        self._nprobe = nprobe
+        self._fetch_full_vectors = full_vector_fetcher or self._fetch_full_vectors_from_db
+
+        self._disk = SharedEmbeddingStore(snapshot_dir, "notices", snapshot_role) if snapshot_dir else None
+        self._disk_checked = False
+        self._generation: Optional[int] = None
+        self._published_at: Optional[float] = None
+        self._last_save_at: float = 0.0
+        self._save_thread: Optional[threading.Thread] = None
+
+        super().__init__()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def precision(self) -> str:
+        return self._store.mode
+
+    @property
+    def nbytes(self) -> int:
+        """임베딩 행렬 메모리 사용량 (바이트)"""
+        return self._store.nbytes
+
+    # =========================================================================
+    # 동기화
+    # =========================================================================
+
+    # SyncedNoticeIndex.sync가 호출하는 훅
+    # - 첫 호출: 디스크 스냅샷이 있으면 복원 후 변경분만, 없으면 전체 재적재
+    # - reader 워커: writer가 발행한 세대가 최신이면 DB 조회 없이 사용
+    # - 전체 재적재는 새 저장소를 잠금 밖에서 채우고 IVF 학습까지 마친 뒤 교체
+
+    def _reset(self) -> None:
+        self._store = IvfVectorIndex(self.dimension, mode=self._mode, nprobe=self._nprobe)
+        self._watermark = None
+
+    def _new_target(self) -> "NoticeVectorIndex":
+        return NoticeVectorIndex(self.dimension, precision=self._mode, nprobe=self._nprobe)
+
+    def _adopt(self, other: "NoticeVectorIndex") -> None:
+        self._store = other._store
+
+    def upsert_many(self, notices: List[Dict[str, Any]]) -> None:
+        """동기화로 받은 공지 행을 반영합니다 (임베딩이 없어진 행은 제거)."""
+        # 벡터 변환은 잠금 밖에서
+        parsed = []
+        for row in notices:
+            embedding = row.get("content_embedding")
+            parsed.append((row, self._to_unit_vector(embedding) if embedding else None, bool(embedding)))
+
+        with self._lock:
+            for row, vector, has_embedding in parsed:
+                if not has_embedding:
+                    self._store.remove(row["id"])
+                elif vector is not None:
+                    self._store.put(row["id"], vector, self._meta(row))
+
+    def describe(self) -> str:
+        return f"{len(self._store)}개 ({self.precision}, {self.nbytes / 2**20:.1f}MB)"
+
+    def _before_sync(self) -> bool:
+        if self._follow_writer():
+            return True
+        if self._watermark is None and not self._disk_checked:
+            self._restore()
+        return False
+
+    def _after_full_load(self, target: "NoticeVectorIndex") -> None:
+        if target._store.needs_training():
+            target._store.train()
+
+    def _after_sync(self, full: bool, applied: int, now: float) -> None:
+        if not full and self._store.needs_training():
+            self._store.train()
+
+        save_interval = self.PUBLISH_INTERVAL if self._disk is not None and self._disk.shared \
+            else self.SAVE_INTERVAL
+        if full or (applied and now - self._last_save_at > save_interval):
+            self._save_in_background()
+
+    # =========================================================================
+    # 디스크 스냅샷
+    # =========================================================================
+
+    def _restore(self) -> None:
+        """디스크 스냅샷으로 인덱스와 watermark를 복원합니다 (잠금 안에서 호출)."""
+        self._disk_checked = True
+        if self._disk is None:
+            return
+
+        manifest = self._adopt_snapshot(shared=False)
+        if manifest is not None:
+            self._last_full_sync_at = max(
+                manifest.get("last_full_sync_at", 0.0),
+                time.time() - self.FULL_RESYNC_INTERVAL + self.RESTORE_GRACE
+            )
+            print(f"[NoticeVectorIndex] 디스크 스냅샷 복원: {len(self._store)}개 (세대 {manifest['generation']})")
+
+    def _follow_writer(self) -> bool:
+        """
+        reader 워커면 writer가 발행한 최신 세대로 맞춥니다 (잠금 안에서 호출).
+
+        반환값:
+        - True: 공유 세대를 그대로 쓰면 됨 / False: 직접 DB와 동기화해야 함
+        """
+        if self._disk is None or not self._disk.shared or self._disk.is_writer():
+            return False
+
+        generation = self._disk.current_generation()
+        if generation is None:
+            return False
+        if generation != self._generation:
+            manifest = self._adopt_snapshot(shared=True)
+            if manifest is None:
+                return False
+            self._disk_checked = True
+            self._last_full_sync_at = manifest.get("last_full_sync_at", 0.0)
+            print(f"[NoticeVectorIndex] writer 세대 적용: {len(self._store)}개 (세대 {generation})")
+
+        return self._watermark is not None and not self._disk.is_stale(self._published_at)
+
+    def _adopt_snapshot(self, shared: bool) -> Optional[Dict[str, Any]]:
+        """
+        현재 세대로 인덱스를 교체하고 manifest를 반환합니다 (실패 시 None).
+
+        shared=True면 벡터 배열을 mmap 그대로 감싸고(워커 간 페이지 공유),
+        False면 메모리로 읽어 이후 증분 동기화를 그 위에 반영합니다.
+        """
+        try:
+            loaded = self._disk.read(kind="notices", dimension=self.dimension, mmap=shared)
+            if loaded is None:
+                return None
+
+            arrays, manifest = loaded
+            if str(arrays["mode"]) != self.precision:
+                print(f"[NoticeVectorIndex] 스냅샷 정밀도({arrays['mode']})가 설정과 달라 무시")
+                return None
+
+            self._store = IvfVectorIndex.from_arrays(arrays, nprobe=self._nprobe, copy=not shared)
+            self._watermark = manifest["watermark"]
+            self._generation = manifest["generation"]
+            self._published_at = manifest["saved_at"]
+            self._last_save_at = manifest["saved_at"]
+            return manifest
+
+        except Exception as e:
+            print(f"[NoticeVectorIndex] 디스크 스냅샷 읽기 실패 (DB에서 적재): {str(e)}")
+            if not shared:
+                self._reset()
+            return None
+
+    def _save_in_background(self) -> None:
+        """인덱스를 잠금 안에서 배열로 복사한 뒤 파일 쓰기는 별도 스레드에서 합니다."""
+        if self._disk is None or self._watermark is None or not self._disk.is_writer():
+            return
+        if self._save_thread is not None and self._save_thread.is_alive():
+            return
+
+        arrays = self._store.export_arrays()
+        manifest = {
+            "kind": "notices",
+            "dimension": self.dimension,
+            "watermark": self._watermark,
+            "last_full_sync_at": self._last_full_sync_at
+        }
+        self._last_save_at = time.time()
+        self._save_thread = threading.Thread(target=self._save, args=(arrays, manifest), daemon=True)
+        self._save_thread.start()
+
+    def _save(self, arrays: Dict[str, np.ndarray], manifest: Dict[str, Any]) -> None:
+        try:
+            generation = self._disk.write(arrays, manifest)
+            self._generation = generation
+            print(f"[NoticeVectorIndex] 디스크 저장: {len(arrays['ids'])}개 (세대 {generation})")
+        except Exception as e:
+            print(f"[NoticeVectorIndex] 디스크 저장 실패: {str(e)}")
+
+    # =========================================================================
+    # 단건 갱신
+    # =========================================================================
+
+    def upsert(self, notice_id: str, embedding: Any, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        공지 임베딩을 추가하거나 교체합니다.
+
+        매개변수:
+        - notice_id: 공지 ID
+        - embedding: 768차원 벡터 (리스트 또는 pgvector 문자열 "[0.1,...]")
+        - meta: title, ai_summary, category를 담은 딕셔너리
+        """
+        vector = self._to_unit_vector(embedding)
+        if vector is None:
+            return False
+
+        with self._lock:
+            self._store.put(notice_id, vector, self._meta(meta or {}))
+        return True
+
+    @staticmethod
+    def _meta(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": row.get("title"),
+            "ai_summary": row.get("ai_summary"),
+            "category": row.get("category")
+        }
+
+    def remove(self, notice_id: str) -> bool:
+        """공지를 인덱스에서 제거합니다."""
+        with self._lock:
+            return self._store.remove(notice_id)
+
+    # =========================================================================
+    # 검색
+    # =========================================================================
+
+    def search(
+        self,
+        query_embedding: Any,
+        limit: int = 50,
+        notice_ids: Optional[List[str]] = None,
+        match_threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        코사인 유사도 상위 limit개 공지를 반환합니다.
+
+        매개변수:
+        - query_embedding: 쿼리 벡터
+        - limit: 최대 결과 수
+        - notice_ids: 후보 공지 ID (None이면 전체)
+        - match_threshold: 최소 유사도 (None이면 제한 없음)
+
+        반환값:
+        - [{"id", "title", "ai_summary", "category", "similarity"}, ...] 유사도 내림차순
+        """
+        query = self._to_unit_vector(query_embedding)
+        if query is None or limit <= 0:
+            return []
+
+        rescore = self._store.lossy
+        shortlist = limit * self.RESCORE_FACTOR if rescore else limit
+        first_threshold = match_threshold
+        if rescore and match_threshold is not None:
+            first_threshold = match_threshold - self.QUANTIZATION_MARGIN
+
+        with self._lock:
+            hits = self._store.search(query, shortlist, threshold=first_threshold, ids=notice_ids)
+
+        # 손실 정밀도: 원본 임베딩으로 정확한 유사도 재계산 (실패 시 근사 점수 유지)
+        if rescore and hits:
+            exact = self._rescore(query, [notice_id for notice_id, _, _ in hits])
+            hits = [(nid, meta, exact.get(nid, score)) for nid, meta, score in hits]
+            if match_threshold is not None:
+                hits = [h for h in hits if h[2] > match_threshold]
+            hits.sort(key=lambda h: h[2], reverse=True)
+            hits = hits[:limit]
+
+        return [
+            {
+                "id": notice_id,
+                "title": meta.get("title"),
+                "ai_summary": meta.get("ai_summary"),
+                "category": meta.get("category"),
+                "similarity": score
+            }
+            for notice_id, meta, score in hits
+        ]
+
+    def _rescore(self, query: np.ndarray, notice_ids: List[str]) -> Dict[str, float]:
+        """1차 후보의 원본 임베딩을 가져와 정확한 유사도를 계산합니다."""
+        try:
+            vectors = self._fetch_full_vectors(notice_ids)
+        except Exception as e:
+            print(f"[NoticeVectorIndex] 원본 임베딩 조회 실패 (근사 점수 사용): {str(e)}")
+            return {}
+
+        ids = [nid for nid in notice_ids if vectors.get(nid) is not None]
+        if not ids:
+            return {}
+
+        matrix = parse_unit_matrix([vectors[nid] for nid in ids], self.dimension)
+        return dict(zip(ids, (matrix @ query).tolist()))
+
+    def _fetch_full_vectors_from_db(self, notice_ids: List[str]) -> Dict[str, Any]:
+        """재계산용 원본 임베딩 조회 (후보 수만큼만)"""
+        result = get_supabase_client().table("notices")\
+            .select("id, content_embedding")\
+            .in_("id", notice_ids)\
+            .execute()
+        return {row["id"]: row.get("content_embedding") for row in (result.data or [])}
+
+    def _to_unit_vector(self, embedding: Any) -> Optional[np.ndarray]:
+        """리스트/pgvector 문자열을 정규화된 float32 벡터로 변환합니다."""
+        try:
+            vector = parse_vector(embedding, self.dimension)
+        except ValueError as e:
+            print(f"[NoticeVectorIndex] {str(e)}")
+            return None
+
+        if vector is None or not np.any(vector):
+            return None
+        return EmbeddingService.normalize(vector)[0]
+
+
+# =============================================================================
+# 프로세스 공유 인스턴스 (하이브리드 검색 폴백과 공지 삭제 훅이 같은 인덱스를 사용)
+# =============================================================================
+
+_shared_index: Optional[NoticeVectorIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_notice_vector_index() -> NoticeVectorIndex:
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = NoticeVectorIndex(
+                dimension=EmbeddingService.DIMENSION,
+                snapshot_dir=default_snapshot_dir(),
+                snapshot_role=default_snapshot_role()
+            )
+        return _shared_index
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+양자화 임베딩 저장소 모듈
+
+이 파일이 하는 일:
+단위 벡터로 정규화된 임베딩을 float32 / float16 / int8 중 하나의 정밀도로
+연속 행렬에 저장하고, 행렬-벡터 곱으로 상위 k개 후보를 고릅니다.
+
+정밀도별 메모리 (768차원, 벡터 1개):
+- float32: 3,072 바이트 (정확한 점수)
+- float16: 1,536 바이트 (상대 오차 ~1e-3)
+- int8:      772 바이트 (벡터별 스케일 4바이트 포함, 상대 오차 ~1e-2)
+
+int8 양자화 방식 (벡터별 스케일):
+- scale = max(|x|) / 127, q = round(x / scale)
+- 점수 = (q · query) × scale
+
+손실 정밀도(float16/int8)에서는 1차 후보를 넉넉히 뽑은 뒤
+호출한 쪽(NoticeVectorIndex)이 원본 정밀도 벡터로 재계산(rescoring)합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class QuantizedEmbeddingStore:
+    """
+    양자화 임베딩 행렬 + ID/페이로드 배열
+
+    사용 예시:
+    store = QuantizedEmbeddingStore(dimension=768, mode="int8")
+    store.put("notice-1", unit_vector, {"title": "..."})
+    rows, scores = store.top_k(query_unit_vector, limit=20)
+    ids = [store.id_at(r) for r in rows]
+    """
+
+    MODES = ("float32", "float16", "int8")
+    INITIAL_CAPACITY = 1024
+    SEARCH_CHUNK_ROWS = 8192  # 역양자화 임시 버퍼 크기 제한 (int8 → float32 변환 단위)
+
+    def __init__(self, dimension: int, mode: str = "float32", initial_capacity: int = INITIAL_CAPACITY):
+        """
+        매개변수:
+        - dimension: 벡터 차원
+        - mode: 저장 정밀도 float32/float16/int8
+        - initial_capacity: 처음 확보할 행 수 (작은 저장소를 여러 개 둘 때 줄여서 사용)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 정밀도입니다: {mode} (가능: {', '.join(self.MODES)})")
+
+        self.dimension = dimension
+        self.mode = mode
+        self.initial_capacity = max(1, initial_capacity)
+        self.clear()
+
+    @property
+    def lossy(self) -> bool:
+        """원본과 점수가 달라질 수 있는 정밀도인지 (True면 재계산 권장)"""
+        return self.mode != "float32"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @classmethod
+    def from_raw(
+        cls,
+        dimension: int,
+        mode: str,
+        ids: List[str],
+        data: np.ndarray,
+        scales: np.ndarray,
+        payloads: List[Any]
+    ) -> "QuantizedEmbeddingStore":
+        """
+        이미 양자화된 배열을 복사 없이 감싼 저장소를 만듭니다.
+        (mmap으로 읽은 공유 스냅샷용, 읽기 전용 배열이면 첫 쓰기 때 복사)
+        """
+        store = cls(dimension, mode, initial_capacity=1)
+        store._data, store._scales = data, scales
+        store._ids = list(ids)
+        store._row_of = {item_id: row for row, item_id in enumerate(store._ids)}
+        store._payloads = list(payloads)
+        return store
+
+    def clear(self) -> None:
+        dtype = {"float32": np.float32, "float16": np.float16, "int8": np.int8}[self.mode]
+        self._data = np.zeros((self.initial_capacity, self.dimension), dtype=dtype)
+        self._scales = np.ones(self.initial_capacity, dtype=np.float32)
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._payloads: List[Any] = []
+
+    # =========================================================================
+    # 저장/삭제
+    # =========================================================================
+
+    def put(self, item_id: str, unit_vector: np.ndarray, payload: Any = None) -> int:
+        """
+        벡터를 추가하거나 교체합니다.
+
+        매개변수:
+        - item_id: 항목 ID
+        - unit_vector: 정규화된 float32 벡터 (dimension,)
+        - payload: 행과 함께 보관할 값 (메타데이터 등)
+
+        반환값:
+        - 저장된 행 번호
+        """
+        self._ensure_writable()
+        row = self._row_of.get(item_id)
+        if row is None:
+            row = len(self._ids)
+            if row >= self._data.shape[0]:
+                self._grow()
+            self._ids.append(item_id)
+            self._payloads.append(payload)
+            self._row_of[item_id] = row
+        else:
+            self._payloads[row] = payload
+
+        data, scale = self.quantize(unit_vector.reshape(1, -1), self.mode)
+        self._data[row] = data[0]
+        self._scales[row] = scale[0]
+        return row
+
+    def remove(self, item_id: str) -> bool:
+        """항목을 삭제합니다 (마지막 행을 빈자리로 옮겨 연속성 유지)."""
+        row = self._row_of.pop(item_id, None)
+        if row is None:
+            return False
+        self._ensure_writable()
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._data[row] = self._data[last]
+            self._scales[row] = self._scales[last]
+            self._ids[row] = moved_id
+            self._payloads[row] = self._payloads[last]
+            self._row_of[moved_id] = row
+
+        self._ids.pop()
+        self._payloads.pop()
+        return True
+
+    def extend_raw(self, ids: List[str], data: np.ndarray, scales: np.ndarray, payloads: List[Any]) -> None:
+        """
+        이미 양자화된 행을 한 번에 추가합니다 (재구성/파일 적재용, ids는 새 항목이어야 함).
+
+        매개변수:
+        - data: 저장 정밀도 행렬 (n, dimension)
+        - scales: 벡터별 스케일 (n,)
+        """
+        start, count = len(self._ids), len(ids)
+        while start + count > self._data.shape[0]:
+            self._grow()
+
+        self._data[start:start + count] = data
+        self._scales[start:start + count] = scales
+        for offset, item_id in enumerate(ids):
+            self._row_of[item_id] = start + offset
+        self._ids.extend(ids)
+        self._payloads.extend(payloads)
+
+    def export_raw(self) -> Tuple[List[str], np.ndarray, np.ndarray, List[Any]]:
+        """사용 중인 행의 (ID, 저장 정밀도 행렬, 스케일, 페이로드) — 행렬은 내부 버퍼의 뷰"""
+        size = len(self._ids)
+        return self._ids, self._data[:size], self._scales[:size], self._payloads
+
+    def _ensure_writable(self) -> None:
+        """읽기 전용(mmap) 버퍼를 감싸고 있으면 쓰기 전에 복사합니다."""
+        if not self._data.flags.writeable or not self._scales.flags.writeable:
+            self._data = np.array(self._data)
+            self._scales = np.array(self._scales)
+
+    def _grow(self) -> None:
+        size = self._data.shape[0]
+        data = np.zeros((size * 2, self.dimension), dtype=self._data.dtype)
+        data[:size] = self._data
+        scales = np.ones(size * 2, dtype=np.float32)
+        scales[:size] = self._scales
+        self._data, self._scales = data, scales
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def row_of(self, item_id: str) -> Optional[int]:
+        return self._row_of.get(item_id)
+
+    def id_at(self, row: int) -> str:
+        return self._ids[row]
+
+    def payload_at(self, row: int) -> Any:
+        return self._payloads[row]
+
+    def vector_at(self, row: int) -> np.ndarray:
+        """저장된 벡터를 float32로 복원합니다 (int8/float16은 근사값)."""
+        return self._data[row].astype(np.float32) * self._scales[row]
+
+    @property
+    def nbytes(self) -> int:
+        """실제 사용 중인 행의 벡터 + 스케일 메모리 (바이트)"""
+        rows = len(self._ids)
+        scale_bytes = rows * self._scales.itemsize if self.mode == "int8" else 0
+        return rows * self.dimension * self._data.itemsize + scale_bytes
+
+    def scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        정규화된 쿼리와 저장된 벡터의 (근사) 코사인 유사도를 계산합니다.
+
+        매개변수:
+        - query: 정규화된 float32 쿼리 (dimension,)
+        - rows: 계산할 행 번호 배열 (None이면 전체)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        size = len(self._ids)
+
+        if self.mode == "float32":
+            matrix = self._data[:size] if rows is None else self._data[rows]
+            return matrix @ query
+
+        count = size if rows is None else rows.size
+        result = np.empty(count, dtype=np.float32)
+        for start in range(0, count, self.SEARCH_CHUNK_ROWS):
+            stop = min(start + self.SEARCH_CHUNK_ROWS, count)
+            index = slice(start, stop) if rows is None else rows[start:stop]
+            chunk = self._data[index].astype(np.float32)
+            result[start:stop] = chunk @ query
+            if self.mode == "int8":
+                result[start:stop] *= self._scales[index]
+        return result
+
+    def top_k(
+        self,
+        query: np.ndarray,
+        limit: int,
+        rows: Optional[np.ndarray] = None,
+        threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (근사) 유사도 상위 limit개의 행 번호와 점수를 내림차순으로 반환합니다.
+
+        매개변수:
+        - rows: 후보 행 번호 (None이면 전체)
+        - threshold: 이 값보다 큰 점수만 (None이면 제한 없음)
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        if limit <= 0 or len(self._ids) == 0 or (rows is not None and rows.size == 0):
+            return empty
+
+        scores = self.scores(query, rows)
+        candidates = np.flatnonzero(scores > threshold) if threshold is not None else np.arange(scores.size)
+
+        if candidates.size > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        selected_rows = candidates if rows is None else rows[candidates]
+        return selected_rows.astype(np.int64), scores[candidates]
+
+    # =========================================================================
+    # 양자화
+    # =========================================================================
+
+    @staticmethod
+    def quantize(vectors: np.ndarray, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n, dimension) float32 벡터를 저장 정밀도로 변환합니다.
+
+        반환값:
+        - (양자화 행렬, 벡터별 스케일) — float32/float16은 스케일 1
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ones = np.ones(vectors.shape[0], dtype=np.float32)
+
+        if mode == "float32":
+            return vectors, ones
+        if mode == "float16":
+            return vectors.astype(np.float16), ones
+
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales.astype(np.float32)
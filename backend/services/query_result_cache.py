@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 검색 의미 캐시 모듈
+
+이 파일이 하는 일:
+search_by_keyword의 후보 집합(제목 매칭 + 벡터 매칭, 상세 정보 포함)을 검색어 임베딩과 함께 저장하고,
+새 검색어의 임베딩이 저장된 검색어와 충분히 가까우면 그 후보 집합을 다시 씁니다.
+
+- "장학금" / "장학금 신청" / "국가장학금"처럼 거의 같은 검색은 벡터 RPC, 제목 검색, 상세 조회를 생략
+- 검색어 임베딩은 EmbeddingService.query_cache가 이미 보관 → 적중 시 외부 호출 없음
+- 후보의 벡터 점수는 저장된 검색어 기준 값을 그대로 쓰고, 제목 보너스만 새 검색어로 다시 계산
+  (HybridSearchService.search_by_keyword 참고)
+
+무효화:
+- 저장 시점의 공지 코퍼스 버전(feed_cache.get_corpus_version)과 현재 버전이 다르면 전체 비움
+- TTL(SEMANTIC_CACHE_TTL)이 지난 항목은 미스
+- 최대 항목 수를 넘으면 가장 오래 안 쓴 항목부터 제거
+
+조회는 (항목 수 × 차원) 행렬과 검색어 단위 벡터의 곱 한 번입니다.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.feed_cache import get_corpus_version
+
+
+class SemanticQueryCache:
+    """
+    임베딩 코사인 유사도 기준 검색 후보 캐시 (LRU + TTL + 코퍼스 버전)
+
+    사용 예시:
+    cache = SemanticQueryCache()
+    candidates = cache.lookup(query, query_embedding, candidate_limit=20)
+    if candidates is None:
+        candidates = compute_candidates(...)
+        cache.put(query, query_embedding, candidates, candidate_limit=20)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        매개변수:
+        - max_entries: 최대 보관 검색어 수 (기본값: 환경 변수 SEMANTIC_CACHE_MAX_ENTRIES 또는 512)
+        - similarity_threshold: 후보를 재사용할 최소 코사인 유사도
+          (기본값: 환경 변수 SEMANTIC_CACHE_THRESHOLD 또는 0.93)
+        - ttl_seconds: 항목 유효 시간 (기본값: 환경 변수 SEMANTIC_CACHE_TTL 또는 1800초, 0이면 캐시 비활성)
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+        if similarity_threshold is None:
+            similarity_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.93"))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("SEMANTIC_CACHE_TTL", "1800"))
+
+        self.max_entries = max(1, int(max_entries))
+        self.similarity_threshold = float(similarity_threshold)
+        self.ttl_seconds = float(ttl_seconds)
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None     # (max_entries, 차원) 단위 벡터, 빈 슬롯은 0
+        # 슬롯 번호 → (검색어, 후보, 후보 수 한도, 저장 시각), 순서 = LRU
+        self._entries: "OrderedDict[int, Tuple[str, List[Dict[str, Any]], int, float]]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._corpus_version: Optional[int] = None
+
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._hit_similarity_sum = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def _unit(embedding: Any) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _check_version_locked(self) -> None:
+        """코퍼스 버전이 바뀌었으면 전체를 비웁니다 (새 공지가 후보에 빠져 있으므로)."""
+        version = get_corpus_version()
+        if version != self._corpus_version:
+            if self._entries:
+                self.invalidations += 1
+            self._clear_locked()
+            self._corpus_version = version
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._free_slots = []
+        if self._vectors is not None:
+            self._vectors[:] = 0
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def lookup(
+        self,
+        query: str,
+        query_embedding: Any,
+        candidate_limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        가장 가까운 저장 검색어의 후보를 반환합니다.
+
+        반환값:
+        - 후보 리스트 (유사도가 임계값 미만이거나, 저장 당시 후보 수 한도가 더 작거나, 만료됐으면 None)
+        """
+        if not self.enabled:
+            return None
+        unit = self._unit(query_embedding)
+
+        with self._lock:
+            self._check_version_locked()
+            if unit is None or not self._entries or self._vectors is None or unit.size != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors @ unit
+            now = time.monotonic()
+            for slot in np.argsort(-similarities).tolist():
+                similarity = float(similarities[slot])
+                if similarity < self.similarity_threshold:
+                    break
+                if slot not in self._entries:
+                    continue
+                cached_query, candidates, cached_limit, stored_at = self._entries[slot]
+                if now - stored_at > self.ttl_seconds:
+                    self._remove_locked(slot)
+                    continue
+                if cached_limit < candidate_limit:
+                    continue
+
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                self._hit_similarity_sum += similarity
+                if cached_query == query:
+                    self.exact_hits += 1
+                return candidates
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        query: str,
+        query_embedding: Any,
+        candidates: List[Dict[str, Any]],
+        candidate_limit: int,
+        corpus_version: Optional[int] = None
+    ) -> None:
+        """
+        후보 집합을 저장합니다 (가득 차면 LRU 항목 제거).
+
+        매개변수:
+        - corpus_version: 후보 계산을 시작할 때의 코퍼스 버전 (계산 도중 새 공지가 저장됐으면 저장 안 함)
+        """
+        if not self.enabled:
+            return
+        unit = self._unit(query_embedding)
+        if unit is None:
+            return
+
+        with self._lock:
+            self._check_version_locked()
+            if corpus_version is not None and corpus_version != self._corpus_version:
+                return
+            if self._vectors is None or unit.size != self._vectors.shape[1]:
+                self._vectors = np.zeros((self.max_entries, unit.size), dtype=np.float32)
+                self._entries.clear()
+                self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+            # 같은 검색어는 기존 슬롯 교체
+            for slot, entry in self._entries.items():
+                if entry[0] == query:
+                    self._remove_locked(slot)
+                    break
+            if not self._free_slots:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self.evictions += 1
+
+            slot = self._free_slots.pop()
+            self._vectors[slot] = unit
+            self._entries[slot] = (query, candidates, int(candidate_limit), time.monotonic())
+
+    def _remove_locked(self, slot: int) -> None:
+        del self._entries[slot]
+        self._vectors[slot] = 0
+        self._free_slots.append(slot)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "corpus_version": self._corpus_version,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.hits - self.exact_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "avg_hit_similarity": round(self._hit_similarity_sum / self.hits, 4) if self.hits else None
+            }
@@ -24,6 +24,8 @@ from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 from services.supabase_service import get_supabase_client
+from services.hybrid_search_service import HybridSearchService
+from services.notice_hydrator import NoticeHydrator
 from ai.gemini_client import GeminiClient
 
 load_dotenv()
@@ -49,6 +51,10 @@ class RerankingService:
         self.supabase = get_supabase_client()
         self.gemini = GeminiClient()
 
+        # 사용자 프로필은 HybridSearchService와 같은 사용자 스냅샷에서 읽음
+        # (여러 워커가 같은 mmap 세대를 공유, 스냅샷에 없는 사용자만 DB 조회)
+        self.user_snapshot = HybridSearchService.user_snapshot
+
         print("RerankingService 초기화 완료")
 
     def should_rerank(
@@ -138,11 +144,12 @@ class RerankingService:
         if not reranked:
             return candidate_users
 
-        # 기존 점수 정보 병합
+        # 기존 점수 정보 병합 (id 딕셔너리 결합)
+        by_user_id = {c["user_id"]: c for c in top_candidates}
         reranked_with_scores = []
         for r in reranked:
             user_id = r["user_id"]
-            original = next((c for c in top_candidates if c["user_id"] == user_id), {})
+            original = by_user_id.get(user_id, {})
             reranked_with_scores.append({
                 **original,
                 "user_id": user_id,
@@ -184,20 +191,25 @@ class RerankingService:
         if not user_profile:
             return candidate_notices
 
+        # 프롬프트에 필요한 제목/카테고리가 빠진 후보만 한 번에 보완
+        top_candidates = self._hydrate_notice_candidates(top_candidates)
+
         # AI 리랭킹
         reranked = self._ai_rerank_notices(user_profile, top_candidates)
 
         if not reranked:
             return candidate_notices
 
-        # 기존 정보 병합 (id 또는 notice_id로 매칭)
+        # 기존 정보 병합 (id 또는 notice_id → 후보 딕셔너리 결합)
+        by_notice_id = {}
+        for c in top_candidates:
+            for key in ("id", "notice_id"):
+                if c.get(key):
+                    by_notice_id.setdefault(c[key], c)
         reranked_with_info = []
         for r in reranked:
             notice_id = r["notice_id"]
-            original = next(
-                (c for c in top_candidates if c.get("id") == notice_id or c.get("notice_id") == notice_id),
-                {}
-            )
+            original = by_notice_id.get(notice_id, {})
             reranked_with_info.append({
                 **original,
                 "notice_id": notice_id,
@@ -212,6 +224,29 @@ class RerankingService:
     # 내부 메서드: 데이터 조회
     # =========================================================================
 
+    def _hydrate_notice_candidates(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """제목/카테고리가 없는 후보만 NoticeHydrator로 한 번에 조회해 채웁니다 (모두 있으면 DB 조회 없음)."""
+        missing = [c for c in candidates if not c.get("title") or not c.get("category")]
+        if not missing:
+            return candidates
+
+        hydrator = NoticeHydrator(self.supabase, columns="id, title, category, ai_summary")
+        hydrator.require(c.get("notice_id") or c.get("id") for c in missing)
+        hydrator.fetch()
+
+        hydrated = []
+        for c in candidates:
+            row = hydrator.row(c.get("notice_id") or c.get("id"))
+            if row is None:
+                hydrated.append(c)
+                continue
+            merged = dict(c)
+            for field in ("title", "category", "ai_summary"):
+                if not merged.get(field):
+                    merged[field] = row.get(field)
+            hydrated.append(merged)
+        return hydrated
+
     def _get_notice_summary(self, notice_id: str) -> Optional[Dict[str, Any]]:
         """공지사항 요약 정보 조회"""
         try:
@@ -227,28 +262,44 @@ class RerankingService:
             print(f"공지사항 조회 실패: {str(e)}")
             return None
 
+    def _profiles_from_snapshot(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """사용자 스냅샷에 있는 사용자의 프로필 (스냅샷이 아직 없으면 빈 딕셔너리)"""
+        users = self.user_snapshot.current()
+        if users is None:
+            return {}
+        return {
+            user_id: users.profile_at(users.row_of[user_id])
+            for user_id in user_ids if user_id in users.row_of
+        }
+
     def _get_user_profiles(self, user_ids: List[str]) -> List[Dict[str, Any]]:
-        """여러 사용자의 프로필 조회 (단일 IN 쿼리로 N+1 문제 해결)"""
+        """여러 사용자의 프로필 조회 (스냅샷 우선, 없는 사용자만 단일 IN 쿼리)"""
+        profiles = self._profiles_from_snapshot(user_ids)
+        missing = [user_id for user_id in user_ids if user_id not in profiles]
+        if missing:
+            for user in self._fetch_user_profiles(missing):
+                profiles[user["id"]] = user
+        return [profiles[user_id] for user_id in user_ids if user_id in profiles]
+
+    @staticmethod
+    def _embedded_preference(user: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """users 행에 임베드된 user_preferences (1:1이지만 PostgREST가 리스트로 줄 수 있음)"""
+        prefs = user.pop("user_preferences", None) or []
+        if isinstance(prefs, dict):
+            return prefs
+        return prefs[0] if prefs else None
+
+    def _fetch_user_profiles(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """여러 사용자의 프로필 DB 조회 (user_preferences 임베드 → 단일 IN 쿼리 1번)"""
         try:
             result = self.supabase.table("users")\
-                .select("id, department, grade")\
+                .select("id, department, grade, user_preferences(categories, keywords)")\
                 .in_("id", user_ids)\
                 .execute()
 
             users = result.data or []
-
-            # user_preferences를 한 번에 조회 (N+1 → 1+1 쿼리)
-            pref_result = self.supabase.table("user_preferences")\
-                .select("user_id, categories, keywords")\
-                .in_("user_id", user_ids)\
-                .execute()
-
-            pref_map = {}
-            for pref in (pref_result.data or []):
-                pref_map[pref["user_id"]] = pref
-
             for user in users:
-                pref = pref_map.get(user["id"])
+                pref = self._embedded_preference(user)
                 if pref:
                     user["interests"] = pref.get("keywords", [])
                     user["categories"] = pref.get("categories", [])
@@ -260,29 +311,27 @@ class RerankingService:
             return []
 
     def _get_user_profile_detail(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """단일 사용자 상세 프로필 조회"""
+        """단일 사용자 상세 프로필 조회 (스냅샷에 있으면 DB 조회 없음)"""
+        profile = self._profiles_from_snapshot([user_id]).get(user_id)
+        if profile is not None:
+            return profile
+
         try:
             result = self.supabase.table("users")\
-                .select("id, department, grade")\
+                .select("id, department, grade, user_preferences(categories, keywords, enriched_profile)")\
                 .eq("id", user_id)\
-                .single()\
+                .limit(1)\
                 .execute()
 
             if not result.data:
                 return None
 
-            user = result.data
-
-            pref_result = self.supabase.table("user_preferences")\
-                .select("categories, keywords, enriched_profile")\
-                .eq("user_id", user_id)\
-                .single()\
-                .execute()
-
-            if pref_result.data:
-                user["interests"] = pref_result.data.get("keywords", [])
-                user["categories"] = pref_result.data.get("categories", [])
-                user["enriched_profile"] = pref_result.data.get("enriched_profile", {})
+            user = result.data[0]
+            pref = self._embedded_preference(user)
+            if pref:
+                user["interests"] = pref.get("keywords", [])
+                user["categories"] = pref.get("categories", [])
+                user["enriched_profile"] = pref.get("enriched_profile", {})
 
             return user
 
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Supabase 왕복(round trip) 계측 모듈
+
+이 파일이 하는 일:
+공유 Supabase 클라이언트의 HTTP 요청(PostgREST 테이블/RPC, Auth)을 세어
+요청(검색 API 호출) 하나가 DB와 몇 번 왕복했는지 기록합니다.
+
+- instrument_client: httpx 요청 훅 등록 (클라이언트 생성 시 1번, supabase_service에서 호출)
+- begin_count / end_count: 현재 컨텍스트(Flask 요청 스레드)의 카운터 시작/종료
+  → 백그라운드 동기화 스레드의 요청은 카운터가 없으므로 세지 않음
+- record / stats: 엔드포인트별 평균/최대 왕복 수 (/api/search/health에 노출)
+
+응답 헤더 X-Supabase-Round-Trips로도 요청별 값을 확인할 수 있습니다 (routes/search.py).
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional
+
+ROUND_TRIP_KINDS = ("rest", "rpc", "auth")
+
+_current: ContextVar[Optional[Dict[str, int]]] = ContextVar("supabase_round_trips", default=None)
+
+_stats_lock = threading.Lock()
+_endpoint_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def _on_request(request) -> None:
+    """httpx 요청 훅: 현재 컨텍스트에 카운터가 있으면 종류별로 1 증가"""
+    counts = _current.get()
+    if counts is None:
+        return
+    path = request.url.path
+    if "/auth/v1/" in path:
+        counts["auth"] += 1
+    elif "/rest/v1/rpc/" in path:
+        counts["rpc"] += 1
+    else:
+        counts["rest"] += 1
+
+
+def instrument_client(client) -> None:
+    """Supabase 클라이언트의 PostgREST/Auth HTTP 세션에 요청 훅을 등록합니다."""
+    sessions = [client.postgrest.session]
+    auth_http = getattr(client.auth, "_http_client", None)
+    if auth_http is not None:
+        sessions.append(auth_http)
+    for session in sessions:
+        hooks = session.event_hooks
+        if _on_request not in hooks["request"]:
+            hooks["request"].append(_on_request)
+            session.event_hooks = hooks
+
+
+def begin_count() -> Token:
+    return _current.set({kind: 0 for kind in ROUND_TRIP_KINDS})
+
+
+def end_count(token: Token) -> Dict[str, int]:
+    counts = _current.get() or {kind: 0 for kind in ROUND_TRIP_KINDS}
+    _current.reset(token)
+    return counts
+
+
+def current_count() -> Optional[int]:
+    """지금까지의 왕복 수 (카운터가 없으면 None)"""
+    counts = _current.get()
+    return sum(counts.values()) if counts is not None else None
+
+
+@contextmanager
+def counting() -> Iterator[Dict[str, int]]:
+    """with counting() as counts: ... (스크립트/테스트용)"""
+    token = begin_count()
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def record(endpoint: str, counts: Dict[str, int]) -> None:
+    total = sum(counts.values())
+    with _stats_lock:
+        stats = _endpoint_stats.setdefault(endpoint, {
+            "requests": 0, "round_trips": 0, "max_round_trips": 0, **{kind: 0 for kind in ROUND_TRIP_KINDS}
+        })
+        stats["requests"] += 1
+        stats["round_trips"] += total
+        stats["max_round_trips"] = max(stats["max_round_trips"], total)
+        for kind in ROUND_TRIP_KINDS:
+            stats[kind] += counts.get(kind, 0)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """엔드포인트별 요청 수, 평균/최대 왕복 수, 종류별 누적"""
+    with _stats_lock:
+        return {
+            endpoint: {
+                **values,
+                "avg_round_trips": round(values["round_trips"] / values["requests"], 2) if values["requests"] else 0.0
+            }
+            for endpoint, values in _endpoint_stats.items()
+        }
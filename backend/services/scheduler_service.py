@@ -104,6 +104,7 @@ class SchedulerService:
             from datetime import timedelta, timezone
             from services.supabase_service import get_supabase_client
             from crawler.notice_crawler import NoticeCrawler
+            from services.notice_suggest_index import get_notice_suggest_index
 
             supabase = get_supabase_client()
             crawler = NoticeCrawler()
@@ -160,6 +161,7 @@ class SchedulerService:
                             .update({"view_count": new_views})\
                             .eq("id", notice["id"])\
                             .execute()
+                        get_notice_suggest_index().update_views(notice["id"], new_views)
                         updated += 1
 
                 except Exception:
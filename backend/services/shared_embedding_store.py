@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+워커 간 공유 임베딩 스냅샷 모듈
+
+이 파일이 하는 일:
+gunicorn 등으로 워커 프로세스를 여러 개 띄울 때, 사용자/공지 임베딩을 워커마다
+Supabase에서 따로 받아 각자 메모리에 들고 있지 않도록 한 프로세스(writer)만 갱신해서
+스냅샷 세대로 저장하고, 나머지 워커(reader)는 같은 .npy 파일을 mmap으로 읽습니다.
+
+- 세대 디렉터리 + CURRENT 교체 방식은 IndexSnapshotStore 그대로 사용
+  (reader는 CURRENT 세대 번호가 바뀌었을 때만 새 세대를 매핑 → 교체가 원자적)
+- mmap 페이지는 OS 페이지 캐시에 한 벌만 올라가므로 워커 수만큼 메모리가 늘지 않음
+- writer 선출: {dir}/writer.lock 에 비차단 flock, 잡은 프로세스가 writer
+  (writer가 죽으면 잠금이 풀리고 다음 reader가 재시도할 때 넘겨받음)
+
+역할 (환경 변수 SHARED_EMBEDDING_ROLE):
+- auto   : flock으로 writer 선출 (기본값)
+- writer : 항상 writer (갱신 전용 프로세스를 따로 둘 때)
+- reader : 항상 reader (writer 세대가 오래되면 스스로 DB에서 갱신)
+- off    : 공유하지 않음 (프로세스별 재시작용 스냅샷만 사용)
+"""
+
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 불가 → 각자 writer로 동작
+    fcntl = None
+
+from services.index_snapshot import IndexSnapshotStore
+
+
+def default_snapshot_dir() -> Optional[str]:
+    """
+    검색 인덱스 스냅샷 루트 디렉터리 (SEARCH_SNAPSHOT_DIR, 기본 backend/.cache/search_snapshots)
+    SEARCH_SNAPSHOT_ENABLED=false면 None (저장/복원하지 않음)
+    """
+    if os.getenv("SEARCH_SNAPSHOT_ENABLED", "true").lower() != "true":
+        return None
+    return os.getenv("SEARCH_SNAPSHOT_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "search_snapshots"
+    )
+
+
+def default_snapshot_role() -> str:
+    """워커 간 스냅샷 공유 역할 (SHARED_EMBEDDING_ROLE, 기본 auto)"""
+    return os.getenv("SHARED_EMBEDDING_ROLE", "auto")
+
+
+class SharedEmbeddingStore(IndexSnapshotStore):
+    """
+    writer 1개 + reader 여러 개가 공유하는 스냅샷 디렉터리
+
+    사용 예시:
+    store = SharedEmbeddingStore("/var/data/search", "users", role="auto")
+    if store.is_writer():
+        store.write(arrays, manifest)                   # 새 세대 발행
+    elif store.current_generation() != my_generation:
+        arrays, manifest = store.read(kind="users")      # 새 세대 매핑
+    """
+
+    ROLES = ("auto", "writer", "reader", "off")
+    STALE_AFTER = 30 * 60           # writer 세대가 이보다 오래되면 reader도 스스로 갱신 (초)
+    LOCK_RETRY_INTERVAL = 30        # reader가 writer 잠금을 다시 시도하는 간격 (초)
+
+    def __init__(self, root: str, name: str, role: str = "auto"):
+        super().__init__(root, name)
+        if role not in self.ROLES:
+            print(f"[공유 스냅샷] 알 수 없는 역할 '{role}', auto로 동작")
+            role = "auto"
+        self.role = role
+        self._lock_handle = None
+        self._last_lock_attempt = 0.0
+
+    @property
+    def shared(self) -> bool:
+        """다른 워커와 세대를 공유하는지 (off면 재시작용 스냅샷만)"""
+        return self.role != "off"
+
+    def is_writer(self) -> bool:
+        if self.role in ("off", "writer"):
+            return True
+        if self.role == "reader":
+            return False
+        if self._lock_handle is not None:
+            return True
+
+        now = time.time()
+        if now - self._last_lock_attempt < self.LOCK_RETRY_INTERVAL:
+            return False
+        self._last_lock_attempt = now
+        return self._try_lock()
+
+    def is_stale(self, saved_at: Optional[float]) -> bool:
+        return saved_at is None or time.time() - saved_at > self.STALE_AFTER
+
+    def release(self) -> None:
+        """writer 잠금을 놓습니다 (테스트/종료용)"""
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+
+    def _try_lock(self) -> bool:
+        if fcntl is None:
+            return True
+
+        os.makedirs(self.path, exist_ok=True)
+        handle = open(os.path.join(self.path, "writer.lock"), "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+
+        self._lock_handle = handle
+        print(f"[공유 스냅샷] writer로 선출: {self.path} (pid {os.getpid()})")
+        return True
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+구면 k-means 모듈
+
+이 파일이 하는 일:
+단위 벡터 행렬을 코사인(내적) 기준으로 k개 클러스터로 묶고,
+각 행을 가장 가까운 중심에 배정합니다.
+
+사용하는 곳:
+- services/user_cluster_index.py: 사용자 임베딩 클러스터 (2단계 매칭)
+- services/ivf_vector_index.py: 공지 벡터 IVF 역색인 리스트
+
+사용 예시:
+centroids = kmeans(sample, k=64)                 # (64, 차원) 정규화된 중심
+labels = nearest_centroids(matrix, centroids)    # (n,) 중심 번호
+"""
+
+import numpy as np
+
+from ai.embedding_service import EmbeddingService
+
+
+def kmeans(data: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    단위 벡터 행렬을 구면 k-means(코사인)로 묶어 정규화된 중심 (k, dimension)을 반환합니다.
+
+    빈 클러스터는 현재 중심과 가장 먼 표본으로 다시 시작합니다.
+    (호출한 쪽에서 표본을 골라 전달)
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = nearest_centroids(data, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        counts = np.bincount(labels, minlength=k)
+
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            fit = np.einsum("ij,ij->i", data, centroids[labels])
+            sums[empty] = data[np.argsort(fit)[:empty.size]]
+
+        centroids = EmbeddingService.normalize(sums)
+    return centroids
+
+
+def nearest_centroids(matrix: np.ndarray, centroids: np.ndarray, chunk_rows: int = 8192) -> np.ndarray:
+    """각 행에 가장 가까운(내적이 큰) 중심 번호 (청크 단위로 (청크 × k) 임시 행렬 크기 제한)"""
+    labels = np.empty(len(matrix), dtype=np.int32)
+    for start in range(0, len(matrix), chunk_rows):
+        chunk = matrix[start:start + chunk_rows]
+        labels[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
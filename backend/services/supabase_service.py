@@ -12,12 +12,28 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 from supabase import create_client, Client
 
+from services.feed_cache import bump_corpus_version
+from services.notice_cursor import apply_keyset
+from services.round_trip_counter import instrument_client
+
 
 # 모듈 레벨 싱글턴 클라이언트 (모든 곳에서 공유)
 _shared_client: Optional[Client] = None
 _client_created_at: float = 0  # 클라이언트 생성 시각 (time.time())
 _CLIENT_MAX_AGE = 30 * 60  # 30분마다 자동 갱신 (stale WebSocket 예방)
 
+# 공지 조회 컬럼 (content_embedding은 건당 ~15KB JSON이므로 API 응답용 조회에서 제외)
+NOTICE_LIST_COLUMNS = (
+    "id, title, content, category, published_at, source_url, "
+    "view_count, ai_summary, author, deadline, deadlines, "
+    "bookmark_count, source_board, board_seq, attachments, "
+    "content_images, display_mode, has_important_image"
+)
+NOTICE_DETAIL_COLUMNS = (
+    NOTICE_LIST_COLUMNS + ", original_id, enriched_metadata, is_processed, "
+    "ai_analyzed_at, created_at, updated_at"
+)
+
 
 def get_supabase_client() -> Client:
     """싱글턴 Supabase 클라이언트를 반환합니다. 모든 모듈에서 공유합니다.
@@ -53,6 +69,8 @@ def _create_supabase_client() -> Client:
     if not url or not key:
         raise ValueError("SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다")
     client = create_client(url, key)
+    # 요청별 DB 왕복 수 계측 (services/round_trip_counter.py)
+    instrument_client(client)
     print(f"[DB] Supabase 클라이언트 초기화 완료")
     return client
 
@@ -177,7 +195,8 @@ class SupabaseService:
         limit: int = 20,
         offset: int = 0,
         user_id: Optional[str] = None,
-        deadline_from: Optional[str] = None
+        deadline_from: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         공지사항 목록을 조회합니다
@@ -185,9 +204,13 @@ class SupabaseService:
         매개변수:
         - category: 카테고리 필터 (선택)
         - limit: 가져올 개수 (기본 20, 0이면 무제한)
-        - offset: 건너뛸 개수 (페이지네이션)
+        - offset: 건너뛸 개수 (cursor가 없을 때만 사용하는 이전 방식 페이지네이션)
         - user_id: 사용자 ID (있으면 is_bookmarked 포함)
         - deadline_from: 마감일 필터 (이 날짜 이후 마감인 공지만, ISO 형식)
+        - cursor: 이전 페이지의 next_cursor (services/notice_cursor.py, 정렬은 latest 또는 deadline)
+
+        예외:
+        - ValueError: 잘못된 cursor (라우트에서 400)
 
         반환값:
         - 공지사항 리스트 (bookmark_count, is_bookmarked 포함)
@@ -195,25 +218,22 @@ class SupabaseService:
         try:
             # content_embedding 제외 (프론트엔드에서 불필요, 건당 ~12KB 절약)
             query = self.client.table("notices")\
-                .select(
-                    "id, title, content, category, published_at, source_url, "
-                    "view_count, ai_summary, author, deadline, deadlines, "
-                    "bookmark_count, source_board, board_seq, attachments, "
-                    "content_images, display_mode, has_important_image"
-                )
+                .select(NOTICE_LIST_COLUMNS)
 
             if category:
                 query = query.eq("category", category)
 
-            # 마감일 필터: deadline_from 이후 마감인 공지만
+            # 마감일 필터: deadline_from 이후 마감인 공지만 (마감일 오름차순)
             if deadline_from:
                 query = query.gte("deadline", deadline_from)
-                query = query.order("deadline", desc=False)
-            else:
-                query = query.order("published_at", desc=True)
 
-            # limit=0이면 무제한, 아니면 페이지네이션 적용
-            if limit > 0:
+            # 정렬 + 커서 다음 행만 (커서가 없으면 첫 페이지)
+            query = apply_keyset(query, "deadline" if deadline_from else "latest", cursor)
+
+            # limit=0이면 무제한, 커서가 있으면 limit만, 없으면 오프셋 페이지네이션
+            if limit > 0 and cursor:
+                query = query.limit(limit)
+            elif limit > 0:
                 query = query.range(offset, offset + limit - 1)
 
             result = query.execute()
@@ -233,6 +253,8 @@ class SupabaseService:
 
             return notices
 
+        except ValueError:
+            raise
         except Exception as e:
             print(f"[ERROR] 조회 에러: {str(e)}")
             return []
@@ -253,7 +275,7 @@ class SupabaseService:
         """
         try:
             result = self.client.table("notices")\
-                .select("*")\
+                .select(NOTICE_DETAIL_COLUMNS)\
                 .eq("id", notice_id)\
                 .single()\
                 .execute()
@@ -264,6 +286,20 @@ class SupabaseService:
             print(f"[ERROR] 조회 에러: {str(e)}")
             return None
 
+    @staticmethod
+    def _remove_from_search_indexes(notice_id: str) -> None:
+        """
+        같은 프로세스의 메모리 검색 인덱스에서 삭제된 공지를 바로 뺍니다.
+        (watermark 동기화는 updated_at 변경만 보므로 삭제는 전체 재적재 전까지 반영되지 않음)
+        """
+        # 순환 import 방지 (인덱스 모듈이 이 모듈의 get_supabase_client를 사용)
+        from services.notice_text_index import get_notice_text_index
+        from services.notice_suggest_index import get_notice_suggest_index
+        from services.notice_vector_index import get_notice_vector_index
+
+        for index in (get_notice_text_index(), get_notice_suggest_index(), get_notice_vector_index()):
+            index.remove(notice_id)
+
     def delete_notice(self, notice_id: str) -> bool:
         """
         공지사항을 삭제합니다
@@ -284,6 +320,9 @@ class SupabaseService:
                 .eq("id", notice_id)\
                 .execute()
 
+            # 삭제된 공지가 캐시된 맞춤/코호트 피드에 남지 않도록 코퍼스 버전 증가
+            bump_corpus_version()
+            self._remove_from_search_indexes(notice_id)
             return True
 
         except Exception as e:
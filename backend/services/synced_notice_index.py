@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+updated_at 기준 증분 동기화 공지 인덱스 공통 모듈
+
+이 파일이 하는 일:
+공지 테이블을 메모리 인덱스로 유지하는 클래스(전문 검색, 검색어 자동완성)가 공유하는
+동기화 규칙을 한 곳에 둡니다 (벡터 검색, 전문 검색, 검색어 자동완성).
+
+- 첫 sync / FULL_RESYNC_INTERVAL 경과 / 삭제 표시 비율 COMPACT_RATIO 초과: 전체 재적재
+  (새 인스턴스를 따로 채운 뒤 _adopt로 교체 → 적재 중에도 기존 인덱스로 검색)
+- 그 외: updated_at > watermark 인 행만 조회해서 upsert_many
+- DB 조회는 읽기 잠금(_lock) 밖에서, 동기화는 한 번에 하나(_sync_lock)
+- 검색 요청은 sync_in_background만 호출 (전체 적재 전에는 ready=False → 호출 측이 DB로 대체)
+
+하위 클래스가 구현할 것:
+- FIELDS, LOG_PREFIX
+- _reset(): 빈 인덱스 상태, _adopt(other): 다른 인스턴스의 상태로 교체
+- upsert_many(rows), dead_ratio(), describe(): 로그용 요약 문자열
+
+필요하면 재정의 (NoticeVectorIndex: 디스크 스냅샷 복원/저장, IVF 학습):
+- _new_target(): 전체 재적재를 채울 빈 인스턴스
+- _before_sync(): DB 조회 전 훅, True면 조회 없이 종료
+- _after_full_load(target): 전체 재적재를 채운 뒤 교체 전 (잠금 밖)
+- _after_sync(full, applied, now): 반영 직후 (잠금 안)
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from services.supabase_service import get_supabase_client
+
+
+class SyncedNoticeIndex(ABC):
+    """공지 테이블을 watermark로 따라가는 메모리 인덱스의 기반 클래스"""
+
+    SYNC_PAGE_SIZE = 500
+    MIN_SYNC_INTERVAL = 60
+    FULL_RESYNC_INTERVAL = 6 * 60 * 60
+    COMPACT_RATIO = 0.25          # 삭제 표시 항목 비율이 넘으면 전체 재적재
+
+    FIELDS = "id, updated_at"
+    LOG_PREFIX = "[공지 인덱스]"
+
+    def __init__(self):
+        self._lock = threading.RLock()          # 인덱스 읽기/쓰기
+        self._sync_lock = threading.Lock()      # 동기화는 한 번에 하나 (DB 조회는 _lock 밖에서)
+        self._sync_thread: Optional[threading.Thread] = None
+        self._reset()
+        self._watermark: Optional[str] = None
+        self._last_sync_at = 0.0
+        self._last_full_sync_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """한 번 이상 전체 적재했는지 (False면 호출 측이 DB 조회로 대체)"""
+        return self._last_full_sync_at > 0
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """빈 인덱스 상태로 초기화"""
+
+    @abstractmethod
+    def _adopt(self, other: "SyncedNoticeIndex") -> None:
+        """전체 재적재로 채운 다른 인스턴스의 상태로 교체 (_lock 안에서 호출)"""
+
+    @abstractmethod
+    def upsert_many(self, notices: List[Dict[str, Any]]) -> None:
+        """공지 행들을 인덱스에 추가/갱신"""
+
+    def dead_ratio(self) -> float:
+        return 0.0
+
+    def describe(self) -> str:
+        return ""
+
+    def _new_target(self) -> "SyncedNoticeIndex":
+        return type(self)()
+
+    def _before_sync(self) -> bool:
+        return False
+
+    def _after_full_load(self, target: "SyncedNoticeIndex") -> None:
+        pass
+
+    def _after_sync(self, full: bool, applied: int, now: float) -> None:
+        pass
+
+    def sync(self, force: bool = False) -> int:
+        """
+        DB와 인덱스를 동기화합니다.
+
+        다른 스레드가 동기화 중이면 기다리지 않고 바로 반환합니다.
+
+        반환값:
+        - 반영된 행 수
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            return 0
+
+        try:
+            now = time.time()
+            with self._lock:
+                if not force and now - self._last_sync_at < self.MIN_SYNC_INTERVAL:
+                    return 0
+
+                if self._before_sync():
+                    self._last_sync_at = now
+                    return 0
+
+                full = (self._watermark is None
+                        or now - self._last_full_sync_at > self.FULL_RESYNC_INTERVAL
+                        or self.dead_ratio() > self.COMPACT_RATIO)
+                watermark = None if full else self._watermark
+
+            target = self._new_target() if full else self
+
+            applied = 0
+            for rows in self._fetch_pages(since=watermark):
+                for row in rows:
+                    updated_at = row.get("updated_at")
+                    if updated_at and (watermark is None or updated_at > watermark):
+                        watermark = updated_at
+                target.upsert_many(rows)
+                applied += len(rows)
+
+            if full:
+                self._after_full_load(target)
+
+            with self._lock:
+                if full:
+                    self._adopt(target)
+                    self._last_full_sync_at = now
+                self._watermark = watermark
+                self._last_sync_at = now
+                self._after_sync(full, applied, now)
+
+            if full:
+                print(f"{self.LOG_PREFIX} 전체 적재 완료: {self.describe()}")
+            elif applied:
+                print(f"{self.LOG_PREFIX} 증분 동기화: {applied}개 반영 ({self.describe()})")
+            return applied
+
+        finally:
+            self._sync_lock.release()
+
+    def sync_in_background(self) -> None:
+        """별도 스레드에서 sync (검색 요청이 전체 적재를 기다리지 않도록)"""
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+        self._sync_thread = threading.Thread(target=self._sync_quietly, daemon=True)
+        self._sync_thread.start()
+
+    def _sync_quietly(self) -> None:
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"{self.LOG_PREFIX} 동기화 실패: {str(e)}")
+
+    def _fetch_pages(self, since: Optional[str]) -> Iterable[List[Dict[str, Any]]]:
+        """updated_at 오름차순으로 공지를 페이지 단위로 조회합니다."""
+        client = get_supabase_client()
+        offset = 0
+        while True:
+            query = client.table("notices").select(self.FIELDS)
+            if since:
+                query = query.gt("updated_at", since)
+
+            rows = query\
+                .order("updated_at", desc=False)\
+                .order("id", desc=False)\
+                .range(offset, offset + self.SYNC_PAGE_SIZE - 1)\
+                .execute().data or []
+            yield rows
+
+            if len(rows) < self.SYNC_PAGE_SIZE:
+                break
+            offset += self.SYNC_PAGE_SIZE
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 관심사 클러스터 인덱스 모듈
+
+이 파일이 하는 일:
+사용자 관심사 임베딩을 k-means(코사인)로 묶어 중심 벡터와 사용자별 배정을 보관하고,
+공지 → 사용자 매칭 시 가까운 클러스터의 구성원만 후보로 돌려줍니다.
+
+2단계 매칭:
+1. 공지 벡터 × 클러스터 중심 (k개) → 상위 probes개 클러스터 선택
+2. 선택된 클러스터 구성원만 768차원 정확 유사도 계산
+   (전체 사용자 대신 약 n × probes / k명만 계산)
+
+구성원 벡터는 클러스터 순서로 한 벌 더 복사해 둡니다 (사용자 행렬만큼 메모리 추가).
+행 번호로 모아 오는(gather) 복사가 행렬 곱보다 비싸서, 클러스터별 연속 구간을 그대로
+잘라 쓰고 같은 클러스터를 고른 공지들은 한 번의 행렬 곱으로 계산합니다.
+
+갱신:
+- fit: 표본(sample_size명)으로 중심 학습 후 전체 사용자 배정 (오프라인/파이프라인)
+- aligned_to: 사용자 스냅샷이 바뀌면 새로 생기거나 임베딩이 바뀐 사용자만 가장 가까운 중심에 배정
+- needs_refit: 재배정 누적 비율 또는 경과 시간이 기준을 넘으면 다시 학습
+- save/load: .npz 파일로 저장 (다른 프로세스의 파이프라인 실행에서도 재사용)
+"""
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.spherical_kmeans import kmeans, nearest_centroids
+from services.user_embedding_snapshot import UserMatrix
+
+
+class UserClusterIndex:
+    """
+    k-means 중심 + 사용자 클러스터 배정
+
+    사용 예시:
+    index = UserClusterIndex.fit(users)            # users: UserMatrix
+    for rows, scores in index.score(notice_unit_matrix, probes=32):
+        ...                                         # 공지별 후보 행 번호와 정확 유사도
+    """
+
+    ASSIGN_CHUNK_ROWS = 8192            # 배정 계산 시 (청크 × k) 임시 행렬 크기 제한
+    REFIT_RATIO = 0.1                   # 학습 이후 재배정된 사용자 비율이 넘으면 재학습
+    REFIT_INTERVAL = 24 * 60 * 60       # 재학습 최대 간격 (초)
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        users: Optional[UserMatrix],
+        ids: list,
+        assignments: np.ndarray,
+        fitted_at: float,
+        fitted_size: int,
+        reassigned: int = 0
+    ):
+        self.centroids = centroids
+        self.users = users                  # 배정 기준 스냅샷 (디스크에서 읽은 직후는 None)
+        self.ids = ids
+        self.assignments = assignments
+        self.fitted_at = fitted_at
+        self.fitted_size = fitted_size
+        self.reassigned = reassigned
+
+        # 클러스터별 구성원 행 번호 (CSR: order[offsets[c]:offsets[c + 1]])
+        self._order = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=len(centroids))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._members = users.matrix[self._order] if users is not None else None
+
+    @property
+    def k(self) -> int:
+        return len(self.centroids)
+
+    def cluster_sizes(self) -> np.ndarray:
+        return np.diff(self._offsets)
+
+    def is_aligned(self, users: UserMatrix) -> bool:
+        """배정 행 순서가 이 스냅샷과 같은지"""
+        return self.users is users
+
+    # =========================================================================
+    # 학습 / 배정
+    # =========================================================================
+
+    @classmethod
+    def fit(
+        cls,
+        users: UserMatrix,
+        k: Optional[int] = None,
+        iterations: int = 10,
+        sample_size: int = 20000,
+        seed: int = 0
+    ) -> "UserClusterIndex":
+        """
+        임베딩이 있는 사용자로 구면 k-means를 학습하고 전체 사용자를 배정합니다.
+
+        매개변수:
+        - users: 사용자 스냅샷
+        - k: 클러스터 수 (기본: √(임베딩 있는 사용자 수), 8~1024)
+        - iterations: Lloyd 반복 횟수
+        - sample_size: 중심 학습에 쓸 표본 수 (배정은 전체)
+        """
+        rng = np.random.default_rng(seed)
+        embedded = np.flatnonzero(users.has_embedding)
+        if embedded.size == 0:
+            raise ValueError("임베딩이 있는 사용자가 없습니다")
+
+        k = k or int(np.clip(np.sqrt(embedded.size), 8, 1024))
+        sample = embedded if embedded.size <= sample_size else rng.choice(embedded, sample_size, replace=False)
+        data = users.matrix[np.sort(sample)]
+        centroids = kmeans(data, k, iterations=iterations, seed=seed)
+
+        assignments = cls._nearest(users.matrix, centroids)
+        index = cls(centroids, users, users.ids, assignments, time.time(), len(users))
+        sizes = index.cluster_sizes()
+        print(f"[사용자 클러스터] 학습 완료: k={index.k}, 사용자 {len(users)}명 "
+              f"(표본 {len(data)}명, 클러스터 크기 중앙값 {int(np.median(sizes))}, 최대 {int(sizes.max())})")
+        return index
+
+    @classmethod
+    def _nearest(cls, matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """각 행에 가장 가까운(내적이 큰) 중심 번호"""
+        return nearest_centroids(matrix, centroids, cls.ASSIGN_CHUNK_ROWS)
+
+    def aligned_to(self, users: UserMatrix) -> "UserClusterIndex":
+        """
+        새 사용자 스냅샷에 맞춘 인덱스를 반환합니다 (중심은 그대로).
+
+        기존 사용자 중 임베딩이 같은 행은 배정을 그대로 옮기고,
+        신규 사용자와 임베딩이 바뀐 사용자만 가장 가까운 중심에 배정합니다.
+        """
+        if self.is_aligned(users):
+            return self
+
+        assignments = np.empty(len(users), dtype=np.int32)
+        stale = np.ones(len(users), dtype=bool)
+
+        if self.users is not None:
+            old_row_of = self.users.row_of
+            pairs = [(row, old_row_of[uid]) for row, uid in enumerate(users.ids) if uid in old_row_of]
+            if pairs:
+                new_rows, old_rows = (np.array(x, dtype=np.int64) for x in zip(*pairs))
+                same = np.all(users.matrix[new_rows] == self.users.matrix[old_rows], axis=1)
+                assignments[new_rows[same]] = self.assignments[old_rows[same]]
+                stale[new_rows[same]] = False
+
+        stale_rows = np.flatnonzero(stale)
+        if stale_rows.size:
+            assignments[stale_rows] = self._nearest(users.matrix[stale_rows], self.centroids)
+
+        return UserClusterIndex(
+            self.centroids, users, users.ids, assignments,
+            self.fitted_at, self.fitted_size, self.reassigned + int(stale_rows.size)
+        )
+
+    def needs_refit(self) -> bool:
+        return (
+            self.reassigned > self.fitted_size * self.REFIT_RATIO
+            or time.time() - self.fitted_at > self.REFIT_INTERVAL
+        )
+
+    # =========================================================================
+    # 검색
+    # =========================================================================
+
+    def candidate_rows(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """
+        쿼리와 가까운 상위 probes개 클러스터의 구성원 행 번호를 반환합니다.
+
+        매개변수:
+        - query: 정규화된 공지 벡터 (dimension,)
+        - probes: 펼칠 클러스터 수
+        """
+        probes = min(probes, self.k)
+        scores = self.centroids @ query
+        top = np.argpartition(-scores, probes - 1)[:probes]
+        return np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in top])
+
+    def score(self, queries: np.ndarray, probes: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        공지마다 가까운 상위 probes개 클러스터 구성원의 정확 유사도를 계산합니다.
+
+        매개변수:
+        - queries: 정규화된 공지 행렬 (공지 수, dimension)
+        - probes: 공지당 펼칠 클러스터 수
+
+        반환값:
+        - 공지 순서대로 [(사용자 행 번호, 유사도), ...]
+        """
+        probes = min(probes, self.k)
+        top = np.argpartition(-(queries @ self.centroids.T), probes - 1, axis=1)[:, :probes]
+
+        parts: List[List[Tuple[np.ndarray, np.ndarray]]] = [[] for _ in range(len(queries))]
+        for cluster in np.unique(top):
+            start, end = self._offsets[cluster], self._offsets[cluster + 1]
+            if start == end:
+                continue
+            probing = np.flatnonzero((top == cluster).any(axis=1))
+            block = self._members[start:end] @ queries[probing].T
+            for column, query_row in enumerate(probing):
+                parts[query_row].append((self._order[start:end], block[:, column]))
+
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        return [
+            (np.concatenate([r for r, _ in p]), np.concatenate([s for _, s in p])) if p else empty
+            for p in parts
+        ]
+
+    # =========================================================================
+    # 저장 / 불러오기
+    # =========================================================================
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            ids=np.array(self.ids, dtype=object),
+            assignments=self.assignments,
+            fitted_at=self.fitted_at,
+            fitted_size=self.fitted_size
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, users: UserMatrix) -> Optional["UserClusterIndex"]:
+        """
+        저장된 중심/배정을 읽어 현재 스냅샷에 맞춥니다.
+
+        저장 이후 임베딩이 바뀐 사용자는 알 수 없으므로 배정은 모두 다시 계산하고
+        (중심 k개와의 행렬 곱 1회), 차원이 다르면 None을 반환합니다.
+        """
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path, allow_pickle=True) as saved:
+            centroids = saved["centroids"].astype(np.float32)
+            fitted_at = float(saved["fitted_at"])
+            fitted_size = int(saved["fitted_size"])
+
+        if centroids.shape[1] != users.matrix.shape[1]:
+            print(f"[사용자 클러스터] 저장된 중심 차원 불일치, 무시: {path}")
+            return None
+
+        assignments = cls._nearest(users.matrix, centroids)
+        print(f"[사용자 클러스터] 저장된 중심 로드: k={len(centroids)} ({path})")
+        return cls(centroids, users, users.ids, assignments, fitted_at, fitted_size)
@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 임베딩 스냅샷 모듈
+
+이 파일이 하는 일:
+알림 매칭에 필요한 사용자 정보(관심사 임베딩, 학과, 학년, 알림 설정, 관심 카테고리)를
+메모리에 행렬 + 병렬 배열로 보관하고, 바뀐 행만 다시 받아 갱신합니다.
+
+구조 (UserMatrix, 한 번 만들면 바꾸지 않음):
+- matrix: (사용자 수 × 768) float32 단위 벡터 (임베딩 없는 사용자는 영벡터)
+- ids / departments / grades / notification_enabled / has_embedding / categories / keywords: 행 순서 병렬 배열
+
+갱신 기준 (스냅샷 키):
+- users.updated_at 최댓값, user_preferences.updated_at 최댓값, 사용자 수
+- 키가 같으면 재사용 (확인 쿼리 2회)
+- 키가 바뀌면 updated_at이 기준보다 큰 사용자만 다시 조회해 새 UserMatrix로 교체
+- 사용자 수가 줄었거나(삭제) FULL_REFRESH_INTERVAL이 지나면 전체 재적재
+
+디스크 스냅샷 (snapshot_dir를 주면):
+- 전체 적재 직후와 증분 갱신 후 SAVE_INTERVAL마다 백그라운드 스레드에서 저장
+- 프로세스 시작 후 첫 refresh에서 파일을 mmap으로 매핑하고 저장 당시 키 이후 변경분만 조회
+  (전체 재적재는 RESTORE_GRACE 뒤로 미룸 → 재시작 직후 첫 요청이 전체 조회를 기다리지 않음)
+
+워커 간 공유 (snapshot_role이 off가 아니면, services/shared_embedding_store.py):
+- writer 워커만 DB에서 갱신하고 PUBLISH_INTERVAL마다 새 세대를 저장
+- reader 워커는 세대 번호가 바뀌면 새 세대를 mmap으로 매핑해 교체 (DB 조회 없음)
+- writer 세대가 STALE_AFTER보다 오래되면 reader도 스스로 DB에서 갱신
+
+왜 필요한가?
+- 기존: 공지마다 users + user_preferences 전체를 조회 (파이프라인 1회에 최대 30번)
+- 스냅샷: 변경이 없으면 확인 쿼리만, 변경이 있으면 바뀐 사용자만 조회
+  (HybridSearchService 클래스 공유 → 같은 프로세스의 다음 파이프라인 실행에서도 재사용)
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ai.embedding_service import EmbeddingService
+from ai.embedding_codec import parse_vector
+from services.shared_embedding_store import SharedEmbeddingStore
+from services.supabase_service import get_supabase_client
+
+
+class UserMatrix:
+    """
+    사용자 임베딩 행렬 + 병렬 배열 (읽기 전용)
+
+    갱신은 항상 새 인스턴스를 만들어 교체하므로
+    검색 중인 스레드는 잠금 없이 같은 인스턴스를 끝까지 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        matrix: np.ndarray,
+        departments: np.ndarray,
+        grades: np.ndarray,
+        notification_enabled: np.ndarray,
+        has_embedding: np.ndarray,
+        categories: List[List[str]],
+        keywords: Optional[List[List[str]]] = None
+    ):
+        self.ids = ids
+        self.matrix = matrix
+        self.departments = departments
+        self.grades = grades
+        self.notification_enabled = notification_enabled
+        self.has_embedding = has_embedding
+        self.categories = categories
+        self.keywords = keywords if keywords is not None else [[] for _ in ids]
+        self.row_of: Dict[str, int] = {user_id: row for row, user_id in enumerate(ids)}
+        self._prefixes: Dict[int, np.ndarray] = {}
+        self._category_masks: Dict[str, np.ndarray] = {}
+        self._prefix_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + sum(p.nbytes for p in self._prefixes.values())
+
+    def prefix(self, dimension: int) -> np.ndarray:
+        """앞쪽 dimension차원만 남겨 재정규화한 행렬 (Matryoshka 1차 선별용, 첫 요청 때 만들고 재사용)"""
+        with self._prefix_lock:
+            if dimension not in self._prefixes:
+                self._prefixes[dimension] = EmbeddingService.truncate(self.matrix, dimension)
+            return self._prefixes[dimension]
+
+    def category_mask(self, category: str) -> np.ndarray:
+        """관심 카테고리에 category가 있는 사용자 마스크 (카테고리별로 한 번만 계산)"""
+        mask = self._category_masks.get(category)
+        if mask is None:
+            mask = np.fromiter((category in cats for cats in self.categories), dtype=bool, count=len(self.ids))
+            mask.flags.writeable = False
+            self._category_masks[category] = mask
+        return mask
+
+    def user_at(self, row: int) -> Dict[str, Any]:
+        """행 번호 → 사용자 딕셔너리 (임베딩 제외)"""
+        grade = int(self.grades[row])
+        return {
+            "id": self.ids[row],
+            "department": self.departments[row] or None,
+            "grade": grade if grade >= 0 else None,
+            "categories": self.categories[row]
+        }
+
+    def profile_at(self, row: int) -> Dict[str, Any]:
+        """행 번호 → 리랭킹 프롬프트용 프로필 (관심 키워드는 interests)"""
+        return {**self.user_at(row), "interests": self.keywords[row]}
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """디스크 스냅샷용 배열 (문자열은 str dtype, 관심 카테고리는 행별 JSON)"""
+        return {
+            "ids": np.array(self.ids, dtype=str),
+            "matrix": self.matrix,
+            "departments": self.departments.astype(str),
+            "grades": self.grades,
+            "notification_enabled": self.notification_enabled,
+            "has_embedding": self.has_embedding,
+            "categories": np.array([json.dumps(c, ensure_ascii=False) for c in self.categories], dtype=str),
+            "keywords": np.array([json.dumps(k, ensure_ascii=False) for k in self.keywords], dtype=str)
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "UserMatrix":
+        """to_arrays()로 저장한 배열로 만듭니다 (matrix는 mmap이면 그대로 매핑해서 사용)."""
+        return cls(
+            ids=arrays["ids"].tolist(),
+            matrix=arrays["matrix"],
+            departments=arrays["departments"].astype(object),
+            grades=np.array(arrays["grades"], dtype=np.int32),
+            notification_enabled=np.array(arrays["notification_enabled"], dtype=bool),
+            has_embedding=np.array(arrays["has_embedding"], dtype=bool),
+            categories=[json.loads(c) for c in arrays["categories"].tolist()],
+            keywords=[json.loads(k) for k in arrays["keywords"].tolist()] if "keywords" in arrays else None
+        )
+
+    @classmethod
+    def from_users(cls, users: List[Dict[str, Any]], dimension: int = EmbeddingService.DIMENSION) -> "UserMatrix":
+        """
+        사용자 딕셔너리 목록으로 만듭니다.
+
+        각 딕셔너리: {"id", "department", "grade", "categories", "keywords"(선택),
+                     "interests_embedding", "notification_enabled"(기본 True)}
+        """
+        builder = _UserMatrixBuilder(dimension, capacity=len(users))
+        for user in users:
+            builder.put(user)
+        return builder.build()
+
+
+class _UserMatrixBuilder:
+    """UserMatrix를 행 단위로 채우는 가변 버퍼 (증분 갱신 시 기존 배열을 복사해 시작)"""
+
+    def __init__(self, dimension: int, capacity: int = 0, base: Optional[UserMatrix] = None):
+        self.dimension = dimension
+        if base is None:
+            self.ids: List[str] = []
+            self.row_of: Dict[str, int] = {}
+            self.categories: List[List[str]] = []
+            self.keywords: List[List[str]] = []
+            size = 0
+        else:
+            self.ids = list(base.ids)
+            self.row_of = dict(base.row_of)
+            self.categories = list(base.categories)
+            self.keywords = list(base.keywords)
+            size = len(base)
+
+        capacity = max(capacity, size, 1)
+        self.matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self.departments = np.empty(capacity, dtype=object)
+        self.grades = np.full(capacity, -1, dtype=np.int32)
+        self.notification_enabled = np.zeros(capacity, dtype=bool)
+        self.has_embedding = np.zeros(capacity, dtype=bool)
+
+        if base is not None:
+            self.matrix[:size] = base.matrix
+            self.departments[:size] = base.departments
+            self.grades[:size] = base.grades
+            self.notification_enabled[:size] = base.notification_enabled
+            self.has_embedding[:size] = base.has_embedding
+
+    def _grow(self) -> None:
+        size = self.matrix.shape[0]
+        for name in ("matrix", "departments", "grades", "notification_enabled", "has_embedding"):
+            old = getattr(self, name)
+            new = np.resize(old, (size * 2,) + old.shape[1:])
+            setattr(self, name, new)
+        self.matrix[size:] = 0.0
+        self.has_embedding[size:] = False
+
+    def put(self, user: Dict[str, Any]) -> None:
+        user_id = user["id"]
+        row = self.row_of.get(user_id)
+        if row is None:
+            row = len(self.ids)
+            if row >= self.matrix.shape[0]:
+                self._grow()
+            self.ids.append(user_id)
+            self.categories.append([])
+            self.keywords.append([])
+            self.row_of[user_id] = row
+
+        try:
+            vector = parse_vector(user.get("interests_embedding"), self.dimension)
+        except ValueError as e:
+            print(f"[사용자 스냅샷] {user_id[:8]}... {str(e)}")
+            vector = None
+
+        norm = float(np.linalg.norm(vector)) if vector is not None else 0.0
+        self.matrix[row] = vector / norm if norm > 0 else 0.0
+        self.has_embedding[row] = norm > 0
+        self.departments[row] = user.get("department") or ""
+        self.grades[row] = user["grade"] if user.get("grade") is not None else -1
+        self.notification_enabled[row] = bool(user.get("notification_enabled", True))
+        self.categories[row] = user.get("categories") or []
+        self.keywords[row] = user.get("keywords") or []
+
+    def build(self) -> UserMatrix:
+        size = len(self.ids)
+        return UserMatrix(
+            ids=self.ids,
+            matrix=self.matrix[:size],
+            departments=self.departments[:size],
+            grades=self.grades[:size],
+            notification_enabled=self.notification_enabled[:size],
+            has_embedding=self.has_embedding[:size],
+            categories=self.categories,
+            keywords=self.keywords
+        )
+
+
+class UserEmbeddingSnapshot:
+    """
+    DB 변경분만 반영하는 사용자 임베딩 스냅샷
+
+    사용 예시:
+    snapshot = UserEmbeddingSnapshot()
+    users = snapshot.refresh()          # UserMatrix
+    scores = users.matrix @ notice_unit_vector
+    """
+
+    PAGE_SIZE = 1000                    # 전체 적재/변경 ID 조회 페이지 크기 (PostgREST 기본 최대 행 수)
+    CHANGED_ID_CHUNK = 200              # 변경 사용자 재조회 시 in_ 필터 묶음 크기
+    MIN_CHECK_INTERVAL = 30             # 스냅샷 키 확인 최소 간격 (초)
+    FULL_REFRESH_INTERVAL = 6 * 60 * 60 # 전체 재적재 간격 (초)
+    MAX_INCREMENTAL_RATIO = 0.2         # 바뀐 사용자가 이 비율을 넘으면 전체 재적재
+    SAVE_INTERVAL = 10 * 60             # 증분 갱신 후 디스크 저장 최소 간격 (초)
+    RESTORE_GRACE = 30 * 60             # 디스크에서 복원한 뒤 전체 재적재를 미루는 최소 시간 (초)
+    PUBLISH_INTERVAL = 60               # 워커 공유 시 writer가 증분 갱신을 발행하는 최소 간격 (초)
+
+    USER_COLUMNS = ("id, department, grade, updated_at, "
+                    "user_preferences(notification_enabled, interests_embedding, categories, keywords, updated_at)")
+
+    def __init__(
+        self,
+        dimension: int = EmbeddingService.DIMENSION,
+        snapshot_dir: Optional[str] = None,
+        snapshot_role: str = "off"
+    ):
+        """
+        매개변수:
+        - dimension: 임베딩 차원
+        - snapshot_dir: 디스크 스냅샷 루트 디렉터리 (None이면 저장/복원 안 함)
+        - snapshot_role: 워커 간 공유 역할 (auto/writer/reader/off, SharedEmbeddingStore 참고)
+        """
+        self.dimension = dimension
+        self._lock = threading.Lock()
+        self._data: Optional[UserMatrix] = None
+        self._key: Optional[Tuple[Optional[str], Optional[str], int]] = None
+        self._last_check_at = 0.0
+        self._last_full_at = 0.0
+        self.stats_counters = {"reused": 0, "incremental": 0, "full": 0, "restored": 0, "shared": 0}
+
+        self._disk = SharedEmbeddingStore(snapshot_dir, "users", snapshot_role) if snapshot_dir else None
+        self._disk_checked = False
+        self._generation: Optional[int] = None
+        self._published_at: Optional[float] = None
+        self._last_save_at = 0.0
+        self._save_thread: Optional[threading.Thread] = None
+
+    def refresh(self, force: bool = False) -> UserMatrix:
+        """
+        스냅샷을 최신 상태로 맞추고 반환합니다.
+
+        매개변수:
+        - force: True면 확인 간격과 무관하게 키를 확인
+
+        반환값:
+        - UserMatrix (조회 실패 시 직전 스냅샷, 없으면 빈 스냅샷)
+        """
+        with self._lock:
+            if self._follow_writer():
+                self.stats_counters["shared"] += 1
+                return self._data
+
+            if self._data is None and not self._disk_checked:
+                self._restore()
+
+            now = time.time()
+            if self._data is not None and not force and now - self._last_check_at < self.MIN_CHECK_INTERVAL:
+                self.stats_counters["reused"] += 1
+                return self._data
+
+            try:
+                key = self._fetch_key()
+                self._last_check_at = now
+                full = False
+
+                if self._data is not None and key == self._key:
+                    self.stats_counters["reused"] += 1
+                elif (self._data is None or self._key is None
+                      or key[2] < self._key[2]
+                      or now - self._last_full_at > self.FULL_REFRESH_INTERVAL):
+                    self._data = self._load_full(key[2])
+                    self._last_full_at = now
+                    self.stats_counters["full"] += 1
+                    full = True
+                else:
+                    data = self._load_changed(self._data, self._key)
+                    if data is None:
+                        data = self._load_full(key[2])
+                        self._last_full_at = now
+                        self.stats_counters["full"] += 1
+                        full = True
+                    else:
+                        self.stats_counters["incremental"] += 1
+                    self._data = data
+
+                # 적재 전에 읽은 키를 기준으로 저장 (적재 중 바뀐 행은 다음 확인 때 다시 반영)
+                changed = key != self._key
+                self._key = key
+                save_interval = self.PUBLISH_INTERVAL if self._disk is not None and self._disk.shared \
+                    else self.SAVE_INTERVAL
+                if full or (changed and now - self._last_save_at > save_interval):
+                    self._save_in_background()
+
+            except Exception as e:
+                print(f"[사용자 스냅샷] 갱신 실패 (직전 스냅샷 사용): {str(e)}")
+                if self._data is None:
+                    self._data = UserMatrix.from_users([], self.dimension)
+
+            return self._data
+
+    def current(self) -> Optional[UserMatrix]:
+        """
+        DB를 조회하지 않고 지금 가진 스냅샷을 반환합니다 (없으면 None).
+
+        reader 워커는 writer의 새 세대를, 처음 호출이면 디스크 스냅샷을 매핑합니다.
+        (리랭킹 프로필 조회처럼 몇 명만 필요해서 전체 적재를 기다릴 이유가 없는 곳용)
+        """
+        with self._lock:
+            if not self._follow_writer() and self._data is None and not self._disk_checked:
+                self._restore()
+            return self._data
+
+    def invalidate(self) -> None:
+        """다음 refresh에서 전체 재적재하도록 표시합니다."""
+        with self._lock:
+            self._key = None
+            self._last_check_at = 0.0
+
+    # =========================================================================
+    # 디스크 스냅샷
+    # =========================================================================
+
+    def _restore(self) -> None:
+        """디스크 스냅샷을 매핑해 시작 상태로 사용합니다 (잠금 안에서 호출)."""
+        self._disk_checked = True
+        if self._disk is None:
+            return
+
+        manifest = self._adopt()
+        if manifest is not None:
+            self._last_full_at = max(
+                manifest.get("last_full_at", 0.0),
+                time.time() - self.FULL_REFRESH_INTERVAL + self.RESTORE_GRACE
+            )
+            self._last_check_at = 0.0
+            self.stats_counters["restored"] += 1
+            print(f"[사용자 스냅샷] 디스크 스냅샷 복원: {len(self._data)}명 (세대 {manifest['generation']})")
+
+    def _follow_writer(self) -> bool:
+        """
+        reader 워커면 writer가 발행한 최신 세대로 맞춥니다 (잠금 안에서 호출).
+
+        반환값:
+        - True: 공유 세대를 그대로 쓰면 됨 / False: 직접 DB에서 갱신해야 함
+          (writer이거나, 발행된 세대가 없거나, writer 세대가 오래됨)
+        """
+        if self._disk is None or not self._disk.shared or self._disk.is_writer():
+            return False
+
+        generation = self._disk.current_generation()
+        if generation is None:
+            return False
+        if generation != self._generation:
+            manifest = self._adopt()
+            if manifest is None:
+                return False
+            self._disk_checked = True
+            self._last_full_at = manifest.get("last_full_at", 0.0)
+            self._last_check_at = time.time()
+            print(f"[사용자 스냅샷] writer 세대 적용: {len(self._data)}명 (세대 {generation})")
+
+        return self._data is not None and not self._disk.is_stale(self._published_at)
+
+    def _adopt(self) -> Optional[Dict[str, Any]]:
+        """현재 세대를 mmap으로 매핑해 교체하고 manifest를 반환합니다 (실패 시 None)."""
+        try:
+            loaded = self._disk.read(kind="users", dimension=self.dimension)
+            if loaded is None:
+                return None
+
+            arrays, manifest = loaded
+            self._data = UserMatrix.from_arrays(arrays)
+            self._key = tuple(manifest["key"])
+            self._generation = manifest["generation"]
+            self._published_at = manifest["saved_at"]
+            self._last_save_at = manifest["saved_at"]
+            return manifest
+
+        except Exception as e:
+            print(f"[사용자 스냅샷] 디스크 스냅샷 읽기 실패 (DB에서 적재): {str(e)}")
+            return None
+
+    def _save_in_background(self) -> None:
+        """현재 스냅샷을 별도 스레드에서 저장합니다 (UserMatrix는 바뀌지 않으므로 잠금 불필요)."""
+        if self._disk is None or self._data is None or not self._disk.is_writer():
+            return
+        if self._save_thread is not None and self._save_thread.is_alive():
+            return
+
+        self._last_save_at = time.time()
+        self._save_thread = threading.Thread(
+            target=self._save,
+            args=(self._data, self._key, self._last_full_at),
+            daemon=True
+        )
+        self._save_thread.start()
+
+    def _save(self, data: UserMatrix, key: Tuple[Optional[str], Optional[str], int], last_full_at: float) -> None:
+        try:
+            generation = self._disk.write(data.to_arrays(), {
+                "kind": "users",
+                "dimension": self.dimension,
+                "key": list(key),
+                "last_full_at": last_full_at
+            })
+            self._generation = generation
+            print(f"[사용자 스냅샷] 디스크 저장: {len(data)}명 (세대 {generation})")
+        except Exception as e:
+            print(f"[사용자 스냅샷] 디스크 저장 실패: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        data = self._data
+        return {
+            "users": len(data) if data is not None else 0,
+            "with_embedding": int(data.has_embedding.sum()) if data is not None else 0,
+            "memory_mb": round(data.nbytes / 2**20, 1) if data is not None else 0.0,
+            "generation": self._generation,
+            "role": self._disk.role if self._disk is not None else None,
+            **self.stats_counters
+        }
+
+    # =========================================================================
+    # DB 조회
+    # =========================================================================
+
+    def _fetch_key(self) -> Tuple[Optional[str], Optional[str], int]:
+        """(users.updated_at 최댓값, user_preferences.updated_at 최댓값, 사용자 수)"""
+        client = get_supabase_client()
+        users = client.table("users")\
+            .select("updated_at", count="exact")\
+            .order("updated_at", desc=True)\
+            .limit(1)\
+            .execute()
+        prefs = client.table("user_preferences")\
+            .select("updated_at")\
+            .order("updated_at", desc=True)\
+            .limit(1)\
+            .execute()
+
+        users_max = users.data[0]["updated_at"] if users.data else None
+        prefs_max = prefs.data[0]["updated_at"] if prefs.data else None
+        return users_max, prefs_max, users.count or 0
+
+    def _load_full(self, expected_count: int) -> UserMatrix:
+        builder = _UserMatrixBuilder(self.dimension, capacity=expected_count)
+        client = get_supabase_client()
+        offset = 0
+        while True:
+            rows = client.table("users")\
+                .select(self.USER_COLUMNS)\
+                .order("id")\
+                .range(offset, offset + self.PAGE_SIZE - 1)\
+                .execute().data or []
+
+            for user in self._flatten(rows):
+                builder.put(user)
+
+            if len(rows) < self.PAGE_SIZE:
+                break
+            offset += self.PAGE_SIZE
+
+        data = builder.build()
+        print(f"[사용자 스냅샷] 전체 적재: {len(data)}명 "
+              f"(임베딩 {int(data.has_embedding.sum())}명, {data.matrix.nbytes / 2**20:.1f}MB)")
+        return data
+
+    def _load_changed(self, base: UserMatrix, key: Tuple[Optional[str], Optional[str], int]) -> Optional[UserMatrix]:
+        """
+        기준 키 이후 바뀐 사용자만 다시 조회해 새 UserMatrix를 만듭니다.
+
+        반환값:
+        - 새 UserMatrix, 바뀐 사용자가 너무 많으면 None (전체 재적재)
+        """
+        users_since, prefs_since, _ = key
+        client = get_supabase_client()
+        max_changed = max(len(base), 1) * self.MAX_INCREMENTAL_RATIO
+
+        # 변경 ID도 PAGE_SIZE씩 나눠 조회 (PostgREST 최대 행 수에서 잘리지 않도록),
+        # 비율을 넘는 순간 더 조회하지 않고 전체 재적재
+        changed = set()
+        for table, column, since in (("users", "id", users_since), ("user_preferences", "user_id", prefs_since)):
+            offset = 0
+            while True:
+                query = client.table(table).select(column)
+                if since:
+                    query = query.gt("updated_at", since)
+                rows = query\
+                    .order(column)\
+                    .range(offset, offset + self.PAGE_SIZE - 1)\
+                    .execute().data or []
+
+                changed.update(r[column] for r in rows)
+                if len(changed) > max_changed:
+                    return None
+                if len(rows) < self.PAGE_SIZE:
+                    break
+                offset += self.PAGE_SIZE
+
+        builder = _UserMatrixBuilder(self.dimension, capacity=len(base) + len(changed), base=base)
+        changed_ids = sorted(changed)
+        for start in range(0, len(changed_ids), self.CHANGED_ID_CHUNK):
+            rows = client.table("users")\
+                .select(self.USER_COLUMNS)\
+                .in_("id", changed_ids[start:start + self.CHANGED_ID_CHUNK])\
+                .execute().data or []
+            for user in self._flatten(rows):
+                builder.put(user)
+
+        data = builder.build()
+        print(f"[사용자 스냅샷] 증분 갱신: {len(changed)}명 반영 (총 {len(data)}명)")
+        return data
+
+    @staticmethod
+    def _flatten(rows: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """users + user_preferences 조인 행을 UserMatrix 입력 형식으로 변환합니다."""
+        for row in rows:
+            prefs = row.get("user_preferences") or []
+            if isinstance(prefs, dict):
+                prefs = [prefs]
+            pref = prefs[0] if prefs else {}
+            yield {
+                "id": row["id"],
+                "department": row.get("department"),
+                "grade": row.get("grade"),
+                "notification_enabled": pref.get("notification_enabled", True),
+                "interests_embedding": pref.get("interests_embedding"),
+                "categories": pref.get("categories") or [],
+                "keywords": pref.get("keywords") or []
+            }
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+halfvec 사본 백필 스크립트 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_backfill_halfvec.py
+"""
+
+import os
+import sys
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from scripts.backfill_halfvec import HalfvecBackfill
+
+
+class _FakeBackfillRpc:
+    """
+    backfill_halfvec_embeddings를 기본키 keyset으로 흉내 냄
+    (ids 순서대로 after_id 다음 batch_size개를 훑고, stale에 있는 행만 변환)
+    """
+
+    def __init__(self, ids, stale):
+        self.ids = sorted(ids)
+        self.stale = set(stale)
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, dict(params)))
+        return self
+
+    def execute(self):
+        name, params = self.calls[-1]
+        if name == "count_stale_halfvec_embeddings":
+            return type("Result", (), {"data": len(self.stale)})()
+
+        after_id = params["after_id"]
+        batch = [i for i in self.ids if after_id is None or i > after_id][:params["batch_size"]]
+        updated = [i for i in batch if i in self.stale]
+        self.stale.difference_update(updated)
+        row = {"last_id": batch[-1] if batch else None, "updated_count": len(updated)}
+        return type("Result", (), {"data": [row]})()
+
+
+def test_backfill_walks_table_once_by_primary_key():
+    """배치마다 앞쪽 행을 다시 찾지 않고 last_id 다음부터 이어서 훑음 (사본이 맞는 행은 건너뜀)"""
+    ids = [f"{i:04d}" for i in range(10)]
+    rpc = _FakeBackfillRpc(ids, stale={"0001", "0004", "0005", "0009"})
+    backfill = HalfvecBackfill.__new__(HalfvecBackfill)
+    backfill.client = rpc
+    backfill.batch_size = 4
+    backfill.sleep_seconds = 0
+
+    assert backfill.run("notices") == 4
+    assert rpc.stale == set()
+
+    after_ids = [params["after_id"] for name, params in rpc.calls if name == "backfill_halfvec_embeddings"]
+    assert after_ids == [None, "0003", "0007", "0009"]
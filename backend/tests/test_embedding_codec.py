@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 코덱 단위 테스트
+
+📚 실행 방법:
+cd backend
+pytest tests/test_embedding_codec.py
+"""
+
+import os
+import sys
+from array import array
+
+import numpy as np
+import pytest
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from ai.embedding_codec import parse_vector, parse_matrix, parse_unit_matrix
+
+
+def test_parse_vector_accepts_pgvector_text_lists_and_buffers():
+    """pgvector 문자열, 리스트, array('f')가 같은 float32 배열로 변환"""
+    expected = np.array([0.5, -0.25, 1e-3], dtype=np.float32)
+
+    for value in ("[0.5,-0.25,0.001]", " [0.5, -0.25, 1e-3] ", [0.5, -0.25, 0.001], array("f", expected)):
+        vector = parse_vector(value, dimension=3)
+        assert vector.dtype == np.float32
+        assert np.array_equal(vector, expected)
+
+    assert parse_vector(None) is None
+    assert parse_vector("[]", dimension=3) is None
+
+
+def test_parse_vector_rejects_bad_dimension_and_text():
+    with pytest.raises(ValueError):
+        parse_vector("[1,2]", dimension=3)
+    with pytest.raises(ValueError):
+        parse_vector("[1,2,]", dimension=3)
+
+
+def test_parse_matrix_keeps_row_order_with_zero_rows_for_invalid_values():
+    """잘못된 값은 영벡터로 두고 입력 순서 유지, 정규화 시에도 0 유지"""
+    matrix = parse_matrix(["[3,4]", None, "[1,2,3]", [0, 2]], dimension=2)
+
+    assert matrix.shape == (4, 2)
+    assert matrix.tolist() == [[3, 4], [0, 0], [0, 0], [0, 2]]
+
+    unit = parse_unit_matrix(["[3,4]", None], dimension=2)
+    assert np.allclose(unit, [[0.6, 0.8], [0, 0]])
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 서비스 단위 테스트 (Gemini API 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_embedding_service.py
+"""
+
+import os
+import sys
+from array import array
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from ai.embedding_cache import QueryEmbeddingCache, PersistentEmbeddingCache
+from ai.embedding_service import EmbeddingService
+
+
+def test_calculate_similarities_matches_pairwise_loop():
+    """벡터화 결과가 기존 단건 코사인 유사도와 일치"""
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(32)
+    matrix = rng.standard_normal((50, 32))
+
+    scores = EmbeddingService.calculate_similarities(query, matrix)
+    expected = [
+        float(np.dot(query, row) / (np.linalg.norm(query) * np.linalg.norm(row)))
+        for row in matrix
+    ]
+
+    assert scores.dtype == np.float32
+    assert np.allclose(scores, expected, atol=1e-5)
+
+
+def test_similarities_accept_buffers_and_zero_vectors():
+    """array('f') 입력과 영벡터(유사도 0) 처리"""
+    query = array("f", [1.0, 0.0, 0.0])
+    matrix = [array("f", [1.0, 0.0, 0.0]), array("f", [0.0, 0.0, 0.0])]
+
+    scores = EmbeddingService.calculate_similarities(query, matrix)
+
+    assert scores.tolist() == [1.0, 0.0]
+
+
+def test_pairwise_similarities_with_cached_norms():
+    """미리 계산한 norm을 넘겨도 같은 결과"""
+    rng = np.random.default_rng(1)
+    a = rng.standard_normal((4, 16)).astype(np.float32)
+    b = rng.standard_normal((6, 16)).astype(np.float32)
+
+    plain = EmbeddingService.pairwise_similarities(a, b)
+    cached = EmbeddingService.pairwise_similarities(
+        a, b,
+        a_norms=EmbeddingService.vector_norms(a),
+        b_norms=EmbeddingService.vector_norms(b)
+    )
+    unit = EmbeddingService.pairwise_similarities(
+        EmbeddingService.normalize(a), EmbeddingService.normalize(b), normalized=True
+    )
+
+    assert plain.shape == (4, 6)
+    assert np.allclose(plain, cached)
+    assert np.allclose(plain, unit, atol=1e-6)
+
+
+def test_query_embedding_cache_skips_repeat_calls(monkeypatch):
+    """같은 검색어(공백/대소문자 차이 포함)는 두 번째부터 API 호출 없음"""
+    calls = []
+
+    def fake_embed_content(model, content, task_type, output_dimensionality):
+        calls.append(content)
+        return {"embedding": [0.5] * output_dimensionality}
+
+    monkeypatch.setattr("ai.embedding_service.genai.embed_content", fake_embed_content)
+    monkeypatch.setattr(EmbeddingService, "query_cache", QueryEmbeddingCache(max_size=2))
+    service = EmbeddingService(api_key="test-key")
+
+    first = service.create_query_embedding("장학금  신청")
+    second = service.create_query_embedding(" 장학금 신청 ")
+
+    assert first == second
+    assert calls == ["장학금 신청"]
+    assert EmbeddingService.query_cache_stats()["hits"] == 1
+
+
+def test_query_cache_lru_and_ttl(monkeypatch):
+    """가득 차면 가장 오래 안 쓴 항목 제거, TTL 지나면 만료"""
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=10)
+    now = [100.0]
+    monkeypatch.setattr("ai.embedding_cache.time.monotonic", lambda: now[0])
+
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") is not None   # a를 최근 사용으로 갱신
+    cache.put("c", [3.0])               # b 제거
+
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_create_embedding_uses_persistent_cache(monkeypatch, tmp_path):
+    """같은 문서 텍스트는 새 프로세스(새 캐시 객체)에서도 API 호출 없음"""
+    calls = []
+
+    def fake_embed_content(model, content, task_type, output_dimensionality):
+        calls.append(content)
+        return {"embedding": [0.25] * output_dimensionality}
+
+    path = str(tmp_path / "embeddings.sqlite3")
+    monkeypatch.setattr("ai.embedding_service.genai.embed_content", fake_embed_content)
+    monkeypatch.setattr(EmbeddingService, "_document_cache_initialized", True)
+    monkeypatch.setattr(EmbeddingService, "_document_cache", PersistentEmbeddingCache(path))
+    service = EmbeddingService(api_key="test-key")
+
+    service.create_embedding("학과: 컴퓨터정보공학과 학년: 3학년")
+
+    # 재시작을 흉내: 같은 파일로 캐시를 다시 연다
+    monkeypatch.setattr(EmbeddingService, "_document_cache", PersistentEmbeddingCache(path))
+    cached = service.create_embedding("학과: 컴퓨터정보공학과  학년: 3학년")
+
+    assert len(calls) == 1
+    assert cached == [0.25] * EmbeddingService.DIMENSION
+
+
+def test_persistent_cache_evicts_least_recently_used(tmp_path):
+    """최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+    cache = PersistentEmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.EVICT_CHECK_INTERVAL = 1
+
+    cache.put("a", [1.0, 2.0])
+    cache.put("b", [3.0, 4.0])
+    assert cache.get("a") is not None
+    cache.put("c", [5.0, 6.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a").tolist() == [1.0, 2.0]
+    assert cache.stats()["size"] == 2
+
+
+def test_persistent_cache_batches_last_used_updates(tmp_path, monkeypatch):
+    """적중마다 커밋하지 않고 last_used 갱신을 모았다가 put/flush 때 기록"""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentEmbeddingCache(path)
+    monkeypatch.setattr("ai.embedding_cache.time.time", lambda: 1000.0)
+    cache.put("a", [1.0, 2.0])
+    monkeypatch.setattr("ai.embedding_cache.time.time", lambda: 2000.0)
+
+    def last_used():
+        import sqlite3
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT last_used FROM embeddings WHERE key = 'a'").fetchone()[0]
+
+    stored = last_used()
+    for _ in range(5):
+        assert cache.get("a").tolist() == [1.0, 2.0]
+    assert last_used() == stored and cache.stats()["pending_touches"] == 1
+
+    cache.flush()
+    assert last_used() == 2000.0 and cache.stats()["pending_touches"] == 0
+
+
+class _StubEmbedder:
+    """genai.embed_content 대체 스텁 (텍스트 길이를 첫 성분에 담은 벡터 반환)"""
+
+    def __init__(self, fail_batches=False, fail_texts=()):
+        self.calls = []
+        self.fail_batches = fail_batches
+        self.fail_texts = set(fail_texts)
+
+    def __call__(self, model, content, task_type, output_dimensionality):
+        self.calls.append(content)
+        if isinstance(content, list):
+            if self.fail_batches:
+                raise RuntimeError("batch unavailable")
+            return {"embedding": [self._vector(t, output_dimensionality) for t in content]}
+        if content in self.fail_texts:
+            raise RuntimeError("single failed")
+        return {"embedding": self._vector(content, output_dimensionality)}
+
+    @staticmethod
+    def _vector(text, dimension):
+        return [float(len(text))] + [0.0] * (dimension - 1)
+
+
+def _service_with_stub(monkeypatch, stub):
+    monkeypatch.setattr(EmbeddingService, "_document_cache_initialized", True)
+    monkeypatch.setattr(EmbeddingService, "_document_cache", None)
+    return EmbeddingService(api_key="test-key", embed_fn=stub)
+
+
+def test_batch_create_embeddings_packs_requests_and_keeps_order(monkeypatch):
+    """여러 텍스트를 묶어 요청하고 입력 순서대로 반환, 빈 텍스트는 None"""
+    stub = _StubEmbedder()
+    service = _service_with_stub(monkeypatch, stub)
+    texts = ["a" * (i + 1) for i in range(7)] + ["   "]
+
+    embeddings = service.batch_create_embeddings(
+        texts, show_progress=False, batch_size=3, max_concurrency=3
+    )
+
+    assert len(stub.calls) == 3
+    assert all(isinstance(call, list) for call in stub.calls)
+    assert [e[0] for e in embeddings[:7]] == [float(i + 1) for i in range(7)]
+    assert embeddings[7] is None
+
+
+def test_batch_create_embeddings_retries_failed_items_individually(monkeypatch):
+    """배치 요청 실패 시 항목별 재시도, 재시도도 실패한 위치만 None"""
+    stub = _StubEmbedder(fail_batches=True, fail_texts={"bb"})
+    service = _service_with_stub(monkeypatch, stub)
+
+    embeddings = service.batch_create_embeddings(
+        ["a", "bb", "ccc"], show_progress=False, batch_size=2
+    )
+
+    assert embeddings[0][0] == 1.0
+    assert embeddings[1] is None
+    assert embeddings[2][0] == 3.0
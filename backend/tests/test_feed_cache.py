@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+맞춤 피드 캐시 단위 테스트 (DB 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_feed_cache.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from ai.embedding_service import EmbeddingService
+from services import feed_cache
+from services.feed_cache import PersonalFeedCache, CohortFeedCache
+from services.hybrid_search_service import HybridSearchService
+from services.supabase_service import SupabaseService
+
+
+def _service_with_stub_ranking(ranked):
+    """DB 없이 순위 계산 횟수만 세는 HybridSearchService"""
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.feed_cache = PersonalFeedCache(max_users=10, ttl_seconds=600)
+    calls = []
+
+    def fake_rank(user_id, min_score, weights):
+        calls.append(user_id)
+        return ranked
+
+    service._rank_notices_for_user = fake_rank
+    return service, calls
+
+
+def test_pages_are_slices_of_one_computation():
+    """같은 버전이면 다음 페이지는 다시 계산하지 않음"""
+    ranked = [{"notice_id": f"n{i}", "total_score": 1 - i / 100} for i in range(50)]
+    service, calls = _service_with_stub_ranking(ranked)
+
+    first = service.find_relevant_notices_for_user("u1", limit=20, offset=0)
+    second = service.find_relevant_notices_for_user("u1", limit=20, offset=20)
+
+    assert len(calls) == 1
+    assert [r["notice_id"] for r in first] == [f"n{i}" for i in range(20)]
+    assert [r["notice_id"] for r in second] == [f"n{i}" for i in range(20, 40)]
+
+    # 반환된 결과를 수정해도 캐시 항목은 그대로
+    first[0]["ai_score"] = 0.9
+    assert "ai_score" not in ranked[0]
+
+
+def test_version_bumps_invalidate_cached_feed():
+    """프로필 변경, 공지 저장, 다른 검색 조건은 재계산"""
+    service, calls = _service_with_stub_ranking([{"notice_id": "n0", "total_score": 0.9}])
+
+    service.find_relevant_notices_for_user("u2")
+    feed_cache.bump_profile_version("u2")
+    service.find_relevant_notices_for_user("u2")
+    feed_cache.bump_corpus_version()
+    service.find_relevant_notices_for_user("u2")
+    service.find_relevant_notices_for_user("u2", min_score=0.5)
+    service.find_relevant_notices_for_user("u2", min_score=0.5, offset=1)
+
+    assert len(calls) == 4
+
+
+def test_cohort_feed_served_only_to_close_members():
+    """코호트 중심과 가까운 사용자만 코호트 피드, 공지가 바뀌면 무효"""
+    cache = CohortFeedCache(embedding_version="test:3", similarity_threshold=0.95)
+    centroid = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    ranked = [{"id": "n1", "total_score": 0.8}]
+    key = cache.cohort_key("컴퓨터정보공학과", 3, ["장학", "학사"])
+    cache.replace({key: (centroid, ranked)}, feed_cache.get_corpus_version())
+
+    close = np.array([0.99, 0.14, 0.0], dtype=np.float32)
+    far = np.array([0.6, 0.8, 0.0], dtype=np.float32)
+
+    # 카테고리 순서는 키에 영향 없음
+    assert cache.lookup("컴퓨터정보공학과", 3, ["학사", "장학"], close / np.linalg.norm(close)) is ranked
+    assert cache.lookup("컴퓨터정보공학과", 3, ["학사", "장학"], far) is None
+    assert cache.lookup("경영학과", 3, ["학사", "장학"], close) is None
+
+    feed_cache.bump_corpus_version()
+    assert not cache.is_fresh()
+    assert cache.lookup("컴퓨터정보공학과", 3, ["장학", "학사"], centroid) is None
+    assert cache.stats()["deviations"] == 1
+
+
+def test_corpus_version_follows_notice_changes_from_other_processes(monkeypatch):
+    """별도 크롤링 프로세스/다른 워커의 저장·삭제도 DB 표식(최대 updated_at, 행 수)으로 감지"""
+    markers = iter([
+        ("2026-01-01T00:00:00", 10),     # 기준값
+        ("2026-01-01T00:00:00", 10),     # 변경 없음
+        ("2026-01-02T00:00:00", 11),     # 다른 프로세스가 공지 저장
+        ("2026-01-02T00:00:00", 10),     # 다른 프로세스가 공지 삭제
+    ])
+    monkeypatch.setattr(feed_cache, "_fetch_corpus_marker", lambda: next(markers))
+    monkeypatch.setattr(feed_cache, "_corpus_marker", None)
+    monkeypatch.setattr(feed_cache, "_corpus_checked_at", 0.0)
+    monkeypatch.setattr(feed_cache, "CORPUS_VERSION_CHECK_INTERVAL", 30)
+
+    # 확인 간격이 지나면 요청 경로를 막지 않고 백그라운드로 확인
+    version = feed_cache.get_corpus_version()
+    feed_cache._corpus_check_thread.join(timeout=2)
+    assert feed_cache.get_corpus_version() == version
+    assert feed_cache._corpus_marker == ("2026-01-01T00:00:00", 10)
+
+    cache = CohortFeedCache(embedding_version="test:3")
+    cache.replace({}, feed_cache.get_corpus_version())
+    assert not feed_cache.refresh_corpus_version() and cache.is_fresh()
+    assert feed_cache.refresh_corpus_version() and not cache.is_fresh()
+
+    cache.replace({}, feed_cache.get_corpus_version())
+    assert feed_cache.refresh_corpus_version() and not cache.is_fresh()
+
+
+class _FakeDeleteClient:
+    """notices.delete().eq("id", ...).execute() 대체 (삭제된 id 기록)"""
+
+    def __init__(self):
+        self.deleted = []
+
+    def table(self, name):
+        return self
+
+    def delete(self):
+        return self
+
+    def eq(self, column, value):
+        self.deleted.append(value)
+        return self
+
+    def execute(self):
+        return type("Result", (), {"data": [{"id": self.deleted[-1]}]})()
+
+
+def _supabase_with_fake_delete():
+    service = object.__new__(SupabaseService)   # 싱글턴/실제 클라이언트 없이
+    service.client = _FakeDeleteClient()
+    return service
+
+
+def test_notice_delete_invalidates_cohort_feeds():
+    """공지를 삭제하면 미리 계산한 코호트 피드를 더 이상 쓰지 않음"""
+    cache = CohortFeedCache(embedding_version="test:3")
+    cache.replace({}, feed_cache.get_corpus_version())
+    assert cache.is_fresh()
+
+    supabase = _supabase_with_fake_delete()
+    assert supabase.delete_notice("n1")
+
+    assert supabase.client.deleted == ["n1"]
+    assert not cache.is_fresh()
+
+
+def test_notice_delete_misses_personal_feed_cache():
+    """공지를 삭제하면 캐시된 맞춤 피드 대신 다시 계산 (삭제된 공지가 다음 페이지에 남지 않음)"""
+    service, calls = _service_with_stub_ranking([{"notice_id": "n1", "total_score": 0.9}])
+
+    service.find_relevant_notices_for_user("u3")
+    service.find_relevant_notices_for_user("u3", offset=1)
+    assert len(calls) == 1
+
+    assert _supabase_with_fake_delete().delete_notice("n1")
+    service.find_relevant_notices_for_user("u3", offset=1)
+
+    assert len(calls) == 2
+    assert service.feed_cache.stats()["misses"] == 2
+
+
+def test_rebuild_cohort_feeds_ranks_like_per_user_path(monkeypatch):
+    """구성원 2명 이상 코호트만 생성, 하드 필터 보너스 + 벡터 점수로 정렬"""
+    service = HybridSearchService.__new__(HybridSearchService)
+    cache = CohortFeedCache(embedding_version="test:2")
+    monkeypatch.setattr(HybridSearchService, "cohort_cache", cache)
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 2)
+
+    users = [
+        {"id": "u1", "department": "A", "grade": 1, "categories": ["학사"], "interests_embedding": [1.0, 0.0]},
+        {"id": "u2", "department": "A", "grade": 1, "categories": ["학사"], "interests_embedding": [0.9, 0.1]},
+        {"id": "u3", "department": "B", "grade": 2, "categories": ["장학"], "interests_embedding": [0.0, 1.0]},
+    ]
+    notices = [
+        {"id": "n1", "category": "장학", "content_embedding": [1.0, 0.0],
+         "enriched_metadata": {"target_departments": ["B"]}},
+        {"id": "n2", "category": "학사", "content_embedding": [0.7, 0.7],
+         "enriched_metadata": {"target_departments": ["A"]}},
+    ]
+    service._load_users_for_matching = lambda notifications_only=True: users
+    service._fetch_recent_notices = lambda include_embedding=False: notices
+
+    assert service.rebuild_cohort_feeds() == 1
+
+    ranked = cache.lookup("A", 1, ["학사"], np.array([1.0, 0.0], dtype=np.float32))
+    assert [r["id"] for r in ranked] == ["n2", "n1"]
+    assert ranked[0]["hard_filter_score"] == HybridSearchService.DEFAULT_WEIGHTS["hard_filter"]
+    assert ranked[1]["hard_filter_score"] == 0
+    assert cache.lookup("B", 2, ["장학"], np.array([0.0, 1.0], dtype=np.float32)) is None
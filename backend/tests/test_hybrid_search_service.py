@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+하이브리드 검색 서비스 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_hybrid_search_service.py
+"""
+
+import os
+import sys
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services.hybrid_search_service import HybridSearchService
+from services.user_embedding_snapshot import UserMatrix
+
+
+class _FakeRpc:
+    """supabase.rpc(name, params).execute() 대체 (함수별 응답/예외 지정)"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return self
+
+    def execute(self):
+        name, _ = self.calls[-1]
+        response = self.responses[name]
+        if isinstance(response, Exception):
+            raise response
+        return type("Result", (), {"data": response})()
+
+
+def _service(responses):
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.supabase = _FakeRpc(responses)
+    service.use_vector_rpc = True
+    service.missing_rpcs = set()
+    return service
+
+
+def test_filtered_rpc_receives_candidate_ids():
+    """후보 공지 ID는 RPC 인자로 전달되고 Python 후처리 필터 없음"""
+    service = _service({
+        "search_notices_by_vector_filtered": [{"id": "n2", "similarity": 0.7}]
+    })
+
+    results = service._vector_search_notices([0.1] * 3, notice_ids=["n1", "n2"], limit=10)
+
+    assert results == [{"id": "n2", "similarity": 0.7}]
+    name, params = service.supabase.calls[0]
+    assert name == "search_notices_by_vector_filtered"
+    assert params["candidate_ids"] == ["n1", "n2"]
+
+
+def test_missing_filtered_rpc_falls_back_to_legacy_once():
+    """016 마이그레이션이 없으면 기존 RPC로 전환하고 이후엔 다시 시도하지 않음"""
+    service = _service({
+        "search_users_by_notice_vector_filtered": Exception("PGRST202 Could not find the function"),
+        "search_users_by_notice_vector": [
+            {"user_id": "u1", "similarity": 0.9},
+            {"user_id": "u9", "similarity": 0.8},
+        ],
+    })
+
+    first = service._vector_search_users([0.1] * 3, user_ids=["u1", "u2"], limit=10)
+    service._vector_search_users([0.1] * 3, user_ids=["u1", "u2"], limit=10)
+
+    assert first == [{"user_id": "u1", "similarity": 0.9}]
+    assert "search_users_by_notice_vector_filtered" in service.missing_rpcs
+    assert [name for name, _ in service.supabase.calls] == [
+        "search_users_by_notice_vector_filtered",
+        "search_users_by_notice_vector",
+        "search_users_by_notice_vector",
+    ]
+
+
+def test_relevant_users_pass_target_predicates_instead_of_all_user_ids():
+    """알림 켜진 사용자 전체 ID 배열 대신 학과/학년 조건을 필터 RPC에 전달, RPC 비활성이면 호출 안 함"""
+    service = _service({
+        "search_users_by_notice_vector": [{"user_id": "u2", "similarity": 0.9}],
+        "search_users_by_notice_vector_filtered": [{"user_id": "u1", "similarity": 0.5}],
+    })
+    service._get_notice = lambda notice_id: {
+        "id": notice_id, "content_embedding": [0.1] * 3,
+        "enriched_metadata": {"target_departments": ["컴퓨터정보공학과"], "target_grades": [3]},
+    }
+    service._hard_filter_users = lambda **kwargs: [
+        {"id": "u1", "department": "컴퓨터정보공학과", "grade": 3, "hard_filter_match": True},
+        {"id": "u2", "department": "경영학과", "grade": 1, "hard_filter_match": False},
+    ]
+
+    results = service.find_relevant_users("n1", min_score=0.3, max_users=10)
+
+    assert [r["user_id"] for r in results] == ["u1", "u2"]
+    assert [name for name, _ in service.supabase.calls] == [
+        "search_users_by_notice_vector", "search_users_by_notice_vector_filtered"
+    ]
+    params = service.supabase.calls[1][1]
+    assert params["candidate_ids"] is None
+    assert (params["target_departments"], params["target_grades"]) == (["컴퓨터정보공학과"], [3])
+
+    service.use_vector_rpc = False
+    fallback_calls = []
+    service._vector_search_users_fallback = lambda *args, **kwargs: fallback_calls.append(kwargs) or []
+    service.find_relevant_users("n1", min_score=0.3, max_users=10)
+    assert len(service.supabase.calls) == 2
+    assert fallback_calls[1]["target_departments"] == ["컴퓨터정보공학과"]
+
+
+def test_scoring_rpc_rows_feed_score_combination():
+    """점수 계산 RPC 결과를 하드 필터/벡터 결과로 나누어 기존 결합 로직에 전달"""
+    service = _service({
+        "score_recent_notices_for_user": [
+            {"id": "n1", "title": "A", "category": "학사", "similarity": 0.0, "hard_filter_match": True},
+            {"id": "n2", "title": "B", "category": "장학", "similarity": 0.6, "hard_filter_match": False},
+        ]
+    })
+    profile = {"department": "컴퓨터정보공학과", "grade": 3, "interests_embedding": [0.1] * 3}
+
+    hard_filtered, vector_results = service._score_recent_notices(profile)
+    combined = {
+        r["id"]: r for r in service._combine_notice_scores(
+            hard_filtered, vector_results, HybridSearchService.DEFAULT_WEIGHTS
+        )
+    }
+
+    assert vector_results == [{"id": "n2", "similarity": 0.6}]
+    assert combined["n1"]["total_score"] == HybridSearchService.DEFAULT_WEIGHTS["hard_filter"]
+    assert abs(combined["n2"]["total_score"] - 0.6 * HybridSearchService.DEFAULT_WEIGHTS["vector"]) < 1e-9
+
+
+def test_matryoshka_prefilter_matches_exact_batch_matching(monkeypatch):
+    """잘라낸 차원으로 후보를 고른 뒤 재계산한 결과가 전체 차원 계산과 같음"""
+    import numpy as np
+    from ai.embedding_service import EmbeddingService
+
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 16)
+    rng = np.random.default_rng(0)
+    decay = np.r_[np.ones(4), np.full(12, 0.05)].astype(np.float32)
+    user_vectors = rng.standard_normal((300, 16)).astype(np.float32) * decay
+    notice_vectors = rng.standard_normal((3, 16)).astype(np.float32) * decay
+
+    users = [
+        {"id": f"u{i}", "department": "컴퓨터정보공학과", "grade": 3, "categories": ["학사"],
+         "interests_embedding": user_vectors[i].tolist()}
+        for i in range(300)
+    ]
+    notices = [
+        {"id": f"n{i}", "category": "학사", "content_embedding": notice_vectors[i].tolist(),
+         "enriched_metadata": {}}
+        for i in range(3)
+    ]
+
+    service = HybridSearchService.__new__(HybridSearchService)
+    service._get_notices = lambda ids: notices
+    user_matrix = UserMatrix.from_users(users, dimension=16)
+    service._user_matrix = lambda: user_matrix
+    service.PREFILTER_MIN_USERS = 0
+    service.PREFILTER_CANDIDATES = 20
+
+    service.PREFILTER_DIMENSION = 0
+    exact = service.find_relevant_users_batch(["n0", "n1", "n2"], min_score=0.4, max_users=5)
+    service.PREFILTER_DIMENSION = 4
+    prefiltered = service.find_relevant_users_batch(["n0", "n1", "n2"], min_score=0.4, max_users=5)
+
+    for notice_id, rows in exact.items():
+        assert rows, notice_id
+        assert [r["user_id"] for r in prefiltered[notice_id]] == [r["user_id"] for r in rows]
+        assert np.allclose(
+            [r["total_score"] for r in prefiltered[notice_id]], [r["total_score"] for r in rows]
+        )
+
+
+def test_user_cluster_matching_matches_exact_batch_matching(monkeypatch):
+    """가까운 클러스터 구성원만 계산한 결과가 전체 사용자 계산과 같음 (주제가 뚜렷한 데이터)"""
+    import numpy as np
+    from ai.embedding_service import EmbeddingService
+    from services.user_cluster_index import UserClusterIndex
+
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 16)
+    rng = np.random.default_rng(0)
+    centers = np.eye(16, dtype=np.float32)[:8] * 5
+    user_vectors = centers[rng.integers(0, 8, 400)] + rng.standard_normal((400, 16)).astype(np.float32)
+
+    users = [
+        {"id": f"u{i}", "department": "컴퓨터정보공학과", "grade": 3, "categories": ["학사"],
+         "interests_embedding": user_vectors[i].tolist()}
+        for i in range(400)
+    ]
+    notices = [
+        {"id": f"n{i}", "category": "학사", "content_embedding": centers[i].tolist(), "enriched_metadata": {}}
+        for i in range(3)
+    ]
+
+    service = HybridSearchService.__new__(HybridSearchService)
+    service._get_notices = lambda ids: notices
+    user_matrix = UserMatrix.from_users(users, dimension=16)
+    service._user_matrix = lambda: user_matrix
+    service.PREFILTER_DIMENSION = 0
+
+    service._cluster_index = lambda users: None
+    exact = service.find_relevant_users_batch(["n0", "n1", "n2"], min_score=0.4, max_users=5)
+    index = UserClusterIndex.fit(user_matrix, k=8)
+    service._cluster_index = lambda users: index
+    service.CLUSTER_PROBES = 2
+    clustered = service.find_relevant_users_batch(["n0", "n1", "n2"], min_score=0.4, max_users=5)
+
+    for notice_id, rows in exact.items():
+        assert rows, notice_id
+        assert [r["user_id"] for r in clustered[notice_id]] == [r["user_id"] for r in rows]
+
+
+def test_user_vector_fallback_uses_snapshot(monkeypatch):
+    """RPC 폴백은 DB 대신 사용자 스냅샷에서 계산 (임베딩 없는 사용자 제외)"""
+    users = [
+        {"id": "u1", "interests_embedding": [1.0, 0.0]},
+        {"id": "u2", "interests_embedding": [0.6, 0.8]},
+        {"id": "u3", "interests_embedding": None},
+        {"id": "u4", "interests_embedding": [0.0, 1.0]},
+    ]
+    service = HybridSearchService.__new__(HybridSearchService)
+    user_matrix = UserMatrix.from_users(users, dimension=2)
+    service._user_matrix = lambda: user_matrix
+    service._cluster_index = lambda users: None
+
+    from ai.embedding_service import EmbeddingService
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 2)
+    top = service._vector_search_users_fallback([1.0, 0.0], limit=2)
+    filtered = service._vector_search_users_fallback([1.0, 0.0], user_ids=["u3", "u4"], limit=5)
+
+    assert [r["user_id"] for r in top] == ["u1", "u2"]
+    assert abs(top[1]["similarity"] - 0.6) < 1e-6
+    assert [r["user_id"] for r in filtered] == ["u4"]
+
+
+def test_batch_user_matching_matches_per_notice_matching(monkeypatch):
+    """공지 N개 일괄 매칭 결과가 공지별 find_relevant_users 결과와 같음 (작은 합성 데이터)"""
+    import numpy as np
+    from ai.embedding_service import EmbeddingService
+
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 8)
+    rng = np.random.default_rng(1)
+    user_vectors = rng.standard_normal((40, 8)).astype(np.float32)
+    notice_vectors = rng.standard_normal((4, 8)).astype(np.float32)
+
+    users = [
+        {"id": f"u{i}", "department": ["컴퓨터정보공학과", "경영학과"][i % 2], "grade": 1 + i % 4,
+         "categories": ["학사"], "interests_embedding": user_vectors[i].tolist(),
+         "notification_enabled": i % 7 != 0}
+        for i in range(40)
+    ]
+    targets = [
+        {"is_for_all": True},
+        {"target_departments": ["컴퓨터정보공학과"]},
+        {"target_departments": ["경영학과"], "target_grades": [2, 4]},
+        {},
+    ]
+    notices = {
+        f"n{i}": {"id": f"n{i}", "category": "학사", "content_embedding": notice_vectors[i].tolist(),
+                  "enriched_metadata": targets[i]}
+        for i in range(4)
+    }
+
+    service = HybridSearchService.__new__(HybridSearchService)
+    user_matrix = UserMatrix.from_users(users, dimension=8)
+    service._user_matrix = lambda: user_matrix
+    service._cluster_index = lambda users: None
+    service.PREFILTER_DIMENSION = 0
+    service._get_notice = notices.get
+    service._get_notices = lambda ids: [notices[i] for i in ids]
+
+    # 공지별 경로의 사용자 벡터 RPC 대체 (match_threshold 초과만 반환하는 RPC와 같은 규칙)
+    def vector_search_users(notice_embedding, user_ids=None, limit=100, **predicates):
+        return [
+            r for r in service._vector_search_users_fallback(notice_embedding, user_ids, limit, **predicates)
+            if r["similarity"] > service.VECTOR_MATCH_THRESHOLD
+        ]
+
+    service._vector_search_users = vector_search_users
+
+    batch = service.find_relevant_users_batch(list(notices), min_score=0.35, max_users=50)
+
+    for notice_id in notices:
+        single = service.find_relevant_users(notice_id, min_score=0.35, max_users=50)
+        assert single, notice_id
+        assert [r["user_id"] for r in batch[notice_id]] == [r["user_id"] for r in single]
+        assert np.allclose([r["total_score"] for r in batch[notice_id]], [r["total_score"] for r in single])
+        assert [r["hard_filter_score"] for r in batch[notice_id]] == [r["hard_filter_score"] for r in single]
+
+
+def test_batch_thresholds_apply_before_max_users_cut(monkeypatch):
+    """이중 임계값/최소 벡터 유사도로 거른 뒤 상위 max_users명을 자름 (거르기 전에 자르면 1명만 남음)"""
+    from ai.embedding_service import EmbeddingService
+
+    monkeypatch.setattr(EmbeddingService, "DIMENSION", 2)
+    users = [
+        # 학과 일치 보너스로 총점 1위지만 유사도 0.5 < min_vector_score
+        {"id": "dept", "department": "컴퓨터정보공학과", "grade": 3, "categories": ["학사"],
+         "interests_embedding": [0.5, 0.8660254]},
+        {"id": "close", "department": "경영학과", "grade": 3, "categories": ["학사"],
+         "interests_embedding": [0.8, 0.6]},
+        {"id": "closer", "department": "경영학과", "grade": 3, "categories": ["학사"],
+         "interests_embedding": [0.75, 0.6614378]},
+    ]
+    notice = {"id": "n1", "category": "학사", "content_embedding": [1.0, 0.0],
+              "enriched_metadata": {"target_departments": ["컴퓨터정보공학과"]}}
+
+    service = HybridSearchService.__new__(HybridSearchService)
+    user_matrix = UserMatrix.from_users(users, dimension=2)
+    service._user_matrix = lambda: user_matrix
+    service._cluster_index = lambda users: None
+    service.PREFILTER_DIMENSION = 0
+    service._get_notices = lambda ids: [notice]
+
+    rows = service.find_relevant_users_batch(["n1"], min_score=0.4, max_users=2, min_vector_score=0.7)["n1"]
+
+    assert [r["user_id"] for r in rows] == ["close", "closer"]
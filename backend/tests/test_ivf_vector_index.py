@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+IVF 벡터 인덱스 단위 테스트
+
+📚 실행 방법:
+cd backend
+pytest tests/test_ivf_vector_index.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from ai.embedding_service import EmbeddingService
+from services.ivf_vector_index import IvfVectorIndex
+
+
+def _vectors(rng, n=400, dimension=16):
+    centers = np.eye(dimension, dtype=np.float32)[:8] * 4
+    return EmbeddingService.normalize(
+        centers[rng.integers(0, 8, n)] + rng.standard_normal((n, dimension)).astype(np.float32)
+    )
+
+
+def _filled(vectors, mode="float32"):
+    index = IvfVectorIndex(vectors.shape[1], mode=mode, nprobe=2)
+    for i, vec in enumerate(vectors):
+        index.put(f"v{i}", vec, {"n": i})
+    return index
+
+
+def test_trained_search_matches_exact_when_all_lists_probed():
+    rng = np.random.default_rng(0)
+    vectors = _vectors(rng)
+    index = _filled(vectors)
+    query = vectors[7]
+    exact = [f"v{i}" for i in np.argsort(-(vectors @ query))[:10]]
+
+    assert [item_id for item_id, _, _ in index.search(query, 10)] == exact
+
+    index.train(nlist=8)
+    assert index.trained and index.nlist == 8 and len(index) == 400
+    assert [item_id for item_id, _, _ in index.search(query, 10, nprobe=8)] == exact
+
+    # 가까운 리스트 2개만 봐도 주제가 뚜렷하면 대부분 찾음
+    approx = {item_id for item_id, _, _ in index.search(query, 10)}
+    assert len(approx & set(exact)) >= 8
+
+    # 후보 ID가 주어지면 리스트와 무관하게 정확 계산
+    candidates = [f"v{i}" for i in range(0, 400, 3)]
+    hits = index.search(query, 5, ids=candidates)
+    expected = sorted(range(0, 400, 3), key=lambda i: -float(vectors[i] @ query))[:5]
+    assert [item_id for item_id, _, _ in hits] == [f"v{i}" for i in expected]
+
+
+def test_incremental_put_remove_and_save_load(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = _vectors(rng)
+    index = _filled(vectors, mode="int8")
+    index.train(nlist=8)
+
+    # 교체 시 다른 리스트로 옮겨도 항목은 하나
+    index.put("v0", vectors[1], {"n": "moved"})
+    assert len(index) == 400
+    assert index.get("v0")[1] == {"n": "moved"}
+
+    assert index.remove("v5") and not index.remove("v5")
+    assert "v5" not in {item_id for item_id, _, _ in index.search(vectors[5], 400, nprobe=8)}
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = IvfVectorIndex.load(path, nprobe=3)
+    assert loaded.mode == "int8" and loaded.nprobe == 3 and len(loaded) == 399
+    assert np.allclose(loaded.centroids, index.centroids)
+    assert loaded.search(vectors[9], 5, nprobe=8) == index.search(vectors[9], 5, nprobe=8)
+    assert loaded.get("v0")[1] == {"n": "moved"}
+
+
+def test_needs_training_after_growth(monkeypatch):
+    monkeypatch.setattr(IvfVectorIndex, "MIN_TRAIN_SIZE", 100)
+    rng = np.random.default_rng(2)
+    index = _filled(_vectors(rng, n=150))
+    assert index.needs_training()
+    index.train(nlist=4)
+    assert not index.needs_training()
+    for i, vec in enumerate(_vectors(rng, n=200)):
+        index.put(f"w{i}", vec)
+    assert index.needs_training()
+
+
+def test_zero_copy_from_arrays_copies_only_on_write():
+    rng = np.random.default_rng(3)
+    vectors = _vectors(rng)
+    index = _filled(vectors)
+    index.train(nlist=8)
+
+    arrays = index.export_arrays()
+    arrays["data"].flags.writeable = False      # mmap으로 읽은 공유 스냅샷처럼
+    shared = IvfVectorIndex.from_arrays(arrays, copy=False)
+    assert shared.search(vectors[3], 10, nprobe=8) == index.search(vectors[3], 10, nprobe=8)
+    assert all(np.shares_memory(store._data, arrays["data"]) for store in shared._lists if len(store))
+
+    # 쓰기가 생기면 그 리스트만 복사 (원본 배열은 그대로)
+    before = arrays["data"].copy()
+    shared.put("v0", vectors[1], {"n": "moved"})
+    assert shared.get("v0")[1] == {"n": "moved"}
+    assert np.array_equal(arrays["data"], before)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+JWT 로컬 검증 + 인증 데코레이터 단위 테스트 (Supabase Auth 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_jwt_verifier.py
+"""
+
+import os
+import sys
+import time
+
+import jwt
+import pytest
+from flask import Flask, g, jsonify
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import utils.auth_middleware as auth_middleware
+from utils.jwt_verifier import AuthTokenError, JwtVerifier
+
+SECRET = "test-jwt-secret-with-enough-length-32b"
+
+
+def _token(secret=SECRET, **overrides):
+    claims = {"sub": "user-1", "email": "a@b.c", "aud": "authenticated", "exp": int(time.time()) + 3600}
+    claims.update(overrides)
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def test_local_verification_checks_signature_exp_and_aud():
+    remote_calls = []
+    verifier = JwtVerifier(secret=SECRET, remote_verify=lambda t: remote_calls.append(t) or {"sub": "x"})
+
+    assert verifier.verify(_token())["sub"] == "user-1"
+    for bad in (_token(secret="another-secret-with-enough-length-32b"),
+                _token(exp=int(time.time()) - 10),
+                _token(aud="anon"),
+                "not-a-jwt"):
+        with pytest.raises(AuthTokenError):
+            verifier.verify(bad)
+
+    # 유효하지 않은 토큰은 원격 재시도 없이 거부
+    assert remote_calls == []
+    stats = verifier.stats()
+    assert (stats["local"], stats["rejected"], stats["remote"]) == (1, 4, 0)
+
+
+def test_claims_cache_and_remote_fallback_only_without_key(monkeypatch):
+    remote_calls = []
+
+    def remote(token):
+        remote_calls.append(token)
+        return {"sub": "user-2", "exp": int(time.time()) + 3600}
+
+    verifier = JwtVerifier(secret=None, remote_verify=remote)
+    token = _token()
+    assert verifier.verify(token)["sub"] == "user-2"
+    assert verifier.verify(token)["sub"] == "user-2"
+    assert len(remote_calls) == 1 and verifier.stats()["cache_hits"] == 1
+
+    # 캐시는 TTL을 넘기면 만료
+    now = time.time()
+    monkeypatch.setattr("utils.jwt_verifier.time.time", lambda: now + 120)
+    verifier.verify(token)
+    assert len(remote_calls) == 2
+
+
+def test_decorators_share_local_path(monkeypatch):
+    verifier = JwtVerifier(secret=SECRET)
+    monkeypatch.setattr(auth_middleware, "get_jwt_verifier", lambda: verifier)
+
+    app = Flask(__name__)
+
+    @app.route("/private")
+    @auth_middleware.login_required
+    def private():
+        return jsonify({"user_id": g.user_id, "email": g.user.email})
+
+    @app.route("/public")
+    @auth_middleware.optional_login
+    def public():
+        return jsonify({"user_id": g.user_id})
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {_token()}"}
+    assert client.get("/private", headers=headers).get_json() == {"user_id": "user-1", "email": "a@b.c"}
+    assert client.get("/public", headers=headers).get_json() == {"user_id": "user-1"}
+    assert verifier.stats()["local"] == 1 and verifier.stats()["cache_hits"] == 1
+
+    expired = {"Authorization": f"Bearer {_token(exp=int(time.time()) - 10)}"}
+    assert client.get("/private", headers=expired).status_code == 401
+    assert client.get("/private").status_code == 401
+    assert client.get("/public", headers=expired).get_json() == {"user_id": None}
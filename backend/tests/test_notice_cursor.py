@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+공지 커서(keyset) 페이지네이션 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_notice_cursor.py
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services.notice_cursor import apply_keyset, decode_cursor, encode_cursor, next_cursor, parse_count_mode
+
+
+def _split_top_level(text):
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    return parts + [current]
+
+
+def _condition(expr):
+    """PostgREST 논리 필터(or/and, lt/gt/eq/is)를 행 판정 함수로 바꿉니다."""
+    if expr.startswith("and("):
+        conditions = [_condition(part) for part in _split_top_level(expr[4:-1])]
+        return lambda r: all(c(r) for c in conditions)
+
+    column, op, value = re.match(r'(\w+)\.((?:not\.)?\w+)\.(.*)', expr).groups()
+    value = value[1:-1] if value.startswith('"') else value
+    if op in ("is", "not.is"):
+        return lambda r: (r[column] is None) == (op == "is")
+
+    def compare(r):
+        if r[column] is None:
+            return False
+        left, right = (r[column], type(r[column])(value))
+        return {"lt": left < right, "gt": left > right, "eq": left == right}[op]
+    return compare
+
+
+class _FakeQuery:
+    """정렬 + 논리 필터만 흉내 내는 PostgREST 쿼리 (NULL 순서는 PostgreSQL 기본값)"""
+
+    def __init__(self, rows):
+        self.rows, self.filters, self.orders, self.size = rows, [], [], None
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def or_(self, expr):
+        conditions = [_condition(part) for part in _split_top_level(expr)]
+        self.filters.append(lambda r: any(c(r) for c in conditions))
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(_condition(f"{column}.is.{value}"))
+        return self
+
+    def filter(self, column, op, value):
+        self.filters.append(_condition(f"{column}.{op}.{value}"))
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)]
+        for column, desc in reversed(self.orders):
+            present = sorted((r for r in rows if r[column] is not None), key=lambda r: r[column], reverse=desc)
+            missing = [r for r in rows if r[column] is None]
+            rows = missing + present if desc else present + missing
+        return type("Result", (), {"data": rows[:self.size]})()
+
+
+def _page_through(rows, sort, limit=2):
+    pages, cursor = [], None
+    while True:
+        page = apply_keyset(_FakeQuery(rows), sort, cursor).limit(limit).execute().data
+        pages.append([r["id"] for r in page])
+        cursor = next_cursor(sort, page, limit)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_roundtrip_and_validation():
+    cursor = encode_cursor("latest", {"id": "a1", "published_at": "2026-03-01T10:00:00+00:00"})
+    assert decode_cursor(cursor, "latest") == ("2026-03-01T10:00:00+00:00", "a1")
+    assert encode_cursor("relevance", {"id": "a1"}, value=3.25) != cursor
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "views")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "latest")
+
+    assert parse_count_mode(None, "exact") == "exact"
+    assert parse_count_mode("NONE", "exact") is None
+    with pytest.raises(ValueError):
+        parse_count_mode("all", "exact")
+
+
+@pytest.mark.parametrize("sort, column", [("latest", "published_at"), ("views", "view_count"), ("deadline", "deadline")])
+def test_keyset_pages_cover_every_row_once_with_ties_and_nulls(sort, column):
+    values = {
+        "latest": ["2026-03-02T09:00:00", "2026-03-01T10:00:00", "2026-03-01T10:00:00", None, "2026-02-01T00:00:00", None],
+        "views": [10, 5, 5, None, 5, 0],
+        "deadline": ["2026-04-01", None, "2026-03-15", "2026-03-15", None, "2026-03-01"],
+    }[sort]
+    rows = [{"id": f"n{i}", column: value} for i, value in enumerate(values)]
+
+    pages = _page_through(rows, sort)
+    seen = [notice_id for page in pages for notice_id in page]
+    assert sorted(seen) == sorted(r["id"] for r in rows)
+    assert seen == [r["id"] for r in apply_keyset(_FakeQuery(rows), sort).execute().data]
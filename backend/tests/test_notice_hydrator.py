@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+검색 결과 상세 정보 보완(hydration) + DB 왕복 계측 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_notice_hydrator.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import httpx
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services import round_trip_counter
+from services.hybrid_search_service import HybridSearchService
+from services.notice_hydrator import NoticeHydrator
+
+
+class _FakeNotices:
+    """notices.select(...).in_("id", ids) 만 흉내 내고 조회 횟수를 셈"""
+
+    def __init__(self, rows):
+        self.rows = {row["id"]: row for row in rows}
+        self.queries = []
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.queries.append(list(values))
+        self._ids = values
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[dict(self.rows[i]) for i in self._ids if i in self.rows])
+
+
+def test_keyword_candidates_are_hydrated_in_one_query():
+    client = _FakeNotices([
+        {"id": "n1", "title": "장학금 신청 안내", "content": "본문1", "category": "장학", "view_count": 3},
+        {"id": "n2", "title": "국가장학금 2차", "content": "본문2", "category": "장학", "view_count": 9},
+        {"id": "n3", "title": "기숙사 입사", "content": "본문3", "category": "생활", "view_count": 1},
+    ])
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.supabase = client
+    service.text_index = SimpleNamespace(
+        ready=True,
+        sync_in_background=lambda: None,
+        search=lambda query, limit: [("n1", 4.0), ("n2", 2.0), ("gone", 1.0)]
+    )
+
+    hydrator = NoticeHydrator(client)
+    title_results = service._search_by_title("장학금", limit=10, hydrator=hydrator)
+    vector_results = [
+        {"id": "n2", "similarity": 0.8},
+        {"id": "n3", "similarity": 0.4, "title": "기숙사"},
+        {"id": "stale", "similarity": 0.9, "title": "로컬 인덱스에만 남은 공지"},
+    ]
+    candidates = {c["id"]: c for c in service._merge_keyword_candidates(title_results, vector_results, hydrator)}
+
+    # BM25 결과 + 벡터 전용 결과 상세를 한 번에 조회, 삭제된 공지(gone, stale)는 양쪽 모두 제외
+    assert client.queries == [["n1", "n2", "gone", "n3", "stale"]]
+    assert set(candidates) == {"n1", "n2", "n3"}
+    assert candidates["n1"]["total_score"] == 0.5 and candidates["n1"]["content"] == "본문1"
+    assert candidates["n2"]["total_score"] == 0.25 + 0.4 and candidates["n2"]["view_count"] == 9
+    assert not candidates["n3"]["title_match"] and candidates["n3"]["title"] == "기숙사 입사"
+
+    # 이미 가진 행은 다시 조회하지 않음
+    assert hydrator.hydrate([{"id": "n3", "title": None}])[0]["title"] == "기숙사 입사"
+    assert len(client.queries) == 1
+
+
+def test_round_trips_are_counted_per_context():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    session = httpx.Client(base_url="http://db.local", transport=transport)
+    round_trip_counter.instrument_client(SimpleNamespace(postgrest=SimpleNamespace(session=session), auth=None))
+    round_trip_counter.instrument_client(SimpleNamespace(postgrest=SimpleNamespace(session=session), auth=None))
+
+    session.get("/rest/v1/notices")        # 카운터 밖 (백그라운드 동기화 등): 세지 않음
+    with round_trip_counter.counting() as counts:
+        session.get("/rest/v1/notices")
+        session.post("/rest/v1/rpc/search_notices_by_vector")
+        assert round_trip_counter.current_count() == 2
+    assert counts == {"rest": 1, "rpc": 1, "auth": 0}
+    assert round_trip_counter.current_count() is None
+
+    round_trip_counter.record("search.test", counts)
+    stats = round_trip_counter.stats()["search.test"]
+    assert (stats["requests"], stats["avg_round_trips"], stats["max_round_trips"]) == (1, 2.0, 2)
+
+
+def test_round_trip_counter_closed_when_view_raises():
+    """처리되지 않은 예외로 after_request가 건너뛰어져도 teardown에서 카운터를 닫음"""
+    import pytest
+    from flask import Flask
+    from routes.search import search_bp
+
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.register_blueprint(search_bp)
+
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_url_rule("/api/search/_boom", endpoint="search._boom", view_func=boom)
+    app.add_url_rule("/api/search/_ok", endpoint="search._ok", view_func=lambda: "ok")
+
+    assert app.test_client().get("/api/search/_ok").headers["X-Supabase-Round-Trips"] == "0"
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/api/search/_boom")
+
+    assert round_trip_counter.current_count() is None
+    assert round_trip_counter.stats()["search._boom"]["requests"] == 1
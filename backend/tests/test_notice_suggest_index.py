@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 자동완성(접두어) 인덱스 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_notice_suggest_index.py
+"""
+
+import os
+import sys
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services.notice_suggest_index import NoticeSuggestIndex, normalize_suggest_key
+
+
+def _notice(notice_id, title, views=0, published_at="2026-03-01", keywords=None):
+    notice = {"id": notice_id, "title": title, "view_count": views, "published_at": published_at}
+    if keywords is not None:
+        notice["enriched_metadata"] = {"keywords_expanded": keywords}
+    return notice
+
+
+def _texts(results):
+    return [result["text"] for result in results]
+
+
+def test_prefix_matches_word_starts_and_partial_syllables():
+    index = NoticeSuggestIndex()
+    index.upsert_many([
+        _notice("n1", "[학사] 2026학년도 국가장학금 신청 안내"),
+        _notice("n2", "교내 장학금 선발 결과"),
+        _notice("n3", "도서관 휴관 안내"),
+    ])
+
+    assert normalize_suggest_key("[학사] AI") == normalize_suggest_key("학사 ai")
+    assert _texts(index.suggest("장하")) == ["교내 장학금 선발 결과"]   # 입력 중인 음절
+    assert _texts(index.suggest("학사")) == ["[학사] 2026학년도 국가장학금 신청 안내"]
+    assert set(_texts(index.suggest("안내"))) == {"[학사] 2026학년도 국가장학금 신청 안내", "도서관 휴관 안내"}
+    assert index.suggest("기숙사") == [] and index.suggest("  ") == []
+
+
+def test_ranking_by_recency_views_and_keyword_aggregation():
+    index = NoticeSuggestIndex()
+    index.upsert_many([
+        _notice("old", "장학금 안내 (지난 학기)", views=50, published_at="2025-09-01", keywords=["장학금"]),
+        _notice("new", "장학금 신청 안내", views=5, published_at="2026-03-01", keywords=["장학금", "신청"]),
+        _notice("hot", "장학생 면접 일정", views=5000, published_at="2026-02-25"),
+    ])
+
+    results = index.suggest("장학", limit=10)
+    # 조회수가 아주 많은 최근 공지 > 두 공지에 붙은 키워드 > 최신 공지 > 오래된 공지
+    assert _texts(results) == ["장학생 면접 일정", "장학금", "장학금 신청 안내", "장학금 안내 (지난 학기)"]
+    assert results[1] == {"text": "장학금", "type": "keyword", "notice_id": None}
+    assert index.suggest("장학", limit=2) == results[:2]
+
+    index.update_views("new", 100000)
+    assert _texts(index.suggest("장학", limit=10))[:2] == ["장학금", "장학금 신청 안내"]
+
+
+def test_title_change_remove_and_keyword_cleanup():
+    index = NoticeSuggestIndex()
+    index.upsert_many([
+        _notice("n1", "기숙사 입사 신청", keywords=["기숙사"]),
+        _notice("n2", "기숙사 퇴사 안내"),
+    ])
+
+    index.upsert("n1", _notice("n1", "생활관 입사 신청", keywords=["생활관"]))
+    assert _texts(index.suggest("기숙")) == ["기숙사 퇴사 안내"]
+    assert _texts(index.suggest("생활")) == ["생활관", "생활관 입사 신청"]
+    assert index.dead_ratio() > 0
+
+    assert index.remove("n1") and not index.remove("n1")
+    assert index.suggest("생활") == []
+    assert len(index) == 1 and index.stats()["keywords"] == 0
+
+
+def test_sync_rebuilds_and_applies_incremental_rows():
+    rows = [
+        {**_notice("n1", "등록금 납부 안내"), "updated_at": "2026-01-01"},
+        {**_notice("n2", "등록 기간 연장"), "updated_at": "2026-01-02"},
+    ]
+    requested = []
+
+    def fetch_pages(since):
+        requested.append(since)
+        yield [r for r in rows if since is None or r["updated_at"] > since]
+
+    index = NoticeSuggestIndex()
+    index._fetch_pages = fetch_pages
+    assert index.sync() == 2 and index.ready
+
+    rows.append({**_notice("n3", "등록금 반환 기준", published_at="2026-04-01"), "updated_at": "2026-01-03"})
+    assert index.sync(force=True) == 1
+    assert requested == [None, "2026-01-02"]
+    assert _texts(index.suggest("등록금")) == ["등록금 반환 기준", "등록금 납부 안내"]
+
+
+def test_notice_delete_removes_title_and_keywords(monkeypatch):
+    """공지 삭제 API 경로가 공유 자동완성 인덱스에서 제목과 그 공지만의 키워드를 바로 제거"""
+    import services.notice_suggest_index as notice_suggest_index
+    from services.supabase_service import SupabaseService
+
+    index = NoticeSuggestIndex()
+    index.upsert_many([
+        _notice("n1", "기숙사 입사 안내", keywords=["기숙사비"]),
+        _notice("n2", "기숙사 점호 일정"),
+    ])
+    monkeypatch.setattr(notice_suggest_index, "_shared_index", index)
+
+    class _FakeDelete:
+        def table(self, name):
+            return self
+
+        def delete(self):
+            return self
+
+        def eq(self, column, value):
+            return self
+
+        def execute(self):
+            return None
+
+    supabase = object.__new__(SupabaseService)
+    supabase.client = _FakeDelete()
+    assert supabase.delete_notice("n1")
+
+    assert _texts(index.suggest("기숙사", limit=10)) == ["기숙사 점호 일정"]
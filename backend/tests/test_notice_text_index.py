@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+공지 전문 검색(BM25) 인덱스 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_notice_text_index.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services.notice_text_index import NoticeTextIndex, tokenize, encode_varints, decode_varints
+
+
+def _notice(notice_id, title, content="", category="학사", published_at="2026-01-01"):
+    return {"id": notice_id, "title": title, "content": content, "category": category, "published_at": published_at}
+
+
+def test_tokenize_and_varint_roundtrip():
+    assert tokenize("장학금을 신청!") == ["장학", "학금", "금을", "장학금", "학금을", "신청"]
+    assert tokenize("ＡＩ 1") == ["ai", "1"]
+
+    values = np.array([0, 1, 127, 128, 16383, 16384, 2**21, 2**28 + 5], dtype=np.int64)
+    assert decode_varints(encode_varints(values)).tolist() == values.tolist()
+
+
+def test_bm25_ranking_updates_and_filters():
+    index = NoticeTextIndex()
+    index.upsert_many([
+        _notice("n1", "국가장학금 2차 신청 안내", "장학금 신청 기간은 3월까지입니다."),
+        _notice("n2", "수강신청 일정", "장학금과 무관한 학사 일정", published_at="2026-02-01"),
+        _notice("n3", "교내 장학금 선발 결과", "성적 장학금", category="장학", published_at="2026-03-01"),
+        _notice("n4", "도서관 휴관 안내", "시설 점검"),
+    ])
+
+    hits = index.search("장학금 신청")
+    assert hits[0][0] == "n1"
+    assert "n4" not in {notice_id for notice_id, _ in hits}
+    assert [notice_id for notice_id, _ in index.search("장학금", category="장학")] == ["n3"]
+    assert {notice_id for notice_id, _ in index.search("장학금", date_from="2026-02-01")} == {"n2", "n3"}
+
+    # 수정: 기존 문서는 삭제 표시 후 새 번호로 추가
+    index.upsert("n4", _notice("n4", "장학금 신청 서류 제출 안내", "장학금 신청 서류"))
+    assert len(index) == 4
+    assert index.search("도서관") == []
+    assert {notice_id for notice_id, _ in index.search("장학금 신청", limit=2)} == {"n1", "n4"}
+
+    assert index.remove("n1") and not index.remove("n1")
+    assert "n1" not in {notice_id for notice_id, _ in index.search("장학금 신청")}
+
+
+def test_full_match_mode_covers_substring_results():
+    """전체 검색 API 모드: 본문 전체 색인 + 검색어 n-gram 전부 일치 (ILIKE 부분 문자열 결과 포함)"""
+    index = NoticeTextIndex()
+    index.upsert_many([
+        _notice("n1", "학사 안내", "가" * 5000 + " 졸업유예 신청 방법"),
+        _notice("n2", "졸업 사정 안내", "졸업유 예정자 신청"),
+    ])
+
+    assert [notice_id for notice_id, _ in index.search("졸업유예", min_term_match=1.0)] == ["n1"]
+    assert {notice_id for notice_id, _ in index.search("졸업유예")} == {"n1", "n2"}
+
+    assert NoticeTextIndex.covers_substring("졸업유예 신청")
+    assert not NoticeTextIndex.covers_substring("a 장학금")
+    assert not NoticeTextIndex.covers_substring("!!")
+
+
+def test_sync_applies_only_rows_after_watermark():
+    rows = [
+        {**_notice("n1", "등록금 납부 안내"), "updated_at": "2026-01-01"},
+        {**_notice("n2", "기숙사 입사 신청"), "updated_at": "2026-01-02"},
+    ]
+    requested = []
+
+    def fetch_pages(since):
+        requested.append(since)
+        yield [r for r in rows if since is None or r["updated_at"] > since]
+
+    index = NoticeTextIndex()
+    index._fetch_pages = fetch_pages
+    assert not index.ready
+    assert index.sync() == 2 and index.ready
+
+    rows.append({**_notice("n3", "기숙사 퇴사 안내"), "updated_at": "2026-01-03"})
+    assert index.sync(force=True) == 1
+    assert requested == [None, "2026-01-02"]
+    assert {notice_id for notice_id, _ in index.search("기숙사")} == {"n2", "n3"}
+
+
+def test_synced_base_requires_index_hooks():
+    """기반 클래스는 추상 클래스 (하위 클래스가 _reset/_adopt/upsert_many를 구현해야 생성 가능)"""
+    from services.synced_notice_index import SyncedNoticeIndex
+
+    with pytest.raises(TypeError):
+        SyncedNoticeIndex()
+
+
+def test_notice_delete_removes_from_shared_index(monkeypatch):
+    """공지 삭제 API 경로가 프로세스 공유 인덱스에서 바로 제거 (전체 재적재 기다리지 않음)"""
+    import services.notice_text_index as notice_text_index
+    from services.supabase_service import SupabaseService
+
+    index = NoticeTextIndex()
+    index.upsert_many([_notice("n1", "국가장학금 신청 안내"), _notice("n2", "교내 장학금 결과")])
+    monkeypatch.setattr(notice_text_index, "_shared_index", index)
+
+    class _FakeDelete:
+        def table(self, name):
+            return self
+
+        def delete(self):
+            return self
+
+        def eq(self, column, value):
+            return self
+
+        def execute(self):
+            return None
+
+    supabase = object.__new__(SupabaseService)
+    supabase.client = _FakeDelete()
+    assert supabase.delete_notice("n1")
+
+    assert [notice_id for notice_id, _ in index.search("장학금", limit=10)] == ["n2"]
+    assert index.dead_ratio() == 0.5
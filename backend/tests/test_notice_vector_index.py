@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+공지사항 벡터 인덱스 단위 테스트
+
+📚 실행 방법:
+cd backend
+pytest tests/test_notice_vector_index.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from services.notice_vector_index import NoticeVectorIndex
+
+
+def _random_vectors(count, dimension, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((count, dimension)).astype(np.float32)
+
+
+def test_search_matches_brute_force():
+    """인덱스 상위 k 결과가 전수 코사인 유사도 순위와 일치"""
+    vectors = _random_vectors(300, 16)
+    index = NoticeVectorIndex(dimension=16)
+    for i, vec in enumerate(vectors):
+        index.upsert(f"n{i}", vec.tolist(), {"title": f"공지 {i}"})
+
+    query = vectors[7] + 0.1
+    results = index.search(query.tolist(), limit=10)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:10]
+
+    assert [r["id"] for r in results] == [f"n{i}" for i in expected]
+    assert results[0]["title"] == f"공지 {expected[0]}"
+
+
+def test_pgvector_string_and_candidate_filter():
+    """pgvector 문자열 입력과 notice_ids 후보 필터"""
+    index = NoticeVectorIndex(dimension=3)
+    index.upsert("a", "[1,0,0]")
+    index.upsert("b", "[0.9,0.1,0]")
+    index.upsert("c", "[0,1,0]")
+
+    results = index.search([1, 0, 0], limit=5, notice_ids=["b", "c", "missing"])
+
+    assert [r["id"] for r in results] == ["b", "c"]
+
+
+def test_remove_keeps_rows_contiguous():
+    """삭제 후에도 남은 공지를 정상 검색"""
+    index = NoticeVectorIndex(dimension=3)
+    index.upsert("a", [1, 0, 0])
+    index.upsert("b", [0, 1, 0])
+    index.upsert("c", [0, 0, 1])
+
+    assert index.remove("a")
+    assert len(index) == 2
+
+    results = index.search([0, 0, 1], limit=1)
+    assert results[0]["id"] == "c"
+    assert results[0]["similarity"] > 0.99
+
+
+def test_quantized_precision_rescores_with_full_vectors():
+    """int8/float16 인덱스는 1차 후보를 원본 벡터로 재계산해 정확한 순위 반환"""
+    vectors = _random_vectors(500, 32, seed=3)
+    full = {f"n{i}": vec.tolist() for i, vec in enumerate(vectors)}
+    fetched = []
+
+    def fetcher(ids):
+        fetched.append(len(ids))
+        return {nid: full[nid] for nid in ids}
+
+    query = vectors[11] + 0.05
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    exact = unit @ (query / np.linalg.norm(query))
+    expected = [f"n{i}" for i in np.argsort(-exact)[:10]]
+
+    for precision in ("float16", "int8"):
+        index = NoticeVectorIndex(dimension=32, precision=precision, full_vector_fetcher=fetcher)
+        for nid, vec in full.items():
+            index.upsert(nid, vec)
+
+        results = index.search(query.tolist(), limit=10)
+
+        assert [r["id"] for r in results] == expected
+        assert abs(results[0]["similarity"] - float(exact.max())) < 1e-5
+        assert index.nbytes < 500 * 32 * 4
+
+    assert fetched == [10 * NoticeVectorIndex.RESCORE_FACTOR] * 2
+
+
+def test_disk_snapshot_restores_index_and_syncs_only_newer_rows(tmp_path):
+    """재시작 후 첫 sync는 스냅샷 복원 + watermark 이후 변경분만 조회"""
+    rows = [
+        {"id": f"n{i}", "title": f"공지 {i}", "content_embedding": vec.tolist(), "updated_at": f"2026-01-0{i + 1}"}
+        for i, vec in enumerate(_random_vectors(3, 4))
+    ]
+    requested = []
+
+    def fetch_pages(since):
+        requested.append(since)
+        yield [r for r in rows if since is None or r["updated_at"] > since]
+
+    index = NoticeVectorIndex(dimension=4, snapshot_dir=str(tmp_path))
+    index._fetch_pages = fetch_pages
+    index.sync()
+    index._save_thread.join()
+
+    rows.append({"id": "n9", "title": "새 공지", "content_embedding": [1, 0, 0, 0], "updated_at": "2026-02-01"})
+    restarted = NoticeVectorIndex(dimension=4, snapshot_dir=str(tmp_path))
+    restarted._fetch_pages = fetch_pages
+    assert restarted.sync() == 1
+
+    assert requested == [None, "2026-01-03"]
+    assert len(restarted) == 4
+    assert restarted.search([1, 0, 0, 0], limit=1)[0]["title"] == "새 공지"
+    assert {r["id"] for r in restarted.search([0, 1, 0, 0], limit=10)} == {"n0", "n1", "n2", "n9"}
+
+
+def test_full_reload_fetches_outside_lock_and_swaps():
+    """전체 재적재 중에도 다른 스레드의 검색은 기존 인덱스로 바로 응답"""
+    import threading
+
+    index = NoticeVectorIndex(dimension=3)
+    index.upsert("old", [1, 0, 0])
+    during_fetch = []
+
+    def fetch_pages(since):
+        worker = threading.Thread(target=lambda: during_fetch.append(index.search([1, 0, 0], limit=5)))
+        worker.start()
+        worker.join(timeout=2)
+        yield [{"id": "new", "content_embedding": [0, 1, 0], "updated_at": "2026-01-01"}]
+
+    index._fetch_pages = fetch_pages
+    assert index.sync() == 1
+
+    assert [r["id"] for r in during_fetch[0]] == ["old"]
+    assert [r["id"] for r in index.search([0, 1, 0], limit=5)] == ["new"]
+
+
+def test_notice_delete_removes_from_shared_vector_index(monkeypatch):
+    """공지 삭제 API 경로가 프로세스 공유 벡터 인덱스에서도 바로 제거"""
+    import services.notice_vector_index as notice_vector_index
+    from services.supabase_service import SupabaseService
+
+    index = NoticeVectorIndex(dimension=3)
+    index.upsert("a", [1, 0, 0])
+    index.upsert("b", [0.9, 0.1, 0])
+    monkeypatch.setattr(notice_vector_index, "_shared_index", index)
+
+    class _FakeDelete:
+        def table(self, name):
+            return self
+
+        def delete(self):
+            return self
+
+        def eq(self, column, value):
+            return self
+
+        def execute(self):
+            return None
+
+    supabase = object.__new__(SupabaseService)
+    supabase.client = _FakeDelete()
+    assert supabase.delete_notice("a")
+
+    assert [r["id"] for r in index.search([1, 0, 0], limit=5)] == ["b"]
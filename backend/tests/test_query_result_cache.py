@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 검색 의미 캐시 단위 테스트 (Supabase/Gemini 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_query_result_cache.py
+"""
+
+import os
+import sys
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import services.feed_cache as feed_cache
+from services.hybrid_search_service import HybridSearchService
+from services.query_result_cache import SemanticQueryCache
+
+
+def test_lookup_threshold_limit_version_and_eviction():
+    cache = SemanticQueryCache(max_entries=2, similarity_threshold=0.9, ttl_seconds=60)
+    cache.put("장학금", [1.0, 0.0, 0.0], [{"id": "n1"}], candidate_limit=20)
+
+    assert cache.lookup("장학금 신청", [0.95, 0.2, 0.0], candidate_limit=20) == [{"id": "n1"}]
+    assert cache.lookup("기숙사", [0.0, 1.0, 0.0], candidate_limit=20) is None
+    assert cache.lookup("장학금", [1.0, 0.0, 0.0], candidate_limit=40) is None   # 후보 수 부족
+
+    cache.put("기숙사", [0.0, 1.0, 0.0], [{"id": "n2"}], candidate_limit=20)
+    cache.lookup("장학금", [1.0, 0.0, 0.0], candidate_limit=20)           # 장학금이 최근 사용
+    cache.put("휴학", [0.0, 0.0, 1.0], [{"id": "n3"}], candidate_limit=20)  # 기숙사 제거
+    assert cache.lookup("기숙사", [0.0, 1.0, 0.0], candidate_limit=20) is None
+    assert cache.lookup("휴학", [0.0, 0.0, 1.0], candidate_limit=20) == [{"id": "n3"}]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["exact_hits"], stats["semantic_hits"], stats["evictions"]) == (3, 2, 1, 1)
+
+    feed_cache.bump_corpus_version()
+    assert cache.lookup("휴학", [0.0, 0.0, 1.0], candidate_limit=20) is None
+    assert cache.stats()["invalidations"] == 1 and cache.stats()["size"] == 0
+
+
+class _FakeEmbedding:
+    VECTORS = {"장학금": [1.0, 0.0], "장학금 신청": [0.97, 0.24], "기숙사": [0.0, 1.0]}
+
+    def create_query_embedding(self, query):
+        return self.VECTORS[query]
+
+
+def _service(monkeypatch):
+    service = HybridSearchService.__new__(HybridSearchService)
+    service.embedding_service = _FakeEmbedding()
+    service.text_index = type("NotReady", (), {"ready": False})()
+    monkeypatch.setattr(HybridSearchService, "query_result_cache",
+                        SemanticQueryCache(max_entries=8, similarity_threshold=0.9, ttl_seconds=60))
+
+    calls = []
+
+    def search_by_title(query, limit=50, hydrator=None):
+        calls.append(("title", query))
+        return [{"id": "n1", "title_match": True, "title_score": 0.5}] if "장학" in query else []
+
+    def vector_search(query_embedding, limit=20):
+        calls.append(("vector", tuple(query_embedding)))
+        return [{"id": "n1", "title": "장학금 신청 안내", "similarity": 0.8},
+                {"id": "n2", "title": "국가 지원 장학 제도", "similarity": 0.6}]
+
+    service._search_by_title = search_by_title
+    service._vector_search_notices = vector_search
+    service.supabase = _FakeDetails()
+    return service, calls
+
+
+class _FakeDetails:
+    """결합 직전 상세 조회 (notices.select(...).in_(...)) 대체"""
+
+    TITLES = {"n1": "장학금 신청 안내", "n2": "국가 지원 장학 제도"}
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.ids = values
+        return self
+
+    def execute(self):
+        rows = [{"id": notice_id, "title": self.TITLES[notice_id], "content": "", "view_count": 0}
+                for notice_id in self.ids]
+        return type("Result", (), {"data": rows})()
+
+
+def test_near_duplicate_query_reuses_candidates_and_reapplies_title_bonus(monkeypatch):
+    service, calls = _service(monkeypatch)
+
+    first = service.search_by_keyword("장학금", limit=5, min_score=0.0)
+    assert [r["id"] for r in first] == ["n1", "n2"]
+    assert len(calls) == 2
+
+    # 임베딩이 가까운 검색어: DB/RPC 호출 없이 후보 재사용, 제목 보너스는 새 검색어 기준
+    second = service.search_by_keyword("장학금 신청", limit=5, min_score=0.0)
+    assert len(calls) == 2
+    by_id = {r["id"]: r for r in second}
+    assert by_id["n1"]["title_match"] and by_id["n1"]["total_score"] == 0.5 + 0.4
+    assert not by_id["n2"]["title_match"] and by_id["n2"]["total_score"] == 0.3
+
+    # 반환값을 고쳐도 캐시된 후보는 그대로
+    second[0]["total_score"] = -1
+    assert service.search_by_keyword("장학금", limit=5, min_score=0.0)[0]["total_score"] == 0.9
+
+    service.search_by_keyword("기숙사", limit=5, min_score=0.0)
+    assert len(calls) == 4
+    assert HybridSearchService.query_result_cache.stats()["semantic_hits"] == 1
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 클러스터 인덱스 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_user_cluster_index.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from ai.embedding_service import EmbeddingService
+from services.user_cluster_index import UserClusterIndex
+from services.user_embedding_snapshot import UserMatrix
+
+
+def _users(vectors: np.ndarray, prefix: str = "u") -> UserMatrix:
+    n = len(vectors)
+    return UserMatrix(
+        ids=[f"{prefix}{i}" for i in range(n)],
+        matrix=EmbeddingService.normalize(vectors.astype(np.float32)),
+        departments=np.array(["A"] * n, dtype=object),
+        grades=np.ones(n, dtype=np.int32),
+        notification_enabled=np.ones(n, dtype=bool),
+        has_embedding=np.ones(n, dtype=bool),
+        categories=[[] for _ in range(n)]
+    )
+
+
+def _clustered(rng, n=600, topics=6, dimension=16):
+    centers = np.eye(dimension, dtype=np.float32)[:topics] * 5
+    return centers[rng.integers(0, topics, n)] + rng.standard_normal((n, dimension)).astype(np.float32)
+
+
+def test_score_matches_exact_similarity_within_probed_clusters():
+    rng = np.random.default_rng(0)
+    users = _users(_clustered(rng))
+    index = UserClusterIndex.fit(users, k=6)
+    assert index.cluster_sizes().sum() == len(users)
+
+    queries = users.matrix[[3, 42]]
+    for query, (rows, scores) in zip(queries, index.score(queries, probes=2)):
+        assert np.array_equal(np.sort(rows), np.sort(index.candidate_rows(query, 2)))
+        assert np.allclose(scores, users.matrix[rows] @ query, atol=1e-5)
+
+        # 전체 정확 계산 상위 20명은 모두 후보에 포함 (주제가 뚜렷한 데이터)
+        exact_top = np.argsort(-(users.matrix @ query))[:20]
+        assert set(exact_top) <= set(rows.tolist())
+
+
+def test_aligned_to_reassigns_only_new_and_changed_users(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = _clustered(rng, n=200)
+    users = _users(vectors)
+    index = UserClusterIndex.fit(users, k=6)
+
+    changed = vectors.copy()
+    changed[0] = -changed[0]
+    updated = _users(np.vstack([changed, _clustered(rng, n=5)]))
+    aligned = index.aligned_to(updated)
+
+    assert aligned.reassigned == 1 + 5
+    assert np.array_equal(aligned.assignments[1:200], index.assignments[1:200])
+    assert aligned.aligned_to(updated) is aligned
+
+    path = str(tmp_path / "clusters.npz")
+    aligned.save(path)
+    loaded = UserClusterIndex.load(path, updated)
+    assert np.allclose(loaded.centroids, aligned.centroids)
+    assert np.array_equal(loaded.assignments, aligned.assignments)
+    assert UserClusterIndex.load(path, _users(rng.standard_normal((4, 8)))) is None
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 임베딩 스냅샷 단위 테스트 (Supabase 호출 없음)
+
+📚 실행 방법:
+cd backend
+pytest tests/test_user_embedding_snapshot.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import services.user_embedding_snapshot as snapshot_module
+from services.user_embedding_snapshot import UserEmbeddingSnapshot
+
+
+class _FakeQuery:
+    """users / user_preferences 테이블만 흉내 내는 PostgREST 쿼리"""
+
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.columns, self.count = "", None
+        self.filters, self.order_desc, self.window = [], False, None
+
+    def select(self, columns, count=None):
+        self.columns, self.count = columns, count
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: r[column] > value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda r: r[column] in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_col, self.order_desc = column, desc
+        return self
+
+    def limit(self, n):
+        self.window = (0, n)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    def execute(self):
+        self.db.queries.append((self.table, self.columns))
+        rows = [dict(r) for r in self.db.tables[self.table] if all(f(r) for f in self.filters)]
+        total = len(rows)
+        if hasattr(self, "order_col"):
+            rows.sort(key=lambda r: r[self.order_col], reverse=self.order_desc)
+        if self.window:
+            rows = rows[self.window[0]:self.window[0] + self.window[1]]
+        if self.db.max_rows:
+            rows = rows[:self.db.max_rows]      # PostgREST 응답 최대 행 수
+        if "user_preferences(" in self.columns:
+            prefs = {p["user_id"]: p for p in self.db.tables["user_preferences"]}
+            for row in rows:
+                row["user_preferences"] = [prefs[row["id"]]] if row["id"] in prefs else []
+        return type("Result", (), {"data": rows, "count": total if self.count else None})()
+
+
+class _FakeDb:
+    def __init__(self):
+        self.tables = {"users": [], "user_preferences": []}
+        self.queries = []
+        self.max_rows = None
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+    def add_user(self, user_id, ts, vector, department="A", grade=1, notify=True):
+        self.tables["users"].append({"id": user_id, "department": department, "grade": grade, "updated_at": ts})
+        self.tables["user_preferences"].append({
+            "user_id": user_id, "notification_enabled": notify, "interests_embedding": vector,
+            "categories": ["학사"], "updated_at": ts
+        })
+
+
+def test_snapshot_full_reuse_incremental_and_deletion(monkeypatch):
+    db = _FakeDb()
+    db.add_user("u1", "2026-01-01", [1.0, 0.0])
+    db.add_user("u2", "2026-01-01", [0.0, 2.0], department="B", notify=False)
+    monkeypatch.setattr(snapshot_module, "get_supabase_client", lambda: db)
+
+    snapshot = UserEmbeddingSnapshot(dimension=2)
+    snapshot.MIN_CHECK_INTERVAL = 0
+    snapshot.MAX_INCREMENTAL_RATIO = 1.0
+
+    users = snapshot.refresh()
+    assert users.ids == ["u1", "u2"]
+    assert np.allclose(users.matrix, [[1.0, 0.0], [0.0, 1.0]])
+    assert users.notification_enabled.tolist() == [True, False]
+    assert snapshot.stats()["full"] == 1
+
+    # 변경 없음 → 키 확인 쿼리만
+    db.queries.clear()
+    assert snapshot.refresh() is users
+    assert all("user_preferences(" not in cols for _, cols in db.queries)
+
+    # 선호도 1건 변경 + 신규 사용자 → 바뀐 사용자만 재조회
+    db.tables["user_preferences"][0].update(interests_embedding=[0.0, 1.0], updated_at="2026-01-02")
+    db.add_user("u3", "2026-01-02", [1.0, 1.0], grade=2)
+    updated = snapshot.refresh()
+    assert updated is not users
+    assert updated.ids == ["u1", "u2", "u3"]
+    assert np.allclose(updated.matrix[0], [0.0, 1.0])
+    assert np.allclose(users.matrix[0], [1.0, 0.0])  # 기존 스냅샷은 그대로
+    assert snapshot.stats()["incremental"] == 1
+
+    # 삭제 (사용자 수 감소) → 전체 재적재
+    db.tables["users"] = [u for u in db.tables["users"] if u["id"] != "u2"]
+    db.tables["user_preferences"] = [p for p in db.tables["user_preferences"] if p["user_id"] != "u2"]
+    assert snapshot.refresh().ids == ["u1", "u3"]
+    assert snapshot.stats()["full"] == 2
+
+
+def test_changed_ids_are_paged_and_ratio_uses_full_count(monkeypatch):
+    """변경 ID 조회도 페이지 단위 (응답 행 수 제한에 잘리지 않음), 비율 초과면 전체 재적재"""
+    db = _FakeDb()
+    for i in range(10):
+        db.add_user(f"u{i}", "2026-01-01", [1.0, 0.0])
+    monkeypatch.setattr(snapshot_module, "get_supabase_client", lambda: db)
+
+    snapshot = UserEmbeddingSnapshot(dimension=2)
+    snapshot.MIN_CHECK_INTERVAL = 0
+    db.max_rows = snapshot.PAGE_SIZE = snapshot.CHANGED_ID_CHUNK = 2
+    snapshot.MAX_INCREMENTAL_RATIO = 0.5
+    snapshot.refresh()
+
+    for pref in db.tables["user_preferences"][:5]:
+        pref.update(interests_embedding=[0.0, 1.0], updated_at="2026-01-02")
+    updated = snapshot.refresh()
+    assert snapshot.stats()["incremental"] == 1
+    assert np.allclose(updated.matrix[:5], [[0.0, 1.0]] * 5)
+
+    # 6명 변경 (페이지 하나 크기보다 많고 비율 초과) → 전체 재적재
+    for pref in db.tables["user_preferences"][4:]:
+        pref.update(interests_embedding=[1.0, 1.0], updated_at="2026-01-03")
+    snapshot.refresh()
+    assert snapshot.stats()["full"] == 2 and snapshot.stats()["incremental"] == 1
+
+
+def test_disk_snapshot_restores_and_catches_up_with_delta(monkeypatch, tmp_path):
+    db = _FakeDb()
+    db.add_user("u1", "2026-01-01", [1.0, 0.0])
+    db.add_user("u2", "2026-01-01", [0.0, 2.0], department="B")
+    monkeypatch.setattr(snapshot_module, "get_supabase_client", lambda: db)
+
+    first = UserEmbeddingSnapshot(dimension=2, snapshot_dir=str(tmp_path))
+    first.refresh()
+    first._save_thread.join()
+
+    # 재시작: 파일을 매핑하고 키만 확인 (사용자 전체 조회 없음)
+    db.queries.clear()
+    restarted = UserEmbeddingSnapshot(dimension=2, snapshot_dir=str(tmp_path))
+    restarted.MAX_INCREMENTAL_RATIO = 1.0
+    users = restarted.refresh()
+    assert users.ids == ["u1", "u2"]
+    assert users.departments.tolist() == ["A", "B"]
+    assert users.categories == [["학사"], ["학사"]]
+    assert np.allclose(users.matrix, [[1.0, 0.0], [0.0, 1.0]])
+    assert not users.matrix.flags.writeable  # mmap (읽기 전용)
+    assert restarted.stats()["restored"] == 1 and restarted.stats()["full"] == 0
+    assert all("user_preferences(" not in cols for _, cols in db.queries)
+
+    # 저장 이후 변경분만 반영
+    db.add_user("u3", "2026-01-02", [1.0, 1.0])
+    assert restarted.refresh(force=True).ids == ["u1", "u2", "u3"]
+    assert restarted.stats()["incremental"] == 1 and restarted.stats()["full"] == 0
+
+
+def test_shared_snapshot_reader_follows_writer_generations(monkeypatch, tmp_path):
+    db = _FakeDb()
+    db.add_user("u1", "2026-01-01", [1.0, 0.0])
+    db.tables["user_preferences"][0]["keywords"] = ["장학금"]
+    monkeypatch.setattr(snapshot_module, "get_supabase_client", lambda: db)
+
+    # 같은 디렉터리의 두 인스턴스 = 워커 2개 (flock은 먼저 연 쪽만 성공)
+    writer = UserEmbeddingSnapshot(dimension=2, snapshot_dir=str(tmp_path), snapshot_role="auto")
+    reader = UserEmbeddingSnapshot(dimension=2, snapshot_dir=str(tmp_path), snapshot_role="auto")
+    writer.MIN_CHECK_INTERVAL = writer.PUBLISH_INTERVAL = 0
+    writer.MAX_INCREMENTAL_RATIO = 1.0
+
+    writer.refresh()
+    writer._save_thread.join()
+
+    # reader는 DB 조회 없이 writer 세대를 매핑
+    db.queries.clear()
+    users = reader.refresh()
+    assert users.ids == ["u1"] and not users.matrix.flags.writeable
+    assert users.profile_at(0)["interests"] == ["장학금"]
+    assert db.queries == []
+    assert reader.stats()["role"] == "auto" and reader.stats()["shared"] == 1
+
+    # writer가 증분 갱신을 발행하면 reader는 다음 호출에서 새 세대로 교체
+    db.add_user("u2", "2026-01-02", [0.0, 1.0])
+    writer.refresh()
+    writer._save_thread.join()
+    db.queries.clear()
+    assert reader.current().ids == ["u1", "u2"]
+    assert reader.stats()["generation"] == writer.stats()["generation"] == 2
+    assert db.queries == []
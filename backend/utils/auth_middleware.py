@@ -2,11 +2,23 @@
 """
 인증 미들웨어
 API 요청 시 Authorization 헤더의 JWT 토큰을 검증합니다.
+검증은 utils/jwt_verifier.py에서 로컬(JWT 시크릿/JWKS)로 처리하고, 불가능할 때만 Supabase Auth를 호출합니다.
 """
 
 from functools import wraps
 from flask import request, jsonify, g
-from services.supabase_service import get_supabase_client
+from utils.jwt_verifier import AuthUser, get_jwt_verifier
+
+
+def _authenticate(token):
+    """
+    토큰을 검증하고 g.user / g.user_id를 설정합니다 (두 데코레이터 공통 경로).
+    유효하지 않으면 AuthTokenError를 발생시킵니다.
+    """
+    claims = get_jwt_verifier().verify(token)
+    g.user = AuthUser.from_claims(claims)
+    g.user_id = g.user.id
+
 
 def optional_login(f):
     """
@@ -22,12 +34,7 @@ def optional_login(f):
             try:
                 parts = auth_header.split()
                 if parts[0].lower() == "bearer" and len(parts) == 2:
-                    token = parts[1]
-                    client = get_supabase_client()
-                    user_response = client.auth.get_user(token)
-                    if user_response and user_response.user:
-                        g.user = user_response.user
-                        g.user_id = user_response.user.id
+                    _authenticate(parts[1])
             except Exception as e:
                 print(f"[Auth] optional_login 토큰 검증 실패 (무시): {str(e)}")
         return f(*args, **kwargs)
@@ -66,17 +73,9 @@ def login_required(f):
             
             token = parts[1]
             
-            # Supabase를 통해 토큰 검증 및 사용자 정보 조회
-            # get_user 함수는 토큰이 유효하지 않으면 에러를 발생시킴
-            client = get_supabase_client()
-            user_response = client.auth.get_user(token)
-            
-            if not user_response or not user_response.user:
-                raise Exception("User info validation failed")
-                
-            # Flask 전역 객체 g에 사용자 정보 저장
-            g.user = user_response.user
-            g.user_id = user_response.user.id
+            # 토큰 검증 후 Flask 전역 객체 g에 사용자 정보 저장
+            # 서명 불일치/만료/aud 불일치 시 AuthTokenError 발생
+            _authenticate(token)
             
         except Exception as e:
             # 토큰 만료, 서명 불일치 등
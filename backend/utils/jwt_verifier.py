@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Supabase 액세스 토큰(JWT) 로컬 검증 모듈
+
+이 파일이 하는 일:
+인증이 필요한 요청마다 client.auth.get_user(token)로 Supabase Auth 서버를 호출하던 것을
+"프로젝트 JWT 시크릿(HS256) 또는 캐시된 JWKS 공개키(RS256/ES256)로 서버 안에서 검증"으로 바꿉니다.
+
+- 서명, exp(만료), aud(기본 "authenticated")를 검사합니다. sub(사용자 ID)가 없으면 거부.
+- 검증된 클레임은 토큰 해시(sha256) 기준으로 짧게(기본 60초, 토큰 만료 시각을 넘지 않음) 캐시
+- 원격 검증(get_user)은 로컬 검증이 "불가능"할 때만 사용합니다.
+  (시크릿 미설정 HS256 토큰, JWKS 조회 실패/알 수 없는 kid, 지원하지 않는 alg)
+  → 서명 불일치/만료/aud 불일치처럼 "유효하지 않은" 토큰은 원격 재시도 없이 바로 거부
+
+환경 변수:
+- SUPABASE_JWT_SECRET: 프로젝트 JWT 시크릿 (대시보드 → Settings → API → JWT Secret)
+- SUPABASE_JWT_AUDIENCE: 기대하는 aud (기본 "authenticated")
+- JWT_CLAIMS_CACHE_TTL / JWT_CLAIMS_CACHE_MAX: 클레임 캐시 TTL(초) / 최대 개수
+- JWKS_CACHE_TTL: JWKS 공개키 캐시 TTL(초)
+
+사용 예시:
+claims = get_jwt_verifier().verify(token)   # 실패 시 AuthTokenError
+user = AuthUser.from_claims(claims)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import jwt
+
+SYMMETRIC_ALGORITHMS = ("HS256",)
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+class AuthTokenError(Exception):
+    """토큰이 유효하지 않음 (서명 불일치, 만료, aud 불일치, 형식 오류)"""
+
+
+class AuthUser:
+    """
+    검증된 클레임으로 만든 가벼운 사용자 객체 (g.user)
+    get_user 응답의 User와 같은 이름의 주요 속성(id, email, role, user_metadata, app_metadata)을 가집니다.
+    """
+
+    def __init__(self, claims: Dict[str, Any]):
+        self.claims = claims
+        self.id = claims.get("sub")
+        self.email = claims.get("email")
+        self.role = claims.get("role")
+        self.user_metadata = claims.get("user_metadata") or {}
+        self.app_metadata = claims.get("app_metadata") or {}
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "AuthUser":
+        return cls(claims)
+
+    def __repr__(self) -> str:
+        return f"AuthUser(id={self.id!r}, email={self.email!r})"
+
+
+class JwtVerifier:
+    """JWT 로컬 검증 + 검증 결과 캐시 (프로세스 전역 1개, get_jwt_verifier)"""
+
+    DEFAULT_AUDIENCE = "authenticated"
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        audience: Optional[str] = DEFAULT_AUDIENCE,
+        cache_ttl: float = 60.0,
+        cache_max_entries: int = 1024,
+        jwks_ttl: float = 600.0,
+        remote_verify: Optional[Callable[[str], Dict[str, Any]]] = None,
+    ):
+        self.secret = secret or None
+        self.audience = audience or None
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.remote_verify = remote_verify
+        self._jwks_client = jwt.PyJWKClient(jwks_url, cache_keys=True, lifespan=jwks_ttl, timeout=5) \
+            if jwks_url else None
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()   # 토큰 해시 → (만료 시각, 클레임)
+        self._stats = {"cache_hits": 0, "local": 0, "remote": 0, "rejected": 0}
+
+    # ------------------------------------------------------------------
+    # 검증
+    # ------------------------------------------------------------------
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        토큰을 검증하고 클레임을 반환합니다.
+
+        반환값:
+        - 클레임 딕셔너리 (sub = 사용자 ID)
+
+        예외:
+        - AuthTokenError: 유효하지 않은 토큰 (원격 검증 실패 포함)
+        """
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self._cache_get(token_hash)
+        if claims is not None:
+            self._count("cache_hits")
+            return claims
+
+        try:
+            key, algorithm = self._resolve_key(token)
+            if key is not None:
+                claims = self._decode(token, key, algorithm)
+                self._count("local")
+            else:
+                claims = self._verify_remote(token)
+                self._count("remote")
+        except AuthTokenError:
+            self._count("rejected")
+            raise
+
+        self._cache_put(token_hash, claims)
+        return claims
+
+    def _resolve_key(self, token: str):
+        """
+        토큰 헤더의 alg/kid로 검증 키를 고릅니다.
+        로컬 검증이 불가능하면 (None, alg)을 반환 → 원격 검증
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            raise AuthTokenError(f"토큰 형식 오류: {str(e)}")
+
+        algorithm = header.get("alg")
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            return self.secret, algorithm
+        if algorithm in ASYMMETRIC_ALGORITHMS and self._jwks_client is not None:
+            try:
+                return self._jwks_client.get_signing_key_from_jwt(token).key, algorithm
+            except jwt.PyJWKClientError as e:
+                # JWKS 조회 실패 / 키 교체 중 알 수 없는 kid → 원격 검증
+                print(f"[Auth] JWKS 서명 키 조회 실패, 원격 검증 사용: {str(e)}")
+        return None, algorithm
+
+    def _decode(self, token: str, key, algorithm: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"require": ["exp", "sub"], "verify_aud": self.audience is not None},
+            )
+        except jwt.InvalidTokenError as e:
+            raise AuthTokenError(str(e))
+
+    def _verify_remote(self, token: str) -> Dict[str, Any]:
+        if self.remote_verify is None:
+            raise AuthTokenError("로컬 검증 불가 (JWT 시크릿/JWKS 없음) + 원격 검증 미설정")
+        try:
+            claims = self.remote_verify(token)
+        except Exception as e:
+            raise AuthTokenError(f"원격 검증 실패: {str(e)}")
+        if not claims or not claims.get("sub"):
+            raise AuthTokenError("원격 검증 실패: 사용자 정보 없음")
+        return claims
+
+    # ------------------------------------------------------------------
+    # 클레임 캐시
+    # ------------------------------------------------------------------
+    def _cache_get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._cache.get(token_hash)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._cache[token_hash]
+                return None
+            self._cache.move_to_end(token_hash)
+            return entry[1]
+
+    def _cache_put(self, token_hash: str, claims: Dict[str, Any]) -> None:
+        if self.cache_ttl <= 0:
+            return
+        expires_at = time.time() + self.cache_ttl
+        if claims.get("exp"):
+            expires_at = min(expires_at, float(claims["exp"]))
+        with self._lock:
+            self._cache[token_hash] = (expires_at, claims)
+            self._cache.move_to_end(token_hash)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "cache_size": len(self._cache),
+                "secret_configured": self.secret is not None,
+                "jwks_configured": self._jwks_client is not None,
+            }
+
+
+def _remote_get_user(token: str) -> Dict[str, Any]:
+    """Supabase Auth 서버 검증 (로컬 검증이 불가능할 때만). 응답 User를 클레임 형태로 변환"""
+    from services.supabase_service import get_supabase_client
+
+    user_response = get_supabase_client().auth.get_user(token)
+    if not user_response or not user_response.user:
+        return {}
+    user = user_response.user
+    claims = {
+        "sub": user.id,
+        "email": user.email,
+        "role": user.role,
+        "user_metadata": user.user_metadata or {},
+        "app_metadata": user.app_metadata or {},
+    }
+    # 서버가 이미 검증했으므로 exp만 읽어 캐시 만료에 사용
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        if exp:
+            claims["exp"] = exp
+    except jwt.InvalidTokenError:
+        pass
+    return claims
+
+
+_verifier: Optional[JwtVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def get_jwt_verifier() -> JwtVerifier:
+    """환경 변수로 설정한 공유 검증기를 반환합니다."""
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                supabase_url = (os.getenv("SUPABASE_URL") or "").rstrip("/")
+                _verifier = JwtVerifier(
+                    secret=os.getenv("SUPABASE_JWT_SECRET"),
+                    jwks_url=f"{supabase_url}/auth/v1/.well-known/jwks.json" if supabase_url else None,
+                    audience=os.getenv("SUPABASE_JWT_AUDIENCE", JwtVerifier.DEFAULT_AUDIENCE),
+                    cache_ttl=float(os.getenv("JWT_CLAIMS_CACHE_TTL", 60)),
+                    cache_max_entries=int(os.getenv("JWT_CLAIMS_CACHE_MAX", 1024)),
+                    jwks_ttl=float(os.getenv("JWKS_CACHE_TTL", 600)),
+                    remote_verify=_remote_get_user,
+                )
+                mode = "HS256 시크릿" if _verifier.secret else "JWKS/원격"
+                print(f"[Auth] JWT 로컬 검증기 초기화 ({mode})")
+    return _verifier
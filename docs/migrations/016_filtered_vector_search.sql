@@ -0,0 +1,113 @@
+-- ============================================================
+-- 016_filtered_vector_search.sql
+-- 후보 필터를 DB 안에서 적용하는 벡터 검색 함수
+--
+-- 변경 사항:
+--   - search_notices_by_vector_filtered: 후보 공지 ID 배열 안에서만 검색
+--   - search_users_by_notice_vector_filtered: 후보 사용자 ID 배열 또는
+--     학과/학년 조건 안에서만 검색
+--   - 두 함수 모두 (id, similarity)만 반환 (본문/요약 등 대용량 컬럼 제외)
+--
+-- 기존 함수(search_notices_by_vector 등)는 전체에서 match_count개를 뽑은 뒤
+-- 백엔드가 Python에서 후보 ID로 걸러내므로, 후보가 적으면 결과가 거의 남지 않고
+-- 버려질 행(content 포함)까지 전송됩니다.
+--
+-- 인덱스 사용:
+--   - 후보 ID 배열: PK 인덱스로 후보만 읽은 뒤 정확한 거리 계산 (재현율 100%)
+--   - 학과/학년 조건: 벡터 인덱스 순서 스캔 + iterative scan (pgvector 0.8+)
+--     (iterative scan이 없는 버전이면 설정을 건너뛰고 기존 방식으로 동작)
+--
+-- 실행 방법: Supabase SQL Editor에서 실행
+-- 백엔드는 함수가 없으면 기존 함수로 자동 폴백합니다.
+-- ============================================================
+
+-- ============================================================
+-- 1. 공지사항: 후보 ID 안에서 벡터 검색
+-- ============================================================
+CREATE OR REPLACE FUNCTION search_notices_by_vector_filtered(
+    query_embedding vector(768),
+    candidate_ids uuid[],
+    match_threshold float DEFAULT 0.2,
+    match_count int DEFAULT 50
+)
+RETURNS TABLE (
+    id uuid,
+    similarity float
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        n.id,
+        1 - (n.content_embedding <=> query_embedding) AS similarity
+    FROM notices n
+    WHERE n.id = ANY(candidate_ids)
+      AND n.content_embedding IS NOT NULL
+      AND 1 - (n.content_embedding <=> query_embedding) > match_threshold
+    ORDER BY n.content_embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION search_notices_by_vector_filtered IS '후보 공지 ID 안에서 벡터 유사도 검색 (id, similarity만 반환)';
+
+-- ============================================================
+-- 2. 사용자: 후보 ID 또는 학과/학년 조건 안에서 벡터 검색
+-- ============================================================
+CREATE OR REPLACE FUNCTION search_users_by_notice_vector_filtered(
+    notice_embedding vector(768),
+    candidate_ids uuid[] DEFAULT NULL,
+    target_departments text[] DEFAULT NULL,
+    target_grades int[] DEFAULT NULL,
+    match_threshold float DEFAULT 0.2,
+    match_count int DEFAULT 100
+)
+RETURNS TABLE (
+    user_id uuid,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- 조건 필터로 결과가 모자라면 인덱스를 더 읽도록 설정 (pgvector 0.8+)
+    IF candidate_ids IS NULL THEN
+        BEGIN
+            PERFORM set_config('ivfflat.iterative_scan', 'relaxed_order', true);
+            PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        EXCEPTION WHEN OTHERS THEN
+            NULL;
+        END;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        up.user_id,
+        1 - (up.interests_embedding <=> notice_embedding) AS similarity
+    FROM user_preferences up
+    JOIN users u ON up.user_id = u.id
+    WHERE up.interests_embedding IS NOT NULL
+      AND up.notification_enabled = TRUE
+      AND (candidate_ids IS NULL OR up.user_id = ANY(candidate_ids))
+      AND (target_departments IS NULL OR cardinality(target_departments) = 0
+           OR u.department = ANY(target_departments))
+      AND (target_grades IS NULL OR cardinality(target_grades) = 0
+           OR u.grade = ANY(target_grades))
+      AND 1 - (up.interests_embedding <=> notice_embedding) > match_threshold
+    ORDER BY up.interests_embedding <=> notice_embedding
+    LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION search_users_by_notice_vector_filtered IS '후보 사용자 ID 또는 학과/학년 조건 안에서 벡터 유사도 검색 (user_id, similarity만 반환)';
+
+-- ============================================================
+-- 완료 메시지
+-- ============================================================
+DO $$
+BEGIN
+    RAISE NOTICE '필터 벡터 검색 함수 생성 완료!';
+    RAISE NOTICE '   - search_notices_by_vector_filtered(query_embedding, candidate_ids, ...)';
+    RAISE NOTICE '   - search_users_by_notice_vector_filtered(notice_embedding, candidate_ids, target_departments, target_grades, ...)';
+END $$;
@@ -0,0 +1,96 @@
+-- ============================================================
+-- 017_notice_scoring_rpc.sql
+-- 맞춤 피드 점수 계산 함수 (하드 필터 + 벡터 유사도를 DB에서 계산)
+--
+-- 변경 사항:
+--   - score_recent_notices_for_user: 최근 공지 후보마다
+--     (id, similarity, hard_filter_match)와 화면 표시용 제목/요약/카테고리 반환
+--
+-- 기존 방식:
+--   백엔드가 최근 공지 200개를 content_embedding(건당 ~15KB JSON)까지 받아
+--   Python에서 하드 필터를 적용하고, 다시 벡터 RPC를 호출했습니다.
+--   임베딩은 Python 점수 계산에 쓰이지 않으므로 전송/파싱 비용만 발생합니다.
+--
+-- 하드 필터 규칙 (HybridSearchService._hard_filter_notices와 동일):
+--   - enriched_metadata.deadline이 지난 공지 제외
+--   - is_for_all이면 매칭
+--   - target_departments/target_grades가 비어 있거나 사용자 값을 포함하면 매칭
+--   - 매칭되지 않은 공지도 후보로 반환 (hard_filter_match = FALSE)
+--
+-- 실행 방법: Supabase SQL Editor에서 실행
+-- 백엔드는 함수가 없으면 기존 방식으로 자동 폴백합니다.
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION score_recent_notices_for_user(
+    query_embedding vector(768),
+    user_department text DEFAULT NULL,
+    user_grade int DEFAULT NULL,
+    published_after timestamptz DEFAULT (NOW() - INTERVAL '30 days'),
+    match_threshold float DEFAULT 0.2,
+    candidate_count int DEFAULT 200
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    ai_summary text,
+    category text,
+    similarity float,
+    hard_filter_match boolean
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT n.id, n.title, n.ai_summary, n.category, n.content_embedding,
+               COALESCE(n.enriched_metadata, '{}'::jsonb) AS meta
+        FROM notices n
+        WHERE n.published_at >= published_after
+        ORDER BY n.published_at DESC
+        LIMIT candidate_count
+    )
+    SELECT
+        c.id,
+        c.title,
+        c.ai_summary,
+        c.category,
+        CASE
+            WHEN c.content_embedding IS NULL THEN 0.0
+            WHEN 1 - (c.content_embedding <=> query_embedding) > match_threshold
+                THEN 1 - (c.content_embedding <=> query_embedding)
+            ELSE 0.0
+        END::float AS similarity,
+        COALESCE(
+            COALESCE((c.meta->>'is_for_all')::boolean, FALSE)
+            OR (
+                CASE WHEN jsonb_typeof(c.meta->'target_departments') = 'array'
+                     THEN jsonb_array_length(c.meta->'target_departments') = 0
+                          OR c.meta->'target_departments' @> to_jsonb(user_department)
+                     ELSE TRUE
+                END
+                AND
+                CASE WHEN jsonb_typeof(c.meta->'target_grades') = 'array'
+                     THEN jsonb_array_length(c.meta->'target_grades') = 0
+                          OR c.meta->'target_grades' @> to_jsonb(user_grade)
+                     ELSE TRUE
+                END
+            ),
+            FALSE
+        ) AS hard_filter_match
+    FROM candidates c
+    WHERE (c.meta->>'deadline') IS NULL
+       OR (c.meta->>'deadline') >= to_char(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS');
+END;
+$$;
+
+COMMENT ON FUNCTION score_recent_notices_for_user IS '최근 공지 후보별 벡터 유사도 + 하드 필터 매칭 여부 계산 (임베딩은 반환하지 않음)';
+
+-- ============================================================
+-- 완료 메시지
+-- ============================================================
+DO $$
+BEGIN
+    RAISE NOTICE '맞춤 피드 점수 계산 함수 생성 완료!';
+    RAISE NOTICE '   - score_recent_notices_for_user(query_embedding, user_department, user_grade, ...)';
+END $$;
@@ -0,0 +1,178 @@
+-- ============================================================
+-- 018_halfvec_embeddings.sql
+-- 임베딩 halfvec(반정밀도) 컬럼 + HNSW 인덱스 추가 (1단계: 사본 동기화)
+--
+-- 왜 필요한가?
+--   - vector(768)은 float32 → 행당 3KB, 인덱스도 같은 크기로 커짐
+--   - halfvec(768)은 float16 → 행당 1.5KB, HNSW 인덱스 크기 절반
+--   - 코사인 유사도 오차는 ~1e-3 수준으로 순위에 거의 영향 없음
+--
+-- 전환 절차:
+--   1. 이 마이그레이션 실행 (컬럼/인덱스/동기화 트리거/백필 함수 추가)
+--      → 이후 content_embedding / interests_embedding을 바꾸는 모든 INSERT/UPDATE는
+--        트리거가 halfvec 사본을 함께 맞춤 (NoticeService, migrate_embeddings.py 등 경로 무관)
+--   2. python backend/scripts/backfill_halfvec.py 로 기존 행 변환
+--   3. 019_halfvec_search_functions.sql 실행 (검색 함수가 halfvec 컬럼 사용)
+--
+-- 다시 실행해도 안전합니다 (IF NOT EXISTS / CREATE OR REPLACE).
+-- 공지 트리거가 없던 이전 버전의 018을 적용한 DB도 이 파일을 다시 실행한 뒤
+-- backfill_halfvec.py로 원본과 달라진 사본을 바로잡으세요.
+--
+-- 요구 사항: pgvector 0.7.0+ (halfvec 타입)
+-- 실행 방법: Supabase SQL Editor에서 실행
+-- ============================================================
+
+-- ============================================================
+-- 1. halfvec 컬럼 추가
+-- ============================================================
+ALTER TABLE notices
+ADD COLUMN IF NOT EXISTS content_embedding_half halfvec(768);
+
+ALTER TABLE user_preferences
+ADD COLUMN IF NOT EXISTS interests_embedding_half halfvec(768);
+
+COMMENT ON COLUMN notices.content_embedding_half IS 'content_embedding의 반정밀도(float16) 사본 (검색/인덱스용)';
+COMMENT ON COLUMN user_preferences.interests_embedding_half IS 'interests_embedding의 반정밀도(float16) 사본 (검색/인덱스용)';
+
+-- ============================================================
+-- 2. HNSW 인덱스 (코사인 거리)
+-- ============================================================
+-- IVFFlat(003)과 달리 학습 데이터가 필요 없어 빈 컬럼에도 바로 생성 가능하고,
+-- 행이 추가되어도 재학습(REINDEX) 없이 재현율이 유지됩니다.
+CREATE INDEX IF NOT EXISTS idx_notices_embedding_half
+ON notices USING hnsw (content_embedding_half halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_embedding_half
+ON user_preferences USING hnsw (interests_embedding_half halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- ============================================================
+-- 3. halfvec 사본 동기화 트리거
+-- ============================================================
+-- 임베딩은 여러 경로(NoticeService, scripts/migrate_embeddings.py, routes/users.py)에서
+-- 갱신되므로 백엔드 대신 DB 트리거로 halfvec 사본을 맞춥니다.
+-- 019 이후 검색 함수는 사본만 보므로, 사본이 빠지거나 낡으면 검색/점수가 틀어집니다.
+CREATE OR REPLACE FUNCTION sync_content_embedding_half()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.content_embedding_half := NEW.content_embedding::halfvec(768);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_sync_content_embedding_half ON notices;
+CREATE TRIGGER trg_sync_content_embedding_half
+BEFORE INSERT OR UPDATE OF content_embedding ON notices
+FOR EACH ROW
+EXECUTE FUNCTION sync_content_embedding_half();
+
+CREATE OR REPLACE FUNCTION sync_interests_embedding_half()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.interests_embedding_half := NEW.interests_embedding::halfvec(768);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_sync_interests_embedding_half ON user_preferences;
+CREATE TRIGGER trg_sync_interests_embedding_half
+BEFORE INSERT OR UPDATE OF interests_embedding ON user_preferences
+FOR EACH ROW
+EXECUTE FUNCTION sync_interests_embedding_half();
+
+-- ============================================================
+-- 4. 배치 백필 함수 (scripts/backfill_halfvec.py에서 호출)
+-- ============================================================
+-- 기본키 순서로 after_id 다음 batch_size개 행을 훑고, 그중 사본이 없거나 원본과 다른 행
+-- (원본이 지워진 행 포함)만 변환합니다. 반환한 last_id를 다음 호출의 after_id로 넘기면
+-- 배치마다 앞쪽 행을 다시 훑지 않습니다 (전체 한 번 순회, last_id가 NULL이면 완료).
+-- 한 번에 전체를 UPDATE하지 않는 이유: 긴 트랜잭션/잠금과 WAL 급증 방지
+DROP FUNCTION IF EXISTS backfill_halfvec_embeddings(text, int);
+
+CREATE OR REPLACE FUNCTION backfill_halfvec_embeddings(
+    target_table text,
+    batch_size int DEFAULT 500,
+    after_id uuid DEFAULT NULL
+)
+RETURNS TABLE (last_id uuid, updated_count int)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_id uuid := COALESCE(after_id, '00000000-0000-0000-0000-000000000000'::uuid);
+BEGIN
+    IF target_table = 'notices' THEN
+        RETURN QUERY
+        WITH batch AS (
+            SELECT n.id FROM notices n
+            WHERE n.id > start_id
+            ORDER BY n.id
+            LIMIT batch_size
+        ), updated AS (
+            UPDATE notices n
+            SET content_embedding_half = n.content_embedding::halfvec(768)
+            FROM batch b
+            WHERE n.id = b.id
+              AND n.content_embedding_half IS DISTINCT FROM n.content_embedding::halfvec(768)
+            RETURNING n.id
+        )
+        SELECT (SELECT b.id FROM batch b ORDER BY b.id DESC LIMIT 1),
+               (SELECT COUNT(*)::int FROM updated);
+    ELSIF target_table = 'user_preferences' THEN
+        RETURN QUERY
+        WITH batch AS (
+            SELECT up.id FROM user_preferences up
+            WHERE up.id > start_id
+            ORDER BY up.id
+            LIMIT batch_size
+        ), updated AS (
+            UPDATE user_preferences up
+            SET interests_embedding_half = up.interests_embedding::halfvec(768)
+            FROM batch b
+            WHERE up.id = b.id
+              AND up.interests_embedding_half IS DISTINCT FROM up.interests_embedding::halfvec(768)
+            RETURNING up.id
+        )
+        SELECT (SELECT b.id FROM batch b ORDER BY b.id DESC LIMIT 1),
+               (SELECT COUNT(*)::int FROM updated);
+    ELSE
+        RAISE EXCEPTION 'unsupported table: %', target_table;
+    END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION backfill_halfvec_embeddings IS '임베딩 halfvec 사본 배치 백필 (기본키 keyset, 마지막으로 훑은 id와 변환한 행 수 반환, last_id가 NULL이면 완료)';
+
+-- 변환 대상(사본이 없거나 원본과 다른) 행 수 (backfill_halfvec.py 시작 시 한 번, 진행률 표시용)
+CREATE OR REPLACE FUNCTION count_stale_halfvec_embeddings(target_table text)
+RETURNS bigint
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    IF target_table = 'notices' THEN
+        RETURN (SELECT COUNT(*) FROM notices
+                WHERE content_embedding_half IS DISTINCT FROM content_embedding::halfvec(768));
+    ELSIF target_table = 'user_preferences' THEN
+        RETURN (SELECT COUNT(*) FROM user_preferences
+                WHERE interests_embedding_half IS DISTINCT FROM interests_embedding::halfvec(768));
+    END IF;
+    RAISE EXCEPTION 'unsupported table: %', target_table;
+END;
+$$;
+
+-- ============================================================
+-- 완료 메시지
+-- ============================================================
+DO $$
+BEGIN
+    RAISE NOTICE 'halfvec 컬럼/인덱스 추가 완료!';
+    RAISE NOTICE '   - notices.content_embedding_half halfvec(768) + HNSW (트리거 동기화)';
+    RAISE NOTICE '   - user_preferences.interests_embedding_half halfvec(768) + HNSW (트리거 동기화)';
+    RAISE NOTICE '';
+    RAISE NOTICE '다음 단계: backfill_halfvec.py → 019';
+END $$;
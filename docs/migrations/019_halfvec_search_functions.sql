@@ -0,0 +1,262 @@
+-- ============================================================
+-- 019_halfvec_search_functions.sql
+-- 벡터 검색 함수를 halfvec 컬럼 + HNSW 인덱스로 전환 (2단계)
+--
+-- 선행 조건:
+--   - 018_halfvec_embeddings.sql 실행
+--   - scripts/backfill_halfvec.py 완료 (halfvec 사본이 없는 행은 검색되지 않음)
+--
+-- 변경 사항:
+--   - search_notices_by_vector / search_users_by_notice_vector
+--   - search_notices_by_vector_filtered / search_users_by_notice_vector_filtered (016)
+--   - score_recent_notices_for_user (017)
+--   → 시그니처(vector(768) 입력, 반환 컬럼)는 그대로, 내부 비교만 halfvec로 변경
+--     (백엔드 코드 변경 없음)
+--   - 사용하지 않게 된 IVFFlat 인덱스(003) 삭제
+--
+-- float32 원본 컬럼(content_embedding, interests_embedding)은 유지합니다.
+--   - NoticeVectorIndex 재계산(rescoring)과 롤백용
+--
+-- 롤백: 006/016/017의 함수 정의를 다시 실행하고 003의 IVFFlat 인덱스 재생성
+-- 실행 방법: Supabase SQL Editor에서 실행
+-- ============================================================
+
+-- ============================================================
+-- 1. 공지사항 벡터 검색
+-- ============================================================
+CREATE OR REPLACE FUNCTION search_notices_by_vector(
+    query_embedding vector(768),
+    match_threshold float DEFAULT 0.3,
+    match_count int DEFAULT 20
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content text,
+    category text,
+    ai_summary text,
+    published_at timestamptz,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    query_half halfvec(768) := query_embedding::halfvec(768);
+BEGIN
+    RETURN QUERY
+    SELECT
+        n.id,
+        n.title,
+        n.content,
+        n.category,
+        n.ai_summary,
+        n.published_at,
+        1 - (n.content_embedding_half <=> query_half) AS similarity
+    FROM notices n
+    WHERE n.content_embedding_half IS NOT NULL
+      AND 1 - (n.content_embedding_half <=> query_half) > match_threshold
+    ORDER BY n.content_embedding_half <=> query_half
+    LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION search_notices_by_vector IS '벡터 유사도 기반 공지사항 검색 (halfvec + HNSW)';
+
+-- ============================================================
+-- 2. 사용자 벡터 검색 (알림 발송용)
+-- ============================================================
+CREATE OR REPLACE FUNCTION search_users_by_notice_vector(
+    notice_embedding vector(768),
+    match_threshold float DEFAULT 0.3,
+    match_count int DEFAULT 50
+)
+RETURNS TABLE (
+    user_id uuid,
+    similarity float,
+    department text,
+    grade int
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    notice_half halfvec(768) := notice_embedding::halfvec(768);
+BEGIN
+    RETURN QUERY
+    SELECT
+        up.user_id,
+        1 - (up.interests_embedding_half <=> notice_half) AS similarity,
+        u.department,
+        u.grade
+    FROM user_preferences up
+    JOIN users u ON up.user_id = u.id
+    WHERE up.interests_embedding_half IS NOT NULL
+      AND up.notification_enabled = TRUE
+      AND 1 - (up.interests_embedding_half <=> notice_half) > match_threshold
+    ORDER BY up.interests_embedding_half <=> notice_half
+    LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION search_users_by_notice_vector IS '공지사항과 관련된 사용자 검색 (알림 발송용, halfvec + HNSW)';
+
+-- ============================================================
+-- 3. 후보 필터 벡터 검색 (016)
+-- ============================================================
+CREATE OR REPLACE FUNCTION search_notices_by_vector_filtered(
+    query_embedding vector(768),
+    candidate_ids uuid[],
+    match_threshold float DEFAULT 0.2,
+    match_count int DEFAULT 50
+)
+RETURNS TABLE (
+    id uuid,
+    similarity float
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    query_half halfvec(768) := query_embedding::halfvec(768);
+BEGIN
+    RETURN QUERY
+    SELECT
+        n.id,
+        1 - (n.content_embedding_half <=> query_half) AS similarity
+    FROM notices n
+    WHERE n.id = ANY(candidate_ids)
+      AND n.content_embedding_half IS NOT NULL
+      AND 1 - (n.content_embedding_half <=> query_half) > match_threshold
+    ORDER BY n.content_embedding_half <=> query_half
+    LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION search_users_by_notice_vector_filtered(
+    notice_embedding vector(768),
+    candidate_ids uuid[] DEFAULT NULL,
+    target_departments text[] DEFAULT NULL,
+    target_grades int[] DEFAULT NULL,
+    match_threshold float DEFAULT 0.2,
+    match_count int DEFAULT 100
+)
+RETURNS TABLE (
+    user_id uuid,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    notice_half halfvec(768) := notice_embedding::halfvec(768);
+BEGIN
+    -- 조건 필터로 결과가 모자라면 인덱스를 더 읽도록 설정 (pgvector 0.8+)
+    IF candidate_ids IS NULL THEN
+        BEGIN
+            PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        EXCEPTION WHEN OTHERS THEN
+            NULL;
+        END;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        up.user_id,
+        1 - (up.interests_embedding_half <=> notice_half) AS similarity
+    FROM user_preferences up
+    JOIN users u ON up.user_id = u.id
+    WHERE up.interests_embedding_half IS NOT NULL
+      AND up.notification_enabled = TRUE
+      AND (candidate_ids IS NULL OR up.user_id = ANY(candidate_ids))
+      AND (target_departments IS NULL OR cardinality(target_departments) = 0
+           OR u.department = ANY(target_departments))
+      AND (target_grades IS NULL OR cardinality(target_grades) = 0
+           OR u.grade = ANY(target_grades))
+      AND 1 - (up.interests_embedding_half <=> notice_half) > match_threshold
+    ORDER BY up.interests_embedding_half <=> notice_half
+    LIMIT match_count;
+END;
+$$;
+
+-- ============================================================
+-- 4. 맞춤 피드 점수 계산 (017)
+-- ============================================================
+CREATE OR REPLACE FUNCTION score_recent_notices_for_user(
+    query_embedding vector(768),
+    user_department text DEFAULT NULL,
+    user_grade int DEFAULT NULL,
+    published_after timestamptz DEFAULT (NOW() - INTERVAL '30 days'),
+    match_threshold float DEFAULT 0.2,
+    candidate_count int DEFAULT 200
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    ai_summary text,
+    category text,
+    similarity float,
+    hard_filter_match boolean
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    query_half halfvec(768) := query_embedding::halfvec(768);
+BEGIN
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT n.id, n.title, n.ai_summary, n.category, n.content_embedding_half,
+               COALESCE(n.enriched_metadata, '{}'::jsonb) AS meta
+        FROM notices n
+        WHERE n.published_at >= published_after
+        ORDER BY n.published_at DESC
+        LIMIT candidate_count
+    )
+    SELECT
+        c.id,
+        c.title,
+        c.ai_summary,
+        c.category,
+        CASE
+            WHEN c.content_embedding_half IS NULL THEN 0.0
+            WHEN 1 - (c.content_embedding_half <=> query_half) > match_threshold
+                THEN 1 - (c.content_embedding_half <=> query_half)
+            ELSE 0.0
+        END::float AS similarity,
+        COALESCE(
+            COALESCE((c.meta->>'is_for_all')::boolean, FALSE)
+            OR (
+                CASE WHEN jsonb_typeof(c.meta->'target_departments') = 'array'
+                     THEN jsonb_array_length(c.meta->'target_departments') = 0
+                          OR c.meta->'target_departments' @> to_jsonb(user_department)
+                     ELSE TRUE
+                END
+                AND
+                CASE WHEN jsonb_typeof(c.meta->'target_grades') = 'array'
+                     THEN jsonb_array_length(c.meta->'target_grades') = 0
+                          OR c.meta->'target_grades' @> to_jsonb(user_grade)
+                     ELSE TRUE
+                END
+            ),
+            FALSE
+        ) AS hard_filter_match
+    FROM candidates c
+    WHERE (c.meta->>'deadline') IS NULL
+       OR (c.meta->>'deadline') >= to_char(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS');
+END;
+$$;
+
+-- ============================================================
+-- 5. 사용하지 않는 float32 IVFFlat 인덱스 삭제
+-- ============================================================
+DROP INDEX IF EXISTS idx_notices_embedding;
+DROP INDEX IF EXISTS idx_user_preferences_embedding;
+
+-- ============================================================
+-- 완료 메시지
+-- ============================================================
+DO $$
+BEGIN
+    RAISE NOTICE '벡터 검색 함수 halfvec 전환 완료!';
+    RAISE NOTICE '   - search_notices_by_vector(_filtered), search_users_by_notice_vector(_filtered)';
+    RAISE NOTICE '   - score_recent_notices_for_user';
+    RAISE NOTICE '   - IVFFlat 인덱스 삭제 (HNSW halfvec 인덱스 사용)';
+END $$;
@@ -0,0 +1,31 @@
+-- ============================================================
+-- 020_notice_keyset_indexes.sql
+-- 공지 목록/전체 검색 커서(keyset) 페이지네이션용 복합 인덱스
+--
+-- 백엔드 변경 (services/notice_cursor.py):
+--   - range(offset, ...) 대신 (정렬 컬럼, id) < (마지막 값, 마지막 id) 조건으로 다음 페이지 조회
+--   - ORDER BY 정렬 컬럼, id 와 같은 순서의 인덱스가 있어야 페이지마다 인덱스 범위 조회로 끝남
+--
+-- 정렬별 인덱스:
+--   - latest:   published_at DESC, id DESC (NULL 먼저 — PostgreSQL DESC 기본값)
+--   - views:    view_count DESC, id DESC
+--   - deadline: deadline ASC, id ASC (NULL 나중 — 008의 idx_notices_deadline 대체)
+--   - 카테고리 목록은 category = ? 조건이 붙으므로 category 선두 인덱스 추가
+--
+-- 롤백: 아래 인덱스 DROP 후 008의 idx_notices_deadline 재생성
+-- 실행 방법: Supabase SQL Editor에서 실행 (CONCURRENTLY는 트랜잭션 밖에서 한 문장씩)
+-- ============================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notices_published_at_id
+    ON notices (published_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notices_view_count_id
+    ON notices (view_count DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notices_category_published_at_id
+    ON notices (category, published_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notices_deadline_id
+    ON notices (deadline ASC, id ASC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_notices_deadline;